@@ -14,6 +14,7 @@
 use App\Models\PenempatanBarang;
 use App\Models\LogOptimasi;
 use App\Models\LogAktivitas;
+use App\Models\RingkasanAreaOptimasi;
 use OpenApi\Annotations as OA;
 
 class AnalyticsController extends Controller
@@ -148,6 +149,13 @@ public function dashboard(Request $request): JsonResponse
      *         required=false,
      *         @OA\Schema(type="string", enum={"gudang", "area"}, example="gudang")
      *     ),
+     *     @OA\Parameter(
+     *         name="log_optimasi_id",
+     *         in="query",
+     *         description="Utilisasi proyeksi per area dari ringkasan hasil optimasi",
+     *         required=false,
+     *         @OA\Schema(type="integer", example=2)
+     *     ),
      *     @OA\Response(
      *         response=200,
      *         description="Data utilisasi berhasil diambil",
@@ -203,6 +211,7 @@ public function utilization(Request $request): JsonResponse
             $validator = Validator::make($request->all(), [
                 'gudang_id' => 'nullable|integer|exists:gudang,id',
                 'per' => 'nullable|string|in:gudang,area',
+                'log_optimasi_id' => 'nullable|integer|exists:log_optimasi,id',
             ]);
 
             if ($validator->fails()) {
@@ -216,6 +225,39 @@ public function utilization(Request $request): JsonResponse
             $gudangId = $request->input('gudang_id');
             $per = $request->input('per', 'gudang');
 
+            if ($logOptimasiId = $request->input('log_optimasi_id')) {
+                // Utilisasi proyeksi dari ringkasan yang ditulis optimizer saat menyimpan hasil
+                $ringkasan = RingkasanAreaOptimasi::with('areaGudang:id,gudang_id,kode_area,nama_area,tersedia')
+                    ->where('log_optimasi_id', $logOptimasiId)
+                    ->when($gudangId, function ($q) use ($gudangId) {
+                        $q->whereHas('areaGudang', function ($area) use ($gudangId) {
+                            $area->where('gudang_id', $gudangId);
+                        });
+                    })
+                    ->get();
+
+                $result = $ringkasan->map(function ($row) {
+                    return [
+                        'id' => $row->area_gudang_id,
+                        'kode_area' => $row->areaGudang->kode_area ?? null,
+                        'nama_area' => $row->areaGudang->nama_area ?? null,
+                        'kapasitas' => (float) $row->kapasitas,
+                        'kapasitas_terpakai' => (float) $row->volume_terpakai,
+                        'utilization_percent' => (float) $row->utilisasi_proyeksi,
+                        'jumlah_barang' => $row->jumlah_barang,
+                        'jumlah_run' => $row->jumlah_run,
+                        'rata_rata_jarak' => (float) $row->rata_rata_jarak,
+                        'tersedia' => (bool) ($row->areaGudang->tersedia ?? false),
+                    ];
+                });
+
+                return response()->json([
+                    'success' => true,
+                    'message' => 'Projected utilization per area',
+                    'data' => $result
+                ]);
+            }
+
             if ($per === 'area' || $gudangId) {
                 // Return per-area utilization, optionally filtered by gudang
                 $areas = AreaGudang::when($gudangId, function ($q) use ($gudangId) {
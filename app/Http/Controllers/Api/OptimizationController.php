@@ -198,10 +198,14 @@ public function runSimulatedAnnealing(Request $request): JsonResponse
 
             // Jalankan optimasi secara synchronous dan langsung return hasil
             $hasilOptimasi = $this->runOptimizationSync($logOptimasi->id, $optimizationConfig);
+            $selesai = $hasilOptimasi['status'] === 'selesai';
 
             return response()->json([
-                'status' => 'success',
-                'message' => 'Optimisasi penempatan barang di ruang gudang berhasil diselesaikan',
+                'status' => $selesai ? 'success' : 'error',
+                'message' => $selesai
+                    ? 'Optimisasi penempatan barang di ruang gudang berhasil diselesaikan'
+                    : 'Optimisasi ruang gudang berakhir dengan status ' . $hasilOptimasi['status']
+                        . (!empty($hasilOptimasi['error']) ? ': ' . $hasilOptimasi['error'] : ''),
                 'data' => [
                     'log_optimasi_id' => $logOptimasi->id,
                     'algoritma' => 'Simulated Annealing',
@@ -214,7 +218,8 @@ public function runSimulatedAnnealing(Request $request): JsonResponse
                     'waktu_selesai' => $hasilOptimasi['waktu_selesai'],
                     'hasil_optimasi' => $hasilOptimasi['hasil_optimasi'],
                     'total_rekomendasi' => $hasilOptimasi['total_rekomendasi'] ?? 0,
-                    'waktu_eksekusi' => $hasilOptimasi['waktu_eksekusi'] ?? '0.0s'
+                    'waktu_eksekusi' => $hasilOptimasi['waktu_eksekusi'] ?? '0.0s',
+                    'error' => $hasilOptimasi['error'] ?? null
                 ]
             ], 200); // 200 OK untuk sync processing dengan hasil langsung
             
@@ -265,6 +270,7 @@ public function runSimulatedAnnealing(Request $request): JsonResponse
      *                 ),
      *                 @OA\Property(property="progress_percentage", type="number", nullable=true, example=null),
      *                 @OA\Property(property="recommendations_count", type="integer", example=6),
+     *                 @OA\Property(property="total_barang", type="integer", example=5),
      *                 @OA\Property(property="dapat_dibatalkan", type="boolean", example=true)
      *             )
      *         )
@@ -276,7 +282,15 @@ public function runSimulatedAnnealing(Request $request): JsonResponse
     public function getOptimizationStatus($logOptimasiId): JsonResponse
     {
         try {
-            $logOptimasi = LogOptimasi::with(['rekomendasiPenempatan'])->findOrFail($logOptimasiId);
+            // Jumlah rekomendasi (run) dan barang unik dari ringkasan (tanpa memuat semua baris
+            // rekomendasi); barang unik dijumlah per kategori karena satu barang hanya punya satu kategori
+            $logOptimasi = LogOptimasi::withSum('ringkasanArea', 'jumlah_run')
+                ->withSum('ringkasanKategori', 'jumlah_barang')
+                ->findOrFail($logOptimasiId);
+            $totalRekomendasi = $logOptimasi->ringkasan_area_sum_jumlah_run
+                ?? $logOptimasi->rekomendasiPenempatan()->count();
+            $totalBarang = $logOptimasi->ringkasan_kategori_sum_jumlah_barang
+                ?? $logOptimasi->rekomendasiPenempatan()->distinct()->count('barang_id');
             
             $response = [
                 'status' => 'success',
@@ -287,7 +301,8 @@ public function getOptimizationStatus($logOptimasiId): JsonResponse
                     'waktu_mulai' => $logOptimasi->waktu_mulai,
                     'waktu_selesai' => $logOptimasi->waktu_selesai,
                     'progress_percentage' => $this->calculateProgress($logOptimasi),
-                    'total_rekomendasi' => $logOptimasi->rekomendasiPenempatan->count(),
+                    'total_rekomendasi' => (int) $totalRekomendasi,
+                    'total_barang' => (int) $totalBarang,
                     'hasil_optimasi' => $logOptimasi->hasil_optimasi,
                     'metrik_hasil' => $logOptimasi->metrik_hasil,
                     'log_error' => $logOptimasi->log_error
@@ -398,6 +413,128 @@ public function getWarehouseState(): JsonResponse
         }
     }
 
+    /**
+     * @OA\Get(
+     *     path="/api/optimization/{logOptimasiId}/summary",
+     *     operationId="getOptimizationSummary",
+     *     tags={"Warehouse Optimization"},
+     *     summary="Get utilization summary of an optimization run",
+     *     description="Returns per-area and per-category summary rows (projected utilization, item count, average distance) written by the optimizer at save time",
+     *     security={{"sanctum":{}}},
+     *     @OA\Parameter(
+     *         name="logOptimasiId",
+     *         in="path",
+     *         required=true,
+     *         description="Optimization log ID",
+     *         @OA\Schema(type="integer", example=2)
+     *     ),
+     *     @OA\Response(
+     *         response=200,
+     *         description="Summary retrieved successfully",
+     *         @OA\JsonContent(
+     *             @OA\Property(property="status", type="string", example="success"),
+     *             @OA\Property(
+     *                 property="data",
+     *                 type="object",
+     *                 @OA\Property(property="log_optimasi_id", type="integer", example=2),
+     *                 @OA\Property(property="total_barang", type="integer", example=6),
+     *                 @OA\Property(property="total_run", type="integer", example=7),
+     *                 @OA\Property(property="utilisasi_proyeksi", type="number", example=68.4),
+     *                 @OA\Property(
+     *                     property="areas",
+     *                     type="array",
+     *                     @OA\Items(
+     *                         type="object",
+     *                         @OA\Property(property="area_gudang_id", type="integer", example=1),
+     *                         @OA\Property(property="kode_area", type="string", example="A1-01"),
+     *                         @OA\Property(property="jumlah_barang", type="integer", example=3),
+     *                         @OA\Property(property="jumlah_run", type="integer", example=4),
+     *                         @OA\Property(property="volume_terpakai", type="number", example=120.5),
+     *                         @OA\Property(property="kapasitas", type="number", example=480.0),
+     *                         @OA\Property(property="utilisasi_proyeksi", type="number", example=25.1),
+     *                         @OA\Property(property="rata_rata_jarak", type="number", example=8.94)
+     *                     )
+     *                 ),
+     *                 @OA\Property(
+     *                     property="kategori",
+     *                     type="array",
+     *                     @OA\Items(
+     *                         type="object",
+     *                         @OA\Property(property="kategori_barang_id", type="integer", example=1),
+     *                         @OA\Property(property="nama_kategori", type="string", example="Elektronik"),
+     *                         @OA\Property(property="jumlah_barang", type="integer", example=2),
+     *                         @OA\Property(property="jumlah_run", type="integer", example=2),
+     *                         @OA\Property(property="total_volume", type="number", example=45.2),
+     *                         @OA\Property(property="jumlah_area", type="integer", example=1),
+     *                         @OA\Property(property="rata_rata_jarak", type="number", example=6.12)
+     *                     )
+     *                 )
+     *             )
+     *         )
+     *     ),
+     *     @OA\Response(response=404, description="Optimization log not found"),
+     *     @OA\Response(response=401, description="Unauthorized")
+     * )
+     */
+    public function getOptimizationSummary($logOptimasiId): JsonResponse
+    {
+        try {
+            $logOptimasi = LogOptimasi::with([
+                'ringkasanArea.areaGudang:id,kode_area,nama_area',
+                'ringkasanKategori.kategoriBarang:id,nama_kategori',
+            ])->findOrFail($logOptimasiId);
+
+            $areas = $logOptimasi->ringkasanArea->map(function ($ringkasan) {
+                return [
+                    'area_gudang_id' => $ringkasan->area_gudang_id,
+                    'kode_area' => $ringkasan->areaGudang->kode_area ?? null,
+                    'nama_area' => $ringkasan->areaGudang->nama_area ?? null,
+                    'jumlah_barang' => $ringkasan->jumlah_barang,
+                    'jumlah_run' => $ringkasan->jumlah_run,
+                    'volume_terpakai' => (float) $ringkasan->volume_terpakai,
+                    'kapasitas' => (float) $ringkasan->kapasitas,
+                    'utilisasi_proyeksi' => (float) $ringkasan->utilisasi_proyeksi,
+                    'rata_rata_jarak' => (float) $ringkasan->rata_rata_jarak,
+                ];
+            });
+
+            $kategori = $logOptimasi->ringkasanKategori->map(function ($ringkasan) {
+                return [
+                    'kategori_barang_id' => $ringkasan->kategori_barang_id,
+                    'nama_kategori' => $ringkasan->kategoriBarang->nama_kategori ?? null,
+                    'jumlah_barang' => $ringkasan->jumlah_barang,
+                    'jumlah_run' => $ringkasan->jumlah_run,
+                    'total_volume' => (float) $ringkasan->total_volume,
+                    'jumlah_area' => $ringkasan->jumlah_area,
+                    'rata_rata_jarak' => (float) $ringkasan->rata_rata_jarak,
+                ];
+            });
+
+            $totalKapasitas = $areas->sum('kapasitas');
+
+            return response()->json([
+                'status' => 'success',
+                'data' => [
+                    'log_optimasi_id' => $logOptimasi->id,
+                    // Barang yang dipecah ke beberapa area dihitung sekali
+                    'total_barang' => $kategori->sum('jumlah_barang'),
+                    'total_run' => $areas->sum('jumlah_run'),
+                    'utilisasi_proyeksi' => $totalKapasitas > 0
+                        ? round(($areas->sum('volume_terpakai') / $totalKapasitas) * 100, 2)
+                        : 0,
+                    'areas' => $areas->values(),
+                    'kategori' => $kategori->values(),
+                ]
+            ]);
+
+        } catch (\Exception $e) {
+            return response()->json([
+                'status' => 'error',
+                'message' => 'Gagal mengambil ringkasan optimasi: ' . $e->getMessage()
+            ], 500);
+        }
+    }
+
     /**
      * Cancel running optimization
      */
@@ -591,12 +728,40 @@ private function runOptimizationSync($logOptimasiId, $parameters)
             // Join output array menjadi string
             $outputString = implode("\n", $output);
 
-            // Jika command gagal
+            // Amplop hasil dari script sudah memuat status, hasil, dan jumlah rekomendasi:
+            // tidak perlu menunggu maupun membaca ulang database. Amplop dibaca sebelum
+            // exit code karena run gagal/dibatalkan juga menulis amplop (status + error)
+            $envelope = $this->parseResultEnvelope($output);
+            if ($envelope !== null) {
+                if ($envelope['status'] !== 'selesai') {
+                    // Script bisa gagal sebelum sempat menulis status ke log_optimasi
+                    LogOptimasi::where('id', $logOptimasiId)
+                        ->where('status', 'sedang_berjalan')
+                        ->update([
+                            'status' => $envelope['status'],
+                            'waktu_selesai' => now(),
+                            'log_error' => $envelope['error'] ?? null
+                        ]);
+                }
+
+                return [
+                    'status' => $envelope['status'],
+                    'error' => $envelope['error'] ?? null,
+                    'waktu_selesai' => $envelope['waktu_selesai'],
+                    'hasil_optimasi' => $envelope['hasil_optimasi'],
+                    'total_rekomendasi' => $envelope['total_rekomendasi'],
+                    'waktu_eksekusi' => $executionTime . 's',
+                    'python_output' => config('app.debug') ? $outputString : null,
+                    'exit_code' => $return_var
+                ];
+            }
+
+            // Tanpa amplop, exit code menjadi satu-satunya tanda kegagalan
             if ($return_var !== 0) {
                 throw new \Exception('Python script error (exit code: ' . $return_var . '): ' . $outputString);
             }
 
-            // Tunggu sebentar untuk memastikan database update selesai
+            // Fallback script tanpa amplop: tunggu sebentar untuk memastikan database update selesai
             sleep(1);
 
             // Refresh log optimasi dari database untuk mendapatkan hasil terbaru
@@ -620,17 +785,36 @@ private function runOptimizationSync($logOptimasiId, $parameters)
             ];
             
         } catch (\Exception $e) {
-            // Update log optimasi dengan status error
-            LogOptimasi::where('id', $logOptimasiId)->update([
-                'status' => 'gagal',
-                'waktu_selesai' => now(),
-                'log_error' => 'Error sync: ' . $e->getMessage()
-            ]);
+            // Update log optimasi dengan status error (status dibatalkan/selesai tidak ditimpa)
+            LogOptimasi::where('id', $logOptimasiId)
+                ->where('status', 'sedang_berjalan')
+                ->update([
+                    'status' => 'gagal',
+                    'waktu_selesai' => now(),
+                    'log_error' => 'Error sync: ' . $e->getMessage()
+                ]);
             
             throw $e;
         }
     }
 
+    /**
+     * Ambil amplop hasil JSON (baris berawalan WAREHOUSE_RESULT) dari output script,
+     * dicari dari baris terakhir karena stderr ikut tergabung
+     */
+    private function parseResultEnvelope(array $output): ?array
+    {
+        $prefix = 'WAREHOUSE_RESULT ';
+        for ($i = count($output) - 1; $i >= 0; $i--) {
+            if (str_starts_with($output[$i], $prefix)) {
+                $envelope = json_decode(substr($output[$i], strlen($prefix)), true);
+                return is_array($envelope) ? $envelope : null;
+            }
+        }
+
+        return null;
+    }
+
     /**
      * Run optimization asynchronously
      */
@@ -75,6 +75,16 @@ public function rekomendasiPenempatan()
         return $this->hasMany(RekomendasiPenempatan::class, 'log_optimasi_id');
     }
 
+    public function ringkasanArea()
+    {
+        return $this->hasMany(RingkasanAreaOptimasi::class, 'log_optimasi_id');
+    }
+
+    public function ringkasanKategori()
+    {
+        return $this->hasMany(RingkasanKategoriOptimasi::class, 'log_optimasi_id');
+    }
+
     // Scopes
     public function scopeSelesai($query)
     {
@@ -112,4 +122,34 @@ public function getWaktuEksekusiFormattedAttribute()
             return $jam . ' jam ' . $menit . ' menit';
         }
     }
+
+    /**
+     * Pilih anggota front Pareto (run multi-objektif, engine 'mosa') untuk bobot
+     * preferensi baru tanpa menjalankan optimasi ulang.
+     * Bobot berlaku pada komponen ternormalisasi (0 = terbaik di front), boleh
+     * berupa list [distance, space, category, access] atau array asosiatif
+     * dengan nama komponen. Terapkan hasilnya dengan
+     * `python warehouse_optimization.py --log-id=<id> --pareto-member=<member>`.
+     */
+    public function paretoMemberFor(array $bobot): ?array
+    {
+        $front = $this->hasil_optimasi['pareto']['front'] ?? [];
+        $terpilih = null;
+        $skorTerbaik = INF;
+
+        foreach ($front as $anggota) {
+            $skor = 0.0;
+            $i = 0;
+            foreach ($anggota['normalized'] as $komponen => $nilai) {
+                $skor += ($bobot[$komponen] ?? $bobot[$i] ?? 0) * $nilai;
+                $i++;
+            }
+            if ($skor < $skorTerbaik) {
+                $skorTerbaik = $skor;
+                $terpilih = $anggota;
+            }
+        }
+
+        return $terpilih;
+    }
 }
@@ -4,6 +4,7 @@
 
 use Illuminate\Database\Eloquent\Model;
 use Illuminate\Database\Eloquent\Factories\HasFactory;
+use App\Services\PlacementReasonService;
 
 class RekomendasiPenempatan extends Model
 {
@@ -81,6 +82,28 @@ public function scopeByPrioritas($query, $prioritas)
     }
 
     // Accessors
+    public function getAlasanAttribute($value)
+    {
+        // Hasil optimasi menyimpan kode alasan ringkas; kalimat dirender saat dibaca
+        if (!PlacementReasonService::isCode($value)) {
+            return $value;
+        }
+
+        // Hanya relasi yang sudah di-eager-load (tanpa query per baris); selain itu nama generik
+        return PlacementReasonService::render(
+            $value,
+            $this->relationLoaded('barang') ? $this->barang?->nama_barang : null,
+            $this->relationLoaded('areaGudangRekomendasi') ? $this->areaGudangRekomendasi?->nama_area : null
+        );
+    }
+
+    public function getKodeAlasanAttribute()
+    {
+        $value = $this->getRawOriginal('alasan');
+
+        return PlacementReasonService::isCode($value) ? $value : null;
+    }
+
     public function getStatusBadgeAttribute()
     {
         $badges = [
@@ -0,0 +1,41 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class RingkasanAreaOptimasi extends Model
+{
+    protected $table = 'ringkasan_area_optimasi';
+
+    protected $fillable = [
+        'log_optimasi_id',
+        'area_gudang_id',
+        'jumlah_barang',
+        'jumlah_run',
+        'volume_terpakai',
+        'kapasitas',
+        'utilisasi_proyeksi',
+        'rata_rata_jarak',
+    ];
+
+    protected $casts = [
+        'jumlah_barang' => 'integer',
+        'jumlah_run' => 'integer',
+        'volume_terpakai' => 'decimal:4',
+        'kapasitas' => 'decimal:4',
+        'utilisasi_proyeksi' => 'decimal:2',
+        'rata_rata_jarak' => 'decimal:4',
+    ];
+
+    // Relationships
+    public function logOptimasi()
+    {
+        return $this->belongsTo(LogOptimasi::class);
+    }
+
+    public function areaGudang()
+    {
+        return $this->belongsTo(AreaGudang::class);
+    }
+}
@@ -0,0 +1,39 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class RingkasanKategoriOptimasi extends Model
+{
+    protected $table = 'ringkasan_kategori_optimasi';
+
+    protected $fillable = [
+        'log_optimasi_id',
+        'kategori_barang_id',
+        'jumlah_barang',
+        'jumlah_run',
+        'total_volume',
+        'jumlah_area',
+        'rata_rata_jarak',
+    ];
+
+    protected $casts = [
+        'jumlah_barang' => 'integer',
+        'jumlah_run' => 'integer',
+        'total_volume' => 'decimal:4',
+        'jumlah_area' => 'integer',
+        'rata_rata_jarak' => 'decimal:4',
+    ];
+
+    // Relationships
+    public function logOptimasi()
+    {
+        return $this->belongsTo(LogOptimasi::class);
+    }
+
+    public function kategoriBarang()
+    {
+        return $this->belongsTo(KategoriBarang::class);
+    }
+}
@@ -110,8 +110,11 @@ public function getAreaGudangDetail(AreaGudang $areaGudang): AreaGudang
         return $areaGudang->load([
             'gudang',
             'penempatanBarang.barang',
-            'rekomendasiSaatIni',
-            'rekomendasiTujuan'
+            // barang dan area tujuan dipakai untuk merender alasan rekomendasi
+            'rekomendasiSaatIni.barang:id,nama_barang',
+            'rekomendasiSaatIni.areaGudangRekomendasi:id,nama_area',
+            'rekomendasiTujuan.barang:id,nama_barang',
+            'rekomendasiTujuan.areaGudangRekomendasi:id,nama_area'
         ]);
     }
 
@@ -0,0 +1,82 @@
+<?php
+
+namespace App\Services;
+
+class PlacementReasonService
+{
+    /**
+     * Prefix kode alasan yang ditulis oleh script/placement_reasoning.py
+     */
+    public const CODE_PREFIX = 'rc:';
+
+    /**
+     * Template kalimat per kunci (harus sama dengan REASON_TEMPLATES di Python)
+     * {u} = utilisasi %, {s} = sisa kapasitas m³, {t} = tinggi area m
+     */
+    public const TEMPLATES = [
+        'E1' => 'barang elektronik ditempatkan di rak tinggi untuk keamanan dan proteksi dari kelembaban',
+        'E2' => 'area dengan kapasitas tersedia {s}m³ cocok untuk barang elektronik sensitif',
+        'E3' => 'penempatan elektronik di area khusus untuk menghindari kerusakan dan gangguan',
+        'D1' => 'dokumen ditempatkan di area lantai karena mudah diakses dan tidak memerlukan rak khusus',
+        'D2' => 'area dengan utilisasi {u}% memiliki ruang memadai untuk arsip dokumen',
+        'D3' => 'penempatan dokumen di area administratif untuk kemudahan akses dan organisasi',
+        'P1' => 'paket express ditempatkan dekat pintu masuk untuk memudahkan proses loading dan unloading',
+        'P2' => 'area dengan kapasitas tersisa {s}m³ optimal untuk rotasi paket cepat',
+        'P3' => 'penempatan paket di area transit untuk mempercepat distribusi dan pengiriman',
+        'F1' => 'barang fragile ditempatkan di rak tinggi untuk proteksi maksimal dari benturan',
+        'F2' => 'penempatan khusus untuk barang mudah pecah dengan akses terbatas',
+        'U1' => 'optimisasi ruang kosong dengan memanfaatkan area yang hanya terisi {u}%',
+        'U2' => 'penempatan efisien pada area dengan utilisasi tinggi {u}%',
+        'U3' => 'pemanfaatan optimal ruang dengan tingkat utilisasi yang seimbang {u}%',
+        'V1' => 'barang berukuran besar memerlukan area dengan tinggi memadai ({t}m)',
+        'V2' => 'penempatan barang voluminous di area yang sesuai dengan dimensi produk',
+        'V3' => 'penempatan barang kompak untuk optimisasi density penyimpanan',
+        'A' => 'lokasi strategis dekat akses utama untuk operasional yang efisien',
+    ];
+
+    /**
+     * Check apakah alasan berupa kode (bukan teks bebas)
+     */
+    public static function isCode(?string $alasan): bool
+    {
+        return $alasan !== null && str_starts_with($alasan, self::CODE_PREFIX);
+    }
+
+    /**
+     * Render kode alasan menjadi kalimat lengkap; teks biasa dikembalikan apa adanya
+     */
+    public static function render(?string $alasan, ?string $namaBarang = null, ?string $namaArea = null): ?string
+    {
+        if (!self::isCode($alasan)) {
+            return $alasan;
+        }
+
+        $parts = explode('|', substr($alasan, strlen(self::CODE_PREFIX)));
+        $keys = array_filter(explode(',', array_shift($parts)));
+
+        $replacements = [];
+        foreach ($parts as $part) {
+            [$name, $value] = array_pad(explode('=', $part, 2), 2, '');
+            $replacements['{' . $name . '}'] = $value;
+        }
+
+        $reasons = [];
+        foreach ($keys as $key) {
+            if (isset(self::TEMPLATES[$key])) {
+                $reasons[] = strtr(self::TEMPLATES[$key], $replacements);
+            }
+        }
+
+        $subject = ($namaBarang ?? 'Item') . ' ditempatkan di ' . ($namaArea ?? 'Area');
+
+        if (count($reasons) >= 2) {
+            return "{$subject} karena {$reasons[0]}, serta {$reasons[1]}";
+        }
+
+        if (count($reasons) === 1) {
+            return "{$subject} karena {$reasons[0]}";
+        }
+
+        return "{$subject} berdasarkan analisis algoritma SA untuk konfigurasi optimal";
+    }
+}
@@ -0,0 +1,56 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     *
+     * Ringkasan utilisasi per log optimasi, ditulis oleh optimizer Python
+     * dalam transaksi yang sama dengan rekomendasi_penempatan.
+     * jumlah_barang = barang unik, jumlah_run = baris rekomendasi (run).
+     */
+    public function up(): void
+    {
+        Schema::create('ringkasan_area_optimasi', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('log_optimasi_id')->constrained('log_optimasi')->onDelete('cascade');
+            $table->foreignId('area_gudang_id')->constrained('area_gudang')->onDelete('cascade');
+            $table->unsignedInteger('jumlah_barang')->default(0);
+            $table->unsignedInteger('jumlah_run')->default(0);
+            $table->decimal('volume_terpakai', 14, 4)->default(0);
+            $table->decimal('kapasitas', 14, 4)->default(0);
+            $table->decimal('utilisasi_proyeksi', 8, 2)->default(0);
+            $table->decimal('rata_rata_jarak', 10, 4)->default(0);
+            $table->timestamps();
+
+            $table->unique(['log_optimasi_id', 'area_gudang_id']);
+        });
+
+        Schema::create('ringkasan_kategori_optimasi', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('log_optimasi_id')->constrained('log_optimasi')->onDelete('cascade');
+            $table->foreignId('kategori_barang_id')->constrained('kategori_barang')->onDelete('cascade');
+            $table->unsignedInteger('jumlah_barang')->default(0);
+            $table->unsignedInteger('jumlah_run')->default(0);
+            $table->decimal('total_volume', 14, 4)->default(0);
+            $table->unsignedInteger('jumlah_area')->default(0);
+            $table->decimal('rata_rata_jarak', 10, 4)->default(0);
+            $table->timestamps();
+
+            $table->unique(['log_optimasi_id', 'kategori_barang_id']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('ringkasan_kategori_optimasi');
+        Schema::dropIfExists('ringkasan_area_optimasi');
+    }
+};
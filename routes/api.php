@@ -158,6 +158,7 @@
         Route::get('warehouse-state', [OptimizationController::class, 'getWarehouseState']);
         Route::post('simulated-annealing', [OptimizationController::class, 'runSimulatedAnnealing']);
         Route::get('{logOptimasiId}/status', [OptimizationController::class, 'getOptimizationStatus']);
+        Route::get('{logOptimasiId}/summary', [OptimizationController::class, 'getOptimizationSummary']);
         Route::post('{logOptimasiId}/cancel', [OptimizationController::class, 'cancelOptimization']);
         
         // Debug route
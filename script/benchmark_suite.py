@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite Offline untuk Optimasi Warehouse
+
+Mengukur performa komponen optimasi pada data sintetis (tanpa MySQL):
+- objective_function : WarehouseOptimizer.calculate_objective_function (API list)
+- compiled_objective : CompiledProblem.evaluate (evaluasi penuh vectorized)
+- generate_neighbor  : WarehouseOptimizer.generate_neighbor
+- move_delta         : MoveEvaluator.delta_relocate/delta_swap
+- sa_loop            : SimulatedAnnealingEngine dengan budget iterasi tetap (loop NumPy)
+- sa_loop_numba      : sama dengan sa_loop, satu kernel numba per langkah suhu (sa_kernels)
+- save_solution      : save_solution_to_database ke InMemoryDatabase
+- load_rows          : fetch_areas + fetch_barang per baris (dict → dataclass)
+- load_columnar      : fetch_areas + fetch_barang langsung ke array (warehouse_columns)
+- picking_sim        : PickingSimulator, 100k order sintetis (nearest-neighbor + 2-opt)
+
+Untuk setiap ukuran dicatat evaluasi/detik dan peak memory (tracemalloc),
+lalu eksponen scaling (kemiringan log-log waktu terhadap N). Hasil dapat
+dibandingkan dengan baseline tersimpan untuk mendeteksi regresi.
+
+Usage:
+    python benchmark_suite.py                        # ukuran default
+    python benchmark_suite.py --sizes 100,1000,10000
+    python benchmark_suite.py --save-baseline        # simpan sebagai baseline
+    python benchmark_suite.py --tolerance 0.3        # batas regresi 30%
+    python benchmark_suite.py --require-baseline     # gagal jika baseline tidak ada/tidak cocok
+
+Baseline bergantung pada mesin, jadi tidak ikut di-commit: buat (atau
+perbarui setelah ganti hardware/perubahan performa yang disengaja) dengan
+--save-baseline pada mesin yang sama dengan run pembanding. Tanpa baseline
+suite tetap berjalan tetapi mencetak peringatan; --require-baseline (CI)
+mengubahnya menjadi kegagalan.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+import argparse
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from synthetic_warehouse import InMemoryDatabase, generate_warehouse, synthetic_problem
+from optimization_problem import MoveEvaluator
+from optimization_engines import create_engine
+from sa_kernels import NUMBA_AVAILABLE
+from picking_simulator import PickingSimulator, synthetic_orders
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'baseline.json')
+
+# Parameter SA dengan budget tetap: 7 langkah suhu x 2000 iterasi, tanpa early stopping
+SA_BENCH_PARAMS = {
+    'temperature_initial': 100.0,
+    'temperature_final': 1.0,
+    'cooling_rate': 0.5,
+    'max_iterations': 2000,
+    'max_no_improvement': 10 ** 9,
+    'kernel': 'numpy',
+}
+
+# Benchmark yang membutuhkan numba; dilewati jika numba tidak terpasang
+JIT_BENCHMARKS = {'sa_loop_numba'}
+
+
+class BenchmarkContext:
+    """Data sintetis untuk satu ukuran, objek dataclass dibuat hanya bila diperlukan"""
+
+    def __init__(self, n_items: int, seed: int = 0):
+        self.n_items = n_items
+        self.seed = seed
+        self.problem = synthetic_problem(n_items, seed=seed)
+        self.layout = self.problem.random_layout(np.random.default_rng(seed))
+        self._optimizer = None
+        self._solution = None
+        self._db = None
+
+    @property
+    def optimizer(self):
+        if self._optimizer is None:
+            from warehouse_optimization import WarehouseOptimizer
+
+            # File hasil export ditulis relatif ke cwd (direktori kerja sementara run_suite)
+            optimizer = WarehouseOptimizer({'results_dir': 'results'}, db=InMemoryDatabase())
+            optimizer.areas, optimizer.barang_list = generate_warehouse(self.n_items, seed=self.seed)
+            optimizer.prepare_distance_model()
+            self._optimizer = optimizer
+        return self._optimizer
+
+    @property
+    def db(self) -> InMemoryDatabase:
+        if self._db is None:
+            self._db = InMemoryDatabase(self.n_items, seed=self.seed)
+        return self._db
+
+    @property
+    def solution(self):
+        if self._solution is None:
+            self._solution = self.problem.solution_from_layout(*self.layout)
+        return self._solution
+
+
+def _repeat(fn: Callable[[], int], min_time: float = 0.3, max_calls: int = 10000) -> Tuple[float, int, int]:
+    """
+    Jalankan fn berulang minimal min_time detik
+
+    Returns:
+        (total detik, jumlah panggilan, total evaluasi)
+    """
+    calls = 0
+    evaluations = 0
+    start = time.perf_counter()
+    while True:
+        evaluations += fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= max_calls:
+            return elapsed, calls, evaluations
+
+
+def bench_objective_function(ctx: BenchmarkContext) -> Callable[[], int]:
+    optimizer, solution = ctx.optimizer, ctx.solution
+
+    def run():
+        optimizer.calculate_objective_function(solution)
+        return 1
+    return run
+
+
+def bench_compiled_objective(ctx: BenchmarkContext) -> Callable[[], int]:
+    problem, layout = ctx.problem, ctx.layout
+
+    def run():
+        problem.evaluate(*layout)
+        return 1
+    return run
+
+
+def bench_generate_neighbor(ctx: BenchmarkContext) -> Callable[[], int]:
+    optimizer, solution = ctx.optimizer, ctx.solution
+
+    def run():
+        for _ in range(10):
+            optimizer.generate_neighbor(solution)
+        return 10
+    return run
+
+
+def bench_move_delta(ctx: BenchmarkContext) -> Callable[[], int]:
+    evaluator = MoveEvaluator(ctx.problem)
+    evaluator.load(*ctx.layout)
+    engine = create_engine('sa', ctx.problem, seed=ctx.seed, verbose=False)
+    moves = engine.draw_moves(evaluator, 1000)
+    strategy = moves['strategy'].tolist()
+    mi, mj, ma = moves['i'].tolist(), moves['j'].tolist(), moves['area'].tolist()
+    mu, mv = moves['u'].tolist(), moves['v'].tolist()
+
+    def run():
+        for k in range(1000):
+            if strategy[k] == 2:
+                evaluator.delta_swap(mi[k], mj[k])
+            else:
+                evaluator.delta_relocate(mi[k], *engine.move_target(evaluator, strategy[k], mi[k], ma[k], mu[k], mv[k]))
+        return 1000
+    return run
+
+
+def _bench_sa(ctx: BenchmarkContext, kernel: str) -> Callable[[], int]:
+    problem, layout = ctx.problem, ctx.layout
+    params = {**SA_BENCH_PARAMS, 'kernel': kernel}
+    if kernel == 'numba':
+        # Kompilasi JIT di luar pengukuran
+        create_engine('sa', problem, params={**params, 'temperature_initial': 2.0}, seed=ctx.seed,
+                      verbose=False).run(initial=layout)
+
+    def run():
+        engine = create_engine('sa', problem, params=params, seed=ctx.seed, verbose=False)
+        return engine.run(initial=layout).evaluations
+    return run
+
+
+def bench_sa_loop(ctx: BenchmarkContext) -> Callable[[], int]:
+    return _bench_sa(ctx, 'numpy')
+
+
+def bench_sa_loop_numba(ctx: BenchmarkContext) -> Callable[[], int]:
+    return _bench_sa(ctx, 'numba')
+
+
+def bench_save_solution(ctx: BenchmarkContext) -> Callable[[], int]:
+    optimizer, solution = ctx.optimizer, ctx.solution
+
+    def run():
+        optimizer.save_solution_to_database(solution)
+        return len(solution)
+    return run
+
+
+def _bench_load(ctx: BenchmarkContext, columnar: bool) -> Callable[[], int]:
+    from warehouse_optimization import WarehouseOptimizer
+
+    db = ctx.db
+
+    def run():
+        optimizer = WarehouseOptimizer({'columnar_load': columnar, 'use_cache': False,
+                                        'algorithm_params': {'seed': ctx.seed}}, db=db)
+        optimizer.fetch_areas()
+        optimizer.fetch_barang()
+        return len(optimizer.barang_list)
+    return run
+
+
+def bench_load_rows(ctx: BenchmarkContext) -> Callable[[], int]:
+    return _bench_load(ctx, columnar=False)
+
+
+def bench_load_columnar(ctx: BenchmarkContext) -> Callable[[], int]:
+    return _bench_load(ctx, columnar=True)
+
+
+def bench_picking_sim(ctx: BenchmarkContext) -> Callable[[], int]:
+    simulator = PickingSimulator(ctx.problem)
+    orders = synthetic_orders(ctx.problem, 100000, seed=ctx.seed)
+
+    def run():
+        return simulator.simulate(orders, *ctx.layout).orders
+    return run
+
+
+# name -> (factory, ukuran maksimal, keterangan). Batas ukuran untuk fungsi
+# API list yang masih O(N²) karena lookup barang/area dengan scan linear.
+BENCHMARKS: Dict[str, Tuple[Callable, Optional[int], str]] = {
+    'objective_function': (bench_objective_function, 2000, 'calculate_objective_function (list API)'),
+    'compiled_objective': (bench_compiled_objective, None, 'CompiledProblem.evaluate'),
+    'generate_neighbor': (bench_generate_neighbor, 100000, 'generate_neighbor (list API)'),
+    'move_delta': (bench_move_delta, None, 'MoveEvaluator delta'),
+    'sa_loop': (bench_sa_loop, None, 'SA engine, 14k iterations'),
+    'sa_loop_numba': (bench_sa_loop_numba, None, 'SA engine, 14k iterations (numba kernel)'),
+    'save_solution': (bench_save_solution, 5000, 'save_solution_to_database (in-memory DB)'),
+    'load_rows': (bench_load_rows, 100000, 'fetch_areas + fetch_barang (dict rows → dataclass)'),
+    'load_columnar': (bench_load_columnar, None, 'fetch_areas + fetch_barang (columnar arrays)'),
+    'picking_sim': (bench_picking_sim, None, 'PickingSimulator, 100k orders'),
+}
+
+
+def run_benchmark(name: str, ctx: BenchmarkContext, min_time: float) -> Dict:
+    factory = BENCHMARKS[name][0]
+
+    # Pengukuran waktu tanpa tracemalloc (tracemalloc memperlambat alokasi)
+    fn = factory(ctx)
+    elapsed, calls, evaluations = _repeat(fn, min_time=min_time)
+
+    # Peak memory dari satu panggilan terpisah
+    tracemalloc.start()
+    factory(ctx)()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds_per_call': elapsed / calls,
+        'calls': calls,
+        'evaluations_per_second': evaluations / elapsed if elapsed > 0 else 0.0,
+        'peak_memory_mb': peak / (1024 * 1024),
+    }
+
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """Kemiringan log(waktu) terhadap log(N): ~1 linear, ~2 kuadratik"""
+    if len(sizes) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return float(slope)
+
+
+def run_suite(sizes: List[int], benchmarks: Optional[List[str]] = None, min_time: float = 0.3,
+              seed: int = 0) -> Dict:
+    """Jalankan semua benchmark untuk setiap ukuran dan hitung eksponen scaling"""
+    names = benchmarks or list(BENCHMARKS)
+    if not NUMBA_AVAILABLE and JIT_BENCHMARKS.intersection(names):
+        print(f"⚠️  numba is not installed, skipping {', '.join(sorted(JIT_BENCHMARKS.intersection(names)))}")
+        names = [name for name in names if name not in JIT_BENCHMARKS]
+    results: Dict[str, Dict] = {name: {'description': BENCHMARKS[name][2], 'sizes': {}} for name in names}
+
+    # save_solution_to_database mengekspor file hasil ke cwd/results
+    workdir = tempfile.mkdtemp(prefix='warehouse_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    devnull = open(os.devnull, 'w')
+    try:
+        for n in sizes:
+            print(f"📏 Size N={n:,}")
+            ctx = BenchmarkContext(n, seed=seed)
+            for name in names:
+                max_size = BENCHMARKS[name][1]
+                if max_size is not None and n > max_size:
+                    continue
+                stdout = sys.stdout
+                sys.stdout = devnull  # redam output print dari fungsi yang diukur
+                try:
+                    measurement = run_benchmark(name, ctx, min_time)
+                finally:
+                    sys.stdout = stdout
+                results[name]['sizes'][str(n)] = measurement
+                print(f"   {name:<20} {measurement['evaluations_per_second']:>14,.1f} eval/s  "
+                      f"{measurement['seconds_per_call'] * 1000:>10.3f} ms/call  "
+                      f"peak {measurement['peak_memory_mb']:.1f} MB")
+    finally:
+        devnull.close()
+        os.chdir(cwd)
+
+    for name, data in results.items():
+        measured = sorted((int(n), m['seconds_per_call']) for n, m in data['sizes'].items())
+        data['scaling_exponent'] = scaling_exponent([n for n, _ in measured], [s for _, s in measured])
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'seed': seed,
+        'benchmarks': results,
+    }
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Bandingkan evaluasi/detik dengan baseline
+
+    Returns:
+        List regresi: throughput turun lebih dari `tolerance` (fraksi)
+    """
+    regressions = []
+    for name, data in report['benchmarks'].items():
+        base_sizes = baseline.get('benchmarks', {}).get(name, {}).get('sizes', {})
+        for size, measurement in data['sizes'].items():
+            if size not in base_sizes:
+                continue
+            base = base_sizes[size]['evaluations_per_second']
+            current = measurement['evaluations_per_second']
+            if base > 0 and current < base * (1 - tolerance):
+                regressions.append({
+                    'benchmark': name,
+                    'size': int(size),
+                    'baseline_eval_per_s': base,
+                    'current_eval_per_s': current,
+                    'change_percent': (current - base) / base * 100,
+                })
+    return regressions
+
+
+def uncovered_measurements(report: Dict, baseline: Dict) -> List[str]:
+    """Pengukuran (benchmark, N) di report yang tidak punya pasangan di baseline"""
+    missing = []
+    for name, data in report['benchmarks'].items():
+        base_sizes = baseline.get('benchmarks', {}).get(name, {}).get('sizes', {})
+        missing.extend(f"{name} N={int(size):,}" for size in data['sizes'] if size not in base_sizes)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite for warehouse optimization')
+    parser.add_argument('--sizes', type=str, default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated item counts (default: 100..1M)')
+    parser.add_argument('--benchmarks', type=str, help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--min-time', type=float, default=0.3, help='Minimum seconds per measurement')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic data')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed throughput drop vs baseline')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='Fail when the baseline is missing or covers none of the measurements')
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='Report output path')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    benchmarks = [b.strip() for b in args.benchmarks.split(',')] if args.benchmarks else None
+    if benchmarks:
+        unknown = [b for b in benchmarks if b not in BENCHMARKS]
+        if unknown:
+            print(f"❌ Unknown benchmark(s): {', '.join(unknown)}")
+            return 1
+
+    print("🏁 Running offline benchmark suite...")
+    report = run_suite(sizes, benchmarks, min_time=args.min_time, seed=args.seed)
+
+    print("\n📈 Scaling exponents (time ∝ N^k):")
+    for name, data in report['benchmarks'].items():
+        k = data['scaling_exponent']
+        print(f"   {name:<20} {'n/a' if k is None else f'{k:.2f}'}")
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        report['regressions'] = regressions
+        uncovered = uncovered_measurements(report, baseline)
+        report['uncovered'] = uncovered
+        measured = sum(len(data['sizes']) for data in report['benchmarks'].values())
+        if uncovered:
+            print(f"\n⚠️  {len(uncovered)}/{measured} measurement(s) not in baseline {args.baseline} (not checked): "
+                  f"{', '.join(uncovered)}")
+            if args.require_baseline and len(uncovered) == measured:
+                exit_code = 1
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs baseline (tolerance {args.tolerance:.0%}):")
+            for r in regressions:
+                print(f"   {r['benchmark']} N={r['size']:,}: {r['current_eval_per_s']:,.1f} eval/s "
+                      f"({r['change_percent']:+.1f}% vs {r['baseline_eval_per_s']:,.1f})")
+            exit_code = 1
+        elif len(uncovered) < measured:
+            print(f"\n✅ No regressions vs baseline {args.baseline}")
+    elif not args.save_baseline:
+        print(f"\n⚠️  WARNING: no baseline at {args.baseline}; regressions were NOT checked. "
+              f"Run with --save-baseline on this machine to create one")
+        report['regressions'] = None
+        if args.require_baseline:
+            exit_code = 1
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Benchmark report saved to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
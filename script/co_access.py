@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Affinity Co-Access dari Riwayat Pengambilan Barang
+
+Objektif lama hanya mengukur jarak setiap barang ke pintu, sehingga barang
+yang selalu diambil bersama tidak mendapat manfaat dari posisi yang
+berdekatan. Modul ini membangun matriks affinity A (scipy.sparse CSR):
+
+1. Sesi pengambilan = (user, jendela waktu bucket_minutes) dari
+   penempatan_barang berstatus 'diambil' dan log_aktivitas yang menyentuh
+   penempatan_barang, dalam window_days hari terakhir
+2. A_ij = jumlah sesi yang memuat barang i dan j (sesi > max_session_items
+   barang diabaikan: operasi massal, bukan picking)
+3. Setiap baris dipangkas ke max_neighbors tetangga terkuat lalu
+   disimetrikan dan dinormalisasi ke skala frekuensi_akses (maks 10)
+
+Matriks (dikunci barang_id) dihitung sekali per jendela refresh_hours dan
+disimpan di cache/affinity/, lalu diselaraskan ke urutan barang setiap run.
+Query yang gagal tidak pernah disimpan (build melempar RuntimeError), dan
+matriks kosong tidak di-cache, sehingga riwayat yang muncul kemudian tetap
+terbaca. Problem harus dikompilasi selagi koneksi database masih terbuka.
+CompiledProblem menambahkan affinity_weight × Σ A_ij · jarak(i, j) ke
+distance cost (lihat optimization_problem).
+
+Author: Sistem Gudang NCS
+Date: 2025-10-19
+"""
+
+import os
+import glob
+import time
+import hashlib
+import json
+import numpy as np
+from scipy.sparse import csr_matrix, coo_matrix
+from typing import Optional, Tuple
+
+from optimization_problem import id_positions
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'affinity')
+
+# Bobot pasangan terkuat setelah normalisasi (= frekuensi_akses maksimum)
+AFFINITY_SCALE = 10.0
+
+DEFAULT_AFFINITY_PARAMS = {
+    'affinity_weight': 1.0,      # pengali affinity terhadap distance cost
+    'window_days': 90,           # riwayat yang dihitung
+    'refresh_hours': 24.0,       # matriks dihitung ulang sekali per jendela ini
+    'bucket_minutes': 30,        # lebar jendela waktu satu sesi pengambilan
+    'max_session_items': 50,     # sesi lebih besar dianggap operasi massal
+    'max_neighbors': 32,         # tetangga per barang (batas biaya delta per move)
+}
+
+
+def co_occurrence_matrix(sessions: np.ndarray, barang_ids: np.ndarray,
+                         max_session_items: int = 50) -> Tuple[np.ndarray, csr_matrix]:
+    """
+    Matriks co-occurrence simetris (diagonal nol) dari pasangan (sesi, barang_id)
+
+    Returns:
+        (barang_id per baris/kolom, CSR jumlah sesi bersama)
+    """
+    sessions = np.asarray(sessions)
+    barang_ids = np.asarray(barang_ids, dtype=np.int64)
+    if len(barang_ids) == 0:
+        return np.zeros(0, dtype=np.int64), csr_matrix((0, 0))
+
+    session_idx = np.unique(sessions, return_inverse=True)[1].reshape(-1)
+    ids, item_idx = np.unique(barang_ids, return_inverse=True)
+    item_idx = item_idx.reshape(-1)
+    incidence = coo_matrix((np.ones(len(item_idx)), (session_idx, item_idx)),
+                           shape=(int(session_idx.max()) + 1, len(ids))).tocsr()
+    incidence.data[:] = 1.0  # barang yang sama dua kali dalam satu sesi dihitung sekali
+    sizes = np.diff(incidence.indptr)
+    incidence = incidence[(sizes >= 2) & (sizes <= max_session_items)]
+
+    counts = (incidence.T @ incidence).tocsr()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return ids, counts
+
+
+def prune_neighbors(matrix: csr_matrix, max_neighbors: int) -> csr_matrix:
+    """Pertahankan max_neighbors bobot terbesar per baris, lalu simetrikan (maksimum)"""
+    matrix = csr_matrix(matrix)
+    lengths = np.diff(matrix.indptr)
+    if max_neighbors and lengths.max(initial=0) > max_neighbors:
+        rows = np.repeat(np.arange(matrix.shape[0]), lengths)
+        # Urut per baris, bobot menurun; peringkat dalam baris menentukan yang dipertahankan
+        order = np.lexsort((-matrix.data, rows))
+        rank = np.arange(len(order)) - matrix.indptr[rows[order]]
+        keep = order[rank < max_neighbors]
+        matrix = csr_matrix((matrix.data[keep], (rows[keep], matrix.indices[keep])), shape=matrix.shape)
+    return matrix.maximum(matrix.T).tocsr()
+
+
+def align_affinity(ids: np.ndarray, matrix: csr_matrix, item_ids: np.ndarray,
+                   weight: float = 1.0) -> Optional[csr_matrix]:
+    """Affinity berurutan item_ids (barang tanpa riwayat: baris kosong); None jika kosong"""
+    if matrix.nnz == 0 or weight <= 0:
+        return None
+    pos = id_positions(ids, item_ids)
+    known = np.flatnonzero(pos >= 0)
+    if len(known) < 2:
+        return None
+    select = csr_matrix((np.ones(len(known)), (known, pos[known])), shape=(len(item_ids), len(ids)))
+    aligned = (select @ matrix @ select.T).tocsr()
+    aligned.eliminate_zeros()
+    if aligned.nnz == 0:
+        return None
+    aligned.data *= weight
+    return aligned
+
+
+class AffinityStore:
+    """
+    Cache matriks affinity global per jendela refresh
+
+    Contoh:
+        store = AffinityStore(params)
+        ids, matrix = store.load_or_build(db)
+        affinity = align_affinity(ids, matrix, problem_item_ids, params['affinity_weight'])
+    """
+
+    def __init__(self, params: Optional[dict] = None, directory: Optional[str] = None, source: str = ''):
+        self.params = {**DEFAULT_AFFINITY_PARAMS, **(params or {})}
+        self.directory = directory or os.getenv('WAREHOUSE_AFFINITY_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.source = source
+
+    @property
+    def params_key(self) -> str:
+        """Hash sumber data + parameter yang menentukan isi matriks (bukan affinity_weight)"""
+        build = {k: v for k, v in self.params.items() if k not in ('affinity_weight', 'refresh_hours')}
+        payload = json.dumps({'source': self.source, 'params': build}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+    @property
+    def window(self) -> int:
+        """Nomor jendela refresh saat ini (bagian kunci cache hasil optimasi)"""
+        return int(time.time() // max(float(self.params['refresh_hours']) * 3600.0, 1.0))
+
+    @property
+    def path(self) -> str:
+        return self.window_path(self.window)
+
+    def window_path(self, window: int) -> str:
+        return os.path.join(self.directory, f"affinity_{self.params_key}_{window}.npz")
+
+    def build(self, db) -> Tuple[np.ndarray, csr_matrix]:
+        rows = db.fetch_co_access_pairs(int(self.params['window_days']), int(self.params['bucket_minutes']))
+        if rows is None:
+            raise RuntimeError("co-access history could not be fetched")
+        sessions = np.array([row[0] for row in rows], dtype=str)
+        barang_ids = np.array([row[1] for row in rows], dtype=np.int64)
+        ids, counts = co_occurrence_matrix(sessions, barang_ids, int(self.params['max_session_items']))
+        matrix = prune_neighbors(counts, int(self.params['max_neighbors']))
+        if matrix.nnz:
+            matrix.data *= AFFINITY_SCALE / matrix.data.max()
+        print(f"🔗 Co-access affinity built: {len(ids)} items, {matrix.nnz // 2} pairs "
+              f"from {len(np.unique(sessions))} sessions")
+        return ids, matrix
+
+    def load_or_build(self, db) -> Tuple[np.ndarray, csr_matrix]:
+        """
+        Ambil matriks jendela ini dari cache disk, atau bangun dan simpan.
+        Matriks kosong tidak disimpan: riwayat yang belum ada (atau terbaca
+        kosong) dicoba lagi pada run berikutnya, bukan dikunci satu jendela.
+        """
+        window = self.window
+        path = self.window_path(window)
+        if os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    n = len(data['ids'])
+                    matrix = csr_matrix((data['data'], data['indices'], data['indptr']), shape=(n, n))
+                    return data['ids'], matrix
+            except (OSError, KeyError, ValueError) as e:
+                print(f"⚠️  Invalid affinity cache, rebuilding: {e}")
+
+        ids, matrix = self.build(db)
+        # Jendela lama tidak akan dibaca lagi, juga saat matriks baru kosong (tidak disimpan)
+        self.remove_stale(window)
+        if matrix.nnz == 0:
+            return ids, matrix
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, ids=ids, indptr=matrix.indptr, indices=matrix.indices, data=matrix.data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not cache affinity matrix: {e}")
+        return ids, matrix
+
+    def remove_stale(self, window: int):
+        """
+        Hapus file jendela selain `window` dengan params_key yang sama, termasuk
+        file .tmp sisa penulisan yang terputus (.tmp jendela ini bisa milik
+        proses lain yang sedang menulis, jadi dibiarkan)
+        """
+        prefix = f"affinity_{self.params_key}_"
+        current = f"{prefix}{window}."
+        for stale in glob.glob(os.path.join(self.directory, f"{prefix}*")):
+            if not os.path.basename(stale).startswith(current):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+def load_affinity(db, item_ids: np.ndarray, params: Optional[dict] = None,
+                  directory: Optional[str] = None) -> Optional[csr_matrix]:
+    """Affinity selaras item_ids (None jika riwayat kosong atau database tidak mendukung)"""
+    if not hasattr(db, 'fetch_co_access_pairs'):
+        return None
+    config = getattr(db, 'db_config', {}) or {}
+    store = AffinityStore(params, directory, source=f"{config.get('host', '')}/{config.get('database', '')}")
+    ids, matrix = store.load_or_build(db)
+    return align_affinity(ids, matrix, np.asarray(item_ids, dtype=np.int64), float(store.params['affinity_weight']))
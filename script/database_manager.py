@@ -12,8 +12,87 @@ import json
 import mysql.connector
 import pymysql
 from dotenv import load_dotenv
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import sys
+from warehouse_columns import AREA_COLUMNS, BARANG_COLUMNS, DEFAULT_CHUNK_SIZE, AreaColumns, BarangColumns
+
+# Insert rekomendasi dengan koordinat spesifik dalam area
+RECOMMENDATION_INSERT_QUERY = """
+INSERT INTO rekomendasi_penempatan 
+(log_optimasi_id, barang_id, area_gudang_rekomendasi, koordinat_x_spesifik, koordinat_y_spesifik, jumlah, alasan, confidence_score, algoritma, created_at, updated_at)
+VALUES (%(log_optimasi_id)s, %(barang_id)s, %(area_gudang_id)s, %(koordinat_x)s, %(koordinat_y)s, %(jumlah)s, %(alasan)s, %(confidence_score)s, %(algoritma)s, NOW(), NOW())
+"""
+
+# Stok per barang (unit berstatus ditempatkan, sama dengan Barang::total_stok); tanpa stok = 1 unit
+STOCK_JOIN = """
+        LEFT JOIN (
+            SELECT barang_id, SUM(jumlah) AS jumlah
+            FROM penempatan_barang
+            WHERE status = 'ditempatkan'
+            GROUP BY barang_id
+        ) stok ON stok.barang_id = b.id"""
+STOCK_COLUMN = "GREATEST(COALESCE(stok.jumlah, 1), 1) AS jumlah"
+
+# Pasangan (sesi pengambilan, barang_id) untuk affinity co-access (lihat co_access.py):
+# sesi = user + jendela waktu, dari pengambilan barang dan log aktivitas penempatan
+CO_ACCESS_QUERY = """
+SELECT CONCAT('pb:', pb.dibuat_oleh, ':', FLOOR(UNIX_TIMESTAMP(pb.updated_at) / %(bucket)s)) AS sesi,
+       pb.barang_id
+FROM penempatan_barang pb
+WHERE pb.status = 'diambil' AND pb.updated_at >= NOW() - INTERVAL %(days)s DAY
+UNION ALL
+SELECT CONCAT('la:', la.user_id, ':', FLOOR(UNIX_TIMESTAMP(la.created_at) / %(bucket)s)),
+       pb.barang_id
+FROM log_aktivitas la
+INNER JOIN penempatan_barang pb ON pb.id = la.model_id
+WHERE la.model_type LIKE '%%PenempatanBarang' AND la.created_at >= NOW() - INTERVAL %(days)s DAY
+"""
+
+# Ringkasan utilisasi per log optimasi (lihat utilization_summary.py): tabel → kolom
+SUMMARY_TABLES = {
+    'area': ('ringkasan_area_optimasi',
+             ('area_gudang_id', 'jumlah_barang', 'jumlah_run', 'volume_terpakai', 'kapasitas', 'utilisasi_proyeksi', 'rata_rata_jarak')),
+    'kategori': ('ringkasan_kategori_optimasi',
+                 ('kategori_barang_id', 'jumlah_barang', 'jumlah_run', 'total_volume', 'jumlah_area', 'rata_rata_jarak')),
+}
+
+SUMMARY_INSERT_QUERIES = {
+    kind: f"INSERT INTO {table} (log_optimasi_id, {', '.join(columns)}, created_at, updated_at) "
+          f"VALUES (%(log_optimasi_id)s, {', '.join(f'%({c})s' for c in columns)}, NOW(), NOW())"
+    for kind, (table, columns) in SUMMARY_TABLES.items()
+}
+
+# Salin ringkasan run sumber ke log optimasi baru (cache hit: layout identik)
+SUMMARY_COPY_QUERIES = {
+    kind: f"INSERT INTO {table} (log_optimasi_id, {', '.join(columns)}, created_at, updated_at) "
+          f"SELECT %s, {', '.join(columns)}, NOW(), NOW() FROM {table} WHERE log_optimasi_id = %s"
+    for kind, (table, columns) in SUMMARY_TABLES.items()
+}
+
+# Statistik database dalam satu round trip
+DATABASE_STATS_QUERY = """
+SELECT
+    (SELECT COUNT(*) FROM area_gudang WHERE tersedia = 1) AS areas,
+    (SELECT COUNT(*) FROM area_gudang) AS total_areas,
+    (SELECT COUNT(*) FROM barang) AS barang,
+    (SELECT COUNT(*) FROM kategori_barang) AS kategori,
+    (SELECT COUNT(*) FROM penempatan_barang) AS placements,
+    (SELECT SUM(kapasitas) FROM area_gudang WHERE tersedia = 1) AS total_capacity,
+    (SELECT SUM(kapasitas_terpakai) FROM area_gudang WHERE tersedia = 1) AS used_capacity,
+    (SELECT COUNT(*) FROM rekomendasi_penempatan) AS recommendations{summary_columns}
+"""
+
+# Jumlah run, barang unik dan utilisasi proyeksi dari ringkasan log optimasi terakhir
+# (barang unik dijumlah per kategori: satu barang hanya punya satu kategori)
+SUMMARY_STATS_COLUMNS = """,
+    (SELECT MAX(log_optimasi_id) FROM ringkasan_area_optimasi) AS summary_log_optimasi_id,
+    (SELECT SUM(jumlah_run) FROM ringkasan_area_optimasi
+     WHERE log_optimasi_id = (SELECT MAX(log_optimasi_id) FROM ringkasan_area_optimasi)) AS summary_runs,
+    (SELECT SUM(jumlah_barang) FROM ringkasan_kategori_optimasi
+     WHERE log_optimasi_id = (SELECT MAX(log_optimasi_id) FROM ringkasan_area_optimasi)) AS summary_items,
+    (SELECT SUM(volume_terpakai) / NULLIF(SUM(kapasitas), 0) * 100 FROM ringkasan_area_optimasi
+     WHERE log_optimasi_id = (SELECT MAX(log_optimasi_id) FROM ringkasan_area_optimasi)) AS projected_utilization"""
+
 
 class DatabaseManager:
     """
@@ -42,7 +121,8 @@ class DatabaseManager:
         
         self.connection = None
         self.cursor = None
-        
+        self.summary_tables = None  # None = belum dicek di INFORMATION_SCHEMA
+
         print(f"Database config loaded:")
         print(f"  Host: {self.db_config['host']}:{self.db_config['port']}")
         print(f"  Database: {self.db_config['database']}")
@@ -130,9 +210,9 @@ class DatabaseManager:
         """
         Mengambil data barang dengan join ke kategori
         
-        SQL Query dengan JOIN untuk mendapatkan informasi kategori
+        SQL Query dengan JOIN untuk mendapatkan informasi kategori dan stok
         """
-        query = """
+        query = f"""
         SELECT 
             b.id,
             b.kode_barang,
@@ -143,10 +223,11 @@ class DatabaseManager:
             (b.panjang * b.lebar * b.tinggi) as volume,
             b.kategori_barang_id,
             kb.nama_kategori,
+            {STOCK_COLUMN},
             b.created_at,
             b.updated_at
         FROM barang b
-        INNER JOIN kategori_barang kb ON b.kategori_barang_id = kb.id
+        INNER JOIN kategori_barang kb ON b.kategori_barang_id = kb.id{STOCK_JOIN}
         ORDER BY b.kode_barang
         """
         
@@ -193,21 +274,157 @@ class DatabaseManager:
             print(f"❌ Error fetching placements: {e}")
             return []
     
-    def save_optimization_results(self, recommendations: List[Dict]) -> bool:
+    def _stream_rows(self, query: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     params: Optional[Dict] = None) -> Iterator[List[Tuple]]:
+        """
+        Jalankan query dengan cursor tuple tanpa buffer (streaming) dan hasilkan
+        baris per chunk, sehingga tidak ada dict per baris maupun fetchall penuh
+        """
+        if isinstance(self.connection, pymysql.connections.Connection):
+            cursor = self.connection.cursor(pymysql.cursors.SSCursor)
+        else:
+            cursor = self.connection.cursor(buffered=False)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+    
+    def fetch_area_columns(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[AreaColumns]:
+        """
+        Versi kolumnar fetch_areas: array NumPy per kolom (lihat warehouse_columns)
+        """
+        query = f"""
+        SELECT {', '.join(AREA_COLUMNS)}
+        FROM area_gudang 
+        WHERE tersedia = 1
+        ORDER BY kode_area
+        """
+        
+        try:
+            areas = AreaColumns.from_chunks(self._stream_rows(query, chunk_size), AREA_COLUMNS)
+            print(f"📦 Loaded {len(areas)} available areas from database (columnar)")
+            return areas
+        except Exception as e:
+            print(f"❌ Error fetching areas: {e}")
+            return None
+    
+    def fetch_barang_columns(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[BarangColumns]:
+        """
+        Versi kolumnar fetch_barang: array NumPy per kolom, kode/nama dalam
+        buffer string, nama kategori di-intern (lihat warehouse_columns)
+        """
+        query = f"""
+        SELECT 
+            b.id,
+            b.kode_barang,
+            b.nama_barang,
+            b.panjang,
+            b.lebar,
+            b.tinggi,
+            b.kategori_barang_id,
+            kb.nama_kategori,
+            {STOCK_COLUMN}
+        FROM barang b
+        INNER JOIN kategori_barang kb ON b.kategori_barang_id = kb.id{STOCK_JOIN}
+        ORDER BY b.kode_barang
+        """
+        
+        try:
+            barang = BarangColumns.from_chunks(self._stream_rows(query, chunk_size), BARANG_COLUMNS)
+            print(f"📋 Loaded {len(barang)} items from database (columnar)")
+            return barang
+        except Exception as e:
+            print(f"❌ Error fetching barang: {e}")
+            return None
+    
+    def fetch_co_access_pairs(self, window_days: int = 90, bucket_minutes: int = 30) -> Optional[List[Tuple]]:
+        """
+        Pasangan (sesi, barang_id) riwayat pengambilan window_days hari
+        terakhir, streaming tanpa dict per baris
+        
+        Returns:
+            List pasangan, atau None jika query gagal (berbeda dengan riwayat kosong)
+        """
+        params = {'days': int(window_days), 'bucket': int(bucket_minutes) * 60}
+        try:
+            pairs = [row for rows in self._stream_rows(CO_ACCESS_QUERY, params=params) for row in rows]
+            print(f"🔗 Loaded {len(pairs)} co-access records from database")
+            return pairs
+        except Exception as e:
+            print(f"❌ Error fetching co-access history: {e}")
+            return None
+    
+    def has_summary_tables(self) -> bool:
+        """Cek sekali apakah tabel ringkasan utilisasi sudah dibuat migrasi Laravel"""
+        if self.summary_tables is None:
+            tables = [table for table, _ in SUMMARY_TABLES.values()]
+            try:
+                self.cursor.execute(
+                    "SELECT COUNT(*) AS count FROM INFORMATION_SCHEMA.TABLES "
+                    "WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN (%s, %s)",
+                    (self.db_config['database'], *tables)
+                )
+                result = self.cursor.fetchone()
+                self.summary_tables = bool(result) and result['count'] == len(tables)
+            except Exception as e:
+                print(f"⚠️ Could not check summary tables: {e}")
+                return False
+            if not self.summary_tables:
+                print("⚠️ Summary tables not found, run `php artisan migrate` to enable utilization summaries")
+        return self.summary_tables
+    
+    def _replace_summaries(self, summaries: Optional[Dict[str, List[Dict]]] = None,
+                           log_optimasi_id: Optional[int] = None, source_log_optimasi_id: Optional[int] = None):
+        """
+        Ganti baris ringkasan log_optimasi_id tanpa commit (bagian dari transaksi
+        penyimpanan rekomendasi); tanpa summaries, salin ringkasan run sumber
+        """
+        if not log_optimasi_id or not (summaries or source_log_optimasi_id) or not self.has_summary_tables():
+            return
+        for kind, (table, _) in SUMMARY_TABLES.items():
+            self.cursor.execute(f"DELETE FROM {table} WHERE log_optimasi_id = %s", (log_optimasi_id,))
+            if summaries:
+                if summaries.get(kind):
+                    self.cursor.executemany(SUMMARY_INSERT_QUERIES[kind], summaries[kind])
+            else:
+                self.cursor.execute(SUMMARY_COPY_QUERIES[kind], (log_optimasi_id, source_log_optimasi_id))
+        print(f"📊 Saved utilization summary for log optimasi {log_optimasi_id}")
+    
+    def _drop_summaries(self, log_optimasi_ids: List[int]):
+        """
+        Hapus ringkasan log yang rekomendasinya baru dihapus (tanpa commit),
+        agar log lama tidak melaporkan jumlah dari layout yang sudah diganti
+        """
+        if not log_optimasi_ids or not self.has_summary_tables():
+            return
+        placeholders = ', '.join(['%s'] * len(log_optimasi_ids))
+        for table, _ in SUMMARY_TABLES.values():
+            self.cursor.execute(f"DELETE FROM {table} WHERE log_optimasi_id IN ({placeholders})",
+                                tuple(log_optimasi_ids))
+    
+    def save_optimization_results(self, recommendations: List[Dict],
+                                  summaries: Optional[Dict[str, List[Dict]]] = None,
+                                  summary_source_log_id: Optional[int] = None) -> bool:
         """
         Menyimpan hasil optimasi ke tabel rekomendasi_penempatan
         Dengan koordinat spesifik dalam area
+        
+        Ringkasan utilisasi (summaries dari utilization_summary.py, atau salinan
+        ringkasan summary_source_log_id saat cache hit) ditulis ke tabel
+        ringkasan dalam transaksi yang sama; ringkasan log lama yang
+        rekomendasinya terhapus ikut dihapus.
         """
         if not recommendations:
             print("⚠️ No recommendations to save")
             return False
         
         # Query untuk insert rekomendasi dengan koordinat
-        insert_query = """
-        INSERT INTO rekomendasi_penempatan 
-        (log_optimasi_id, barang_id, area_gudang_rekomendasi, koordinat_x_spesifik, koordinat_y_spesifik, alasan, confidence_score, algoritma, created_at, updated_at)
-        VALUES (%(log_optimasi_id)s, %(barang_id)s, %(area_gudang_id)s, %(koordinat_x)s, %(koordinat_y)s, %(alasan)s, %(confidence_score)s, %(algoritma)s, NOW(), NOW())
-        """
+        insert_query = RECOMMENDATION_INSERT_QUERY
         
         try:
             # Cek apakah kolom koordinat spesifik ada, jika tidak create terlebih dahulu
@@ -215,7 +432,7 @@ class DatabaseManager:
             SELECT COLUMN_NAME 
             FROM INFORMATION_SCHEMA.COLUMNS 
             WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'rekomendasi_penempatan' 
-            AND COLUMN_NAME IN ('koordinat_x_spesifik', 'koordinat_y_spesifik', 'confidence_score', 'algoritma')
+            AND COLUMN_NAME IN ('koordinat_x_spesifik', 'koordinat_y_spesifik', 'jumlah', 'confidence_score', 'algoritma')
             """
             
             self.cursor.execute(check_columns_query, (self.db_config['database'],))
@@ -231,6 +448,14 @@ class DatabaseManager:
                 self.cursor.execute(alter_query)
                 print("✅ Added coordinate columns to rekomendasi_penempatan")
             
+            if 'jumlah' not in existing_columns:
+                alter_query_jumlah = """
+                ALTER TABLE rekomendasi_penempatan 
+                ADD COLUMN jumlah INT UNSIGNED NOT NULL DEFAULT 1 AFTER koordinat_y_spesifik
+                """
+                self.cursor.execute(alter_query_jumlah)
+                print("✅ Added quantity column to rekomendasi_penempatan")
+            
             if 'confidence_score' not in existing_columns:
                 alter_query2 = """
                 ALTER TABLE rekomendasi_penempatan 
@@ -241,12 +466,24 @@ class DatabaseManager:
                 print("✅ Added algorithm tracking columns to rekomendasi_penempatan")
             
             # Hapus rekomendasi lama dari algoritma yang sama
-            delete_query = "DELETE FROM rekomendasi_penempatan WHERE algoritma = 'Simulated Annealing'"
-            self.cursor.execute(delete_query)
-            print(f"🗑️ Cleared previous Simulated Annealing recommendations")
+            algoritma = recommendations[0].get('algoritma', 'Simulated Annealing')
+            log_optimasi_id = recommendations[0].get('log_optimasi_id')
+            self.cursor.execute(
+                "SELECT DISTINCT log_optimasi_id FROM rekomendasi_penempatan "
+                "WHERE algoritma = %s AND log_optimasi_id IS NOT NULL",
+                (algoritma,)
+            )
+            replaced_logs = [row['log_optimasi_id'] for row in self.cursor.fetchall()
+                             if row['log_optimasi_id'] != log_optimasi_id]
+            delete_query = "DELETE FROM rekomendasi_penempatan WHERE algoritma = %s"
+            self.cursor.execute(delete_query, (algoritma,))
+            print(f"🗑️ Cleared previous {algoritma} recommendations")
             
             # Insert rekomendasi baru
             self.cursor.executemany(insert_query, recommendations)
+            # Salin ringkasan sumber (cache hit) sebelum ringkasan log lama dihapus
+            self._replace_summaries(summaries, log_optimasi_id, summary_source_log_id)
+            self._drop_summaries(replaced_logs)
             self.connection.commit()
             
             print(f"💾 Saved {len(recommendations)} recommendations to database")
@@ -257,6 +494,40 @@ class DatabaseManager:
             self.connection.rollback()
             return False
     
+    def upsert_recommendations(self, recommendations: List[Dict],
+                               summaries: Optional[Dict[str, List[Dict]]] = None,
+                               removed: Optional[List[Tuple[str, int]]] = None) -> bool:
+        """
+        Ganti rekomendasi untuk barang tertentu saja (penempatan online, repair),
+        tanpa menghapus rekomendasi barang lain dari algoritma yang sama;
+        ringkasan utilisasi layout baru ikut diganti dalam transaksi yang sama.
+        Semua baris run satu barang diganti bersama, jadi recommendations
+        harus memuat setiap run barang tersebut (LayoutState.barang_recommendations).
+        removed: (algoritma, barang_id) yang barisnya dihapus walau tanpa baris
+        pengganti (barang yang tidak lagi mendapat area)
+        """
+        if not recommendations and not removed:
+            return True
+        
+        try:
+            keys = list(dict.fromkeys([(rec['algoritma'], rec['barang_id']) for rec in recommendations]
+                                      + list(removed or [])))
+            self.cursor.executemany(
+                "DELETE FROM rekomendasi_penempatan WHERE algoritma = %s AND barang_id = %s",
+                keys
+            )
+            if recommendations:
+                self.cursor.executemany(RECOMMENDATION_INSERT_QUERY, recommendations)
+            rows = recommendations or [row for kind_rows in (summaries or {}).values() for row in kind_rows]
+            self._replace_summaries(summaries, rows[0].get('log_optimasi_id') if rows else None)
+            self.connection.commit()
+            print(f"💾 Updated {len(recommendations)} recommendations")
+            return True
+        except Exception as e:
+            print(f"❌ Error updating recommendations: {e}")
+            self.connection.rollback()
+            return False
+    
     def update_optimization_status(self, log_optimasi_id: int, status: str, 
                                  hasil_optimasi: Dict = None, 
                                  detail_hasil: str = None) -> bool:
@@ -325,53 +596,150 @@ class DatabaseManager:
             self.connection.rollback()
             return False
     
+    def get_optimization_status(self, log_optimasi_id: int) -> Optional[str]:
+        """
+        Membaca status log optimasi terkini (dipakai untuk deteksi pembatalan)
+        """
+        try:
+            # Akhiri snapshot transaksi agar perubahan dari API terlihat
+            self.connection.commit()
+            self.cursor.execute("SELECT status FROM log_optimasi WHERE id = %s", (log_optimasi_id,))
+            row = self.cursor.fetchone()
+            return row['status'] if row else None
+        except Exception as e:
+            print(f"❌ Error reading optimization status: {e}")
+            return None
+    
+    def acquire_advisory_lock(self, name: str, timeout: int = 0) -> Optional[bool]:
+        """
+        MySQL GET_LOCK untuk sesi koneksi ini (dilepas otomatis saat koneksi putus)
+        
+        Returns:
+            True jika lock didapat, False jika timeout, None jika error
+        """
+        try:
+            self.cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (name, int(timeout)))
+            row = self.cursor.fetchone()
+            if not row or row['acquired'] is None:
+                return None
+            if row['acquired']:
+                # Akhiri snapshot transaksi agar hasil run yang ditunggu terlihat
+                self.connection.commit()
+            return bool(row['acquired'])
+        except Exception as e:
+            print(f"❌ Error acquiring advisory lock: {e}")
+            return None
+    
+    def release_advisory_lock(self, name: str) -> bool:
+        """Lepas lock GET_LOCK milik sesi ini"""
+        try:
+            self.cursor.execute("SELECT RELEASE_LOCK(%s) AS released", (name,))
+            row = self.cursor.fetchone()
+            return bool(row and row['released'])
+        except Exception as e:
+            print(f"❌ Error releasing advisory lock: {e}")
+            return False
+    
+    def get_optimization_result(self, log_optimasi_id: int) -> Optional[Dict]:
+        """
+        Membaca hasil_optimasi (JSON) log optimasi
+        """
+        try:
+            self.cursor.execute("SELECT hasil_optimasi FROM log_optimasi WHERE id = %s", (log_optimasi_id,))
+            row = self.cursor.fetchone()
+            if not row or not row['hasil_optimasi']:
+                return None
+            return json.loads(row['hasil_optimasi'])
+        except Exception as e:
+            print(f"❌ Error reading optimization result: {e}")
+            return None
+    
+    def set_optimization_running(self, log_optimasi_id: int) -> bool:
+        """
+        Set status log optimasi kembali ke 'sedang_berjalan' (mis. saat resume)
+        """
+        try:
+            self.cursor.execute(
+                "UPDATE log_optimasi SET status = 'sedang_berjalan', waktu_selesai = NULL, updated_at = NOW() WHERE id = %s",
+                (log_optimasi_id,)
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            print(f"❌ Error updating optimization status: {e}")
+            self.connection.rollback()
+            return False
+    
+    def master_data_fingerprint(self) -> Optional[str]:
+        """
+        Fingerprint data master yang dibaca optimizer (area_gudang tersedia,
+        barang + kategori, stok penempatan_barang) dalam satu query: jumlah baris dan checksum CRC32
+        per tabel, tanpa memuat data ke Python. Dipakai sebagai kunci cache hasil.
+        """
+        query = """
+        SELECT 'area_gudang' AS tabel, COUNT(*) AS jumlah,
+               COALESCE(SUM(CRC32(CONCAT_WS('|', id, gudang_id, kode_area, koordinat_x, koordinat_y,
+                   panjang, lebar, tinggi, kapasitas, kapasitas_terpakai, jenis_area))), 0) AS checksum
+        FROM area_gudang
+        WHERE tersedia = 1
+        UNION ALL
+        SELECT 'barang', COUNT(*),
+               COALESCE(SUM(CRC32(CONCAT_WS('|', b.id, b.kode_barang, b.panjang, b.lebar, b.tinggi,
+                   b.kategori_barang_id, kb.nama_kategori))), 0)
+        FROM barang b
+        INNER JOIN kategori_barang kb ON b.kategori_barang_id = kb.id
+        UNION ALL
+        SELECT 'stok', COUNT(*), COALESCE(SUM(CRC32(CONCAT_WS('|', barang_id, jumlah))), 0)
+        FROM penempatan_barang
+        WHERE status = 'ditempatkan'
+        """
+
+        try:
+            self.connection.commit()
+            self.cursor.execute(query)
+            rows = self.cursor.fetchall()
+            return ';'.join(f"{row['tabel']}:{row['jumlah']}:{row['checksum']}" for row in rows)
+        except Exception as e:
+            print(f"❌ Error computing master data fingerprint: {e}")
+            return None
+
     def get_database_stats(self) -> Dict:
         """
         Mendapatkan statistik database untuk validation
+        
+        Satu query; recommendations = jumlah baris rekomendasi_penempatan.
+        Jika tabel ringkasan tersedia, jumlah run (summary_runs), barang unik
+        (summary_items) dan utilisasi proyeksi log optimasi terakhir ikut dibaca.
         """
-        stats = {}
+        summary_columns = SUMMARY_STATS_COLUMNS if self.has_summary_tables() else ""
         
         try:
-            # Count tables
-            queries = {
-                'areas': "SELECT COUNT(*) as count FROM area_gudang WHERE tersedia = 1",
-                'total_areas': "SELECT COUNT(*) as count FROM area_gudang",
-                'barang': "SELECT COUNT(*) as count FROM barang",
-                'kategori': "SELECT COUNT(*) as count FROM kategori_barang",
-                'placements': "SELECT COUNT(*) as count FROM penempatan_barang",
-                'recommendations': "SELECT COUNT(*) as count FROM rekomendasi_penempatan"
-            }
-            
-            for key, query in queries.items():
-                self.cursor.execute(query)
-                result = self.cursor.fetchone()
-                stats[key] = result['count'] if result else 0
+            self.cursor.execute(DATABASE_STATS_QUERY.format(summary_columns=summary_columns))
+            row = self.cursor.fetchone() or {}
+            stats = {key: int(row.get(key) or 0)
+                     for key in ('areas', 'total_areas', 'barang', 'kategori', 'placements', 'recommendations')}
             
             # Calculate capacity utilization
-            capacity_query = """
-            SELECT 
-                SUM(kapasitas) as total_capacity,
-                SUM(kapasitas_terpakai) as used_capacity
-            FROM area_gudang 
-            WHERE tersedia = 1
-            """
-            
-            self.cursor.execute(capacity_query)
-            capacity_result = self.cursor.fetchone()
-            
-            if capacity_result and capacity_result['total_capacity']:
-                total_cap = float(capacity_result['total_capacity'])
-                used_cap = float(capacity_result['used_capacity'] or 0)
+            if row.get('total_capacity'):
+                total_cap = float(row['total_capacity'])
+                used_cap = float(row['used_capacity'] or 0)
                 stats['capacity_utilization'] = (used_cap / total_cap) * 100
             else:
                 stats['capacity_utilization'] = 0
             
+            if row.get('summary_log_optimasi_id'):
+                stats['summary_log_optimasi_id'] = int(row['summary_log_optimasi_id'])
+                stats['summary_runs'] = int(row['summary_runs'] or 0)
+                stats['summary_items'] = int(row['summary_items'] or 0)
+                stats['projected_utilization'] = float(row['projected_utilization'] or 0)
+            
             return stats
             
         except Exception as e:
             print(f"❌ Error getting database stats: {e}")
             return {}
 
+
 def test_database_connection():
     """
     Test function untuk memastikan koneksi database berfungsi
@@ -396,6 +764,10 @@ def test_database_connection():
         print(f"  Existing Placements: {stats.get('placements', 0)}")
         print(f"  Recommendations: {stats.get('recommendations', 0)}")
         print(f"  Capacity Utilization: {stats.get('capacity_utilization', 0):.1f}%")
+        if 'projected_utilization' in stats:
+            print(f"  Projected Utilization (log {stats['summary_log_optimasi_id']}): "
+                  f"{stats['projected_utilization']:.1f}% "
+                  f"({stats['summary_items']} items in {stats['summary_runs']} runs)")
         
         # Test data fetching
         areas = db.fetch_areas()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Instrumentasi Waktu per Fase dan Profiling Run Optimasi
+
+- PhaseTimer  : timer per fase (wall time, CPU time), evaluasi/detik, peak RSS
+- RunProfiler : cProfile + sampling stack profiler; menghasilkan file .prof
+                (pstats/snakeviz) dan .collapsed (flamegraph.pl/speedscope)
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import sys
+import time
+import cProfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size proses dalam MB (None jika tidak didukung OS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class PhaseTimer:
+    """
+    Mencatat durasi setiap fase run optimasi
+
+    Contoh:
+        timer = PhaseTimer()
+        with timer.phase('fetch_areas'):
+            ...
+        timer.add_evaluations('annealing', result.evaluations)
+        timer.summary()
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.evaluations: Dict[str, int] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {'seconds': 0.0, 'cpu_seconds': 0.0})
+            entry['seconds'] += time.perf_counter() - wall_start
+            entry['cpu_seconds'] += time.process_time() - cpu_start
+
+    def add_evaluations(self, name: str, count: int):
+        self.evaluations[name] = self.evaluations.get(name, 0) + int(count)
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._start
+
+    def summary(self) -> Dict:
+        """Ringkasan untuk hasil_optimasi (JSON-serializable)"""
+        phases = {}
+        for name, entry in self.phases.items():
+            phases[name] = {
+                'seconds': round(entry['seconds'], 4),
+                'cpu_seconds': round(entry['cpu_seconds'], 4),
+            }
+            if name in self.evaluations:
+                phases[name]['evaluations'] = self.evaluations[name]
+                phases[name]['evaluations_per_second'] = (
+                    round(self.evaluations[name] / entry['seconds'], 1) if entry['seconds'] > 0 else 0.0)
+
+        rss = peak_rss_mb()
+        return {
+            'total_seconds': round(self.total_seconds, 4),
+            'phases': phases,
+            'peak_rss_mb': round(rss, 1) if rss is not None else None,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print("=== PHASE TIMINGS ===")
+        for name, entry in summary['phases'].items():
+            rate = f"  ({entry['evaluations_per_second']:,.0f} eval/s)" if 'evaluations_per_second' in entry else ''
+            print(f"⏱️  {name:<18} {entry['seconds']:>9.3f}s{rate}")
+        print(f"⏱️  {'total':<18} {summary['total_seconds']:>9.3f}s")
+        if summary['peak_rss_mb'] is not None:
+            print(f"🧠 Peak RSS: {summary['peak_rss_mb']:.1f} MB")
+
+
+class StackSampler(threading.Thread):
+    """Sampling profiler sederhana: catat stack thread target setiap `interval` detik"""
+
+    def __init__(self, target_thread_id: int, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """
+    Profiler untuk satu run: cProfile (deterministik) dan stack sampler
+    (collapsed stack, format `frame1;frame2;frame3 count` per baris)
+    """
+
+    def __init__(self, output_dir: str = 'profiles', name: Optional[str] = None, interval: float = 0.005):
+        self.output_dir = output_dir
+        self.name = name or time.strftime('optimization_%Y%m%d_%H%M%S')
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.sampler: Optional[StackSampler] = None
+
+    def start(self):
+        self.sampler = StackSampler(threading.get_ident(), self.interval)
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self) -> Dict[str, str]:
+        """Hentikan profiling dan tulis file; return path file yang dihasilkan"""
+        self.profile.disable()
+        self.sampler.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prof_path = os.path.join(self.output_dir, f"{self.name}.prof")
+        collapsed_path = os.path.join(self.output_dir, f"{self.name}.collapsed")
+
+        self.profile.dump_stats(prof_path)
+        with open(collapsed_path, 'w') as f:
+            for stack, count in sorted(self.sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+        print(f"🔬 Profile saved to {prof_path} (cProfile) and {collapsed_path} (collapsed stacks)")
+        return {'prof': prof_path, 'collapsed': collapsed_path}
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Repair Layout Lokal saat Area Tidak Tersedia atau Kapasitas Berubah
+
+Jika sebuah rak offline (tersedia = 0) atau kapasitasnya berubah, layout
+sebelumnya tidak perlu dioptimasi ulang dari random. Repair memuat layout
+terkini (LayoutState, lihat online_placement) lalu hanya memindahkan:
+
+- barang yang areanya tidak lagi tersedia (displaced)
+- barang di area yang kini melebihi kapasitas, mulai dari barang dengan
+  frekuensi akses terendah (dan volume terbesar) sampai volume ≤ kapasitas
+
+Setiap barang dimasukkan ulang dengan evaluator delta (insertion_deltas),
+dibatasi ke `candidate_areas` area terdekat dari posisi lamanya, barang
+dengan frekuensi akses tinggi lebih dulu. Diff penempatan disimpan ke
+results/optimization_<id>_repair.json, rekomendasi barang yang pindah
+di-upsert (barang tanpa area kandidat: baris lamanya dihapus), dan
+ringkasan ditambahkan ke hasil_optimasi.repairs.
+
+Usage:
+    python layout_repair.py --log-id 12                # deteksi otomatis
+    python layout_repair.py --log-id 12 --areas 3,7    # hanya cek kapasitas area ini
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import sys
+import json
+import time
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+from scipy.spatial import cKDTree
+
+from online_placement import LayoutState
+from optimization_problem import id_positions
+from result_export import results_dir
+
+REPAIR_DISPLACED = 'area_unavailable'
+REPAIR_OVERFLOW = 'over_capacity'
+
+
+class LayoutRepair:
+    """
+    Reassign barang yang terdampak perubahan area pada LayoutState
+
+    Contoh:
+        state = LayoutState.load(optimizer, log_optimasi_id=12)
+        summary = LayoutRepair(state).repair(changed_area_ids=[3, 7])
+    """
+
+    DEFAULT_PARAMS = {
+        'candidate_areas': 12,    # area terdekat yang boleh menerima barang terdampak
+    }
+
+    def __init__(self, state: LayoutState, params: Optional[Dict] = None):
+        self.state = state
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
+        p = state.problem
+        self.available = p.available
+        centers = np.column_stack([(p.area_rects[:, 0] + p.area_rects[:, 2]) / 2,
+                                   (p.area_rects[:, 1] + p.area_rects[:, 3]) / 2])
+        self.tree = cKDTree(centers[self.available]) if len(self.available) else None
+
+    def overflow_items(self, areas: np.ndarray) -> List[int]:
+        """Barang yang dikeluarkan dari area over-capacity agar volume ≤ kapasitas"""
+        ev, p = self.state.evaluator, self.state.problem
+        over = areas[ev.area_volume[areas] > p.capacity[areas] * (1 + 1e-9)]
+        items = []
+        for a in over:
+            members = self.state.area_members(int(a))
+            order = members[np.lexsort((-p.volume[members], p.frequency[members]))]
+            excess = ev.area_volume[a] - p.capacity[a]
+            count = int(np.searchsorted(np.cumsum(p.volume[order]), excess)) + 1
+            items.extend(int(i) for i in order[:count])
+        return items
+
+    def nearest_areas(self, x: float, y: float, exclude: int = -1) -> np.ndarray:
+        k = min(int(self.params['candidate_areas']) + 1, len(self.available))
+        _, idx = self.tree.query((x, y), k=k)
+        candidates = self.available[np.atleast_1d(idx)]
+        return candidates[candidates != exclude]
+
+    def repair(self, changed_area_ids: Optional[List[int]] = None) -> Dict:
+        """
+        Jalankan repair; changed_area_ids membatasi pengecekan kapasitas (None = semua area)
+
+        Returns:
+            ringkasan: jumlah barang per alasan, cost sebelum/sesudah, diff per barang
+        """
+        start = time.perf_counter()
+        state, ev, p = self.state, self.state.evaluator, self.state.problem
+        cost_before = ev.cost
+
+        if changed_area_ids:
+            areas = id_positions(p.area_ids, changed_area_ids)
+            areas = areas[areas >= 0]
+        else:
+            areas = np.arange(p.n_areas)
+
+        # (barang, area_gudang_id lama, x lama, y lama, alasan)
+        jobs = [(int(i), int(a), float(x), float(y), REPAIR_DISPLACED) for i, a, x, y in zip(*state.displaced)]
+        for i in self.overflow_items(areas):
+            jobs.append((i, int(p.area_ids[ev.area_idx[i]]), float(ev.x[i]), float(ev.y[i]), REPAIR_OVERFLOW))
+            ev.remove(i)
+
+        diff = []
+        unplaced = []
+        jobs.sort(key=lambda job: -p.frequency[job[0]])
+        for i, old_area, ox, oy, reason in jobs:
+            origin = int(id_positions(p.area_ids, [old_area])[0])
+            candidates = self.nearest_areas(ox, oy, exclude=origin) if self.tree is not None else np.zeros(0, dtype=np.int64)
+            if len(candidates) == 0:
+                unplaced.append(int(p.item_ids[i]))
+                continue
+            deltas = ev.insertion_deltas(i)[candidates]
+            a = int(candidates[np.argmin(deltas)])
+            ev.insert(i, a, float(p.anchor_x[a]), float(p.anchor_y[a]))
+            state.note_placed(i)
+            diff.append({
+                'barang_id': int(p.item_ids[i]),
+                'area_lama': old_area,
+                'area_baru': int(p.area_ids[a]),
+                'koordinat_x': round(float(ev.x[i]), 2),
+                'koordinat_y': round(float(ev.y[i]), 2),
+                'jumlah': int(p.quantity[i]),
+                'alasan': reason,
+            })
+
+        state.displaced = tuple(values[:0] for values in state.displaced)
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'changed_areas': list(changed_area_ids or []),
+            'displaced_items': sum(1 for job in jobs if job[4] == REPAIR_DISPLACED),
+            'overflow_items': sum(1 for job in jobs if job[4] == REPAIR_OVERFLOW),
+            'moved_items': len(diff),
+            'unplaced_items': unplaced,
+            'cost_before': cost_before,
+            'cost_after': ev.cost,
+            'execution_time': round(time.perf_counter() - start, 3),
+            'diff': diff,
+        }
+
+
+def repair_file(log_optimasi_id: int) -> str:
+    return os.path.join(results_dir(), f"optimization_{log_optimasi_id}_repair.json")
+
+
+def save_repair(state: LayoutState, summary: Dict) -> bool:
+    """
+    Simpan diff, upsert rekomendasi barang yang pindah, snapshot layout, dan ringkasan di hasil_optimasi
+
+    Run yang tidak mendapat area (unplaced_items) tidak boleh tetap menunjuk
+    area lamanya: run lain barang tersebut dikirim ulang, dan barang yang
+    tidak punya run tersisa dihapus barisnya dalam transaksi yang sama.
+    """
+    db = state.optimizer.db
+    log_id = state.log_optimasi_id
+    path = repair_file(log_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2, default=float)
+
+    # Semua run barang yang pindah (bukan hanya run yang pindah): upsert mengganti per barang
+    unplaced = summary['unplaced_items']
+    touched = [row['barang_id'] for row in summary['diff']] + unplaced
+    success = db.upsert_recommendations(state.barang_recommendations(touched), state.summaries(),
+                                        removed=[(state.algorithm, barang_id) for barang_id in unplaced])
+    state.save()
+
+    hasil_optimasi = db.get_optimization_result(log_id) or {}
+    record = {key: value for key, value in summary.items() if key != 'diff'}
+    record['diff_file'] = path
+    hasil_optimasi.setdefault('repairs', []).append(record)
+    db.update_optimization_status(
+        log_optimasi_id=log_id,
+        status="selesai",
+        hasil_optimasi=hasil_optimasi,
+        detail_hasil=f"Layout repair: {summary['moved_items']} items moved"
+    )
+    return success
+
+
+def main():
+    import argparse
+    from warehouse_optimization import WarehouseOptimizer
+
+    parser = argparse.ArgumentParser(description='Repair the current layout after area availability or capacity changes')
+    parser.add_argument('--log-id', type=int, required=True, help='Log optimasi ID yang layoutnya di-repair')
+    parser.add_argument('--areas', type=str, help='area_gudang_id yang berubah, dipisah koma (default: semua area)')
+    parser.add_argument('--params', type=str, help='JSON parameters (candidate_areas, ...)')
+    args = parser.parse_args()
+
+    params = json.loads(args.params) if args.params else {}
+    changed = [int(v) for v in args.areas.split(',') if v.strip()] if args.areas else None
+    optimizer = WarehouseOptimizer({**params, 'use_cache': False})
+    optimizer.log_optimasi_id = args.log_id
+    if not optimizer.connect_database():
+        print("❌ Failed to connect to database")
+        return 1
+
+    try:
+        state = LayoutState.load(optimizer, args.log_id)
+        summary = LayoutRepair(state, params=params).repair(changed)
+        success = save_repair(state, summary)
+        print(f"🔧 Repair: {summary['displaced_items']} displaced, {summary['overflow_items']} over capacity, "
+              f"{summary['moved_items']} moved in {summary['execution_time']:.2f}s "
+              f"(cost {summary['cost_before']:.2f} → {summary['cost_after']:.2f})")
+        return 0 if success else 1
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"❌ Layout repair failed: {e}")
+        return 1
+    finally:
+        optimizer.disconnect_database()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Optimasi Multilevel (Coarse-to-Fine) via Clustering Barang
+
+Annealing per SKU tidak skalabel untuk katalog puluhan ribu barang. Mode
+multilevel (engine 'multilevel', lihat optimization_engines) bekerja dalam
+dua tingkat:
+
+1. Coarse: barang dikelompokkan per (kategori, sering diakses) lalu di-cluster
+   menurut log volume dan frekuensi akses (MiniBatchKMeans) menjadi
+   super-item. Penempatan cluster → area di-anneal pada CompiledProblem kecil
+   (volume dan frekuensi dijumlahkan, kategori tetap).
+2. Fine: area yang tersedia dibagi menjadi blok area berdekatan (cincin jarak
+   dari pintu). Karena blok tidak berbagi area, penalti ruang, kategori, dan
+   jarak terpisah sempurna antar blok, sehingga setiap blok di-refine
+   independen dan paralel (parallel_runner.run_block_jobs).
+
+Ukuran setiap sub-masalah dibatasi (cluster_size, areas_per_block), sehingga
+total kerja tumbuh hampir linear terhadap jumlah barang.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import math
+import numpy as np
+from scipy.sparse import csr_matrix
+from typing import List, Optional, Tuple
+
+from optimization_problem import CompiledProblem
+
+try:
+    from sklearn.cluster import MiniBatchKMeans
+except ImportError:  # scikit-learn opsional, fallback ke binning kuantil
+    MiniBatchKMeans = None
+
+Layout = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _quantile_labels(features: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Fallback tanpa scikit-learn: bin kuantil pada kombinasi fitur"""
+    score = features.sum(axis=1)
+    order = np.argsort(score, kind='stable')
+    labels = np.empty(len(score), dtype=np.int64)
+    labels[order] = np.arange(len(score)) * n_clusters // max(len(score), 1)
+    return labels
+
+
+def cluster_items(problem: CompiledProblem, cluster_size: int = 50, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Label cluster per barang (0..K-1)
+
+    Cluster tidak pernah mencampur kategori atau status sering diakses, sehingga
+    penalti kategori dan akses pada masalah coarse tetap bermakna.
+    """
+    p = problem
+    cluster_size = max(1, int(cluster_size))
+    labels = np.empty(p.n_items, dtype=np.int64)
+    group_key = p.category.astype(np.int64) * 2 + p.hot
+    features = np.column_stack([np.log1p(p.volume), p.frequency])
+    spread = features.std(axis=0)
+    features = (features - features.mean(axis=0)) / np.where(spread > 0, spread, 1.0)
+
+    next_label = 0
+    for key in np.unique(group_key):
+        members = np.flatnonzero(group_key == key)
+        n_clusters = max(1, math.ceil(len(members) / cluster_size))
+        if n_clusters == 1:
+            local = np.zeros(len(members), dtype=np.int64)
+        elif MiniBatchKMeans is not None:
+            model = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed, n_init=1,
+                                    batch_size=min(4096, len(members)))
+            local = model.fit_predict(features[members]).astype(np.int64)
+        else:
+            local = _quantile_labels(features[members], n_clusters)
+        # Label lokal bisa berlubang (cluster kosong): padatkan
+        _, local = np.unique(local, return_inverse=True)
+        labels[members] = next_label + local.reshape(-1)
+        next_label += int(local.max()) + 1
+    return labels
+
+
+def coarse_problem(problem: CompiledProblem, labels: np.ndarray) -> CompiledProblem:
+    """Masalah super-item: volume dan frekuensi dijumlahkan per cluster, area sama"""
+    p = problem
+    n_clusters = int(labels.max()) + 1 if len(labels) else 0
+    first = np.full(n_clusters, len(labels), dtype=np.int64)
+    np.minimum.at(first, labels, np.arange(len(labels)))
+    affinity = None
+    if p.affinity is not None:
+        # Affinity antar cluster = jumlah affinity anggota; di dalam cluster jaraknya nol (anchor sama)
+        members = csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)),
+                             shape=(len(labels), n_clusters))
+        affinity = (members.T @ p.affinity @ members).tocsr()
+        affinity.setdiag(0)
+        affinity.eliminate_zeros()
+    coarse = CompiledProblem(
+        item_ids=np.arange(n_clusters),
+        volume=np.bincount(labels, weights=p.volume, minlength=n_clusters),
+        frequency=np.bincount(labels, weights=p.frequency, minlength=n_clusters),
+        category=p.category[first],
+        category_ids=p.category_ids,
+        category_names=p.category_names,
+        area_ids=p.area_ids,
+        area_rects=p.area_rects,
+        capacity=p.capacity,
+        available=np.isin(np.arange(p.n_areas), p.available),
+        door_distances=p.door_distances,
+        access_points=p.access_points,
+        weights=p.weights,
+        affinity=affinity,
+    )
+    # Frekuensi gabungan selalu > ambang; status akses mengikuti anggota cluster
+    coarse.hot = p.hot[first]
+    return coarse
+
+
+def expand_layout(problem: CompiledProblem, labels: np.ndarray, cluster_area: np.ndarray) -> Layout:
+    """Layout per barang dari penempatan cluster (semua anggota di anchor area cluster)"""
+    area_idx = np.asarray(cluster_area, dtype=np.int64)[labels]
+    return area_idx, problem.anchor_x[area_idx].copy(), problem.anchor_y[area_idx].copy()
+
+
+def area_blocks(problem: CompiledProblem, areas_per_block: int = 8) -> List[np.ndarray]:
+    """Partisi area tersedia menjadi blok area berdekatan (urut jarak anchor dari pintu)"""
+    available = problem.available
+    order = available[np.argsort(problem.anchor_distance[available], kind='stable')]
+    size = max(1, int(areas_per_block))
+    return [order[start:start + size] for start in range(0, len(order), size)]
+
+
+def subproblem(problem: CompiledProblem, items: np.ndarray, areas: np.ndarray) -> CompiledProblem:
+    """Sub-masalah satu blok: barang dan area terpilih saja (indeks kategori tetap)"""
+    p = problem
+    sub = CompiledProblem(
+        item_ids=p.item_ids[items],
+        volume=p.volume[items],
+        frequency=p.frequency[items],
+        category=p.category[items],
+        category_ids=p.category_ids,
+        category_names=p.category_names,
+        area_ids=p.area_ids[areas],
+        area_rects=p.area_rects[areas],
+        capacity=p.capacity[areas],
+        door_distances=None if p.door_distances is None else p.door_distances[areas],
+        access_points=None if p.access_points is None else p.access_points[areas],
+        weights=p.weights,
+        # Pasangan lintas blok diabaikan saat refine; evaluasi akhir memakai problem penuh
+        affinity=None if p.affinity is None else p.affinity[items][:, items],
+    )
+    # Run parsial membawa sebagian frekuensi; status akses tetap milik barang
+    sub.hot = p.hot[items]
+    return sub
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Penempatan Online Barang Baru tanpa Optimasi Ulang
+
+Barang yang baru datang tidak perlu menunggu run annealing penuh. Layout
+terkini dari run sebelumnya (file hasil per log_optimasi_id, atau snapshot
+state yang sudah memuat penempatan online sebelumnya) dimuat ke
+`MoveEvaluator`, sehingga volume per area, jumlah barang kategori×area, dan
+komponen objektif tersedia di memori. Untuk setiap barang baru:
+
+1. semua area kandidat dinilai sekaligus (insertion_deltas, vectorized)
+2. barang dimasukkan ke area terbaik pada titik terdekat ke pintu
+3. local improvement singkat: swap/relocate barang di area kandidat teratas
+   yang menurunkan cost (greedy, budget move tetap)
+
+State disusun per run (barang, jumlah unit) persis seperti layout
+tersimpan: run dari file hasil/snapshot dipertahankan, barang baru dipecah
+dengan aturan split_runs. Barang berubah di-upsert dengan semua run-nya,
+karena upsert mengganti seluruh baris (algoritma, barang_id).
+
+Rekomendasi barang yang berubah di-upsert ke rekomendasi_penempatan dan
+layout disimpan sebagai snapshot di cache/layout_state/ (env
+WAREHOUSE_LAYOUT_STATE_DIR). Run optimasi penuh berikutnya menulis file hasil
+yang lebih baru sehingga snapshot lama diabaikan.
+
+Usage:
+    python online_placement.py --log-id 12 --barang-ids 501,502
+    python online_placement.py --log-id 12 --stdin     # satu barang_id per baris
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import sys
+import json
+import time
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from optimization_problem import CompiledProblem, MoveEvaluator, id_positions
+from quantity_runs import expand_runs, run_counts, with_runs
+from placement_reasoning import area_features, category_class, reason_code, size_class
+from result_export import iter_result_chunks, latest_result_file, read_result_metadata
+from utilization_summary import summarize_layout
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'layout_state')
+
+
+def state_dir(path: Optional[str] = None) -> str:
+    return path or os.getenv('WAREHOUSE_LAYOUT_STATE_DIR', DEFAULT_STATE_DIR)
+
+
+class LayoutState:
+    """
+    Layout terkini satu log_optimasi_id dalam MoveEvaluator
+
+    Satu item problem adalah satu run; run_item memetakan run ke indeks
+    optimizer.barang_list. Run barang baru (tidak ada di layout tersimpan)
+    atau yang areanya sudah tidak tersedia memiliki area_idx = -1.
+    """
+
+    def __init__(self, optimizer, problem: CompiledProblem, evaluator: MoveEvaluator,
+                 log_optimasi_id: int, algorithm: str, directory: Optional[str] = None,
+                 run_item: Optional[np.ndarray] = None):
+        self.optimizer = optimizer
+        self.problem = problem
+        self.evaluator = evaluator
+        self.run_item = np.arange(problem.n_items) if run_item is None else np.asarray(run_item, dtype=np.int64)
+        self._run_order = np.argsort(problem.item_ids, kind='stable')
+        self.log_optimasi_id = log_optimasi_id
+        self.algorithm = algorithm
+        self.directory = state_dir(directory)
+        self.displaced = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+        self.build_area_index()
+
+    @classmethod
+    def load(cls, optimizer, log_optimasi_id: int, directory: Optional[str] = None) -> 'LayoutState':
+        """
+        Muat data master lewat optimizer (sudah terkoneksi) lalu layout
+        terbaru: snapshot state jika lebih baru dari file hasil
+        """
+        if not optimizer.fetch_areas() or not optimizer.fetch_barang():
+            raise RuntimeError("Failed to load warehouse data")
+        base = optimizer.compile_problem()
+        item_ids, area_ids, x, y, quantity, algorithm = cls.read_layout(log_optimasi_id, directory)
+
+        # Run tersimpan dipertahankan (jumlah unitnya); barang baru dipecah seperti split_runs
+        item_pos = id_positions(base.item_ids, item_ids)
+        known = item_pos >= 0
+        item_pos, area_ids, x, y, quantity = item_pos[known], area_ids[known], x[known], y[known], quantity[known]
+        quantity = np.where(np.isfinite(quantity) & (quantity > 0), quantity, base.quantity[item_pos]).astype(np.int64)
+        new_items = np.setdiff1d(np.arange(base.n_items), item_pos)
+        new_run_item, new_count = expand_runs(base, new_items,
+                                              run_counts(base, optimizer.max_run_units)[new_items])
+        run_item = np.concatenate([item_pos, new_run_item])
+        problem = with_runs(base, run_item, np.concatenate([quantity, new_count]))
+
+        stored = np.arange(len(item_pos))
+        area_pos = id_positions(problem.area_ids, area_ids)
+        keep = area_pos >= 0
+        area_idx = np.full(problem.n_items, -1, dtype=np.int64)
+        layout_x = np.zeros(problem.n_items)
+        layout_y = np.zeros(problem.n_items)
+        area_idx[stored[keep]] = area_pos[keep]
+        layout_x[stored[keep]] = x[keep]
+        layout_y[stored[keep]] = y[keep]
+
+        evaluator = MoveEvaluator(problem)
+        evaluator.load_partial(area_idx, layout_x, layout_y)
+        state = cls(optimizer, problem, evaluator, log_optimasi_id, algorithm, directory, run_item=run_item)
+        # Run yang areanya tidak lagi tersedia: (indeks run, area_gudang_id lama, x, y)
+        lost = ~keep
+        state.displaced = (stored[lost], area_ids[lost], x[lost], y[lost])
+        print(f"🗺️  Layout state loaded: {int((area_idx >= 0).sum())}/{problem.n_items} runs placed "
+              f"({base.n_items} items), cost {evaluator.cost:.2f}")
+        return state
+
+    @staticmethod
+    def snapshot_path(log_optimasi_id: int, directory: Optional[str] = None) -> str:
+        return os.path.join(state_dir(directory), f"layout_{log_optimasi_id}.npz")
+
+    @classmethod
+    def read_layout(cls, log_optimasi_id: int, directory: Optional[str] = None
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, str]:
+        """
+        (item_ids, area_ids, x, y, jumlah, algoritma) per run dari snapshot
+        atau file hasil; jumlah NaN jika layout lama tidak menyimpannya
+        """
+        result_path = latest_result_file(log_optimasi_id)
+        snapshot = cls.snapshot_path(log_optimasi_id, directory)
+        if os.path.exists(snapshot) and (result_path is None
+                                         or os.path.getmtime(snapshot) >= os.path.getmtime(result_path)):
+            with np.load(snapshot, allow_pickle=False) as data:
+                quantity = data['quantity'].astype(float) if 'quantity' in data else np.full(len(data['item_ids']), np.nan)
+                return (data['item_ids'], data['area_ids'], data['x'], data['y'], quantity, str(data['algorithm']))
+        if result_path is None:
+            raise FileNotFoundError(f"No optimization result for log optimasi {log_optimasi_id}")
+
+        algorithm = read_result_metadata(result_path).get('algorithm') or 'Simulated Annealing'
+        columns = {'barang_id': [], 'area_gudang_id': [], 'koordinat_x': [], 'koordinat_y': [], 'jumlah': []}
+        for chunk in iter_result_chunks(result_path):
+            for name in columns:
+                columns[name].append(chunk[name].to_numpy(dtype=float) if name in chunk
+                                     else np.full(len(chunk), np.nan))
+        item_ids, area_ids, x, y, quantity = (np.concatenate(columns[name]) if columns[name] else np.zeros(0)
+                                              for name in columns)
+        return (item_ids.astype(np.int64), area_ids.astype(np.int64), x.astype(float), y.astype(float),
+                quantity.astype(float), algorithm)
+
+    def save(self) -> str:
+        """Simpan layout terkini (termasuk penempatan online) sebagai snapshot"""
+        ev, p = self.evaluator, self.problem
+        path = self.snapshot_path(self.log_optimasi_id, self.directory)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        placed = ev.area_idx >= 0
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, item_ids=p.item_ids[placed], area_ids=p.area_ids[ev.area_idx[placed]],
+                         x=ev.x[placed], y=ev.y[placed], quantity=p.quantity[placed],
+                         algorithm=np.array(self.algorithm))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def summaries(self) -> Dict[str, List[Dict]]:
+        """Ringkasan utilisasi layout terkini (diganti bersama upsert rekomendasi)"""
+        ev = self.evaluator
+        return summarize_layout(self.problem, ev.area_idx, ev.x, ev.y, self.log_optimasi_id)
+
+    def build_area_index(self):
+        """Indeks barang per area (CSR); barang yang pindah dicatat di daftar tambahan"""
+        area_idx = self.evaluator.area_idx
+        placed = np.flatnonzero(area_idx >= 0)
+        self._member_order = placed[np.argsort(area_idx[placed], kind='stable')]
+        self._member_start = np.searchsorted(area_idx[self._member_order], np.arange(self.problem.n_areas + 1))
+        self._member_extra: Dict[int, List[int]] = defaultdict(list)
+
+    def area_members(self, a: int) -> np.ndarray:
+        """Barang yang saat ini berada di area a"""
+        members = self._member_order[self._member_start[a]:self._member_start[a + 1]]
+        extra = self._member_extra.get(a)
+        if extra:
+            members = np.unique(np.concatenate([members, np.asarray(extra, dtype=np.int64)]))
+        return members[self.evaluator.area_idx[members] == a]
+
+    def note_placed(self, i: int):
+        self._member_extra[int(self.evaluator.area_idx[i])].append(int(i))
+
+    def item_runs(self, barang_id: int) -> np.ndarray:
+        """Indeks run milik barang_id (kosong jika barang tidak ada di data master)"""
+        ids = self.problem.item_ids[self._run_order]
+        lo, hi = np.searchsorted(ids, barang_id, side='left'), np.searchsorted(ids, barang_id, side='right')
+        return self._run_order[lo:hi]
+
+    def barang_recommendations(self, barang_ids) -> List[Dict]:
+        """
+        Rekomendasi semua run yang ditempatkan untuk barang_ids; upsert
+        mengganti seluruh baris satu barang, jadi run yang tidak berubah ikut dikirim
+        """
+        rows = []
+        for barang_id in dict.fromkeys(int(b) for b in barang_ids):
+            rows.extend(self.recommendation(int(r)) for r in self.item_runs(barang_id)
+                        if self.evaluator.area_idx[r] >= 0)
+        return rows
+
+    def recommendation(self, i: int) -> Dict:
+        """Baris rekomendasi_penempatan untuk run i pada posisinya saat ini"""
+        ev = self.evaluator
+        a = int(ev.area_idx[i])
+        barang = self.optimizer.barang_list[int(self.run_item[i])]
+        area = self.optimizer.areas[a]
+        return {
+            "log_optimasi_id": self.log_optimasi_id,
+            "barang_id": int(self.problem.item_ids[i]),
+            "area_gudang_id": int(self.problem.area_ids[a]),
+            "koordinat_x": round(float(ev.x[i]), 2),
+            "koordinat_y": round(float(ev.y[i]), 2),
+            "jumlah": int(self.problem.quantity[i]),
+            "alasan": reason_code(category_class(barang.kategori_nama), size_class(barang.volume), area_features(area)),
+            "confidence_score": 0.85,
+            "algoritma": self.algorithm,
+        }
+
+
+class OnlinePlacer:
+    """
+    Penempatan barang satu per satu pada LayoutState yang tetap di memori
+
+    Contoh:
+        state = LayoutState.load(optimizer, log_optimasi_id=12)
+        placer = OnlinePlacer(state)
+        result = placer.place(501)   # {'recommendation': {...}, 'moved': [...], ...}
+    """
+
+    DEFAULT_PARAMS = {
+        'candidate_areas': 8,     # area teratas yang dipakai local improvement
+        'improve_moves': 200,     # budget move local improvement per barang
+        'max_moved': 5,           # maksimal barang lama yang ikut dipindah per barang baru
+    }
+
+    def __init__(self, state: LayoutState, params: Optional[Dict] = None, seed: Optional[int] = None):
+        self.state = state
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
+        self.rng = np.random.default_rng(seed)
+
+    def place(self, barang_id: int) -> Dict:
+        """
+        Tempatkan semua run satu barang; return ringkasan dengan rekomendasi
+        run barang tersebut dan run barang lain yang ikut dipindah oleh
+        local improvement
+        """
+        start = time.perf_counter()
+        state, ev, p = self.state, self.state.evaluator, self.state.problem
+        runs = state.item_runs(barang_id)
+        if len(runs) == 0:
+            raise KeyError(f"barang {barang_id} not found in master data")
+        if (ev.area_idx[runs] >= 0).any():
+            placed = [state.recommendation(int(r)) for r in runs if ev.area_idx[r] >= 0]
+            return {'barang_id': barang_id, 'status': 'existing', 'recommendation': placed[0], 'runs': placed,
+                    'moved': [], 'delta_cost': 0.0, 'elapsed_ms': (time.perf_counter() - start) * 1000}
+
+        k = min(int(self.params['candidate_areas']), len(p.available))
+        if k == 0:
+            raise ValueError("No available areas for placement")
+        cost_before = ev.cost
+        moved = set()
+        for i in runs.tolist():
+            deltas = ev.insertion_deltas(i)
+            candidates = np.argpartition(deltas, k - 1)[:k] if k < p.n_areas else np.arange(p.n_areas)
+            candidates = candidates[np.isfinite(deltas[candidates])]
+            a = int(candidates[np.argmin(deltas[candidates])])
+            ev.insert(i, a, float(p.anchor_x[a]), float(p.anchor_y[a]))
+            state.note_placed(i)
+            moved |= self.improve(i, candidates)
+
+        own = set(runs.tolist())
+        placed = [state.recommendation(int(r)) for r in runs]
+        return {
+            'barang_id': barang_id,
+            'status': 'placed',
+            'recommendation': placed[0],
+            'runs': placed,
+            'moved': [state.recommendation(j) for j in sorted(moved - own)],
+            'delta_cost': ev.cost - cost_before,
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
+
+    def improve(self, i: int, candidates: np.ndarray) -> set:
+        """
+        Local improvement greedy di sekitar barang baru: swap barang baru dengan
+        barang di area kandidat, atau relocate barang tersebut ke area kandidat
+        lain; hanya move yang menurunkan cost yang diterapkan, dan paling banyak
+        `max_moved` barang lama yang dipindah (biaya handling di gudang)
+        """
+        state, ev, p = self.state, self.state.evaluator, self.state.problem
+        moved = set()
+        members = {int(a): state.area_members(int(a)) for a in candidates}
+        pool = [a for a, m in members.items() if len(m)]
+        if not pool:
+            return moved
+
+        max_moved = int(self.params['max_moved'])
+        for _ in range(int(self.params['improve_moves'])):
+            if len(moved - {i}) >= max_moved:
+                break
+            a = pool[self.rng.integers(len(pool))]
+            j = int(members[a][self.rng.integers(len(members[a]))])
+            if j == i or ev.area_idx[j] != a:
+                continue
+            if self.rng.random() < 0.5:
+                if ev.area_idx[i] == a:
+                    continue
+                delta = ev.delta_swap(i, j)
+                if ev.weighted(delta) < -1e-9:
+                    ev.apply_swap(i, j, delta)
+                    moved.update((i, j))
+                    state.note_placed(i)
+                    state.note_placed(j)
+            else:
+                b = int(candidates[self.rng.integers(len(candidates))])
+                if b == a:
+                    continue
+                delta = ev.delta_relocate(j, b, float(p.anchor_x[b]), float(p.anchor_y[b]))
+                if ev.weighted(delta) < -1e-9:
+                    ev.apply_relocate(j, b, float(p.anchor_x[b]), float(p.anchor_y[b]), delta)
+                    moved.add(j)
+                    state.note_placed(j)
+        return moved
+
+
+def place_items(placer: OnlinePlacer, barang_ids: List[int]) -> List[Dict]:
+    """Tempatkan beberapa barang, upsert rekomendasi yang berubah, lalu simpan snapshot"""
+    state = placer.state
+    results = []
+    changed = set()
+    for barang_id in barang_ids:
+        try:
+            result = placer.place(barang_id)
+        except KeyError as e:
+            results.append({'barang_id': barang_id, 'status': 'not_found', 'error': str(e)})
+            continue
+        results.append(result)
+        if result['status'] == 'placed':
+            changed.update(rec['barang_id'] for rec in result['runs'] + result['moved'])
+        print(f"📥 Barang {barang_id}: {result['status']} → area {result['recommendation']['area_gudang_id']} "
+              f"({result['elapsed_ms']:.1f} ms, Δcost {result['delta_cost']:+.2f}, {len(result['moved'])} moved)")
+
+    if changed:
+        state.optimizer.db.upsert_recommendations(state.barang_recommendations(changed), state.summaries())
+        state.save()
+    return results
+
+
+def main():
+    import argparse
+    from warehouse_optimization import WarehouseOptimizer
+
+    parser = argparse.ArgumentParser(description='Online placement of new items on the current layout')
+    parser.add_argument('--log-id', type=int, required=True, help='Log optimasi ID yang layoutnya dipakai')
+    parser.add_argument('--barang-ids', type=str, help='barang_id dipisah koma')
+    parser.add_argument('--stdin', action='store_true', help='Baca barang_id per baris dari stdin (state tetap di memori)')
+    parser.add_argument('--params', type=str, help='JSON parameters (candidate_areas, improve_moves, ...)')
+    args = parser.parse_args()
+
+    params = json.loads(args.params) if args.params else {}
+    optimizer = WarehouseOptimizer({**params, 'use_cache': False})
+    optimizer.log_optimasi_id = args.log_id
+    if not optimizer.connect_database():
+        print("❌ Failed to connect to database")
+        return 1
+
+    try:
+        state = LayoutState.load(optimizer, args.log_id)
+        placer = OnlinePlacer(state, params=params, seed=optimizer.seed)
+        if args.stdin:
+            for line in sys.stdin:
+                ids = [int(v) for v in line.replace(',', ' ').split()]
+                if ids:
+                    print(json.dumps(place_items(placer, ids), default=float), flush=True)
+        elif args.barang_ids:
+            ids = [int(v) for v in args.barang_ids.split(',') if v.strip()]
+            print(json.dumps(place_items(placer, ids), default=float))
+        else:
+            print("❌ Provide --barang-ids or --stdin")
+            return 1
+        return 0
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"❌ Online placement failed: {e}")
+        return 1
+    finally:
+        optimizer.disconnect_database()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Lower Bound dan Optimality Gap berbasis MILP (scipy.optimize.milp)
+
+Fungsi objektif dapat ditulis eksak sebagai MILP karena koordinat terbaik
+setiap barang di sebuah area adalah anchor area tersebut (titik terdekat ke
+pintu/akses lorong), sehingga biaya jarak + akses per (barang, area) konstan:
+
+    min  Σ c_ia·x_ia + w2·10·(Σ z_ca − |kategori|) + w1·Σ (s_a + o_a)
+    s.t. Σ_a x_ia = 1                      setiap barang ditempatkan sekali
+         x_ia ≤ z_ca ≤ u_a                 kategori c memakai area a, area terpakai
+         s_a ≥ 100·(0.3·u_a − V_a/cap_a)   penalti under-utilization (area terpakai)
+         o_a ≥ 1000·(V_a/cap_a − 1)        penalti over-capacity
+         x, z, u ∈ {0, 1}
+
+- instance kecil (barang × area ≤ milp_max_variables): MILP per barang,
+  menghasilkan layout optimal (atau feasible + dual bound jika time limit)
+- instance besar: relaksasi LP atas kelas barang dengan frekuensi sama
+  (biaya per areanya identik). Volume kelas dialirkan sebagai w_ka dengan
+  v_min·y_ka ≤ w_ka ≤ v_max·y_ka; setiap solusi per barang memetakan ke solusi
+  kelas dengan cost tidak lebih besar, jadi optimum LP tetap lower bound yang
+  valid dan ukurannya tidak bergantung pada jumlah barang
+
+Gap = (cost − lower_bound) / cost. Engine berhenti begitu gap best-so-far
+≤ gap_tolerance (lihat OptimizationEngine.attach_bound).
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from optimization_problem import (
+    ACCESS_DISTANCE_LIMIT, ACCESS_PENALTY_FACTOR, CATEGORY_SPREAD_FACTOR, HIGH_FREQUENCY_THRESHOLD,
+    OVER_CAPACITY_FACTOR, UNDER_UTILIZATION_FACTOR, UNDER_UTILIZATION_RATIO, CompiledProblem,
+)
+
+DEFAULT_BOUND_PARAMS = {
+    'milp_max_variables': 2000,   # batas barang × area untuk MILP eksak
+    'time_limit': 10.0,           # detik per solve HiGHS
+    'gap_tolerance': 0.01,        # engine berhenti jika gap ≤ 1%
+}
+
+Layout = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass
+class BoundResult:
+    """Hasil perhitungan lower bound"""
+    method: str                       # 'milp' atau 'lp_relaxation'
+    lower_bound: float
+    status: str                       # 'optimal' atau 'time_limit'
+    solve_time: float
+    variables: int
+    layout: Optional[Layout] = None   # layout MILP (area_idx, x, y), hanya metode milp
+    objective: Optional[float] = None  # cost layout MILP
+
+    def summary(self, cost: float) -> Dict:
+        """Ringkasan untuk hasil_optimasi"""
+        return {
+            'method': self.method,
+            'status': self.status,
+            'lower_bound': round(self.lower_bound, 4),
+            'final_cost': round(float(cost), 4),
+            'gap': round(optimality_gap(cost, self.lower_bound), 6),
+            'variables': self.variables,
+            'solve_time': round(self.solve_time, 3),
+        }
+
+
+def optimality_gap(cost: float, lower_bound: float) -> float:
+    """Gap relatif terhadap cost (0 = terbukti optimal)"""
+    if not np.isfinite(cost):
+        return float('inf')
+    return max(0.0, float(cost - lower_bound)) / max(abs(float(cost)), 1e-9)
+
+
+def placement_costs(problem: CompiledProblem, frequency: np.ndarray, areas: np.ndarray) -> np.ndarray:
+    """Biaya berbobot distance + access per (frekuensi, area) di anchor area (matriks U × A)"""
+    w_distance, _, _, w_access = problem.weights
+    distance = problem.anchor_distance[areas][None, :]
+    frequency = np.asarray(frequency, dtype=np.float64)[:, None]
+    access = np.where((frequency > HIGH_FREQUENCY_THRESHOLD) & (distance > ACCESS_DISTANCE_LIMIT),
+                      distance * ACCESS_PENALTY_FACTOR, 0.0)
+    return w_distance * frequency * distance + w_access * access
+
+
+def constraint_block(rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, n_rows: int, n_vars: int,
+                     lower, upper) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """Satu blok baris constraint sparse beserta batas bawah/atasnya"""
+    matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(n_rows, n_vars))
+    return matrix, np.broadcast_to(np.asarray(lower, dtype=np.float64), n_rows), \
+        np.broadcast_to(np.asarray(upper, dtype=np.float64), n_rows)
+
+
+class BoundModel:
+    """
+    Penyusun model (MI)LP untuk satu CompiledProblem
+
+    Area dengan kapasitas 0 tidak dimodelkan (penalti over-capacity praktis tak hingga).
+    """
+
+    def __init__(self, problem: CompiledProblem):
+        self.problem = problem
+        p = problem
+        self.areas = p.available[p.capacity[p.available] > 0]
+
+    def item_variables(self) -> int:
+        return self.problem.n_items * len(self.areas)
+
+    def solve(self, params: Optional[Dict] = None) -> Optional[BoundResult]:
+        """MILP eksak jika cukup kecil, selain itu relaksasi LP kelas barang"""
+        params = {**DEFAULT_BOUND_PARAMS, **(params or {})}
+        if self.problem.n_items == 0 or len(self.areas) == 0:
+            return None
+        if self.item_variables() <= int(params['milp_max_variables']):
+            return self.solve_milp(float(params['time_limit']))
+        return self.solve_class_lp(float(params['time_limit']))
+
+    def solve_milp(self, time_limit: float) -> Optional[BoundResult]:
+        """
+        MILP per barang; variabel berurutan x (N×A), z (C×A), u (A), s (A), o (A)
+        """
+        p = self.problem
+        areas = self.areas
+        n_items, n_areas, n_categories = p.n_items, len(areas), p.n_categories
+        n_pairs = n_items * n_areas
+        n_links = n_categories * n_areas
+        z0 = n_pairs
+        u0 = z0 + n_links
+        s0 = u0 + n_areas
+        o0 = s0 + n_areas
+        n_vars = o0 + n_areas
+        w_space, w_category = p.weights[1], p.weights[2] * CATEGORY_SPREAD_FACTOR
+
+        present = np.bincount(p.category, minlength=n_categories) > 0
+        c = np.zeros(n_vars)
+        c[:z0] = placement_costs(p, p.frequency, areas).ravel()
+        c[z0:u0] = np.repeat(present, n_areas) * w_category
+        c[s0:] = w_space
+        constant = -w_category * present.sum()
+
+        pair = np.arange(n_pairs)
+        pair_item = pair // n_areas
+        pair_area = pair % n_areas
+        link = np.arange(n_links)
+        area = np.arange(n_areas)
+        inv_capacity = p.inv_capacity[areas]
+        volume = p.volume[pair_item] * inv_capacity[pair_area]
+        ones = np.ones(n_pairs)
+        blocks = [
+            # Σ_a x_ia = 1
+            constraint_block(pair_item, pair, ones, n_items, n_vars, 1.0, 1.0),
+            # x_ia ≤ z_ca
+            constraint_block(np.concatenate([pair, pair]),
+                             np.concatenate([pair, z0 + p.category[pair_item].astype(np.int64) * n_areas + pair_area]),
+                             np.concatenate([ones, -ones]), n_pairs, n_vars, -np.inf, 0.0),
+            # z_ca ≤ u_a
+            constraint_block(np.concatenate([link, link]), np.concatenate([z0 + link, u0 + link % n_areas]),
+                             np.concatenate([np.ones(n_links), -np.ones(n_links)]), n_links, n_vars, -np.inf, 0.0),
+            # 30·u_a − 100·V_a/cap_a − s_a ≤ 0
+            constraint_block(np.concatenate([pair_area, area, area]), np.concatenate([pair, u0 + area, s0 + area]),
+                             np.concatenate([-UNDER_UTILIZATION_FACTOR * volume,
+                                             np.full(n_areas, UNDER_UTILIZATION_RATIO * UNDER_UTILIZATION_FACTOR),
+                                             -np.ones(n_areas)]), n_areas, n_vars, -np.inf, 0.0),
+            # 1000·V_a/cap_a − o_a ≤ 1000
+            constraint_block(np.concatenate([pair_area, area]), np.concatenate([pair, o0 + area]),
+                             np.concatenate([OVER_CAPACITY_FACTOR * volume, -np.ones(n_areas)]),
+                             n_areas, n_vars, -np.inf, OVER_CAPACITY_FACTOR),
+        ]
+        upper_bounds = np.full(n_vars, np.inf)
+        upper_bounds[:s0] = 1.0
+        integrality = np.zeros(n_vars, dtype=np.int8)
+        integrality[:s0] = 1
+
+        result, elapsed = self._run(c, blocks, upper_bounds, integrality, time_limit)
+        if result.status == 0 or (result.status == 1 and result.x is not None):
+            bound = getattr(result, 'mip_dual_bound', None)
+            bound = result.fun if bound is None and result.status == 0 else bound
+        else:
+            bound = None
+        if bound is None or not np.isfinite(bound):
+            return None
+
+        bound_result = BoundResult(method='milp', lower_bound=float(bound + constant),
+                                   status='optimal' if result.status == 0 else 'time_limit',
+                                   solve_time=elapsed, variables=int(n_vars))
+        if result.x is not None:
+            area_idx = areas[result.x[:z0].reshape(n_items, n_areas).argmax(axis=1)].astype(np.int64)
+            bound_result.layout = (area_idx, p.anchor_x[area_idx].copy(), p.anchor_y[area_idx].copy())
+            bound_result.objective = p.weighted_cost(p.evaluate_components(*bound_result.layout))
+        return bound_result
+
+    def solve_class_lp(self, time_limit: float) -> Optional[BoundResult]:
+        """
+        Relaksasi LP transportasi atas kelas frekuensi; variabel berurutan
+        y (K×A, jumlah barang), w (K×A, volume), o (A). Penalti kategori dan
+        under-utilization (keduanya ≥ 0) tidak dimodelkan, sehingga hasilnya
+        tetap lower bound yang valid dan ukurannya tidak bergantung pada N.
+        """
+        p = self.problem
+        areas = self.areas
+        frequency, inverse = np.unique(p.frequency, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        n_classes, n_areas = len(frequency), len(areas)
+        counts = np.bincount(inverse, minlength=n_classes).astype(np.float64)
+        totals = np.bincount(inverse, weights=p.volume, minlength=n_classes)
+        v_min = np.full(n_classes, np.inf)
+        v_max = np.zeros(n_classes)
+        np.minimum.at(v_min, inverse, p.volume)
+        np.maximum.at(v_max, inverse, p.volume)
+
+        n_pairs = n_classes * n_areas
+        w0 = n_pairs
+        o0 = 2 * n_pairs
+        n_vars = o0 + n_areas
+        c = np.zeros(n_vars)
+        c[:w0] = placement_costs(p, frequency, areas).ravel()
+        c[o0:] = p.weights[1]
+
+        pair = np.arange(n_pairs)
+        pair_class = pair // n_areas
+        pair_area = pair % n_areas
+        area = np.arange(n_areas)
+        ones = np.ones(n_pairs)
+        blocks = [
+            # Σ_a y_ka = n_k dan Σ_a w_ka = V_k
+            constraint_block(pair_class, pair, ones, n_classes, n_vars, counts, counts),
+            constraint_block(pair_class, w0 + pair, ones, n_classes, n_vars, totals, totals),
+            # v_min·y_ka ≤ w_ka ≤ v_max·y_ka
+            constraint_block(np.concatenate([pair, pair]), np.concatenate([w0 + pair, pair]),
+                             np.concatenate([ones, -v_max[pair_class]]), n_pairs, n_vars, -np.inf, 0.0),
+            constraint_block(np.concatenate([pair, pair]), np.concatenate([w0 + pair, pair]),
+                             np.concatenate([ones, -v_min[pair_class]]), n_pairs, n_vars, 0.0, np.inf),
+            # 1000·V_a/cap_a − o_a ≤ 1000
+            constraint_block(np.concatenate([pair_area, area]), np.concatenate([w0 + pair, o0 + area]),
+                             np.concatenate([OVER_CAPACITY_FACTOR * p.inv_capacity[areas][pair_area],
+                                             -np.ones(n_areas)]), n_areas, n_vars, -np.inf, OVER_CAPACITY_FACTOR),
+        ]
+        upper_bounds = np.full(n_vars, np.inf)
+        upper_bounds[:w0] = counts[pair_class]
+
+        result, elapsed = self._run(c, blocks, upper_bounds, np.zeros(n_vars, dtype=np.int8), time_limit)
+        if result.status != 0 or result.fun is None:
+            return None
+        return BoundResult(method='lp_relaxation', lower_bound=float(result.fun), status='optimal',
+                           solve_time=elapsed, variables=int(n_vars))
+
+    @staticmethod
+    def _run(c: np.ndarray, blocks, upper_bounds: np.ndarray, integrality: np.ndarray, time_limit: float):
+        matrix = sparse.vstack([block[0] for block in blocks], format='csr')
+        lower = np.concatenate([block[1] for block in blocks])
+        upper = np.concatenate([block[2] for block in blocks])
+        start = time.perf_counter()
+        result = milp(c, constraints=LinearConstraint(matrix, lower, upper),
+                      bounds=Bounds(np.zeros(len(c)), upper_bounds), integrality=integrality,
+                      options={'time_limit': time_limit, 'disp': False})
+        return result, time.perf_counter() - start
+
+
+def compute_lower_bound(problem: CompiledProblem, params: Optional[Dict] = None) -> Optional[BoundResult]:
+    """Lower bound (dan layout eksak untuk instance kecil); None jika solver gagal"""
+    return BoundModel(problem).solve(params)
+
+
+def bounded_start(engine, bound: Optional[BoundResult], gap_tolerance: float,
+                  initial: Optional[Layout] = None, warm_start: bool = True) -> Optional[Layout]:
+    """
+    Pasang lower bound ke engine (early stopping berbasis gap) dan pilih
+    solusi awal: layout MILP menggantikan `initial` jika tersedia dan
+    warm_start. Dipakai WarehouseOptimizer.optimize dan parallel_runner,
+    sehingga replikasi/tuning menjalankan pipeline yang sama dengan produksi.
+    """
+    if bound is None:
+        return initial
+    engine.attach_bound(bound.lower_bound, gap_tolerance)
+    if warm_start and bound.layout is not None:
+        return bound.layout
+    return initial
@@ -17,55 +17,268 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import json
-from typing import List, Dict, Tuple
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
 from warehouse_optimization import WarehouseOptimizer, PenempatanSolution, AreaGudang, Barang
+from result_export import DEFAULT_CHUNK_SIZE, iter_result_chunks, latest_result_file, read_result_metadata
+from optimization_problem import COMPONENT_NAMES, CompiledProblem, id_positions
+
+def _merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    Gabungkan (count, mean, M2) dua partisi (Chan et al.); bekerja untuk
+    skalar maupun array per grup
+    """
+    n = n_a + n_b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = mean_b - mean_a
+        mean = np.where(n > 0, mean_a + delta * n_b / n, 0.0)
+        m2 = np.where(n > 0, m2_a + m2_b + delta ** 2 * n_a * n_b / n, 0.0)
+    return n, mean, m2
+
+
+class MetricAccumulator:
+    """
+    Agregat metrik yang dapat digabung per chunk
+    
+    Menyimpan jumlah volume per area, momen jarak (count/mean/M2, min, max,
+    sum per bucket frekuensi), momen posisi per kategori, dan pasangan
+    (kategori, area) unik. Ukuran state hanya bergantung pada jumlah area
+    dan kategori, bukan jumlah penempatan.
+    """
+    
+    FREQUENCY_BUCKETS = ('high', 'medium', 'low')
+    
+    def __init__(self):
+        self.area_volume = pd.Series(dtype=float, index=pd.Index([], dtype=np.int64))
+        self.distance_n = 0
+        self.distance_mean = 0.0
+        self.distance_m2 = 0.0
+        self.distance_sum = 0.0
+        self.distance_min = np.inf
+        self.distance_max = -np.inf
+        self.bucket_sum = np.zeros(3)
+        self.bucket_count = np.zeros(3, dtype=np.int64)
+        self.categories = pd.DataFrame(columns=['category_name', 'n', 'mean_x', 'm2_x', 'mean_y', 'm2_y'])
+        self.category_areas = pd.DataFrame({'kategori_id': pd.Series(dtype=np.int64),
+                                            'area_id': pd.Series(dtype=np.int64)})
+    
+    def update(self, frame: pd.DataFrame):
+        """Tambahkan frame penempatan yang sudah di-join (build_placement_frame)"""
+        if frame.empty:
+            return
+        
+        # Volume per area
+        self.area_volume = self.area_volume.add(frame.groupby('area_id', sort=False)['volume'].sum(), fill_value=0.0)
+        
+        # Momen jarak tempuh
+        distances = frame['distance'].to_numpy()
+        n_b = len(distances)
+        mean_b = distances.mean()
+        m2_b = ((distances - mean_b) ** 2).sum()
+        n, mean, m2 = _merge_moments(self.distance_n, self.distance_mean, self.distance_m2, n_b, mean_b, m2_b)
+        self.distance_n, self.distance_mean, self.distance_m2 = int(n), float(mean), float(m2)
+        self.distance_sum += float(distances.sum())
+        self.distance_min = min(self.distance_min, float(distances.min()))
+        self.distance_max = max(self.distance_max, float(distances.max()))
+        
+        # Bucket frekuensi akses: high >= 7, medium 4-6, low < 4
+        frequency = frame['frekuensi_akses'].to_numpy()
+        bucket = np.where(frequency >= 7, 0, np.where(frequency >= 4, 1, 2))
+        self.bucket_sum += np.bincount(bucket, weights=distances, minlength=3)
+        self.bucket_count += np.bincount(bucket, minlength=3)
+        
+        # Momen posisi per kategori
+        grouped = frame.groupby('kategori_id', sort=False)
+        chunk = grouped.agg(
+            category_name=('kategori_nama', 'first'),
+            n=('koordinat_x', 'size'),
+            mean_x=('koordinat_x', 'mean'),
+            mean_y=('koordinat_y', 'mean'),
+        )
+        variance = grouped[['koordinat_x', 'koordinat_y']].var(ddof=0)
+        chunk['m2_x'] = variance['koordinat_x'] * chunk['n']
+        chunk['m2_y'] = variance['koordinat_y'] * chunk['n']
+        self._merge_categories(chunk)
+        
+        pairs = frame[['kategori_id', 'area_id']].drop_duplicates()
+        self.category_areas = (pd.concat([self.category_areas, pairs], ignore_index=True)
+                               .drop_duplicates(ignore_index=True))
+    
+    def _merge_categories(self, chunk: pd.DataFrame):
+        if self.categories.empty:
+            self.categories = chunk[self.categories.columns].copy()
+            return
+        # Urutan kategori mengikuti kemunculan pertama
+        index = self.categories.index.append(chunk.index.difference(self.categories.index, sort=False))
+        a = self.categories.reindex(index)
+        b = chunk.reindex(index)
+        n_a = a['n'].fillna(0).to_numpy(dtype=float)
+        n_b = b['n'].fillna(0).to_numpy(dtype=float)
+        merged = pd.DataFrame(index=index)
+        merged['category_name'] = a['category_name'].fillna(b['category_name'])
+        for axis in ('x', 'y'):
+            n, mean, m2 = _merge_moments(
+                n_a, a[f'mean_{axis}'].fillna(0).to_numpy(dtype=float), a[f'm2_{axis}'].fillna(0).to_numpy(dtype=float),
+                n_b, b[f'mean_{axis}'].fillna(0).to_numpy(dtype=float), b[f'm2_{axis}'].fillna(0).to_numpy(dtype=float))
+            merged[f'mean_{axis}'] = mean
+            merged[f'm2_{axis}'] = m2
+        merged['n'] = (n_a + n_b).astype(np.int64)
+        self.categories = merged[self.categories.columns]
+    
+    def space_utilization(self, areas: List[AreaGudang]) -> Dict:
+        area_ids = np.fromiter((a.id for a in areas), dtype=np.int64, count=len(areas))
+        volume_used = self.area_volume.reindex(area_ids, fill_value=0.0).to_numpy(dtype=float)
+        
+        area_utilization = {}
+        for area, used in zip(areas, volume_used.tolist()):
+            area_utilization[area.id] = {
+                'area_name': area.nama_area,
+                'kapasitas': area.kapasitas,
+                'volume_used': used,
+                'utilization_percent': (used / area.kapasitas) * 100 if area.kapasitas > 0 else 0,
+                'available_space': area.kapasitas - used
+            }
+        
+        return area_utilization
+    
+    def travel_metrics(self) -> Dict:
+        has_distances = self.distance_n > 0
+        bucket_mean = [np.float64(total / count) if count else 0
+                       for total, count in zip(self.bucket_sum, self.bucket_count)]
+        
+        return {
+            'total_distance': self.distance_sum if has_distances else 0,
+            'average_distance': np.float64(self.distance_mean) if has_distances else 0,
+            'max_distance': self.distance_max if has_distances else 0,
+            'min_distance': self.distance_min if has_distances else 0,
+            'std_distance': np.sqrt(self.distance_m2 / self.distance_n) if has_distances else 0,
+            'high_freq_avg_distance': bucket_mean[0],
+            'medium_freq_avg_distance': bucket_mean[1],
+            'low_freq_avg_distance': bucket_mean[2]
+        }
+    
+    def category_clustering(self) -> Dict:
+        num_areas = self.category_areas.groupby('kategori_id', sort=False).size()
+        
+        clustering_metrics = {}
+        for cat_id, row in zip(self.categories.index.tolist(), self.categories.itertuples(index=False)):
+            # Dispersi geografis = √(σx² + σy²), σ populasi seperti np.std
+            total_dispersi = np.sqrt((row.m2_x + row.m2_y) / row.n) if row.n > 1 else 0
+            clustering_metrics[cat_id] = {
+                'category_name': row.category_name,
+                'num_areas_used': int(num_areas[cat_id]),
+                'num_items': int(row.n),
+                'geographic_dispersion': total_dispersi,
+                'clustering_score': 1 / (1 + total_dispersi) if total_dispersi > 0 else 1.0
+            }
+        
+        return clustering_metrics
+
 
 class OptimizationAnalyzer:
     """
     Kelas untuk analisis hasil optimasi Simulated Annealing
+    
+    Semua metrik dihitung dari satu frame kolumnar (placement ⋈ barang ⋈
+    area) dengan agregasi group-by, bukan loop per penempatan.
     """
     
+    FRAME_COLUMNS = ['barang_id', 'area_id', 'koordinat_x', 'koordinat_y']
+    
     def __init__(self, optimizer: WarehouseOptimizer):
         self.optimizer = optimizer
         self.analysis_results = {}
+        self._item_frame = None
+    
+    def item_frame(self) -> pd.DataFrame:
+        """Atribut barang per barang_id (volume satuan; dibangun sekali per daftar barang)"""
+        barang_list = self.optimizer.barang_list
+        table = getattr(barang_list, 'columns', None)
+        if table is not None and (self._item_frame is None or len(self._item_frame) != len(barang_list)):
+            kategori = table['nama_kategori']
+            self._item_frame = pd.DataFrame({
+                'barang_id': table['id'],
+                'volume': table['volume'],
+                'frekuensi_akses': table['frekuensi_akses'],
+                'kategori_id': table['kategori_barang_id'],
+                'kategori_nama': np.array(kategori.levels, dtype=object)[kategori.codes],
+            }).drop_duplicates('barang_id')
+        elif self._item_frame is None or len(self._item_frame) != len(barang_list):
+            self._item_frame = pd.DataFrame({
+                'barang_id': np.fromiter((b.id for b in barang_list), dtype=np.int64, count=len(barang_list)),
+                'volume': np.fromiter((b.volume for b in barang_list), dtype=float, count=len(barang_list)),
+                'frekuensi_akses': np.fromiter((b.frekuensi_akses for b in barang_list), dtype=np.int64,
+                                               count=len(barang_list)),
+                'kategori_id': np.fromiter((b.kategori_id for b in barang_list), dtype=np.int64,
+                                           count=len(barang_list)),
+                'kategori_nama': [b.kategori_nama for b in barang_list],
+            }).drop_duplicates('barang_id')
+        return self._item_frame
     
-    def calculate_space_utilization(self, solution: List[PenempatanSolution]) -> Dict:
+    def build_placement_frame(self, solution) -> pd.DataFrame:
+        """
+        Frame penempatan yang sudah di-join dengan atribut barang dan jarak tempuh
+        
+        solution boleh berupa List[PenempatanSolution] atau DataFrame dengan
+        kolom barang_id, area_id, koordinat_x, koordinat_y (dan jumlah).
+        Penempatan tanpa barang yang dikenal dibuang (sama seperti perilaku
+        lama). Kolom volume adalah volume run: volume satuan × jumlah unit,
+        sama dengan utilization_summary.summarize_recommendations.
+        """
+        if isinstance(solution, pd.DataFrame):
+            if 'distance' in solution.columns and 'volume' in solution.columns:
+                return solution
+            placements = solution[self.FRAME_COLUMNS].copy()
+            # File hasil lama tanpa jumlah: satu unit per baris
+            jumlah = solution['jumlah'] if 'jumlah' in solution.columns else pd.Series(1, index=solution.index)
+            placements['jumlah'] = jumlah.fillna(1).to_numpy(dtype=np.int64)
+        else:
+            placements = pd.DataFrame({
+                'barang_id': np.fromiter((p.barang_id for p in solution), dtype=np.int64, count=len(solution)),
+                'area_id': np.fromiter((p.area_id for p in solution), dtype=np.int64, count=len(solution)),
+                'koordinat_x': np.fromiter((p.koordinat_x for p in solution), dtype=float, count=len(solution)),
+                'koordinat_y': np.fromiter((p.koordinat_y for p in solution), dtype=float, count=len(solution)),
+                'jumlah': np.fromiter((p.jumlah for p in solution), dtype=np.int64, count=len(solution)),
+            })
+        
+        frame = placements.merge(self.item_frame(), on='barang_id', how='inner', sort=False)
+        frame['volume'] = frame['volume'] * frame['jumlah']
+        frame['distance'] = self.travel_distances(frame['area_id'].to_numpy(),
+                                                  frame['koordinat_x'].to_numpy(),
+                                                  frame['koordinat_y'].to_numpy())
+        return frame
+    
+    def travel_distances(self, area_ids: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Versi vectorized dari WarehouseOptimizer.calculate_travel_distance"""
+        optimizer = self.optimizer
+        if optimizer.area_distance_matrix is None:
+            return np.sqrt(x ** 2 + y ** 2)
+        
+        idx = pd.Series(optimizer._area_index).reindex(area_ids).to_numpy()
+        if np.isnan(idx).any():
+            missing = area_ids[np.isnan(idx)][0]
+            raise KeyError(int(missing))
+        idx = idx.astype(np.int64)
+        access = np.asarray(optimizer._access_points)
+        door = np.asarray(optimizer._door_distances)
+        return door[idx] + np.sqrt((access[idx, 0] - x) ** 2 + (access[idx, 1] - y) ** 2)
+    
+    def accumulate(self, solution, accumulator: Optional['MetricAccumulator'] = None) -> 'MetricAccumulator':
+        """Tambahkan satu chunk penempatan ke akumulator metrik"""
+        accumulator = accumulator or MetricAccumulator()
+        accumulator.update(self.build_placement_frame(solution))
+        return accumulator
+    
+    def calculate_space_utilization(self, solution) -> Dict:
         """
         Menghitung tingkat utilisasi ruang untuk setiap area
         
         Formula:
         Utilisasi Area = (Total Volume Barang di Area) / (Kapasitas Area) × 100%
         """
-        area_utilization = {}
-        area_volumes = {}
-        
-        # Hitung total volume per area
-        for placement in solution:
-            area_id = placement.area_id
-            barang = next((b for b in self.optimizer.barang_list if b.id == placement.barang_id), None)
-            
-            if area_id not in area_volumes:
-                area_volumes[area_id] = 0.0
-            
-            if barang:
-                area_volumes[area_id] += barang.volume
-        
-        # Hitung persentase utilisasi
-        for area in self.optimizer.areas:
-            volume_used = area_volumes.get(area.id, 0.0)
-            utilization_percent = (volume_used / area.kapasitas) * 100 if area.kapasitas > 0 else 0
-            
-            area_utilization[area.id] = {
-                'area_name': area.nama_area,
-                'kapasitas': area.kapasitas,
-                'volume_used': volume_used,
-                'utilization_percent': utilization_percent,
-                'available_space': area.kapasitas - volume_used
-            }
-        
-        return area_utilization
+        return self.accumulate(solution).space_utilization(self.optimizer.areas)
     
-    def calculate_travel_distance_metrics(self, solution: List[PenempatanSolution]) -> Dict:
+    def calculate_travel_distance_metrics(self, solution) -> Dict:
         """
         Menghitung metrik jarak tempuh untuk picking
         
@@ -75,40 +288,9 @@ class OptimizationAnalyzer:
         3. Jarak terjauh
         4. Distribusi jarak berdasarkan frekuensi akses
         """
-        distances = []
-        high_frequency_distances = []  # Barang sering diakses
-        medium_frequency_distances = []
-        low_frequency_distances = []
-        
-        for placement in solution:
-            barang = next((b for b in self.optimizer.barang_list if b.id == placement.barang_id), None)
-            if barang:
-                # Hitung jarak dari entry point (0,0)
-                distance = self.optimizer.calculate_distance(0, 0, placement.koordinat_x, placement.koordinat_y)
-                distances.append(distance)
-                
-                # Kategorikan berdasarkan frekuensi akses
-                if barang.frekuensi_akses >= 7:
-                    high_frequency_distances.append(distance)
-                elif barang.frekuensi_akses >= 4:
-                    medium_frequency_distances.append(distance)
-                else:
-                    low_frequency_distances.append(distance)
-        
-        metrics = {
-            'total_distance': sum(distances),
-            'average_distance': np.mean(distances) if distances else 0,
-            'max_distance': max(distances) if distances else 0,
-            'min_distance': min(distances) if distances else 0,
-            'std_distance': np.std(distances) if distances else 0,
-            'high_freq_avg_distance': np.mean(high_frequency_distances) if high_frequency_distances else 0,
-            'medium_freq_avg_distance': np.mean(medium_frequency_distances) if medium_frequency_distances else 0,
-            'low_freq_avg_distance': np.mean(low_frequency_distances) if low_frequency_distances else 0
-        }
-        
-        return metrics
+        return self.accumulate(solution).travel_metrics()
     
-    def calculate_category_clustering(self, solution: List[PenempatanSolution]) -> Dict:
+    def calculate_category_clustering(self, solution) -> Dict:
         """
         Menghitung seberapa baik pengelompokan kategori barang
         
@@ -117,75 +299,53 @@ class OptimizationAnalyzer:
         2. Koefisien clustering
         3. Dispersi geografis kategori
         """
-        category_areas = {}
-        category_positions = {}
-        
-        for placement in solution:
-            barang = next((b for b in self.optimizer.barang_list if b.id == placement.barang_id), None)
-            if barang:
-                cat_id = barang.kategori_id
-                cat_name = barang.kategori_nama
-                
-                if cat_id not in category_areas:
-                    category_areas[cat_id] = {
-                        'name': cat_name,
-                        'areas': set(),
-                        'positions': []
-                    }
-                
-                category_areas[cat_id]['areas'].add(placement.area_id)
-                category_areas[cat_id]['positions'].append((placement.koordinat_x, placement.koordinat_y))
-        
-        clustering_metrics = {}
-        for cat_id, data in category_areas.items():
-            positions = np.array(data['positions'])
-            
-            # Hitung dispersi geografis (standard deviation of positions)
-            if len(positions) > 1:
-                dispersi_x = np.std(positions[:, 0])
-                dispersi_y = np.std(positions[:, 1])
-                total_dispersi = np.sqrt(dispersi_x**2 + dispersi_y**2)
-            else:
-                total_dispersi = 0
-            
-            clustering_metrics[cat_id] = {
-                'category_name': data['name'],
-                'num_areas_used': len(data['areas']),
-                'num_items': len(positions),
-                'geographic_dispersion': total_dispersi,
-                'clustering_score': 1 / (1 + total_dispersi) if total_dispersi > 0 else 1.0
-            }
-        
-        return clustering_metrics
+        return self.accumulate(solution).category_clustering()
     
-    def generate_performance_report(self, solution: List[PenempatanSolution], 
-                                  optimization_cost: float) -> Dict:
+    def generate_performance_report(self, solution, optimization_cost: float) -> Dict:
         """
         Menghasilkan laporan performa lengkap
         """
         print("Generating performance analysis report...")
-        
+        return self.build_report(self.accumulate(solution), len(solution), optimization_cost)
+    
+    def generate_streaming_report(self, chunks: Iterable[pd.DataFrame], optimization_cost: float) -> Dict:
+        """
+        Laporan performa dari chunk penempatan (mis. iter_result_chunks);
+        memori konstan karena hanya agregat yang disimpan antar chunk
+        """
+        print("Generating performance analysis report (streaming)...")
+        accumulator = MetricAccumulator()
+        total_items = 0
+        for chunk in chunks:
+            chunk = chunk.rename(columns={'area_gudang_id': 'area_id'})
+            total_items += len(chunk)
+            self.accumulate(chunk, accumulator)
+        return self.build_report(accumulator, total_items, optimization_cost)
+    
+    def build_report(self, accumulator: 'MetricAccumulator', total_items: int, optimization_cost: float) -> Dict:
+        """Susun laporan dari akumulator metrik"""
         report = {
             'optimization_summary': {
                 'algorithm': 'Simulated Annealing',
-                'total_items': len(solution),
+                'total_items': total_items,
                 'total_areas': len(self.optimizer.areas),
                 'objective_function_value': optimization_cost
             },
-            'space_utilization': self.calculate_space_utilization(solution),
-            'travel_metrics': self.calculate_travel_distance_metrics(solution),
-            'category_clustering': self.calculate_category_clustering(solution)
+            'space_utilization': accumulator.space_utilization(self.optimizer.areas),
+            'travel_metrics': accumulator.travel_metrics(),
+            'category_clustering': accumulator.category_clustering()
         }
         
         # Hitung summary statistics
-        utilizations = [data['utilization_percent'] for data in report['space_utilization'].values()]
+        utilizations = np.array([data['utilization_percent'] for data in report['space_utilization'].values()],
+                                dtype=float)
         
         report['summary_statistics'] = {
             'average_space_utilization': np.mean(utilizations),
             'max_space_utilization': np.max(utilizations),
             'min_space_utilization': np.min(utilizations),
-            'areas_over_80_percent': sum(1 for u in utilizations if u > 80),
-            'areas_under_30_percent': sum(1 for u in utilizations if u < 30),
+            'areas_over_80_percent': int((utilizations > 80).sum()),
+            'areas_under_30_percent': int((utilizations < 30).sum()),
             'total_categories': len(report['category_clustering']),
             'well_clustered_categories': sum(1 for data in report['category_clustering'].values() 
                                            if data['num_areas_used'] <= 2)
@@ -249,48 +409,173 @@ class OptimizationAnalyzer:
         
         print("\n" + "="*80)
 
-def analyze_optimization_results(solution_file: str = "optimization_result.json"):
+def read_layouts(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+    """
+    Baca layout dari file hasil (NDJSON/Parquet/JSON lama) atau arsip Pareto (.npz)
+
+    Returns:
+        list layout {'name', 'barang_id', 'area_gudang_id', 'koordinat_x', 'koordinat_y'};
+        arsip Pareto menghasilkan satu layout per anggota front
     """
-    Fungsi utama untuk menganalisis hasil optimasi dari file JSON
+    name = os.path.basename(path)
+    if path.endswith('.npz'):
+        with np.load(path, allow_pickle=False) as data:
+            return [{
+                'name': f"{name}#{member}",
+                'barang_id': data['item_ids'],
+                'area_gudang_id': data['area_ids'][member],
+                'koordinat_x': data['x'][member],
+                'koordinat_y': data['y'][member],
+            } for member in range(len(data['area_ids']))]
+
+    chunks = list(iter_result_chunks(path, chunk_size))
+    columns = ['barang_id', 'area_gudang_id', 'koordinat_x', 'koordinat_y']
+    frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+    layout = {'name': name}
+    for column in columns:
+        layout[column] = frame[column].to_numpy(dtype=np.float64 if column.startswith('koordinat') else np.int64)
+    return [layout]
+
+
+def stack_layouts(problem: CompiledProblem, layouts: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Susun layout menjadi matriks (L × N) dengan urutan barang = problem.item_ids
+
+    Barang yang tidak ada di layout (atau areanya tidak dikenal) bernilai
+    area_idx = -1; barang di layout yang tidak ada di master data diabaikan.
+
+    Returns:
+        (area_idx, x, y, unknown_items per layout)
+    """
+    shape = (len(layouts), problem.n_items)
+    area_idx = np.full(shape, -1, dtype=np.int64)
+    x = np.zeros(shape)
+    y = np.zeros(shape)
+    unknown = np.zeros(len(layouts), dtype=np.int64)
+    for row, layout in enumerate(layouts):
+        items = id_positions(problem.item_ids, layout['barang_id'])
+        known = items >= 0
+        unknown[row] = int((~known).sum())
+        area_idx[row, items[known]] = id_positions(problem.area_ids, layout['area_gudang_id'])[known]
+        x[row, items[known]] = np.asarray(layout['koordinat_x'], dtype=np.float64)[known]
+        y[row, items[known]] = np.asarray(layout['koordinat_y'], dtype=np.float64)[known]
+    return area_idx, x, y, unknown
+
+
+def score_layouts(problem: CompiledProblem, layouts: List[Dict]) -> List[Dict]:
+    """
+    Hitung keempat komponen objektif dan cost berbobot untuk banyak layout
+    sekaligus (CompiledProblem.evaluate_components_batch), bukan
+    calculate_objective_function per file
+    """
+    area_idx, x, y, unknown = stack_layouts(problem, layouts)
+    components = problem.evaluate_components_batch(area_idx, x, y)
+    missing = (area_idx < 0).sum(axis=1)
+    return [{
+        'name': layout['name'],
+        'components': {name: round(float(value), 4) for name, value in zip(COMPONENT_NAMES, components[row])},
+        'weighted_cost': round(float(problem.weighted_cost(components[row])), 4),
+        'missing_items': int(missing[row]),
+        'unknown_items': int(unknown[row]),
+    } for row, layout in enumerate(layouts)]
+
+
+def compare_layouts(sources: List[str], optimization_config: Optional[Dict] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, output_file: str = "layout_comparison.json"):
+    """
+    Bandingkan banyak layout kandidat (file hasil, arsip Pareto, layout impor)
+    terhadap master data saat ini dalam satu evaluasi batch
+
+    Returns:
+        list skor per layout, terurut dari cost berbobot terkecil (None jika gagal)
     """
     try:
-        # Load hasil optimasi
-        with open(solution_file, 'r') as f:
-            optimization_data = json.load(f)
+        layouts = [layout for path in sources for layout in read_layouts(path, chunk_size)]
+        if not layouts:
+            print("No layouts to compare")
+            return None
+
+        optimizer = WarehouseOptimizer(optimization_config)
+        if not optimizer.connect_database():
+            print("Warning: Could not connect to database, comparison not possible")
+            return None
+        try:
+            optimizer.fetch_areas()
+            optimizer.fetch_barang()
+            # Kompilasi selagi terkoneksi: affinity co-access dibaca dari database
+            problem = optimizer.compile_problem()
+        finally:
+            optimizer.disconnect_database()
+
+        scores = sorted(score_layouts(problem, layouts), key=lambda row: row['weighted_cost'])
+
+        print(f"\n📊 Layout comparison ({len(scores)} layouts)")
+        print(f"{'Layout':40s} {'Cost':>14s} {'Distance':>14s} {'Space':>10s} {'Category':>10s} {'Access':>10s} {'Missing':>8s}")
+        for row in scores:
+            c = row['components']
+            print(f"{row['name'][:40]:40s} {row['weighted_cost']:14.2f} {c['distance_cost']:14.2f} "
+                  f"{c['space_penalty']:10.2f} {c['category_penalty']:10.2f} {c['access_penalty']:10.2f} "
+                  f"{row['missing_items']:8d}")
+
+        with open(output_file, 'w') as f:
+            json.dump({'layouts': scores}, f, indent=2)
+        print(f"Layout comparison saved to {output_file}")
+        return scores
+
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error comparing layouts: {e}")
+        return None
+
+def analyze_optimization_results(solution_file: Optional[str] = None, log_optimasi_id: Optional[int] = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Fungsi utama untuk menganalisis hasil optimasi dari file hasil
+    
+    Default: file hasil untuk log_optimasi_id, atau file terbaru di direktori
+    results/. File dibaca per chunk sehingga memori tidak bergantung pada
+    ukuran hasil; file optimization_result.json lama tetap didukung.
+    """
+    try:
+        solution_file = solution_file or latest_result_file(log_optimasi_id)
+        if not solution_file:
+            print("No optimization result file found")
+            return False
         
+        metadata = read_result_metadata(solution_file)
         print(f"Loaded optimization results from {solution_file}")
-        print(f"Algorithm used: {optimization_data.get('algorithm', 'Unknown')}")
-        print(f"Total recommendations: {optimization_data.get('total_items', 0)}")
+        print(f"Algorithm used: {metadata.get('algorithm', 'Unknown')}")
         
         # Inisialisasi optimizer untuk akses ke data
-        optimizer = WarehouseOptimizer()
-        if not optimizer.load_token_from_file():
-            print("Warning: Could not load token, analysis might be limited")
+        optimizer = WarehouseOptimizer({'distance_model': metadata.get('distance_model', 'euclidean')})
+        if not optimizer.connect_database():
+            print("Warning: Could not connect to database, analysis might be limited")
             return False
         
-        # Load data dari API
-        optimizer.fetch_areas()
-        optimizer.fetch_barang()
-        
-        # Convert recommendations to PenempatanSolution objects
-        solution = []
-        for rec in optimization_data.get('recommendations', []):
-            placement = PenempatanSolution(
-                barang_id=rec['barang_id'],
-                area_id=rec['area_gudang_id'],
-                koordinat_x=rec['koordinat_x'],
-                koordinat_y=rec['koordinat_y']
-            )
-            solution.append(placement)
+        # Load data dari database
+        try:
+            optimizer.fetch_areas()
+            optimizer.fetch_barang()
+        finally:
+            optimizer.disconnect_database()
         
         # Jalankan analisis
         analyzer = OptimizationAnalyzer(optimizer)
         
-        # Hitung objective function untuk solusi ini
-        optimization_cost = optimizer.calculate_objective_function(solution)
+        # Nilai objective dari metadata export; file lama dihitung ulang
+        optimization_cost = metadata.get('objective_function_value')
+        if optimization_cost is None:
+            solution = [
+                PenempatanSolution(barang_id=int(row.barang_id), area_id=int(row.area_gudang_id),
+                                   koordinat_x=float(row.koordinat_x), koordinat_y=float(row.koordinat_y),
+                                   jumlah=int(getattr(row, 'jumlah', 1) or 1))
+                for chunk in iter_result_chunks(solution_file, chunk_size)
+                for row in chunk.itertuples(index=False)
+            ]
+            optimization_cost = optimizer.calculate_objective_function(solution)
         
         # Generate full report
-        report = analyzer.generate_performance_report(solution, optimization_cost)
+        report = analyzer.generate_streaming_report(iter_result_chunks(solution_file, chunk_size), optimization_cost)
+        print(f"Total recommendations: {report['optimization_summary']['total_items']}")
         
         # Print summary
         analyzer.print_summary_report(report)
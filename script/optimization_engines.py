@@ -0,0 +1,872 @@
+#!/usr/bin/env python3
+"""
+Engine Metaheuristik untuk Optimasi Penempatan Barang
+
+Semua engine memakai satu `CompiledProblem` dan `MoveEvaluator` yang sama
+(lihat optimization_problem.py), sehingga hasilnya dapat dibandingkan secara
+langsung:
+
+- sa   : Simulated Annealing (default, parameter sama dengan versi lama)
+- tabu : Tabu Search dengan tabu list berbasis atribut move (barang, area asal)
+- lns  : Large Neighborhood Search (destroy kategori/area, repair greedy vectorized)
+- mosa : Simulated Annealing multi-objektif dengan arsip Pareto (lihat pareto.py)
+- multilevel : cluster barang → anneal coarse → refine paralel per blok area (lihat multilevel.py)
+
+Engine dipilih per request melalui `--params`:
+    {"algorithm_params": {"engine": "tabu", "seed": 42}}
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import math
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from optimization_problem import PRIORITY_WEIGHTS, CompiledProblem, MoveEvaluator
+from optimality_bound import optimality_gap
+from pareto import ParetoArchive, compact_layout
+from sa_kernels import AnnealingKernel, resolve_backend
+from quantity_runs import balance_result
+
+
+@dataclass
+class EngineResult:
+    """Hasil satu run engine"""
+    engine: str
+    area_idx: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    cost: float
+    components: np.ndarray
+    initial_cost: float
+    iterations: int
+    evaluations: int
+    elapsed: float
+    history: List[Tuple[float, float]] = field(default_factory=list)  # (detik, best cost)
+    cancelled: bool = False
+    archive: Optional[ParetoArchive] = None  # front Pareto (engine multi-objektif)
+    gap_stopped: bool = False  # berhenti karena gap ke lower bound ≤ toleransi
+
+
+class OptimizationEngine:
+    """
+    Interface dasar engine optimasi
+
+    Subclass mengimplementasikan `search(evaluator)` yang memodifikasi state
+    evaluator dan mencatat solusi terbaik melalui `record_best`.
+    """
+
+    name = 'base'
+    label = 'Base Engine'
+    default_params: Dict = {}
+
+    def __init__(self, problem: CompiledProblem, params: Optional[Dict] = None, seed: Optional[int] = None,
+                 verbose: bool = True):
+        self.problem = problem
+        self.params = dict(self.default_params)
+        if params:
+            self.params.update({k: v for k, v in params.items() if k in self.default_params})
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.verbose = verbose
+
+        self.iterations = 0
+        self.evaluations = 0
+        self.best_cost = math.inf
+        self.best_layout = None
+        self._at_best = False
+        self.history: List[Tuple[float, float]] = []
+        self._start = 0.0
+        self._elapsed_before = 0.0
+        self._initial_cost = math.inf
+
+        # Checkpoint/pembatalan (opsional, lihat run_control)
+        self.checkpointer = None
+        self.cancel_token = None
+        self.cancelled = False
+        self.resume_state: Optional[Dict] = None
+
+        # Arsip Pareto, hanya diisi engine multi-objektif
+        self.archive: Optional[ParetoArchive] = None
+
+        # Lower bound (optimality_bound) untuk early stopping berbasis gap
+        self.lower_bound: Optional[float] = None
+        self.gap_tolerance = 0.0
+        self.gap_stopped = False
+
+    def attach_control(self, checkpointer=None, cancel_token=None):
+        """Pasang Checkpointer dan/atau CancellationToken untuk run ini"""
+        self.checkpointer = checkpointer
+        self.cancel_token = cancel_token
+
+    def attach_bound(self, lower_bound: Optional[float], gap_tolerance: float):
+        """Pasang lower bound; search berhenti begitu gap best-so-far ≤ gap_tolerance"""
+        self.lower_bound = lower_bound
+        self.gap_tolerance = float(gap_tolerance)
+
+    def gap_closed(self) -> bool:
+        """True jika best-so-far terbukti cukup dekat ke optimum"""
+        if self.lower_bound is None:
+            return False
+        gap = optimality_gap(self.best_cost, self.lower_bound)
+        if gap > self.gap_tolerance:
+            return False
+        if not self.gap_stopped:
+            self.gap_stopped = True
+            self.log(f"🎯 Optimality gap {gap:.4%} ≤ {self.gap_tolerance:.4%} "
+                     f"(lower bound {self.lower_bound:.2f}), stopping search")
+        return True
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def record_best(self, evaluator: MoveEvaluator, cost: float) -> bool:
+        """Tandai state evaluator sebagai best-so-far jika cost lebih baik"""
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self._at_best = True
+            self.history.append((time.perf_counter() - self._start, cost))
+            return True
+        return False
+
+    def leave_best(self, evaluator: MoveEvaluator):
+        """
+        Snapshot best-so-far secara lazy, tepat sebelum state meninggalkan solusi
+        terbaik. Snapshot O(N) tidak lagi dibuat di setiap perbaikan beruntun.
+        """
+        if self._at_best:
+            self.best_layout = evaluator.snapshot()
+            self._at_best = False
+
+    def initial_layout(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Solusi awal random dari RNG engine"""
+        return self.problem.random_layout(self.rng)
+
+    def problem_signature(self) -> List[int]:
+        """Identitas masalah untuk validasi checkpoint (jumlah barang/area + checksum id)"""
+        p = self.problem
+        return [int(p.n_items), int(p.n_areas),
+                int(np.asarray(p.item_ids, dtype=np.int64).sum() % (2 ** 31)),
+                int(np.asarray(p.area_ids, dtype=np.int64).sum() % (2 ** 31))]
+
+    def checkpoint_state(self, evaluator: MoveEvaluator, **extra) -> Dict:
+        """State lengkap untuk resume: solusi saat ini, best-so-far, RNG, counter"""
+        best_area_idx, best_x, best_y = evaluator.snapshot() if self._at_best else self.best_layout
+        return {
+            'area_idx': evaluator.area_idx,
+            'x': evaluator.x,
+            'y': evaluator.y,
+            'best_area_idx': best_area_idx,
+            'best_x': best_x,
+            'best_y': best_y,
+            'best_cost': self.best_cost,
+            'initial_cost': self._initial_cost,
+            'iterations': self.iterations,
+            'evaluations': self.evaluations,
+            'elapsed': self._elapsed_before + time.perf_counter() - self._start,
+            'json_engine': self.name,
+            'json_params': self.params,
+            'json_rng_state': self.rng.bit_generator.state,
+            'json_problem': self.problem_signature(),
+            **extra,
+        }
+
+    def control_step(self, evaluator: MoveEvaluator, **extra) -> bool:
+        """
+        Dipanggil engine di antara langkah besar (mis. per suhu): simpan
+        checkpoint periodik dan cek pembatalan. Return True jika harus berhenti.
+        """
+        if self.cancel_token is not None and self.cancel_token.is_cancelled():
+            self.cancelled = True
+            self.log(f"⛔ Run cancelled ({self.cancel_token.reason}), saving best-so-far")
+            if self.checkpointer is not None:
+                self.checkpointer.save(self.checkpoint_state(evaluator, **extra))
+            return True
+        if self.gap_closed():
+            return True
+        if self.checkpointer is not None and self.checkpointer.due():
+            self.checkpointer.save(self.checkpoint_state(evaluator, **extra))
+        return False
+
+    def restore(self, state: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pulihkan RNG, counter, dan best-so-far dari checkpoint; return solusi saat ini"""
+        if state.get('json_engine') != self.name:
+            raise ValueError(f"Checkpoint was written by engine '{state.get('json_engine')}', not '{self.name}'")
+        if list(state.get('json_problem', [])) != self.problem_signature():
+            raise ValueError("Checkpoint does not match the loaded warehouse data")
+
+        self.params.update(state.get('json_params', {}))
+        self.rng.bit_generator.state = state['json_rng_state']
+        self.iterations = int(state['iterations'])
+        self.evaluations = int(state['evaluations'])
+        self.best_cost = float(state['best_cost'])
+        self.best_layout = (state['best_area_idx'].astype(np.int64), state['best_x'].astype(float),
+                            state['best_y'].astype(float))
+        self._at_best = False
+        self.resume_state = state
+        return state['area_idx'].astype(np.int64), state['x'].astype(float), state['y'].astype(float)
+
+    def run(self, initial: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+            resume: Optional[Dict] = None) -> EngineResult:
+        """
+        Jalankan engine dari solusi awal (random jika tidak diberikan), atau
+        lanjutkan dari state checkpoint (`resume`)
+        """
+        problem = self.problem
+        if resume is not None:
+            initial = self.restore(resume)
+        elif initial is None:
+            initial = self.initial_layout()
+
+        evaluator = MoveEvaluator(problem)
+        evaluator.load(*initial)
+
+        self._start = time.perf_counter()
+        if resume is not None:
+            self._initial_cost = float(resume['initial_cost'])
+            self._elapsed_before = float(resume.get('elapsed', 0.0))
+            self.log(f"Resuming from checkpoint: iteration {self.iterations}, best cost {self.best_cost:.2f}")
+        else:
+            self._initial_cost = evaluator.cost
+            self._elapsed_before = 0.0
+            self.record_best(evaluator, self._initial_cost)
+            self.log(f"Initial solution cost: {self._initial_cost:.2f}")
+        initial_cost = self._initial_cost
+
+        if problem.n_items > 0 and len(problem.available) > 0 and not self.gap_closed():
+            self.search(evaluator)
+        self.leave_best(evaluator)
+
+        area_idx, x, y = self.best_layout
+        # Evaluasi ulang secara penuh agar cost akhir bebas drift dari delta
+        components = problem.evaluate_components(area_idx, x, y)
+        elapsed = self._elapsed_before + time.perf_counter() - self._start
+
+        self.log(f"{self.label} completed after {self.iterations} iterations ({self.evaluations} evaluations)")
+        self.log(f"Best cost achieved: {problem.weighted_cost(components):.2f}")
+
+        return EngineResult(
+            engine=self.name,
+            area_idx=area_idx,
+            x=x,
+            y=y,
+            cost=problem.weighted_cost(components),
+            components=components,
+            initial_cost=initial_cost,
+            iterations=self.iterations,
+            evaluations=self.evaluations,
+            elapsed=elapsed,
+            history=self.history,
+            cancelled=self.cancelled,
+            archive=self.archive,
+            gap_stopped=self.gap_stopped,
+        )
+
+    def search(self, evaluator: MoveEvaluator):
+        raise NotImplementedError
+
+    def draw_moves(self, evaluator: MoveEvaluator, n: int) -> Dict[str, np.ndarray]:
+        """
+        Ambil n move acak sekaligus (vectorized), strategi sama dengan generate_neighbor:
+        1 = pindah ke area lain, 2 = tukar dua barang, 3 = geser dalam area (maks 2 m)
+        """
+        p = self.problem
+        rng = self.rng
+        n_items = p.n_items
+
+        strategy = rng.integers(1, 4, size=n)
+        if n_items < 2:
+            strategy[strategy == 2] = 3
+        i = rng.integers(0, n_items, size=n)
+        j = rng.integers(0, max(n_items - 1, 1), size=n)
+        j = j + (j >= i)  # j != i
+        area = p.available[rng.integers(0, len(p.available), size=n)]
+        u = rng.random(n)
+        v = rng.random(n)
+        return {'strategy': strategy, 'i': i, 'j': j, 'area': area, 'u': u, 'v': v}
+
+    def move_target(self, evaluator: MoveEvaluator, strategy: int, i: int, area: int,
+                    u: float, v: float) -> Tuple[int, float, float]:
+        """Area dan koordinat tujuan untuk move relocate (strategi 1) atau geser (strategi 3)"""
+        rects = self.problem.area_rects
+        if strategy == 1:
+            x0, y0, x1, y1 = rects[area]
+            return area, x0 + u * (x1 - x0), y0 + v * (y1 - y0)
+        a = evaluator.area_idx[i]
+        x0, y0, x1, y1 = rects[a]
+        nx = min(max(evaluator.x[i] + (u * 4.0 - 2.0), x0), x1)
+        ny = min(max(evaluator.y[i] + (v * 4.0 - 2.0), y0), y1)
+        return a, nx, ny
+
+
+class SimulatedAnnealingEngine(OptimizationEngine):
+    """
+    Simulated Annealing dengan evaluasi delta
+
+    Jadwal suhu dan early stopping mengikuti implementasi awal:
+    T = α·T setiap langkah suhu, maksimal max_iterations per suhu, dan
+    berhenti di suhu tersebut setelah max_no_improvement iterasi tanpa perbaikan.
+    Dengan kernel 'numba' (lihat sa_kernels) satu langkah suhu dijalankan
+    dalam satu panggilan kernel terkompilasi.
+    """
+
+    name = 'sa'
+    label = 'Simulated Annealing'
+    default_params = {
+        'temperature_initial': 1000.0,
+        'temperature_final': 0.1,
+        'cooling_rate': 0.95,
+        'max_iterations': 1000,
+        'max_no_improvement': 50,
+        'kernel': 'auto',  # 'auto' | 'numba' | 'numpy'
+    }
+
+    def numpy_step(self, evaluator: MoveEvaluator, moves: Dict[str, np.ndarray], accept_u: np.ndarray,
+                   temperature: float, current_cost: float, no_improvement_count: int,
+                   max_no_improvement: int) -> Tuple[float, int]:
+        """Satu langkah suhu dengan loop Python di atas MoveEvaluator (fallback tanpa JIT)"""
+        improved_in_temperature = False
+        accept_u = accept_u.tolist()
+        strategy = moves['strategy'].tolist()
+        mi, mj, ma = moves['i'].tolist(), moves['j'].tolist(), moves['area'].tolist()
+        mu, mv = moves['u'].tolist(), moves['v'].tolist()
+
+        for k in range(len(strategy)):
+            self.iterations += 1
+            self.evaluations += 1
+
+            if strategy[k] == 2:
+                delta = evaluator.delta_swap(mi[k], mj[k])
+                target = None
+            else:
+                target = self.move_target(evaluator, strategy[k], mi[k], ma[k], mu[k], mv[k])
+                delta = evaluator.delta_relocate(mi[k], *target)
+            delta_cost = evaluator.weighted(delta)
+
+            if delta_cost < 0 or accept_u[k] < math.exp(-delta_cost / temperature):
+                if delta_cost >= 0:
+                    self.leave_best(evaluator)
+                if target is None:
+                    evaluator.apply_swap(mi[k], mj[k], delta)
+                else:
+                    evaluator.apply_relocate(mi[k], *target, delta)
+                current_cost += delta_cost
+
+                if self.record_best(evaluator, current_cost):
+                    improved_in_temperature = True
+                    no_improvement_count = 0
+
+            if not improved_in_temperature:
+                no_improvement_count += 1
+                if no_improvement_count >= max_no_improvement:
+                    break
+
+        return current_cost, no_improvement_count
+
+    def kernel_step(self, kernel: AnnealingKernel, moves: Dict[str, np.ndarray], accept_u: np.ndarray,
+                    temperature: float, current_cost: float, no_improvement_count: int,
+                    max_no_improvement: int) -> Tuple[float, int]:
+        """Satu langkah suhu lewat kernel JIT; counter dan best-so-far engine ikut diperbarui"""
+        steps, current_cost, best_cost, at_best, left_best, no_improvement_count, _ = kernel.step(
+            moves, accept_u, temperature, current_cost, self.best_cost, self._at_best,
+            no_improvement_count, max_no_improvement)
+        self.iterations += steps
+        self.evaluations += steps
+        if left_best:
+            self.best_layout = kernel.best_layout()
+        if best_cost < self.best_cost:
+            # Kurva cost per langkah suhu (bukan per perbaikan seperti loop NumPy)
+            self.best_cost = best_cost
+            self.history.append((time.perf_counter() - self._start, best_cost))
+        self._at_best = at_best
+        return current_cost, no_improvement_count
+
+    def search(self, evaluator: MoveEvaluator):
+        temperature = float(self.params['temperature_initial'])
+        temperature_final = float(self.params['temperature_final'])
+        cooling_rate = float(self.params['cooling_rate'])
+        max_iterations = int(self.params['max_iterations'])
+        max_no_improvement = int(self.params['max_no_improvement'])
+
+        current_cost = evaluator.cost
+        no_improvement_count = 0
+        if self.resume_state is not None:
+            temperature = float(self.resume_state['temperature'])
+            no_improvement_count = int(self.resume_state['no_improvement_count'])
+
+        kernel = AnnealingKernel(evaluator) if resolve_backend(self.params['kernel']) == 'numba' else None
+
+        while temperature > temperature_final:
+            moves = self.draw_moves(evaluator, max_iterations)
+            accept_u = self.rng.random(max_iterations)
+            if kernel is not None:
+                current_cost, no_improvement_count = self.kernel_step(
+                    kernel, moves, accept_u, temperature, current_cost, no_improvement_count, max_no_improvement)
+            else:
+                current_cost, no_improvement_count = self.numpy_step(
+                    evaluator, moves, accept_u, temperature, current_cost, no_improvement_count, max_no_improvement)
+
+            temperature *= cooling_rate
+            self.log(f"Iteration {self.iterations}: T = {temperature:.4f}, "
+                     f"Current cost = {current_cost:.2f}, Best cost = {self.best_cost:.2f}")
+
+            if self.control_step(evaluator, temperature=temperature, no_improvement_count=no_improvement_count):
+                break
+
+
+class MultiObjectiveAnnealingEngine(SimulatedAnnealingEngine):
+    """
+    Simulated Annealing multi-objektif (MOSA) dengan arsip Pareto bersama
+
+    Satu rantai annealing per skalarisasi, dijalankan bergantian per langkah
+    suhu dengan jadwal yang sama:
+    - rantai 0 memakai bobot dasar problem.weights (best-so-far & cost hasil,
+      setara SA biasa)
+    - satu rantai per preset PRIORITY_WEIGHTS, pada komponen yang diskalakan ke
+      nilai solusi awal (total setara cost awal, sehingga arti suhu sama)
+    Setiap move yang diterima di rantai mana pun ditawarkan ke ParetoArchive.
+    Data, kompilasi, dan penyimpanan hanya sekali untuk seluruh front.
+    """
+
+    name = 'mosa'
+    label = 'Multi-objective Simulated Annealing'
+    default_params = {
+        **SimulatedAnnealingEngine.default_params,
+        'archive_size': 32,
+        'archive_epsilon': 0.01,
+    }
+
+    def chain_weights(self, evaluator: MoveEvaluator) -> List[Tuple[float, float, float, float]]:
+        """Bobot skalarisasi per rantai (rantai 0 = bobot dasar)"""
+        initial = evaluator.components
+        scale = np.where(initial > 0, initial, max(float(initial.max()), 1.0)) / max(evaluator.cost, 1e-9)
+        chains = [tuple(self.problem.weights)]
+        for weights in PRIORITY_WEIGHTS.values():
+            chains.append(tuple(float(w) for w in np.asarray(weights, dtype=np.float64) / scale))
+        return chains
+
+    def search(self, evaluator: MoveEvaluator):
+        temperature = float(self.params['temperature_initial'])
+        temperature_final = float(self.params['temperature_final'])
+        cooling_rate = float(self.params['cooling_rate'])
+        max_iterations = int(self.params['max_iterations'])
+        max_no_improvement = int(self.params['max_no_improvement'])
+
+        archive = ParetoArchive(int(self.params['archive_size']), float(self.params['archive_epsilon']))
+        self.archive = archive
+
+        weights = self.chain_weights(evaluator)
+        evaluators = [evaluator]
+        for _ in weights[1:]:
+            chain = MoveEvaluator(self.problem)
+            chain.load(*evaluator.snapshot())
+            evaluators.append(chain)
+        # Best per rantai preset, snapshot lazy seperti leave_best
+        chain_best = [float(np.dot(w, evaluator.components)) for w in weights]
+        chain_layouts = [None] * len(weights)
+        at_chain_best = [True] * len(weights)
+        archive.offer(evaluator.components, lambda: compact_layout(*evaluator.snapshot()))
+
+        no_improvement = [0] * len(weights)
+        if self.resume_state is not None:
+            temperature = float(self.resume_state['temperature'])
+            no_improvement[0] = int(self.resume_state['no_improvement_count'])
+
+        while temperature > temperature_final:
+            for c, (chain, (w0, w1, w2, w3)) in enumerate(zip(evaluators, weights)):
+                base_chain = c == 0
+                snapshot = lambda: compact_layout(*chain.snapshot())
+                current = w0 * chain.components[0] + w1 * chain.components[1] + \
+                    w2 * chain.components[2] + w3 * chain.components[3]
+                improved_in_temperature = False
+                moves = self.draw_moves(chain, max_iterations)
+                accept_u = self.rng.random(max_iterations).tolist()
+                strategy = moves['strategy'].tolist()
+                mi, mj, ma = moves['i'].tolist(), moves['j'].tolist(), moves['area'].tolist()
+                mu, mv = moves['u'].tolist(), moves['v'].tolist()
+
+                for k in range(max_iterations):
+                    self.iterations += 1
+                    self.evaluations += 1
+
+                    if strategy[k] == 2:
+                        delta = chain.delta_swap(mi[k], mj[k])
+                        target = None
+                    else:
+                        target = self.move_target(chain, strategy[k], mi[k], ma[k], mu[k], mv[k])
+                        delta = chain.delta_relocate(mi[k], *target)
+                    delta_cost = w0 * delta[0] + w1 * delta[1] + w2 * delta[2] + w3 * delta[3]
+
+                    if delta_cost < 0 or accept_u[k] < math.exp(-delta_cost / temperature):
+                        if delta_cost >= 0:
+                            if base_chain:
+                                self.leave_best(chain)
+                            elif at_chain_best[c]:
+                                chain_layouts[c] = compact_layout(*chain.snapshot())
+                                at_chain_best[c] = False
+                        if target is None:
+                            chain.apply_swap(mi[k], mj[k], delta)
+                        else:
+                            chain.apply_relocate(mi[k], *target, delta)
+                        current += delta_cost
+
+                        archived = archive.offer(chain.components, snapshot)
+                        if base_chain:
+                            improved = self.record_best(chain, current)
+                        elif current < chain_best[c]:
+                            chain_best[c] = current
+                            at_chain_best[c] = True
+                            improved = True
+                        else:
+                            improved = False
+                        if improved or archived:
+                            improved_in_temperature = True
+                            no_improvement[c] = 0
+
+                    if not improved_in_temperature:
+                        no_improvement[c] += 1
+                        if no_improvement[c] >= max_no_improvement:
+                            break
+
+            temperature *= cooling_rate
+            self.log(f"Iteration {self.iterations}: T = {temperature:.4f}, "
+                     f"Best cost = {self.best_cost:.2f}, Pareto front = {len(archive)}")
+
+            if self.control_step(evaluator, temperature=temperature, no_improvement_count=no_improvement[0]):
+                break
+
+        for c in range(1, len(evaluators)):
+            if at_chain_best[c]:
+                chain_layouts[c] = compact_layout(*evaluators[c].snapshot())
+        self.finalize_archive(evaluator, chain_layouts[1:])
+
+    def finalize_archive(self, evaluator: MoveEvaluator, chain_layouts: List):
+        """
+        Best setiap rantai selalu masuk front (tanpa ε, bisa terbuang oleh
+        crowding), lalu komponen dievaluasi ulang penuh untuk menghapus drift
+        """
+        p = self.problem
+        archive = self.archive
+        self.leave_best(evaluator)
+        for layout in [compact_layout(*self.best_layout)] + list(chain_layouts):
+            archive.offer(p.evaluate_components(*layout), lambda layout=layout: layout, epsilon=0.0)
+        archive.refresh(p.evaluate_components)
+        self.log(f"Pareto front: {len(archive)} layouts ({archive.insertions} archive insertions)")
+
+
+class TabuSearchEngine(OptimizationEngine):
+    """
+    Tabu Search dengan tabu list berbasis atribut move
+
+    Setiap iterasi mengevaluasi `candidate_moves` move acak dan mengambil move
+    terbaik yang tidak tabu. Atribut tabu adalah pasangan (barang, area asal):
+    barang yang baru dipindah dilarang kembali ke area asalnya selama
+    `tabu_tenure` iterasi, kecuali move tersebut menghasilkan best-so-far (aspirasi).
+    """
+
+    name = 'tabu'
+    label = 'Tabu Search'
+    default_params = {
+        'max_iterations': 2000,
+        'candidate_moves': 64,
+        'tabu_tenure': 15,
+        'max_no_improvement': 400,
+    }
+
+    def search(self, evaluator: MoveEvaluator):
+        max_iterations = int(self.params['max_iterations'])
+        n_candidates = int(self.params['candidate_moves'])
+        tenure = int(self.params['tabu_tenure'])
+        max_no_improvement = int(self.params['max_no_improvement'])
+
+        tabu_until: Dict[Tuple[int, int], int] = {}
+        current_cost = evaluator.cost
+        no_improvement_count = 0
+
+        for it in range(max_iterations):
+            self.iterations += 1
+            moves = self.draw_moves(evaluator, n_candidates)
+            strategy = moves['strategy'].tolist()
+            mi, mj, ma = moves['i'].tolist(), moves['j'].tolist(), moves['area'].tolist()
+            mu, mv = moves['u'].tolist(), moves['v'].tolist()
+
+            best_move = None
+            best_delta_cost = math.inf
+            for k in range(n_candidates):
+                self.evaluations += 1
+                i = mi[k]
+                if strategy[k] == 2:
+                    j = mj[k]
+                    delta = evaluator.delta_swap(i, j)
+                    attrs = ((i, int(evaluator.area_idx[j])), (j, int(evaluator.area_idx[i])))
+                    target = None
+                else:
+                    target = self.move_target(evaluator, strategy[k], i, ma[k], mu[k], mv[k])
+                    delta = evaluator.delta_relocate(i, *target)
+                    attrs = ((i, target[0]),)
+                delta_cost = evaluator.weighted(delta)
+
+                is_tabu = any(tabu_until.get(attr, -1) > it for attr in attrs)
+                if is_tabu and current_cost + delta_cost >= self.best_cost:
+                    continue
+                if delta_cost < best_delta_cost:
+                    best_delta_cost = delta_cost
+                    best_move = (strategy[k], i, mj[k], target, delta)
+
+            if best_move is None:
+                continue
+
+            strategy_k, i, j, target, delta = best_move
+            if best_delta_cost >= 0:
+                self.leave_best(evaluator)
+            if target is None:
+                # Larang barang kembali ke area asalnya
+                tabu_until[(i, int(evaluator.area_idx[i]))] = it + tenure
+                tabu_until[(j, int(evaluator.area_idx[j]))] = it + tenure
+                evaluator.apply_swap(i, j, delta)
+            else:
+                if target[0] != evaluator.area_idx[i]:
+                    tabu_until[(i, int(evaluator.area_idx[i]))] = it + tenure
+                evaluator.apply_relocate(i, *target, delta)
+            current_cost += best_delta_cost
+
+            if self.record_best(evaluator, current_cost):
+                no_improvement_count = 0
+            else:
+                no_improvement_count += 1
+                if no_improvement_count >= max_no_improvement:
+                    self.log(f"Early stopping: No improvement for {max_no_improvement} iterations")
+                    break
+
+            if len(tabu_until) > 4 * tenure * n_candidates:
+                tabu_until = {attr: until for attr, until in tabu_until.items() if until > it}
+
+            if self.iterations % 100 == 0:
+                self.log(f"Iteration {self.iterations}: Current cost = {current_cost:.2f}, "
+                         f"Best cost = {self.best_cost:.2f}")
+                if self.control_step(evaluator):
+                    break
+
+
+class LargeNeighborhoodEngine(OptimizationEngine):
+    """
+    Large Neighborhood Search (destroy & repair)
+
+    Destroy: keluarkan semua barang satu kategori atau satu area (dibatasi
+    `destroy_fraction` dari total barang). Repair: masukkan kembali barang satu
+    per satu (frekuensi tertinggi dulu) ke area dengan delta cost terkecil,
+    skor semua area dihitung vectorized. Solusi baru diterima jika lebih baik,
+    atau dengan kriteria annealing ringan (`acceptance_temperature`).
+    """
+
+    name = 'lns'
+    label = 'Large Neighborhood Search'
+    default_params = {
+        'max_iterations': 300,
+        'destroy_fraction': 0.1,
+        'acceptance_temperature': 1.0,
+        'max_no_improvement': 100,
+    }
+
+    def destroy_set(self, evaluator: MoveEvaluator) -> np.ndarray:
+        p = self.problem
+        limit = max(1, int(p.n_items * float(self.params['destroy_fraction'])))
+        if self.rng.random() < 0.5 and p.n_categories > 0:
+            target = self.rng.integers(0, p.n_categories)
+            members = np.flatnonzero(p.category == target)
+        else:
+            used = np.flatnonzero(evaluator.area_count > 0)
+            target = used[self.rng.integers(0, len(used))]
+            members = np.flatnonzero(evaluator.area_idx == target)
+        if len(members) > limit:
+            members = self.rng.choice(members, size=limit, replace=False)
+        return members
+
+    def search(self, evaluator: MoveEvaluator):
+        max_iterations = int(self.params['max_iterations'])
+        temperature = float(self.params['acceptance_temperature'])
+        max_no_improvement = int(self.params['max_no_improvement'])
+        p = self.problem
+
+        current_cost = evaluator.cost
+        no_improvement_count = 0
+
+        for _ in range(max_iterations):
+            self.iterations += 1
+            self.leave_best(evaluator)
+            saved = evaluator.snapshot()
+
+            removed = self.destroy_set(evaluator)
+            for i in removed:
+                evaluator.remove(int(i))
+
+            order = removed[np.argsort(-p.frequency[removed], kind='stable')]
+            for i in order:
+                i = int(i)
+                deltas = evaluator.insertion_deltas(i)
+                self.evaluations += len(p.available)
+                a = int(np.argmin(deltas))
+                evaluator.insert(i, a, float(p.anchor_x[a]), float(p.anchor_y[a]))
+
+            new_cost = evaluator.cost
+            delta_cost = new_cost - current_cost
+            if delta_cost < 0 or self.rng.random() < math.exp(-delta_cost / max(temperature, 1e-12)):
+                current_cost = new_cost
+                if self.record_best(evaluator, current_cost):
+                    no_improvement_count = 0
+                else:
+                    no_improvement_count += 1
+            else:
+                evaluator.load(*saved)
+                no_improvement_count += 1
+
+            if no_improvement_count >= max_no_improvement:
+                self.log(f"Early stopping: No improvement for {max_no_improvement} iterations")
+                break
+
+            if self.iterations % 20 == 0:
+                self.log(f"Iteration {self.iterations}: Current cost = {current_cost:.2f}, "
+                         f"Best cost = {self.best_cost:.2f}")
+                if self.control_step(evaluator):
+                    break
+
+
+class MultilevelEngine(OptimizationEngine):
+    """
+    Optimasi multilevel coarse-to-fine (lihat multilevel.py)
+
+    1. Coarse: barang di-cluster menjadi super-item, penempatan cluster → area
+       di-anneal dengan SA pada masalah kecil
+    2. Fine: setiap blok area berdekatan di-refine secara paralel (default LNS:
+       destroy/repair dengan insertion delta di dalam blok); kerja per blok
+       sebanding jumlah barangnya, sehingga total kerja tumbuh hampir linear
+       terhadap jumlah barang
+
+    Pembatalan dan gap dicek di antara kedua tingkat.
+    """
+
+    name = 'multilevel'
+    label = 'Multilevel Simulated Annealing'
+    default_params = {
+        'cluster_size': 50,             # rata-rata barang per super-item
+        'areas_per_block': 8,           # area per blok refinement
+        'coarse_max_iterations': 1000,  # iterasi per suhu pada masalah coarse
+        'refine_engine': 'lns',         # engine per blok ('lns' atau 'sa')
+        'refine_iterations': 30,        # iterasi destroy/repair per blok (lns)
+        'refine_moves_per_item': 2,     # iterasi per suhu per barang di blok (sa)
+        'workers': 0,                   # 0 = semua core
+    }
+
+    def accept_layout(self, evaluator: MoveEvaluator, layout: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> bool:
+        """Muat layout hasil satu tingkat ke evaluator dan catat jika lebih baik"""
+        self.leave_best(evaluator)
+        evaluator.load(*layout)
+        return self.record_best(evaluator, evaluator.cost)
+
+    def search(self, evaluator: MoveEvaluator):
+        from multilevel import area_blocks, cluster_items, coarse_problem, expand_layout, subproblem
+        from parallel_runner import run_block_jobs
+
+        p = self.problem
+        seed = int(self.rng.integers(0, 2 ** 31 - 1))
+
+        labels = cluster_items(p, int(self.params['cluster_size']), seed)
+        coarse = coarse_problem(p, labels)
+        coarse_engine = SimulatedAnnealingEngine(
+            coarse, params={'max_iterations': int(self.params['coarse_max_iterations'])}, seed=seed, verbose=False)
+        coarse_result = coarse_engine.run()
+        self.iterations += coarse_result.iterations
+        self.evaluations += coarse_result.evaluations
+        layout = expand_layout(p, labels, coarse_result.area_idx)
+        self.accept_layout(evaluator, layout)
+        self.log(f"🧩 Coarse level: {p.n_items} items in {coarse.n_items} clusters, "
+                 f"cost = {evaluator.cost:.2f}")
+        if self.control_step(evaluator):
+            return
+
+        refine_engine = str(self.params['refine_engine'])
+
+        def refine_params(n_items: int) -> Dict:
+            if refine_engine == 'sa':
+                return {'max_iterations': max(100, int(self.params['refine_moves_per_item']) * n_items),
+                        'max_no_improvement': max(50, n_items)}
+            return {'max_iterations': int(self.params['refine_iterations'])}
+
+        area_idx, x, y = evaluator.snapshot()
+        local_area = np.full(p.n_areas, -1, dtype=np.int64)
+        jobs, members = [], []
+        for k, areas in enumerate(area_blocks(p, int(self.params['areas_per_block']))):
+            items = np.flatnonzero(np.isin(area_idx, areas))
+            if len(items) == 0:
+                continue
+            local_area[areas] = np.arange(len(areas))
+            jobs.append({
+                'block': k,
+                'engine': refine_engine,
+                'problem': subproblem(p, items, areas),
+                'initial': (local_area[area_idx[items]], x[items], y[items]),
+                'params': refine_params(len(items)),
+                'seed': seed + k + 1,
+            })
+            members.append((items, areas))
+
+        results = run_block_jobs(jobs, workers=int(self.params['workers']) or None)
+        for (items, areas), result in zip(members, results):
+            area_idx[items] = areas[result['area_idx']]
+            x[items] = result['x']
+            y[items] = result['y']
+            self.iterations += result['iterations']
+            self.evaluations += result['evaluations']
+        self.accept_layout(evaluator, (area_idx, x, y))
+        self.log(f"🧩 Fine level: {len(jobs)} area blocks refined, cost = {evaluator.cost:.2f}")
+
+
+ENGINES = {
+    SimulatedAnnealingEngine.name: SimulatedAnnealingEngine,
+    TabuSearchEngine.name: TabuSearchEngine,
+    LargeNeighborhoodEngine.name: LargeNeighborhoodEngine,
+    MultiObjectiveAnnealingEngine.name: MultiObjectiveAnnealingEngine,
+    MultilevelEngine.name: MultilevelEngine,
+}
+
+
+def create_engine(name: str, problem: CompiledProblem, params: Optional[Dict] = None,
+                  seed: Optional[int] = None, verbose: bool = True) -> OptimizationEngine:
+    """Buat engine berdasarkan nama ('sa', 'tabu', 'lns', 'mosa', 'multilevel')"""
+    key = (name or 'sa').lower()
+    if key not in ENGINES:
+        raise ValueError(f"Unknown optimization engine '{name}'. Available: {', '.join(ENGINES)}")
+    return ENGINES[key](problem, params=params, seed=seed, verbose=verbose)
+
+
+def benchmark_engines(problem: CompiledProblem, engines: Optional[List[str]] = None,
+                      seeds: Tuple[int, ...] = (0, 1, 2), params: Optional[Dict] = None) -> List[Dict]:
+    """
+    Perbandingan head-to-head engine pada masalah dan solusi awal yang sama
+
+    Returns:
+        List hasil per (engine, seed): best cost, wall time, evaluasi/detik, dan
+        kurva cost terhadap waktu (history)
+    """
+    results = []
+    for seed in seeds:
+        initial = problem.random_layout(np.random.default_rng(seed))
+        for name in engines or list(ENGINES):
+            engine = create_engine(name, problem, params=params, seed=seed, verbose=False)
+            result = engine.run(initial=initial)
+            results.append({
+                'engine': name,
+                'label': engine.label,
+                'seed': seed,
+                'initial_cost': result.initial_cost,
+                'best_cost': balance_result(problem, result)[0],
+                'wall_time': result.elapsed,
+                'iterations': result.iterations,
+                'evaluations': result.evaluations,
+                'evaluations_per_second': result.evaluations / result.elapsed if result.elapsed > 0 else 0.0,
+                'cost_vs_time': [[round(t, 4), c] for t, c in result.history],
+            })
+    return results
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+"""
+Representasi Masalah Terkompilasi dan Evaluator Delta untuk Engine Optimasi
+
+`CompiledProblem` mengubah list `AreaGudang`/`Barang` (atau langsung tabel
+kolom dari warehouse_columns) menjadi array NumPy (volume, frekuensi,
+kategori, geometri area) sekali saja. `MoveEvaluator`
+menyimpan state solusi (area per barang, koordinat, volume per area, jumlah
+barang per kategori×area) sehingga perubahan cost akibat satu move dihitung
+dalam O(1), bukan dengan mengevaluasi ulang seluruh solusi.
+
+Fungsi objektif identik dengan WarehouseOptimizer.calculate_objective_function:
+f(x) = w1*DistanceCost + w2*SpacePenalty + w3*CategoryPenalty + w4*AccessPenalty
+
+Jika matriks affinity co-access tersedia (lihat co_access), DistanceCost
+ditambah Σ_{i<j} A_ij · ‖posisi_i − posisi_j‖: barang yang sering diambil
+bersama sebaiknya berdekatan (calculate_objective_function menambah suku yang
+sama lewat solution_affinity_cost). Delta satu move hanya menyentuh baris CSR
+barang yang dipindah (O(jumlah tetangga), bukan O(ukuran katalog)).
+
+Satu "item" pada problem adalah satu run penempatan (barang, jumlah unit):
+volume item = volume satuan × jumlah, sehingga 10k SKU × 500 unit tetap
+10k item bagi engine (lihat quantity_runs untuk SKU yang dipecah).
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import math
+import numpy as np
+from scipy.sparse import csr_matrix
+from typing import Dict, List, Optional, Tuple
+
+# Bobot komponen objektif (w1..w4), sama dengan calculate_objective_function
+OBJECTIVE_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
+# Bobot preferensi per prioritas_optimasi untuk memilih layout dari front Pareto
+# (mode multi-objektif). Berlaku pada komponen yang dinormalisasi ke rentang
+# front (ideal..nadir), karena skala distance_cost jauh lebih besar dari penalti lain.
+PRIORITY_WEIGHTS = {
+    'space_utilization': (0.2, 0.5, 0.2, 0.1),
+    'accessibility': (0.4, 0.1, 0.1, 0.4),
+    'balanced': OBJECTIVE_WEIGHTS,
+}
+
+# Konstanta komponen objektif
+HIGH_FREQUENCY_THRESHOLD = 7      # frekuensi_akses > 7 dianggap sering diakses
+ACCESS_DISTANCE_LIMIT = 20.0      # jarak (m) maksimal untuk barang sering diakses
+ACCESS_PENALTY_FACTOR = 2.0
+UNDER_UTILIZATION_RATIO = 0.3
+UNDER_UTILIZATION_FACTOR = 100.0
+OVER_CAPACITY_FACTOR = 1000.0
+CATEGORY_SPREAD_FACTOR = 10.0
+
+# Indeks komponen pada vektor components
+DISTANCE, SPACE, CATEGORY, ACCESS = 0, 1, 2, 3
+COMPONENT_NAMES = ('distance_cost', 'space_penalty', 'category_penalty', 'access_penalty')
+
+
+def space_penalty(volume: float, count: int, inv_capacity: float) -> float:
+    """Penalti utilisasi satu area (hanya untuk area yang berisi barang)"""
+    if count <= 0:
+        return 0.0
+    ratio = volume * inv_capacity
+    if ratio < UNDER_UTILIZATION_RATIO:
+        return (UNDER_UTILIZATION_RATIO - ratio) * UNDER_UTILIZATION_FACTOR
+    if ratio > 1.0:
+        return (ratio - 1.0) * OVER_CAPACITY_FACTOR
+    return 0.0
+
+
+def space_penalty_vec(volume: np.ndarray, count: np.ndarray, inv_capacity: np.ndarray) -> np.ndarray:
+    """Versi vectorized dari space_penalty"""
+    ratio = volume * inv_capacity
+    penalty = np.where(ratio < UNDER_UTILIZATION_RATIO,
+                       (UNDER_UTILIZATION_RATIO - ratio) * UNDER_UTILIZATION_FACTOR,
+                       np.where(ratio > 1.0, (ratio - 1.0) * OVER_CAPACITY_FACTOR, 0.0))
+    return np.where(count > 0, penalty, 0.0)
+
+
+def id_positions(ids: np.ndarray, lookup: np.ndarray) -> np.ndarray:
+    """Posisi setiap nilai `lookup` di array `ids` (-1 jika tidak ada)"""
+    ids = np.asarray(ids, dtype=np.int64)
+    lookup = np.asarray(lookup, dtype=np.int64)
+    if len(ids) == 0:
+        return np.full(len(lookup), -1, dtype=np.int64)
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    pos = np.clip(np.searchsorted(sorted_ids, lookup), 0, len(ids) - 1)
+    return np.where(sorted_ids[pos] == lookup, order[pos], -1)
+
+
+class CompiledProblem:
+    """
+    Data masalah penempatan dalam bentuk array, dibagi read-only oleh semua engine
+    """
+
+    def __init__(self, item_ids: np.ndarray, volume: np.ndarray, frequency: np.ndarray,
+                 category: np.ndarray, category_ids: List[int], category_names: List[str],
+                 area_ids: np.ndarray, area_rects: np.ndarray, capacity: np.ndarray,
+                 available: Optional[np.ndarray] = None,
+                 door_distances: Optional[np.ndarray] = None,
+                 access_points: Optional[np.ndarray] = None,
+                 weights: Tuple[float, float, float, float] = OBJECTIVE_WEIGHTS,
+                 quantity: Optional[np.ndarray] = None,
+                 affinity: Optional[csr_matrix] = None):
+        self.item_ids = np.asarray(item_ids, dtype=np.int64)
+        # volume = volume satuan; volume run = volume satuan × jumlah unit
+        self.unit_volume = np.asarray(volume, dtype=np.float64)
+        self.quantity = (np.ones(len(self.item_ids), dtype=np.int64) if quantity is None
+                         else np.asarray(quantity, dtype=np.int64))
+        self.volume = self.unit_volume * self.quantity
+        self.frequency = np.asarray(frequency, dtype=np.float64)
+        self.category = np.asarray(category, dtype=np.int32)
+        self.category_ids = list(category_ids)
+        self.category_names = list(category_names)
+
+        self.area_ids = np.asarray(area_ids, dtype=np.int64)
+        self.area_rects = np.asarray(area_rects, dtype=np.float64).reshape(-1, 4)  # x0, y0, x1, y1
+        self.capacity = np.asarray(capacity, dtype=np.float64)
+        self.inv_capacity = np.where(self.capacity > 0, 1.0 / np.where(self.capacity > 0, self.capacity, 1.0), 1e9)
+        if available is None:
+            available = np.ones(len(self.area_ids), dtype=bool)
+        self.available = np.flatnonzero(np.asarray(available, dtype=bool))
+
+        # Model jarak: None = euclidean dari pintu (0,0), selain itu graf lorong
+        self.door_distances = None if door_distances is None else np.asarray(door_distances, dtype=np.float64)
+        self.access_points = None if access_points is None else np.asarray(access_points, dtype=np.float64)
+
+        self.weights = tuple(float(w) for w in weights)
+        self.hot = self.frequency > HIGH_FREQUENCY_THRESHOLD
+
+        self.n_items = len(self.item_ids)
+        self.n_areas = len(self.area_ids)
+        self.n_categories = len(self.category_ids)
+
+        # Affinity co-access: CSR simetris N×N (diagonal nol), None = tanpa affinity
+        self.affinity = None
+        self.affinity_rows = np.zeros(0, dtype=np.int64)
+        if affinity is not None and affinity.nnz:
+            self.affinity = csr_matrix(affinity, dtype=np.float64)
+            self.affinity.sort_indices()
+            self.affinity_rows = np.repeat(np.arange(self.n_items), np.diff(self.affinity.indptr))
+
+        # Titik terdekat ke pintu di dalam setiap area (dipakai repair greedy)
+        self.anchor_x, self.anchor_y = self._compute_anchors()
+        self.anchor_distance = self.travel_distance(np.arange(self.n_areas), self.anchor_x, self.anchor_y)
+
+    @classmethod
+    def from_optimizer(cls, optimizer) -> 'CompiledProblem':
+        """Kompilasi data dari WarehouseOptimizer yang sudah memuat areas dan barang_list"""
+        areas = optimizer.areas
+        barang_list = optimizer.barang_list
+
+        door_distances = None
+        access_points = None
+        if getattr(optimizer, 'area_distance_matrix', None) is not None:
+            door_distances = np.asarray(optimizer._door_distances)
+            access_points = np.asarray(optimizer._access_points)
+
+        area_table = getattr(areas, 'columns', None)
+        barang_table = getattr(barang_list, 'columns', None)
+        if area_table is not None and barang_table is not None:
+            return cls.from_columns(area_table, barang_table, door_distances, access_points,
+                                    affinity=getattr(optimizer, 'affinity', None))
+
+        category_index = {}
+        category_names = []
+        for barang in barang_list:
+            if barang.kategori_id not in category_index:
+                category_index[barang.kategori_id] = len(category_index)
+                category_names.append(barang.kategori_nama)
+
+        return cls(
+            item_ids=[b.id for b in barang_list],
+            volume=[b.volume for b in barang_list],
+            frequency=[b.frekuensi_akses for b in barang_list],
+            category=[category_index[b.kategori_id] for b in barang_list],
+            category_ids=list(category_index.keys()),
+            category_names=category_names,
+            area_ids=[a.id for a in areas],
+            area_rects=[(a.koordinat_x, a.koordinat_y, a.koordinat_x + a.panjang, a.koordinat_y + a.lebar)
+                        for a in areas],
+            capacity=[a.kapasitas for a in areas],
+            available=[a.tersedia for a in areas],
+            door_distances=door_distances,
+            access_points=access_points,
+            quantity=[b.jumlah for b in barang_list],
+            affinity=getattr(optimizer, 'affinity', None),
+        )
+
+    @classmethod
+    def from_columns(cls, areas, barang, door_distances: Optional[np.ndarray] = None,
+                     access_points: Optional[np.ndarray] = None,
+                     affinity: Optional[csr_matrix] = None) -> 'CompiledProblem':
+        """
+        Kompilasi langsung dari AreaColumns/BarangColumns (warehouse_columns)
+        tanpa membuat objek per barang; indeks kategori mengikuti urutan
+        kemunculan pertama, sama dengan from_optimizer
+        """
+        kategori_ids = barang['kategori_barang_id']
+        unique_ids, first, inverse = np.unique(kategori_ids, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        kategori = barang['nama_kategori']
+
+        x0 = areas['koordinat_x']
+        y0 = areas['koordinat_y']
+        return cls(
+            item_ids=barang['id'],
+            volume=barang['volume'],
+            frequency=barang['frekuensi_akses'],
+            category=rank[inverse.reshape(-1)],
+            category_ids=unique_ids[order].tolist(),
+            category_names=[kategori[i] for i in first[order].tolist()],
+            area_ids=areas['id'],
+            area_rects=np.column_stack([x0, y0, x0 + areas['panjang'], y0 + areas['lebar']]),
+            capacity=areas['kapasitas'],
+            available=areas['tersedia'],
+            door_distances=door_distances,
+            access_points=access_points,
+            quantity=barang['jumlah'],
+            affinity=affinity,
+        )
+
+    def _compute_anchors(self) -> Tuple[np.ndarray, np.ndarray]:
+        x0, y0, x1, y1 = self.area_rects.T
+        if self.access_points is None:
+            return np.clip(0.0, x0, x1), np.clip(0.0, y0, y1)
+        return np.clip(self.access_points[:, 0], x0, x1), np.clip(self.access_points[:, 1], y0, y1)
+
+    def travel_distance(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Jarak tempuh dari pintu ke posisi penempatan (vectorized)"""
+        if self.door_distances is None:
+            return np.hypot(x, y)
+        ax = self.access_points[area_idx, 0]
+        ay = self.access_points[area_idx, 1]
+        return self.door_distances[area_idx] + np.hypot(x - ax, y - ay)
+
+    def item_costs(self, distance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Kontribusi distance cost dan access penalty per barang"""
+        distance_cost = distance * self.frequency
+        access = np.where(self.hot & (distance > ACCESS_DISTANCE_LIMIT), distance * ACCESS_PENALTY_FACTOR, 0.0)
+        return distance_cost, access
+
+    def affinity_cost(self, x: np.ndarray, y: np.ndarray, placed: Optional[np.ndarray] = None) -> float:
+        """Σ_{i<j} A_ij · jarak(i, j) untuk pasangan yang keduanya ditempatkan"""
+        if self.affinity is None:
+            return 0.0
+        rows, cols = self.affinity_rows, self.affinity.indices
+        pair_cost = self.affinity.data * np.hypot(x[rows] - x[cols], y[rows] - y[cols])
+        if placed is not None:
+            pair_cost = pair_cost[placed[rows] & placed[cols]]
+        return 0.5 * float(pair_cost.sum())
+
+    def evaluate_components(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Evaluasi penuh keempat komponen objektif (tanpa bobot)
+
+        Returns:
+            array [distance_cost, space_penalty, category_penalty, access_penalty]
+        """
+        if self.n_items == 0:
+            return np.full(4, np.inf)
+
+        distance = self.travel_distance(area_idx, x, y)
+        distance_cost, access = self.item_costs(distance)
+
+        volume = np.bincount(area_idx, weights=self.volume, minlength=self.n_areas)
+        count = np.bincount(area_idx, minlength=self.n_areas)
+        space = space_penalty_vec(volume, count, self.inv_capacity).sum()
+
+        used_pairs = np.unique(self.category.astype(np.int64) * self.n_areas + area_idx)
+        areas_per_category = np.bincount(used_pairs // self.n_areas, minlength=self.n_categories)
+        category = (np.maximum(areas_per_category - 1, 0) * CATEGORY_SPREAD_FACTOR).sum()
+
+        return np.array([distance_cost.sum() + self.affinity_cost(x, y), space, category, access.sum()])
+
+    def evaluate_components_batch(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray,
+                                  block_elements: int = 1 << 22) -> np.ndarray:
+        """
+        Evaluasi keempat komponen untuk L layout sekaligus (vectorized)
+
+        Args:
+            area_idx, x, y: matriks (L × N) dengan urutan barang = item_ids;
+                area_idx = -1 untuk barang yang tidak ditempatkan (tidak dihitung)
+            block_elements: batas elemen L×N per blok untuk membatasi memori
+
+        Returns:
+            array (L × 4) [distance_cost, space_penalty, category_penalty, access_penalty]
+        """
+        area_idx = np.atleast_2d(np.asarray(area_idx, dtype=np.int64))
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+        n_layouts = area_idx.shape[0]
+        if self.n_items == 0:
+            return np.full((n_layouts, 4), np.inf)
+
+        out = np.empty((n_layouts, 4))
+        block = max(1, block_elements // (self.n_items + len(self.affinity_rows)))
+        for lo in range(0, n_layouts, block):
+            hi = min(n_layouts, lo + block)
+            out[lo:hi] = self._components_block(area_idx[lo:hi], x[lo:hi], y[lo:hi])
+        return out
+
+    def _components_block(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        rows = area_idx.shape[0]
+        n_areas, n_categories = self.n_areas, self.n_categories
+        placed = area_idx >= 0
+        safe_idx = np.where(placed, area_idx, 0)
+
+        distance = self.travel_distance(safe_idx, x, y)
+        distance_cost, access = self.item_costs(distance)
+        distance_cost = np.where(placed, distance_cost, 0.0).sum(axis=1)
+        access = np.where(placed, access, 0.0).sum(axis=1)
+        if self.affinity is not None:
+            rows_a, cols_a = self.affinity_rows, self.affinity.indices
+            pair_cost = self.affinity.data * np.hypot(x[:, rows_a] - x[:, cols_a], y[:, rows_a] - y[:, cols_a])
+            distance_cost += 0.5 * np.where(placed[:, rows_a] & placed[:, cols_a], pair_cost, 0.0).sum(axis=1)
+
+        row = np.broadcast_to(np.arange(rows)[:, None], area_idx.shape)[placed]
+        area = safe_idx[placed]
+        flat = row * n_areas + area
+        volume = np.bincount(flat, weights=np.broadcast_to(self.volume, area_idx.shape)[placed],
+                             minlength=rows * n_areas).reshape(rows, n_areas)
+        count = np.bincount(flat, minlength=rows * n_areas).reshape(rows, n_areas)
+        space = space_penalty_vec(volume, count, self.inv_capacity).sum(axis=1)
+
+        category = np.broadcast_to(self.category.astype(np.int64), area_idx.shape)[placed]
+        pair = (row * n_categories + category) * n_areas + area
+        cells = rows * n_categories * n_areas
+        if cells <= 4 * len(pair):
+            # Tabel (layout × kategori × area) cukup kecil: bincount lebih cepat dari sort
+            used = np.bincount(pair, minlength=cells).reshape(rows, n_categories, n_areas) > 0
+            areas_per_category = used.sum(axis=2)
+        else:
+            used_pairs = np.unique(pair)
+            areas_per_category = np.bincount(used_pairs // n_areas,
+                                             minlength=rows * n_categories).reshape(rows, n_categories)
+        category_penalty = (np.maximum(areas_per_category - 1, 0) * CATEGORY_SPREAD_FACTOR).sum(axis=1)
+
+        return np.column_stack([distance_cost, space, category_penalty, access])
+
+    def weighted_cost(self, components: np.ndarray) -> float:
+        return float(np.dot(self.weights, components))
+
+    def evaluate(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> float:
+        return self.weighted_cost(self.evaluate_components(area_idx, x, y))
+
+    def random_layout(self, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Solusi awal random, setara generate_initial_solution"""
+        area_idx = self.available[rng.integers(0, len(self.available), size=self.n_items)]
+        x0, y0, x1, y1 = self.area_rects[area_idx].T
+        x = x0 + rng.random(self.n_items) * (x1 - x0)
+        y = y0 + rng.random(self.n_items) * (y1 - y0)
+        return area_idx.astype(np.int64), x, y
+
+    def layout_from_solution(self, solution: List) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Konversi List[PenempatanSolution] menjadi array (urutan mengikuti item_ids);
+        beberapa run barang yang sama dipetakan berurutan ke run problem
+        """
+        item_pos: Dict[int, List[int]] = {}
+        for i, item_id in enumerate(self.item_ids.tolist()):
+            item_pos.setdefault(item_id, []).append(i)
+        area_pos = {int(area_id): i for i, area_id in enumerate(self.area_ids)}
+        area_idx = np.zeros(self.n_items, dtype=np.int64)
+        x = np.zeros(self.n_items)
+        y = np.zeros(self.n_items)
+        for placement in solution:
+            runs = item_pos[placement.barang_id]
+            i = runs.pop(0) if len(runs) > 1 else runs[0]
+            area_idx[i] = area_pos[placement.area_id]
+            x[i] = placement.koordinat_x
+            y[i] = placement.koordinat_y
+        return area_idx, x, y
+
+    def solution_from_layout(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> List:
+        """Konversi array layout menjadi List[PenempatanSolution]"""
+        from warehouse_optimization import PenempatanSolution
+
+        return [
+            PenempatanSolution(barang_id=int(item_id), area_id=int(area_id), koordinat_x=float(px), koordinat_y=float(py),
+                               jumlah=int(count))
+            for item_id, area_id, px, py, count in zip(self.item_ids, self.area_ids[area_idx], x, y, self.quantity)
+        ]
+
+
+class MoveEvaluator:
+    """
+    State solusi dengan evaluasi delta O(1) per move
+
+    Move yang didukung (sama dengan generate_neighbor):
+    - relocate: pindah satu barang ke area/koordinat baru (termasuk geser dalam area)
+    - swap    : tukar area dan koordinat dua barang
+    Untuk destroy/repair (LNS) tersedia remove/insert dan insertion_deltas.
+    """
+
+    def __init__(self, problem: CompiledProblem):
+        self.problem = problem
+        self.w = problem.weights
+        self.components = np.zeros(4)
+
+    def load(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray):
+        """Set state dari layout lengkap"""
+        p = self.problem
+        self.area_idx = np.array(area_idx, dtype=np.int64)
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.distance = p.travel_distance(self.area_idx, self.x, self.y)
+        self.area_volume = np.bincount(self.area_idx, weights=p.volume, minlength=p.n_areas).astype(np.float64)
+        self.area_count = np.bincount(self.area_idx, minlength=p.n_areas).astype(np.int64)
+        self.cat_area = np.zeros((p.n_categories, p.n_areas), dtype=np.int32)
+        np.add.at(self.cat_area, (p.category, self.area_idx), 1)
+        self.cat_spread = (self.cat_area > 0).sum(axis=1).astype(np.int64)
+        self.components = p.evaluate_components(self.area_idx, self.x, self.y)
+
+    def load_partial(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray):
+        """
+        Seperti load, tetapi barang dengan area_idx = -1 dianggap belum
+        ditempatkan (mis. barang baru yang belum ada di layout tersimpan)
+        """
+        area_idx = np.asarray(area_idx, dtype=np.int64)
+        unplaced = np.flatnonzero(area_idx < 0)
+        if len(unplaced) == 0:
+            self.load(area_idx, x, y)
+            return
+        if len(self.problem.available) == 0:
+            raise ValueError("No available areas to hold the layout")
+        filled = area_idx.copy()
+        filled[unplaced] = self.problem.available[0]
+        self.load(filled, x, y)
+        for i in unplaced:
+            self.remove(int(i))
+
+    @property
+    def cost(self) -> float:
+        return self.problem.weighted_cost(self.components)
+
+    def weighted(self, delta: Tuple[float, float, float, float]) -> float:
+        w = self.w
+        return w[0] * delta[0] + w[1] * delta[1] + w[2] * delta[2] + w[3] * delta[3]
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.area_idx.copy(), self.x.copy(), self.y.copy()
+
+    def resync(self):
+        """Hitung ulang komponen secara penuh untuk menghapus drift floating point"""
+        self.components = self.problem.evaluate_components(self.area_idx, self.x, self.y)
+
+    def point_distance(self, a: int, x: float, y: float) -> float:
+        p = self.problem
+        if p.door_distances is None:
+            return math.hypot(x, y)
+        return p.door_distances[a] + math.hypot(x - p.access_points[a, 0], y - p.access_points[a, 1])
+
+    def _item_terms(self, i: int, distance: float) -> Tuple[float, float]:
+        p = self.problem
+        access = distance * ACCESS_PENALTY_FACTOR if (p.hot[i] and distance > ACCESS_DISTANCE_LIMIT) else 0.0
+        return distance * p.frequency[i], access
+
+    def _spread_penalty(self, spread: int) -> float:
+        return max(spread - 1, 0) * CATEGORY_SPREAD_FACTOR
+
+    def _neighbors(self, i: int, exclude: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+        """Tetangga affinity barang i yang sedang ditempatkan (indeks, bobot)"""
+        A = self.problem.affinity
+        lo, hi = A.indptr[i], A.indptr[i + 1]
+        k = A.indices[lo:hi]
+        keep = (self.area_idx[k] >= 0) & (k != exclude)
+        return k[keep], A.data[lo:hi][keep]
+
+    def affinity_delta(self, i: int, nx: float, ny: float, exclude: int = -1) -> float:
+        """Perubahan affinity cost jika barang i pindah ke (nx, ny); hanya baris CSR i"""
+        if self.problem.affinity is None:
+            return 0.0
+        k, w = self._neighbors(i, exclude)
+        if len(k) == 0:
+            return 0.0
+        xs, ys = self.x[k], self.y[k]
+        return float(np.dot(w, np.hypot(nx - xs, ny - ys) - np.hypot(self.x[i] - xs, self.y[i] - ys)))
+
+    def affinity_terms(self, i: int, nx: float, ny: float) -> float:
+        """Affinity cost pasangan barang i (di posisi nx, ny) dengan tetangga yang ditempatkan"""
+        if self.problem.affinity is None:
+            return 0.0
+        k, w = self._neighbors(i, exclude=i)
+        return float(np.dot(w, np.hypot(nx - self.x[k], ny - self.y[k])))
+
+    def delta_relocate(self, i: int, a: int, nx: float, ny: float) -> Tuple[float, float, float, float]:
+        """Delta komponen jika barang i dipindah ke area a pada koordinat (nx, ny)"""
+        p = self.problem
+        old_d = self.distance[i]
+        new_d = self.point_distance(a, nx, ny)
+        old_dc, old_ac = self._item_terms(i, old_d)
+        new_dc, new_ac = self._item_terms(i, new_d)
+
+        d_dist = new_dc - old_dc + self.affinity_delta(i, nx, ny)
+
+        o = self.area_idx[i]
+        if a == o:
+            return d_dist, 0.0, 0.0, new_ac - old_ac
+
+        v = p.volume[i]
+        inv = p.inv_capacity
+        vol_o, cnt_o = self.area_volume[o], self.area_count[o]
+        vol_a, cnt_a = self.area_volume[a], self.area_count[a]
+        d_space = (space_penalty(vol_o - v, cnt_o - 1, inv[o]) - space_penalty(vol_o, cnt_o, inv[o])
+                   + space_penalty(vol_a + v, cnt_a + 1, inv[a]) - space_penalty(vol_a, cnt_a, inv[a]))
+
+        c = p.category[i]
+        spread = self.cat_spread[c]
+        new_spread = spread - (self.cat_area[c, o] == 1) + (self.cat_area[c, a] == 0)
+        d_cat = self._spread_penalty(new_spread) - self._spread_penalty(spread)
+
+        return d_dist, d_space, d_cat, new_ac - old_ac
+
+    def apply_relocate(self, i: int, a: int, nx: float, ny: float, delta: Tuple[float, float, float, float]):
+        p = self.problem
+        o = self.area_idx[i]
+        if a != o:
+            v = p.volume[i]
+            c = p.category[i]
+            self.area_volume[o] -= v
+            self.area_volume[a] += v
+            self.area_count[o] -= 1
+            self.area_count[a] += 1
+            self.cat_area[c, o] -= 1
+            if self.cat_area[c, o] == 0:
+                self.cat_spread[c] -= 1
+            if self.cat_area[c, a] == 0:
+                self.cat_spread[c] += 1
+            self.cat_area[c, a] += 1
+            self.area_idx[i] = a
+        self.x[i] = nx
+        self.y[i] = ny
+        self.distance[i] = self.point_distance(a, nx, ny)
+        self.components += delta
+
+    def delta_swap(self, i: int, j: int) -> Tuple[float, float, float, float]:
+        """Delta komponen jika area dan koordinat barang i dan j ditukar"""
+        p = self.problem
+        di, dj = self.distance[i], self.distance[j]
+        ai, aj = self.area_idx[i], self.area_idx[j]
+        # Setelah tukar, barang i berada di posisi j (jarak dj) dan sebaliknya
+        old_dci, old_aci = self._item_terms(i, di)
+        old_dcj, old_acj = self._item_terms(j, dj)
+        new_dci, new_aci = self._item_terms(i, dj)
+        new_dcj, new_acj = self._item_terms(j, di)
+        d_dist = new_dci + new_dcj - old_dci - old_dcj
+        d_access = new_aci + new_acj - old_aci - old_acj
+        if p.affinity is not None:
+            # Jarak pasangan (i, j) sendiri tidak berubah oleh tukar posisi
+            d_dist += (self.affinity_delta(i, self.x[j], self.y[j], exclude=j)
+                       + self.affinity_delta(j, self.x[i], self.y[i], exclude=i))
+
+        if ai == aj:
+            return d_dist, 0.0, 0.0, d_access
+
+        vi, vj = p.volume[i], p.volume[j]
+        inv = p.inv_capacity
+        vol_i, cnt_i = self.area_volume[ai], self.area_count[ai]
+        vol_j, cnt_j = self.area_volume[aj], self.area_count[aj]
+        d_space = (space_penalty(vol_i - vi + vj, cnt_i, inv[ai]) - space_penalty(vol_i, cnt_i, inv[ai])
+                   + space_penalty(vol_j - vj + vi, cnt_j, inv[aj]) - space_penalty(vol_j, cnt_j, inv[aj]))
+
+        ci, cj = p.category[i], p.category[j]
+        d_cat = 0.0
+        if ci != cj:
+            for c, src, dst in ((ci, ai, aj), (cj, aj, ai)):
+                spread = self.cat_spread[c]
+                new_spread = spread - (self.cat_area[c, src] == 1) + (self.cat_area[c, dst] == 0)
+                d_cat += self._spread_penalty(new_spread) - self._spread_penalty(spread)
+
+        return d_dist, d_space, d_cat, d_access
+
+    def apply_swap(self, i: int, j: int, delta: Tuple[float, float, float, float]):
+        p = self.problem
+        ai, aj = self.area_idx[i], self.area_idx[j]
+        if ai != aj:
+            vi, vj = p.volume[i], p.volume[j]
+            self.area_volume[ai] += vj - vi
+            self.area_volume[aj] += vi - vj
+            ci, cj = p.category[i], p.category[j]
+            if ci != cj:
+                for c, src, dst in ((ci, ai, aj), (cj, aj, ai)):
+                    self.cat_area[c, src] -= 1
+                    if self.cat_area[c, src] == 0:
+                        self.cat_spread[c] -= 1
+                    if self.cat_area[c, dst] == 0:
+                        self.cat_spread[c] += 1
+                    self.cat_area[c, dst] += 1
+            self.area_idx[i], self.area_idx[j] = aj, ai
+        self.x[i], self.x[j] = self.x[j], self.x[i]
+        self.y[i], self.y[j] = self.y[j], self.y[i]
+        self.distance[i], self.distance[j] = self.distance[j], self.distance[i]
+        self.components += delta
+
+    def remove(self, i: int):
+        """Keluarkan barang i dari solusi (area_idx = -1), komponen ikut diperbarui"""
+        p = self.problem
+        a = self.area_idx[i]
+        if a < 0:
+            return
+        dc, ac = self._item_terms(i, self.distance[i])
+        dc += self.affinity_terms(i, self.x[i], self.y[i])
+        v = p.volume[i]
+        c = p.category[i]
+        before = space_penalty(self.area_volume[a], self.area_count[a], p.inv_capacity[a])
+        self.area_volume[a] -= v
+        self.area_count[a] -= 1
+        after = space_penalty(self.area_volume[a], self.area_count[a], p.inv_capacity[a])
+        spread = self.cat_spread[c]
+        self.cat_area[c, a] -= 1
+        if self.cat_area[c, a] == 0:
+            self.cat_spread[c] -= 1
+        d_cat = self._spread_penalty(self.cat_spread[c]) - self._spread_penalty(spread)
+        self.components += (-dc, after - before, d_cat, -ac)
+        self.area_idx[i] = -1
+
+    def insertion_deltas(self, i: int) -> np.ndarray:
+        """
+        Delta cost (berbobot) memasukkan barang i ke setiap area pada titik
+        anchor-nya, dihitung vectorized untuk semua area sekaligus
+        """
+        p = self.problem
+        distance = p.anchor_distance
+        dist_cost = distance * p.frequency[i]
+        access = (distance * ACCESS_PENALTY_FACTOR) * (p.hot[i] & (distance > ACCESS_DISTANCE_LIMIT))
+
+        before = space_penalty_vec(self.area_volume, self.area_count, p.inv_capacity)
+        after = space_penalty_vec(self.area_volume + p.volume[i], self.area_count + 1, p.inv_capacity)
+
+        c = p.category[i]
+        spread = self.cat_spread[c]
+        new_spread = spread + (self.cat_area[c] == 0)
+        d_cat = (np.maximum(new_spread - 1, 0) - max(spread - 1, 0)) * CATEGORY_SPREAD_FACTOR
+
+        if p.affinity is not None:
+            k, weight = self._neighbors(i, exclude=i)
+            if len(k):
+                dist_cost = dist_cost + np.hypot(p.anchor_x[:, None] - self.x[k], p.anchor_y[:, None] - self.y[k]) @ weight
+
+        w = self.w
+        deltas = w[0] * dist_cost + w[1] * (after - before) + w[2] * d_cat + w[3] * access
+        mask = np.full(p.n_areas, np.inf)
+        mask[p.available] = 0.0
+        return deltas + mask
+
+    def insert(self, i: int, a: int, nx: float, ny: float):
+        """Masukkan kembali barang i (yang sudah di-remove) ke area a"""
+        p = self.problem
+        d = self.point_distance(a, nx, ny)
+        dc, ac = self._item_terms(i, d)
+        dc += self.affinity_terms(i, nx, ny)
+        v = p.volume[i]
+        c = p.category[i]
+        before = space_penalty(self.area_volume[a], self.area_count[a], p.inv_capacity[a])
+        self.area_volume[a] += v
+        self.area_count[a] += 1
+        after = space_penalty(self.area_volume[a], self.area_count[a], p.inv_capacity[a])
+        spread = self.cat_spread[c]
+        if self.cat_area[c, a] == 0:
+            self.cat_spread[c] += 1
+        self.cat_area[c, a] += 1
+        d_cat = self._spread_penalty(self.cat_spread[c]) - self._spread_penalty(spread)
+        self.components += (dc, after - before, d_cat, ac)
+        self.area_idx[i] = a
+        self.x[i] = nx
+        self.y[i] = ny
+        self.distance[i] = d
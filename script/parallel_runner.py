@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Eksekusi Paralel Run Engine pada Masalah yang Sama
+
+Masalah terkompilasi (CompiledProblem) dimuat sekali di proses induk lalu
+dibagikan read-only ke worker:
+- fork (Linux/macOS): worker mewarisi array lewat copy-on-write, tanpa pickle
+- spawn (Windows): masalah di-pickle sekali per worker lewat initializer
+
+Setiap job adalah dict {engine, params, seed, ...}; field tambahan (mis.
+config_id, round) dikembalikan apa adanya di hasil. Lower bound (dihitung
+sekali oleh pemanggil) ikut dibagikan bersama masalah: setiap job memakai
+warm start MILP dan early stopping gap yang sama dengan optimize()
+(optimality_bound.bounded_start), sehingga seed replikasi bisa di-replay. Mode multilevel memakai
+run_block_jobs: setiap job membawa sub-masalah dan layout awalnya sendiri.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from optimization_problem import CompiledProblem
+from optimization_engines import create_engine
+from optimality_bound import DEFAULT_BOUND_PARAMS, BoundResult, bounded_start
+from quantity_runs import balance_result
+
+# Masalah dan lower bound-nya yang dibagikan ke worker (diset sebelum pool dibuat)
+_SHARED_PROBLEM: Optional[CompiledProblem] = None
+_SHARED_BOUND: Optional[BoundResult] = None
+
+
+def default_workers() -> int:
+    """Jumlah core yang boleh dipakai proses ini"""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _init_worker(problem: Optional[CompiledProblem], bound: Optional[BoundResult] = None):
+    global _SHARED_PROBLEM, _SHARED_BOUND
+    if problem is not None:
+        _SHARED_PROBLEM = problem
+        _SHARED_BOUND = bound
+
+
+def run_job(job: Dict, problem: Optional[CompiledProblem] = None, bound: Optional[BoundResult] = None) -> Dict:
+    """Jalankan satu job engine dan kembalikan ringkasan (tanpa array layout)"""
+    if problem is None:
+        problem, bound = _SHARED_PROBLEM, _SHARED_BOUND
+    engine = create_engine(job.get('engine', 'sa'), problem, params=job.get('params'), seed=job.get('seed'),
+                           verbose=False)
+    initial = bounded_start(engine, bound, job.get('gap_tolerance', DEFAULT_BOUND_PARAMS['gap_tolerance']),
+                            engine.initial_layout())
+    result = engine.run(initial=initial)
+    # Barang yang dipecah menjadi run: cost setelah RunBalancer, sama dengan optimize()
+    cost, components = balance_result(problem, result)
+    return {
+        **job,
+        'label': engine.label,
+        'initial_cost': result.initial_cost,
+        'best_cost': cost,
+        'components': [float(c) for c in components],
+        'iterations': result.iterations,
+        'evaluations': result.evaluations,
+        'duration': result.elapsed,
+        'gap_stopped': result.gap_stopped,
+    }
+
+
+def run_jobs(problem: CompiledProblem, jobs: Iterable[Dict], workers: Optional[int] = None,
+             bound: Optional[BoundResult] = None) -> List[Dict]:
+    """
+    Jalankan job secara paralel; urutan hasil mengikuti urutan job
+
+    bound: lower bound masalah (WarehouseOptimizer.compute_optimality_bound),
+    gap_tolerance diambil dari job. workers=1 menjalankan job di proses ini
+    (berguna untuk debug/profiling).
+    """
+    global _SHARED_PROBLEM, _SHARED_BOUND
+    jobs = list(jobs)
+    workers = min(workers or default_workers(), max(1, len(jobs)))
+
+    if workers == 1:
+        return [run_job(job, problem, bound) for job in jobs]
+
+    if 'fork' in mp.get_all_start_methods():
+        context = mp.get_context('fork')
+        _SHARED_PROBLEM, _SHARED_BOUND = problem, bound
+        initargs = (None,)
+    else:
+        context = mp.get_context('spawn')
+        initargs = (problem, bound)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=initargs) as executor:
+            return list(executor.map(run_job, jobs))
+    finally:
+        _SHARED_PROBLEM, _SHARED_BOUND = None, None
+
+
+def run_block_job(job: Dict) -> Dict:
+    """
+    Jalankan engine pada sub-masalah milik job sendiri (job['problem']) dari
+    layout awal job['initial']; layout terbaik dikembalikan untuk digabung
+    """
+    engine = create_engine(job.get('engine', 'sa'), job['problem'], params=job.get('params'),
+                           seed=job.get('seed'), verbose=False)
+    # Bound hanya berlaku untuk masalah yang sama; sub-masalah blok tanpa 'bound' jalan tanpa early stopping
+    initial = bounded_start(engine, job.get('bound'), job.get('gap_tolerance', DEFAULT_BOUND_PARAMS['gap_tolerance']),
+                            job['initial'])
+    result = engine.run(initial=initial)
+    return {
+        'block': job.get('block'),
+        'area_idx': result.area_idx,
+        'x': result.x,
+        'y': result.y,
+        'initial_cost': result.initial_cost,
+        'best_cost': result.cost,
+        'iterations': result.iterations,
+        'evaluations': result.evaluations,
+    }
+
+
+def run_block_jobs(jobs: Iterable[Dict], workers: Optional[int] = None) -> List[Dict]:
+    """
+    Jalankan job sub-masalah independen secara paralel (mode multilevel);
+    setiap sub-masalah di-pickle ke worker, urutan hasil mengikuti urutan job
+    """
+    jobs = list(jobs)
+    workers = min(workers or default_workers(), max(1, len(jobs)))
+    if workers == 1:
+        return [run_block_job(job) for job in jobs]
+
+    method = 'fork' if 'fork' in mp.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(method)) as executor:
+        return list(executor.map(run_block_job, jobs))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Hyper-parameter Search untuk Engine Optimasi
+
+Data dimuat dan dikompilasi sekali, lalu setiap konfigurasi dijalankan
+dengan beberapa seed secara paralel (parallel_runner). Strategi:
+- grid    : semua kombinasi search space
+- random  : n_trials sampel acak dari search space
+- halving : successive halving; semua kandidat mulai dengan budget kecil
+            (max_iterations diskalakan), hanya 1/eta terbaik naik ke budget
+            berikutnya hingga budget penuh
+
+Hasil: leaderboard (mean/std/best cost, waktu, evaluasi per konfigurasi)
+dan algorithm_params yang direkomendasikan.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import json
+import math
+import itertools
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from optimization_problem import CompiledProblem
+from optimality_bound import DEFAULT_BOUND_PARAMS, BoundResult
+from parallel_runner import run_jobs
+
+# Search space default untuk Simulated Annealing
+SA_SEARCH_SPACE = {
+    'temperature_initial': [500.0, 1000.0, 2000.0],
+    'cooling_rate': [0.90, 0.95, 0.99],
+    'max_iterations': [500, 1000, 2000],
+    'max_no_improvement': [50, 100],
+}
+
+STRATEGIES = ('grid', 'random', 'halving')
+BUDGET_PARAM = 'max_iterations'
+
+
+def grid_candidates(space: Dict[str, Sequence]) -> List[Dict]:
+    """Semua kombinasi nilai search space"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_candidates(space: Dict[str, Sequence], n_trials: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Sampel acak unik dari search space
+
+    Nilai berupa list dipilih salah satu; tuple (low, high) disampel
+    log-uniform untuk float positif dan uniform integer untuk int.
+    """
+    rng = np.random.default_rng(seed)
+    candidates, seen = [], set()
+    for _ in range(n_trials * 20):
+        if len(candidates) >= n_trials:
+            break
+        candidate = {}
+        for name, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    candidate[name] = int(rng.integers(low, high + 1))
+                else:
+                    candidate[name] = float(np.exp(rng.uniform(math.log(low), math.log(high))))
+            else:
+                candidate[name] = values[int(rng.integers(len(values)))]
+        key = json.dumps(candidate, sort_keys=True, default=float)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(candidate)
+    return candidates
+
+
+class ParameterTuner:
+    """
+    Menjalankan search dan menyusun leaderboard
+
+    Contoh:
+        tuner = ParameterTuner(problem, seeds=(0, 1, 2))
+        leaderboard = tuner.search('halving', n_trials=27)
+        tuner.recommended_params()
+    """
+
+    def __init__(self, problem: CompiledProblem, engine: str = 'sa', seeds: Sequence[int] = (0, 1, 2),
+                 workers: Optional[int] = None, base_params: Optional[Dict] = None,
+                 bound: Optional[BoundResult] = None, gap_tolerance: Optional[float] = None):
+        self.problem = problem
+        # Lower bound produksi: setiap run memakai warm start dan early stopping yang sama dengan optimize()
+        self.bound = bound
+        self.gap_tolerance = DEFAULT_BOUND_PARAMS['gap_tolerance'] if gap_tolerance is None else float(gap_tolerance)
+        self.engine = engine
+        self.seeds = tuple(seeds)
+        self.workers = workers
+        self.base_params = dict(base_params or {})
+        self.runs: List[Dict] = []
+        self.leaderboard: List[Dict] = []
+        self.strategy = None
+
+    def evaluate(self, candidates: List[Dict], budget_fraction: float = 1.0, round_index: int = 0) -> List[Dict]:
+        """Jalankan setiap kandidat untuk semua seed; return ringkasan per kandidat"""
+        jobs = []
+        for config_id, candidate in enumerate(candidates):
+            params = {**self.base_params, **candidate}
+            if budget_fraction < 1.0 and BUDGET_PARAM in params:
+                params[BUDGET_PARAM] = max(1, int(round(params[BUDGET_PARAM] * budget_fraction)))
+            for seed in self.seeds:
+                jobs.append({'engine': self.engine, 'params': params, 'seed': seed, 'gap_tolerance': self.gap_tolerance,
+                             'config_id': config_id, 'round': round_index, 'budget_fraction': budget_fraction})
+
+        runs = run_jobs(self.problem, jobs, self.workers, bound=self.bound)
+        self.runs.extend(runs)
+
+        summaries = []
+        for config_id, candidate in enumerate(candidates):
+            config_runs = [run for run in runs if run['config_id'] == config_id]
+            costs = np.array([run['best_cost'] for run in config_runs])
+            durations = np.array([run['duration'] for run in config_runs])
+            summaries.append({
+                'parameters': candidate,
+                'budget_fraction': budget_fraction,
+                'mean_cost': float(costs.mean()),
+                'std_cost': float(costs.std(ddof=1)) if len(costs) > 1 else 0.0,
+                'best_cost': float(costs.min()),
+                'mean_duration': float(durations.mean()),
+                'evaluations': int(sum(run['evaluations'] for run in config_runs)),
+                'seeds': list(self.seeds),
+            })
+        return summaries
+
+    def search(self, strategy: str = 'grid', space: Optional[Dict[str, Sequence]] = None,
+               n_trials: int = 20, eta: int = 3, min_budget_fraction: Optional[float] = None,
+               seed: Optional[int] = None) -> List[Dict]:
+        """Jalankan strategi search; return leaderboard (cost rata-rata terkecil di atas)"""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown tuning strategy '{strategy}'. Available: {', '.join(STRATEGIES)}")
+        space = space or SA_SEARCH_SPACE
+        self.strategy = strategy
+
+        if strategy == 'grid':
+            summaries = self.evaluate(grid_candidates(space))
+        elif strategy == 'random':
+            summaries = self.evaluate(random_candidates(space, n_trials, seed))
+        else:
+            summaries = self.successive_halving(random_candidates(space, n_trials, seed), eta, min_budget_fraction)
+
+        self.leaderboard = sorted(summaries, key=lambda s: (s['mean_cost'], s['mean_duration']))
+        for rank, entry in enumerate(self.leaderboard, 1):
+            entry['rank'] = rank
+        return self.leaderboard
+
+    def successive_halving(self, candidates: List[Dict], eta: int = 3,
+                           min_budget_fraction: Optional[float] = None) -> List[Dict]:
+        """
+        Successive halving atas budget max_iterations
+
+        Jumlah ronde = ⌈log_eta(n kandidat)⌉ + 1; budget ronde r adalah
+        min_budget_fraction · eta^r (ronde terakhir selalu budget penuh).
+        Hanya kandidat yang mencapai budget penuh masuk leaderboard akhir.
+        """
+        rounds = max(1, int(math.ceil(math.log(max(len(candidates), 1), eta))) + 1)
+        if min_budget_fraction is None:
+            min_budget_fraction = float(eta) ** -(rounds - 1)
+
+        survivors = candidates
+        summaries: List[Dict] = []
+        for round_index in range(rounds):
+            fraction = 1.0 if round_index == rounds - 1 else min(1.0, min_budget_fraction * eta ** round_index)
+            summaries = self.evaluate(survivors, fraction, round_index)
+            if round_index == rounds - 1 or len(survivors) <= 1:
+                break
+            keep = max(1, len(survivors) // eta)
+            ranked = sorted(summaries, key=lambda s: s['mean_cost'])[:keep]
+            survivors = [entry['parameters'] for entry in ranked]
+
+        if summaries and summaries[0]['budget_fraction'] < 1.0:
+            summaries = self.evaluate(survivors, 1.0, rounds)
+        return summaries
+
+    def recommended_params(self) -> Optional[Dict]:
+        """algorithm_params terbaik (siap dipakai di config optimasi)"""
+        if not self.leaderboard:
+            return None
+        return {'engine': self.engine, **self.base_params, **self.leaderboard[0]['parameters']}
+
+    def report(self) -> Dict:
+        return {
+            'strategy': self.strategy,
+            'engine': self.engine,
+            'seeds': list(self.seeds),
+            'problem': {'items': self.problem.n_items, 'areas': self.problem.n_areas},
+            'recommended_algorithm_params': self.recommended_params(),
+            'leaderboard': self.leaderboard,
+            'total_runs': len(self.runs),
+            'total_evaluations': int(sum(run['evaluations'] for run in self.runs)),
+        }
+
+    def save(self, filename: str = 'parameter_tuning_results.json') -> str:
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=float)
+        return filename
+
+
+def print_leaderboard(leaderboard: List[Dict], limit: int = 10):
+    """Cetak leaderboard ke console"""
+    print(f"{'Rank':<5} {'Mean cost':<12} {'Std':<10} {'Time(s)':<9} {'Temp':<8} {'Cool':<6} {'Iter':<6} {'NoImp':<6}")
+    print("-" * 70)
+    for entry in leaderboard[:limit]:
+        params = entry['parameters']
+        print(f"{entry['rank']:<5} "
+              f"{entry['mean_cost']:<12.2f} "
+              f"{entry['std_cost']:<10.2f} "
+              f"{entry['mean_duration']:<9.2f} "
+              f"{params.get('temperature_initial', '-'):<8} "
+              f"{params.get('cooling_rate', '-'):<6} "
+              f"{params.get('max_iterations', '-'):<6} "
+              f"{params.get('max_no_improvement', '-'):<6}")
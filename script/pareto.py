@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Arsip Pareto untuk Optimasi Multi-objektif
+
+Keempat komponen objektif (distance_cost, space_penalty, category_penalty,
+access_penalty) disimpan terpisah. Arsip hanya menyimpan layout yang tidak
+didominasi (non-dominated) oleh layout lain di arsip:
+
+- ε-dominance relatif (`epsilon`) mencegah arsip terisi layout yang hampir
+  identik, sehingga snapshot layout (O(N)) jarang terjadi
+- jika arsip penuh, anggota dengan crowding distance terkecil dibuang
+  (titik ekstrem per komponen selalu dipertahankan)
+
+Layout di arsip dapat di-reweight tanpa run ulang: komponen dinormalisasi ke
+rentang front (0 = ideal, 1 = nadir) lalu dipilih anggota dengan w·normalized
+terkecil untuk bobot apa pun (lihat PRIORITY_WEIGHTS). Layout disimpan ringkas
+(int32/float32) agar arsip tetap kecil untuk jumlah barang besar.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from optimization_problem import COMPONENT_NAMES, PRIORITY_WEIGHTS
+
+Layout = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def compact_layout(area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> Layout:
+    """Salinan layout ringkas untuk arsip (12 byte per barang)"""
+    return area_idx.astype(np.int32), x.astype(np.float32), y.astype(np.float32)
+
+
+def expand_layout(layout: Layout) -> Layout:
+    """Kembalikan layout arsip ke dtype yang dipakai evaluator"""
+    area_idx, x, y = layout
+    return area_idx.astype(np.int64), x.astype(np.float64), y.astype(np.float64)
+
+
+def non_dominated_mask(points: np.ndarray) -> np.ndarray:
+    """Mask baris yang tidak didominasi baris lain (minimasi semua kolom)"""
+    points = np.asarray(points, dtype=np.float64)
+    le = np.all(points[:, None, :] <= points[None, :, :], axis=2)
+    lt = np.any(points[:, None, :] < points[None, :, :], axis=2)
+    dominated = (le & lt).any(axis=0)
+    return ~dominated
+
+
+def crowding_distance(points: np.ndarray) -> np.ndarray:
+    """Crowding distance NSGA-II; titik ekstrem per komponen bernilai inf"""
+    n, m = points.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for k in range(m):
+        order = np.argsort(points[:, k], kind='stable')
+        values = points[order, k]
+        span = values[-1] - values[0]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (values[2:] - values[:-2]) / span
+    return distance
+
+
+class ParetoArchive:
+    """
+    Arsip layout non-dominated selama satu search
+
+    Contoh:
+        archive = ParetoArchive(max_size=32, epsilon=0.01)
+        archive.offer(evaluator.components, lambda: compact_layout(*evaluator.snapshot()))
+        idx = archive.select(PRIORITY_WEIGHTS['accessibility'])
+    """
+
+    def __init__(self, max_size: int = 32, epsilon: float = 0.01):
+        self.max_size = int(max_size)
+        self.epsilon = float(epsilon)
+        self.points = np.empty((0, len(COMPONENT_NAMES)))
+        self.layouts: List[Layout] = []
+        self.offers = 0
+        self.insertions = 0
+
+    def __len__(self) -> int:
+        return len(self.layouts)
+
+    def offer(self, components: np.ndarray, snapshot: Callable[[], Layout], epsilon: Optional[float] = None) -> bool:
+        """
+        Tawarkan solusi saat ini; `snapshot` hanya dipanggil jika solusi masuk arsip.
+        epsilon=0 memakai dominance biasa (mis. untuk best-so-far di akhir search).
+
+        Returns:
+            True jika solusi ditambahkan
+        """
+        self.offers += 1
+        c = np.asarray(components, dtype=np.float64)
+        points = self.points
+        if len(points):
+            # Ditolak jika ada anggota yang ε-mendominasi kandidat
+            slack = np.abs(c) * (self.epsilon if epsilon is None else epsilon)
+            if np.any(np.all(points <= c + slack, axis=1)):
+                return False
+            dominated = np.all(c <= points, axis=1) & np.any(c < points, axis=1)
+            if dominated.any():
+                keep = np.flatnonzero(~dominated)
+                self.points = points[keep]
+                self.layouts = [self.layouts[i] for i in keep]
+
+        self.points = np.vstack([self.points, c])
+        self.layouts.append(snapshot())
+        self.insertions += 1
+        if len(self.layouts) > self.max_size:
+            self._prune()
+        return True
+
+    def _prune(self):
+        crowding = crowding_distance(self.points)
+        drop = int(np.argmin(crowding))
+        self.points = np.delete(self.points, drop, axis=0)
+        del self.layouts[drop]
+
+    def refresh(self, evaluate: Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]):
+        """Evaluasi ulang komponen secara penuh (hapus drift delta) lalu saring ulang"""
+        if not self.layouts:
+            return
+        self.points = np.array([evaluate(*layout) for layout in self.layouts])
+        keep = np.flatnonzero(non_dominated_mask(self.points))
+        self.points = self.points[keep]
+        self.layouts = [self.layouts[i] for i in keep]
+
+    def normalized(self) -> np.ndarray:
+        """Komponen dinormalisasi per kolom: 0 = terbaik (ideal), 1 = terburuk (nadir) di front"""
+        ideal = self.points.min(axis=0)
+        span = self.points.max(axis=0) - ideal
+        return (self.points - ideal) / np.where(span > 0, span, 1.0)
+
+    def select(self, weights: Sequence[float]) -> int:
+        """Indeks anggota dengan biaya berbobot (komponen ternormalisasi) terkecil"""
+        return int(np.argmin(self.normalized() @ np.asarray(weights, dtype=np.float64)))
+
+    def summary(self, base_weights: Sequence[float]) -> List[Dict]:
+        """
+        Ringkasan front untuk hasil_optimasi: komponen, biaya per preset
+        prioritas_optimasi, dan preset yang memilih anggota tersebut
+        """
+        chosen = {name: self.select(weights) for name, weights in PRIORITY_WEIGHTS.items()}
+        normalized = self.normalized()
+        front = []
+        for k, point in enumerate(self.points):
+            front.append({
+                'member': k,
+                'components': {name: round(float(value), 4) for name, value in zip(COMPONENT_NAMES, point)},
+                'normalized': {name: round(float(value), 4) for name, value in zip(COMPONENT_NAMES, normalized[k])},
+                'weighted_cost': round(float(np.dot(base_weights, point)), 4),
+                'preset_scores': {name: round(float(np.dot(weights, normalized[k])), 4)
+                                  for name, weights in PRIORITY_WEIGHTS.items()},
+                'selected_by': [name for name, idx in chosen.items() if idx == k],
+            })
+        return front
+
+    def save(self, path: str, item_ids: np.ndarray, area_ids: np.ndarray,
+             quantity: Optional[np.ndarray] = None) -> str:
+        """
+        Simpan semua layout arsip (.npz) agar anggota lain bisa diterapkan
+        tanpa run ulang (area_gudang_id, koordinat, dan jumlah unit per run)
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        area_idx = np.stack([layout[0] for layout in self.layouts])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    item_ids=np.asarray(item_ids, dtype=np.int64),
+                    quantity=(np.ones(len(item_ids), dtype=np.int64) if quantity is None
+                              else np.asarray(quantity, dtype=np.int64)),
+                    area_ids=np.asarray(area_ids, dtype=np.int64)[area_idx],
+                    x=np.stack([layout[1] for layout in self.layouts]),
+                    y=np.stack([layout[2] for layout in self.layouts]),
+                    components=self.points,
+                )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+
+def load_pareto_member(path: str, member: int) -> Dict[str, np.ndarray]:
+    """Baca satu anggota front dari file .npz (item_ids, quantity, area_ids, x, y, components)"""
+    with np.load(path, allow_pickle=False) as data:
+        if not 0 <= member < len(data['components']):
+            raise ValueError(f"Pareto member {member} not found in {path} ({len(data['components'])} members)")
+        return {
+            'item_ids': data['item_ids'],
+            'quantity': (data['quantity'] if 'quantity' in data.files
+                         else np.ones(len(data['item_ids']), dtype=np.int64)),
+            'area_ids': data['area_ids'][member],
+            'x': data['x'][member],
+            'y': data['y'][member],
+            'components': data['components'][member],
+        }
+
+
+def pareto_weights(prioritas_optimasi: Optional[str]) -> Tuple[float, float, float, float]:
+    """Bobot preset untuk prioritas_optimasi (balanced jika tidak dikenal)"""
+    return PRIORITY_WEIGHTS.get(prioritas_optimasi or 'balanced', PRIORITY_WEIGHTS['balanced'])
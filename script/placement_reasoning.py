@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Kode Alasan Penempatan (Reason Codes)
+
+Alasan penempatan disimpan sebagai kode ringkas, bukan kalimat lengkap:
+
+    rc:E1,U3|s=12.5|u=41.7
+
+- bagian pertama : maksimal dua kunci template (alasan utama, pendukung)
+- bagian `k=v`   : nilai numerik yang sudah diformat untuk template tersebut
+
+Kode ditentukan oleh (kelas kategori, jenis area, bucket utilisasi, akses
+tinggi, kelas ukuran) dan di-memoize, sehingga save 100k rekomendasi tidak
+lagi memformat kalimat per barang. Kalimat lengkap baru dirender saat dibaca
+(`render_reasoning` di Python, `PlacementReasonService` di Laravel) dengan
+template yang sama persis.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+CODE_PREFIX = 'rc:'
+
+# Template kalimat per kunci; {u}=utilisasi %, {s}=sisa kapasitas m³, {t}=tinggi area m
+REASON_TEMPLATES = {
+    'E1': "barang elektronik ditempatkan di rak tinggi untuk keamanan dan proteksi dari kelembaban",
+    'E2': "area dengan kapasitas tersedia {s}m³ cocok untuk barang elektronik sensitif",
+    'E3': "penempatan elektronik di area khusus untuk menghindari kerusakan dan gangguan",
+    'D1': "dokumen ditempatkan di area lantai karena mudah diakses dan tidak memerlukan rak khusus",
+    'D2': "area dengan utilisasi {u}% memiliki ruang memadai untuk arsip dokumen",
+    'D3': "penempatan dokumen di area administratif untuk kemudahan akses dan organisasi",
+    'P1': "paket express ditempatkan dekat pintu masuk untuk memudahkan proses loading dan unloading",
+    'P2': "area dengan kapasitas tersisa {s}m³ optimal untuk rotasi paket cepat",
+    'P3': "penempatan paket di area transit untuk mempercepat distribusi dan pengiriman",
+    'F1': "barang fragile ditempatkan di rak tinggi untuk proteksi maksimal dari benturan",
+    'F2': "penempatan khusus untuk barang mudah pecah dengan akses terbatas",
+    'U1': "optimisasi ruang kosong dengan memanfaatkan area yang hanya terisi {u}%",
+    'U2': "penempatan efisien pada area dengan utilisasi tinggi {u}%",
+    'U3': "pemanfaatan optimal ruang dengan tingkat utilisasi yang seimbang {u}%",
+    'V1': "barang berukuran besar memerlukan area dengan tinggi memadai ({t}m)",
+    'V2': "penempatan barang voluminous di area yang sesuai dengan dimensi produk",
+    'V3': "penempatan barang kompak untuk optimisasi density penyimpanan",
+    'A': "lokasi strategis dekat akses utama untuk operasional yang efisien",
+}
+
+LARGE_ITEM_VOLUME = 0.01  # > 10 liter
+UTILIZATION_LIMITS = (30, 50, 60, 70)
+
+
+@lru_cache(maxsize=None)
+def category_class(category: str) -> str:
+    """Kelas kategori: E (elektronik), D (dokumen), P (paket), F (fragile), '' (lainnya)"""
+    name = (category or '').lower()
+    if 'elektronik' in name:
+        return 'E'
+    if 'dokumen' in name:
+        return 'D'
+    if 'paket' in name:
+        return 'P'
+    if 'fragile' in name:
+        return 'F'
+    return ''
+
+
+def size_class(volume: float) -> str:
+    """Kelas ukuran barang: L (besar), C (kompak), '' (volume tidak diketahui)"""
+    if volume > LARGE_ITEM_VOLUME:
+        return 'L'
+    if volume > 0:
+        return 'C'
+    return ''
+
+
+def area_features(area) -> Tuple:
+    """
+    Fitur area yang menentukan alasan (dihitung sekali per area):
+    (jenis_area, secure, high_access, bucket utilisasi, utilisasi,
+    sisa kapasitas, tinggi)
+    """
+    utilization = (area.kapasitas_terpakai / area.kapasitas * 100) if area.kapasitas > 0 else 0
+    return (
+        area.jenis_area,
+        area.tinggi >= 5,
+        area.koordinat_x <= 20 and area.koordinat_y <= 20,
+        utilization_bucket(utilization),
+        f"{utilization:.1f}",
+        f"{area.kapasitas - area.kapasitas_terpakai:.1f}",
+        str(area.tinggi),
+    )
+
+
+def utilization_bucket(utilization: float) -> int:
+    """
+    Bucket utilisasi area (%) dengan batas 30, 50, 60, 70, 80:
+    0: <30, 1: <50, 2: <60, 3: <70, 4: <=80, 5: >80
+    """
+    if utilization > 80:
+        return 5
+    for bucket, limit in enumerate(UTILIZATION_LIMITS):
+        if utilization < limit:
+            return bucket
+    return len(UTILIZATION_LIMITS)
+
+
+def _category_key(cat: str, area_type: str, secure: bool, high_access: bool, bucket: int) -> Optional[str]:
+    if cat == 'E':
+        if area_type == 'rak' and secure:
+            return 'E1'
+        return 'E2' if bucket <= 1 else 'E3'
+    if cat == 'D':
+        if area_type == 'lantai':
+            return 'D1'
+        return 'D2' if bucket <= 3 else 'D3'
+    if cat == 'P':
+        if high_access:
+            return 'P1'
+        return 'P2' if bucket <= 2 else 'P3'
+    if cat == 'F':
+        return 'F1' if area_type == 'rak' and secure else 'F2'
+    return None
+
+
+@lru_cache(maxsize=65536)
+def reason_code(cat: str, size: str, features: Tuple) -> str:
+    """Kode alasan (memoized) untuk kombinasi kelas barang dan fitur area"""
+    area_type, secure, high_access, bucket, utilization_text, space_text, tinggi_text = features
+
+    keys = []
+    category_key = _category_key(cat, area_type, secure, high_access, bucket)
+    if category_key:
+        keys.append(category_key)
+
+    if bucket == 0:
+        keys.append('U1')
+    elif bucket == 5:
+        keys.append('U2')
+    else:
+        keys.append('U3')
+
+    if size == 'L':
+        keys.append('V1' if float(tinggi_text) >= 4 else 'V2')
+    elif size == 'C':
+        keys.append('V3')
+
+    if high_access:
+        keys.append('A')
+
+    # Kalimat hanya memakai dua alasan pertama
+    keys = keys[:2]
+    values = {'u': utilization_text, 's': space_text, 't': tinggi_text}
+    used = sorted(k for k in values if any('{' + k + '}' in REASON_TEMPLATES[key] for key in keys))
+    return CODE_PREFIX + ','.join(keys) + ''.join(f"|{k}={values[k]}" for k in used)
+
+
+def parse_reason_code(code: str) -> Tuple[Tuple[str, ...], Dict[str, str]]:
+    """Pecah kode menjadi (kunci template, nilai)"""
+    parts = code[len(CODE_PREFIX):].split('|')
+    keys = tuple(key for key in parts[0].split(',') if key)
+    values = dict(part.split('=', 1) for part in parts[1:])
+    return keys, values
+
+
+def render_reasoning(alasan: str, item_name: str = 'Item', area_name: str = 'Area') -> str:
+    """
+    Render kode alasan menjadi kalimat lengkap; teks biasa (alasan manual
+    atau data lama) dikembalikan apa adanya
+    """
+    if not alasan or not alasan.startswith(CODE_PREFIX):
+        return alasan
+    keys, values = parse_reason_code(alasan)
+    reasons = [REASON_TEMPLATES[key].format(**values) for key in keys if key in REASON_TEMPLATES]
+
+    if len(reasons) >= 2:
+        return f"{item_name} ditempatkan di {area_name} karena {reasons[0]}, serta {reasons[1]}"
+    if len(reasons) == 1:
+        return f"{item_name} ditempatkan di {area_name} karena {reasons[0]}"
+    return f"{item_name} ditempatkan di {area_name} berdasarkan analisis algoritma SA untuk konfigurasi optimal"
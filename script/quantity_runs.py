@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Barang Berjumlah: Representasi Run-Length (barang, area, jumlah unit)
+
+Model lama menempatkan satu unit per baris barang dan mengabaikan
+penempatan_barang.jumlah. Di sini stok setiap barang disimpan sebagai satu
+atau beberapa run (barang, jumlah unit) dalam array ringkas:
+
+- CompiledProblem: satu item = satu run. Volume run = volume satuan × jumlah,
+  frekuensi run = frekuensi barang × bagian unitnya. Engine tetap memindahkan
+  run utuh, sehingga 10k SKU × 500 unit sama murahnya dengan 10k baris.
+- split_runs: barang yang total volumenya melebihi kapasitas area terbesar
+  (atau lebih dari max_run_units unit) dipecah menjadi beberapa run
+  berukuran hampir sama.
+- RunBalancer: pass setelah engine yang memindahkan sebagian unit antar run
+  barang yang sama (transfer parsial antar area). Delta kapasitas dan cost
+  dihitung per run dalam O(1); penalti kategori dan akses tidak berubah
+  karena run tidak pernah dikosongkan.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-19
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from typing import List, Optional, Tuple
+
+from optimization_problem import (
+    CompiledProblem, MoveEvaluator, DISTANCE, SPACE, UNDER_UTILIZATION_RATIO, space_penalty_vec
+)
+
+Layout = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def with_runs(problem: CompiledProblem, run_item: np.ndarray, count: np.ndarray) -> CompiledProblem:
+    """
+    Problem baru dengan run `run_item` (indeks item problem asal) berisi
+    `count` unit; frekuensi per unit dan status akses mengikuti item asal
+    """
+    p = problem
+    run_item = np.asarray(run_item, dtype=np.int64)
+    count = np.asarray(count, dtype=np.int64)
+    affinity = None
+    if p.affinity is not None:
+        # Affinity barang dibagi rata ke run-nya (tidak bergantung jumlah unit per run)
+        share = 1.0 / np.bincount(run_item, minlength=p.n_items)[run_item]
+        members = csr_matrix((share, (np.arange(len(run_item)), run_item)), shape=(len(run_item), p.n_items))
+        affinity = (members @ p.affinity @ members.T).tocsr()
+    runs = CompiledProblem(
+        item_ids=p.item_ids[run_item],
+        volume=p.unit_volume[run_item],
+        frequency=p.frequency[run_item] / p.quantity[run_item] * count,
+        category=p.category[run_item],
+        category_ids=p.category_ids,
+        category_names=p.category_names,
+        area_ids=p.area_ids,
+        area_rects=p.area_rects,
+        capacity=p.capacity,
+        available=np.isin(np.arange(p.n_areas), p.available),
+        door_distances=p.door_distances,
+        access_points=p.access_points,
+        weights=p.weights,
+        quantity=count,
+        affinity=affinity,
+    )
+    # Frekuensi run parsial bisa di bawah ambang; status akses milik barang
+    runs.hot = p.hot[run_item]
+    return runs
+
+
+def run_counts(problem: CompiledProblem, max_run_units: Optional[int] = None) -> np.ndarray:
+    """Jumlah run per barang: cukup untuk muat di area terbesar dan ≤ max_run_units unit per run"""
+    p = problem
+    if p.n_items == 0 or len(p.available) == 0:
+        return np.ones(p.n_items, dtype=np.int64)
+    largest = float(p.capacity[p.available].max())
+    runs = np.ceil(p.volume / max(largest, 1e-9)).astype(np.int64)
+    if max_run_units:
+        runs = np.maximum(runs, -(-p.quantity // int(max_run_units)))
+    return np.clip(runs, 1, np.maximum(p.quantity, 1))
+
+
+def expand_runs(problem: CompiledProblem, items: np.ndarray, runs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(run_item, jumlah unit) untuk barang `items` yang dipecah rata menjadi `runs` run"""
+    items = np.asarray(items, dtype=np.int64)
+    runs = np.asarray(runs, dtype=np.int64)
+    run_item = np.repeat(items, runs)
+    start = np.cumsum(runs) - runs
+    k = np.arange(len(run_item)) - np.repeat(start, runs)
+    per_run = np.repeat(runs, runs)
+    quantity = problem.quantity[run_item]
+    return run_item, quantity // per_run + (k < quantity % per_run)
+
+
+def split_runs(problem: CompiledProblem, max_run_units: Optional[int] = None) -> CompiledProblem:
+    """
+    Pecah barang yang tidak muat di area terbesar (atau > max_run_units unit)
+    menjadi run berukuran hampir sama; problem dikembalikan apa adanya jika
+    semua barang cukup satu run
+    """
+    p = problem
+    runs = run_counts(p, max_run_units)
+    if (runs == 1).all():
+        return p
+
+    run_item, count = expand_runs(p, np.arange(p.n_items), runs)
+    print(f"📦 Split {int((runs > 1).sum())} items into {len(run_item)} placement runs "
+          f"({int(p.quantity.sum())} units)")
+    return with_runs(p, run_item, count)
+
+
+def has_runs(problem: CompiledProblem) -> bool:
+    """True jika ada barang dengan lebih dari satu run"""
+    return len(np.unique(problem.item_ids)) < problem.n_items
+
+
+def balance_result(problem: CompiledProblem, result) -> Tuple[float, np.ndarray]:
+    """
+    (cost, komponen) hasil engine setelah RunBalancer, sama dengan
+    WarehouseOptimizer.optimize; hasil engine apa adanya jika tidak ada
+    barang yang dipecah atau run dibatalkan
+    """
+    if result.cancelled or not has_runs(problem):
+        return result.cost, np.asarray(result.components, dtype=np.float64)
+    balancer = RunBalancer(problem, verbose=False)
+    balancer.balance(result.area_idx, result.x, result.y)
+    return balancer.evaluator.cost, balancer.evaluator.components.copy()
+
+
+class RunBalancer:
+    """
+    Transfer sebagian unit antar run barang yang sama (pass setelah engine)
+
+    Transfer k unit dari run r (area a) ke run s (area b) hanya mengubah
+    distance cost (frekuensi per unit × k × selisih jarak) dan penalti ruang
+    area a dan b. Penalti ruang linear sepotong-sepotong terhadap k, sehingga
+    k terbaik selalu di ujung rentang atau di titik patah utilisasi
+    (UNDER_UTILIZATION_RATIO dan 100%) salah satu area.
+
+    Contoh:
+        balancer = RunBalancer(problem)
+        balanced, layout = balancer.balance(area_idx, x, y)
+        solution = balanced.solution_from_layout(*layout)
+    """
+
+    def __init__(self, problem: CompiledProblem, max_rounds: int = 20, verbose: bool = True):
+        self.problem = problem
+        self.max_rounds = int(max_rounds)
+        self.verbose = verbose
+        # Salinan privat: volume, frekuensi, dan jumlah run diubah selama transfer
+        self.work = with_runs(problem, np.arange(problem.n_items), problem.quantity.copy())
+        self.evaluator = MoveEvaluator(self.work)
+        self.groups = self._groups()
+        self.transfers = 0
+
+    def _groups(self) -> List[np.ndarray]:
+        """Run per barang, hanya barang dengan lebih dari satu run"""
+        ids = self.problem.item_ids
+        order = np.argsort(ids, kind='stable')
+        _, start, size = np.unique(ids[order], return_index=True, return_counts=True)
+        return [order[lo:lo + n] for lo, n in zip(start[size > 1], size[size > 1])]
+
+    def transfer_candidates(self, r: int, s: int) -> np.ndarray:
+        """Nilai k (1..jumlah run r - 1) di ujung rentang dan titik patah penalti ruang"""
+        p, ev = self.work, self.evaluator
+        a, b = ev.area_idx[r], ev.area_idx[s]
+        top = int(p.quantity[r]) - 1
+        unit = p.unit_volume[r]
+        points = [1.0, float(top)]
+        if a != b and unit > 0:
+            for ratio in (UNDER_UTILIZATION_RATIO, 1.0):
+                points.append((ev.area_volume[a] - ratio * p.capacity[a]) / unit)
+                points.append((ratio * p.capacity[b] - ev.area_volume[b]) / unit)
+        points = np.asarray(points)
+        k = np.concatenate([np.floor(points), np.ceil(points)])
+        return np.unique(np.clip(k, 1, top)).astype(np.int64)
+
+    def delta_transfer(self, r: int, s: int, k: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Delta (distance_cost, space_penalty) jika k unit run r pindah ke run s"""
+        p, ev = self.work, self.evaluator
+        a, b = ev.area_idx[r], ev.area_idx[s]
+        k = np.asarray(k, dtype=np.float64)
+        unit_frequency = p.frequency[r] / p.quantity[r]
+        distance = unit_frequency * k * (ev.distance[s] - ev.distance[r])
+        if a == b:
+            return distance, np.zeros_like(k)
+
+        moved = p.unit_volume[r] * k
+        vol_a, vol_b = ev.area_volume[a], ev.area_volume[b]
+        count_a, count_b = ev.area_count[a], ev.area_count[b]
+        space = (space_penalty_vec(vol_a - moved, count_a, p.inv_capacity[a])
+                 - space_penalty_vec(vol_a, count_a, p.inv_capacity[a])
+                 + space_penalty_vec(vol_b + moved, count_b, p.inv_capacity[b])
+                 - space_penalty_vec(vol_b, count_b, p.inv_capacity[b]))
+        return distance, space
+
+    def apply_transfer(self, r: int, s: int, k: int, distance: float, space: float):
+        p, ev = self.work, self.evaluator
+        moved = p.unit_volume[r] * k
+        unit_frequency = p.frequency[r] / p.quantity[r]
+        ev.area_volume[ev.area_idx[r]] -= moved
+        ev.area_volume[ev.area_idx[s]] += moved
+        for run, change in ((r, -k), (s, k)):
+            p.quantity[run] += change
+            p.volume[run] = p.unit_volume[run] * p.quantity[run]
+            p.frequency[run] = unit_frequency * p.quantity[run]
+        ev.components[DISTANCE] += distance
+        ev.components[SPACE] += space
+        self.transfers += 1
+
+    def best_transfer(self, r: int, s: int) -> Tuple[float, int, float, float]:
+        """(delta berbobot, k, delta distance, delta space) transfer terbaik r → s"""
+        k = self.transfer_candidates(r, s)
+        distance, space = self.delta_transfer(r, s, k)
+        w = self.work.weights
+        weighted = w[DISTANCE] * distance + w[SPACE] * space
+        j = int(np.argmin(weighted))
+        return float(weighted[j]), int(k[j]), float(distance[j]), float(space[j])
+
+    def balance(self, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> Tuple[CompiledProblem, Layout]:
+        """
+        Perbaiki pembagian unit antar run sampai tidak ada transfer yang
+        menurunkan cost (atau max_rounds); layout (area, koordinat) tidak berubah
+
+        Returns:
+            (problem dengan jumlah unit baru, layout)
+        """
+        ev = self.evaluator
+        ev.load(area_idx, x, y)
+        if not self.groups:
+            return self.problem, (area_idx, x, y)
+
+        start_cost = ev.cost
+        for _ in range(self.max_rounds):
+            improved = False
+            for runs in self.groups:
+                for r in runs.tolist():
+                    for s in runs.tolist():
+                        if r == s or self.work.quantity[r] < 2:
+                            continue
+                        delta, k, distance, space = self.best_transfer(r, s)
+                        if delta < -1e-9:
+                            self.apply_transfer(r, s, k, distance, space)
+                            improved = True
+            if not improved:
+                break
+
+        ev.resync()
+        if self.verbose:
+            print(f"⚖️  Run balancing: {self.transfers} partial transfers, cost {start_cost:.2f} → {ev.cost:.2f}")
+        return with_runs(self.problem, np.arange(self.problem.n_items), self.work.quantity), ev.snapshot()
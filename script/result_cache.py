@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Cache Hasil Optimasi per Konfigurasi dan Snapshot Data Master
+
+Request optimasi yang identik (gudang_ids, barang_ids, prioritas_optimasi,
+parameter engine sama, dan data master tidak berubah) tidak perlu menjalankan
+pipeline penuh lagi. Kunci cache adalah hash dari:
+- konfigurasi yang dinormalisasi (id diurutkan, parameter engine efektif)
+- fingerprint data master dari database (count + checksum kolom yang dibaca
+  optimizer pada area_gudang dan barang/kategori_barang)
+
+Setiap entri menyimpan set rekomendasi (kolom ringkas, .npz terkompresi) dan
+hasil_optimasi run sumber. Entri dibuang secara LRU jika jumlah entri atau
+total ukuran file melewati batas.
+
+File berada di cache/results/ (env WAREHOUSE_RESULT_CACHE_DIR untuk override).
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import json
+import time
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional
+
+# Versi format cache, naikkan jika isi rekomendasi atau fungsi objektif berubah
+RESULT_CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'results')
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_FILE = 'index.json'
+
+# Kolom rekomendasi yang disimpan (log_optimasi_id diisi ulang saat hit)
+CACHED_COLUMNS = {
+    'barang_id': np.int64,
+    'area_gudang_id': np.int64,
+    'koordinat_x': np.float64,
+    'koordinat_y': np.float64,
+    'jumlah': np.int64,
+    'alasan': np.str_,
+    'confidence_score': np.float64,
+    'algoritma': np.str_,
+}
+
+
+def result_cache_key(config: Dict, fingerprint: str) -> str:
+    """Hash konfigurasi ternormalisasi + fingerprint data master"""
+    payload = json.dumps({'version': RESULT_CACHE_VERSION, 'config': config, 'data': fingerprint},
+                         sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache LRU di disk untuk set rekomendasi hasil optimasi
+
+    Contoh:
+        cache = ResultCache()
+        entry = cache.get(key)
+        if entry is None:
+            ...  # jalankan optimasi
+            cache.put(key, recommendations, hasil_optimasi, log_optimasi_id)
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.getenv('WAREHOUSE_RESULT_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.index_path = os.path.join(self.directory, INDEX_FILE)
+
+    def _payload_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"result_{key[:32]}.npz")
+
+    def load_index(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            return index if index.get('version') == RESULT_CACHE_VERSION else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        index['version'] = RESULT_CACHE_VERSION
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, default=float)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Ambil entri cache; return dict {recommendations, hasil_optimasi,
+        source_log_optimasi_id, created_at} atau None jika miss
+        """
+        index = self.load_index()
+        entry = index.get('entries', {}).get(key)
+        if entry is None:
+            return None
+
+        path = os.path.join(self.directory, entry['file'])
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = {name: data[name].tolist() for name in CACHED_COLUMNS}
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️  Invalid result cache entry, ignoring: {e}")
+            self.discard(key)
+            return None
+
+        names = list(columns)
+        recommendations = [dict(zip(names, values)) for values in zip(*(columns[name] for name in names))]
+
+        entry['last_used'] = time.time()
+        entry['hits'] = entry.get('hits', 0) + 1
+        self.save_index(index)
+        return {
+            'recommendations': recommendations,
+            'hasil_optimasi': entry.get('hasil_optimasi', {}),
+            'source_log_optimasi_id': entry.get('source_log_optimasi_id'),
+            'created_at': entry.get('created_at'),
+        }
+
+    def put(self, key: str, recommendations: List[Dict], hasil_optimasi: Optional[Dict] = None,
+            log_optimasi_id: Optional[int] = None) -> Optional[str]:
+        """Simpan set rekomendasi sebagai entri baru lalu jalankan eviction LRU"""
+        if not recommendations:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        columns = {name: np.array([rec[name] for rec in recommendations], dtype=dtype)
+                   for name, dtype in CACHED_COLUMNS.items()}
+
+        path = self._payload_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, **columns)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        index = self.load_index()
+        now = time.time()
+        index.setdefault('entries', {})[key] = {
+            'file': os.path.basename(path),
+            'bytes': os.path.getsize(path),
+            'records': len(recommendations),
+            'hasil_optimasi': hasil_optimasi or {},
+            'source_log_optimasi_id': log_optimasi_id,
+            'created_at': now,
+            'last_used': now,
+            'hits': 0,
+        }
+        self.evict(index)
+        self.save_index(index)
+        return path
+
+    def evict(self, index: Dict) -> List[str]:
+        """Buang entri yang paling lama tidak dipakai hingga batas jumlah & ukuran terpenuhi"""
+        entries = index.get('entries', {})
+        evicted = []
+        by_age = sorted(entries, key=lambda k: entries[k]['last_used'])
+        total_bytes = sum(entry['bytes'] for entry in entries.values())
+        while by_age and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            key = by_age.pop(0)
+            total_bytes -= entries[key]['bytes']
+            self._remove_file(entries.pop(key))
+            evicted.append(key)
+        return evicted
+
+    def discard(self, key: str):
+        index = self.load_index()
+        entry = index.get('entries', {}).pop(key, None)
+        if entry is not None:
+            self._remove_file(entry)
+            self.save_index(index)
+
+    def _remove_file(self, entry: Dict):
+        path = os.path.join(self.directory, entry['file'])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def stats(self) -> Dict:
+        entries = self.load_index().get('entries', {})
+        return {
+            'entries': len(entries),
+            'bytes': int(sum(entry['bytes'] for entry in entries.values())),
+            'hits': int(sum(entry.get('hits', 0) for entry in entries.values())),
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Amplop Hasil (Result Envelope) untuk Pemanggil CLI
+
+Tanpa amplop, OptimizationController::runOptimizationSync harus menunggu
+sebentar, membaca ulang log_optimasi, dan menghitung rekomendasi_penempatan
+setelah proses selesai. warehouse_optimization.py sekarang selalu menulis
+satu baris JSON ringkas di akhir stdout:
+
+    WAREHOUSE_RESULT {"version":1,"log_optimasi_id":12,"status":"selesai",...}
+
+Baris ini juga bisa dikirim ke file descriptor khusus (--result-fd) untuk
+pemanggil yang memisahkannya dari log. Isinya status, cost, jumlah
+rekomendasi/unit, durasi per fase, dan hasil_optimasi yang sama dengan yang
+disimpan ke log_optimasi.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-19
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+ENVELOPE_PREFIX = 'WAREHOUSE_RESULT '
+ENVELOPE_VERSION = 1
+
+
+def build_envelope(optimizer, exit_code: int, error: Optional[str] = None,
+                   log_optimasi_id: Optional[int] = None) -> Dict:
+    """Amplop dari state optimizer setelah run (optimizer boleh None jika gagal sebelum dibuat)"""
+    hasil = getattr(optimizer, 'hasil_optimasi', None) or {}
+    status = getattr(optimizer, 'run_status', None)
+    recommendations = getattr(optimizer, 'last_recommendations', None) or []
+    performance = hasil.get('performance') or {}
+    phases = {name: entry['seconds'] for name, entry in performance.get('phases', {}).items()}
+    saved = status == 'selesai'
+    return {
+        'version': ENVELOPE_VERSION,
+        'log_optimasi_id': getattr(optimizer, 'log_optimasi_id', None) or log_optimasi_id,
+        'status': status or ('selesai' if exit_code == 0 else 'gagal'),
+        'exit_code': int(exit_code),
+        'error': error,
+        'waktu_selesai': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'initial_cost': hasil.get('initial_cost'),
+        'final_cost': hasil.get('final_cost'),
+        'total_rekomendasi': len(recommendations) if saved else 0,
+        'total_units': int(sum(r.get('jumlah', 1) for r in recommendations)) if saved else 0,
+        'cache_hit': bool(getattr(optimizer, 'cache_hit', False)),
+        'execution_time': hasil.get('execution_time'),
+        'phases': phases,
+        'hasil_optimasi': hasil or None,
+    }
+
+
+def emit_envelope(envelope: Dict, fd: Optional[int] = None):
+    """Tulis amplop sebagai satu baris; ke fd jika diberikan, selain itu baris terakhir stdout"""
+    line = ENVELOPE_PREFIX + json.dumps(envelope, separators=(',', ':'), default=str) + '\n'
+    if fd is not None:
+        try:
+            os.write(fd, line.encode())
+            return
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write result envelope to fd {fd}: {e}")
+    print(line, end='', flush=True)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Export Hasil Optimasi secara Streaming
+
+Menggantikan optimization_result.json monolitik:
+- satu file per log_optimasi_id di direktori results/
+  (env WAREHOUSE_RESULTS_DIR untuk override)
+- format default gzip NDJSON: baris pertama header metadata, lalu satu
+  rekomendasi per baris, ditutup baris footer berisi total_items
+- format Parquet opsional (butuh pyarrow), ditulis per row group dengan
+  metadata di schema
+- reader streaming (chunk DataFrame) untuk analyzer; file JSON lama tetap
+  bisa dibaca
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import glob
+import gzip
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional
+    pa = None
+    pq = None
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+EXPORT_FORMATS = ('ndjson', 'parquet')
+RECORD_COLUMNS = ['log_optimasi_id', 'barang_id', 'area_gudang_id', 'koordinat_x', 'koordinat_y', 'jumlah',
+                  'alasan', 'confidence_score', 'algoritma']
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def results_dir(path: Optional[str] = None) -> str:
+    return path or os.getenv('WAREHOUSE_RESULTS_DIR', DEFAULT_RESULTS_DIR)
+
+
+def result_filename(log_optimasi_id: Optional[int], fmt: str = 'ndjson') -> str:
+    """Nama file hasil per log_optimasi_id (timestamp untuk run tanpa log)"""
+    stem = (f"optimization_{log_optimasi_id}" if log_optimasi_id
+            else datetime.now().strftime('optimization_%Y%m%d_%H%M%S'))
+    return f"{stem}.parquet" if fmt == 'parquet' else f"{stem}.ndjson.gz"
+
+
+class ResultExporter:
+    """
+    Menulis rekomendasi ke file hasil secara streaming (atomic tmp + rename)
+
+    Contoh:
+        exporter = ResultExporter()
+        path = exporter.export(recommendations, {'log_optimasi_id': 12, 'algorithm': 'SA'})
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, fmt: str = 'ndjson',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}'. Available: {', '.join(EXPORT_FORMATS)}")
+        if fmt == 'parquet' and pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.output_dir = results_dir(output_dir)
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+
+    def export(self, recommendations: Iterable[Dict], metadata: Dict) -> str:
+        """Tulis metadata + rekomendasi; return path file"""
+        header = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            **metadata,
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, result_filename(header.get('log_optimasi_id'), self.fmt))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            if self.fmt == 'parquet':
+                self._write_parquet(tmp_path, recommendations, header)
+            else:
+                self._write_ndjson(tmp_path, recommendations, header)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def _write_ndjson(self, path: str, recommendations: Iterable[Dict], header: Dict):
+        total = 0
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(json.dumps({'type': 'header', **header}, default=str) + '\n')
+            for rec in recommendations:
+                f.write(json.dumps(rec, default=str, separators=(',', ':')) + '\n')
+                total += 1
+            f.write(json.dumps({'type': 'footer', 'total_items': total}) + '\n')
+
+    def _write_parquet(self, path: str, recommendations: Iterable[Dict], header: Dict):
+        schema = pa.schema([
+            ('log_optimasi_id', pa.int64()),
+            ('barang_id', pa.int64()),
+            ('area_gudang_id', pa.int64()),
+            ('koordinat_x', pa.float64()),
+            ('koordinat_y', pa.float64()),
+            ('jumlah', pa.int64()),
+            ('alasan', pa.string()),
+            ('confidence_score', pa.float64()),
+            ('algoritma', pa.string()),
+        ], metadata={b'optimization': json.dumps(header, default=str).encode()})
+
+        iterator = iter(recommendations)
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            while True:
+                batch = list(islice(iterator, self.chunk_size))
+                if not batch:
+                    break
+                frame = pd.DataFrame(batch).reindex(columns=RECORD_COLUMNS)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+
+def latest_result_file(log_optimasi_id: Optional[int] = None, directory: Optional[str] = None) -> Optional[str]:
+    """File hasil untuk log_optimasi_id tertentu, atau file terbaru di direktori hasil"""
+    directory = results_dir(directory)
+    if log_optimasi_id:
+        for fmt in EXPORT_FORMATS:
+            path = os.path.join(directory, result_filename(log_optimasi_id, fmt))
+            if os.path.exists(path):
+                return path
+        return None
+    candidates = glob.glob(os.path.join(directory, 'optimization_*.ndjson.gz'))
+    candidates += glob.glob(os.path.join(directory, 'optimization_*.parquet'))
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def read_result_metadata(path: str) -> Dict:
+    """Metadata (header) file hasil tanpa membaca seluruh rekomendasi"""
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("Reading Parquet results requires pyarrow (pip install pyarrow)")
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata.get(b'optimization', b'{}'))
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+        header.pop('type', None)
+        return header
+    # File JSON lama (optimization_result.json)
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {key: value for key, value in data.items() if key != 'recommendations'}
+
+
+def iter_result_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Baca rekomendasi sebagai DataFrame per chunk (memori konstan untuk NDJSON/Parquet)"""
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("Reading Parquet results requires pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            f.readline()  # header
+            while True:
+                lines = list(islice(f, chunk_size))
+                if not lines:
+                    break
+                records = [json.loads(line) for line in lines]
+                if records and records[-1].get('type') == 'footer':
+                    records.pop()
+                if records:
+                    yield pd.DataFrame.from_records(records)
+        return
+
+    with open(path, 'r') as f:
+        recommendations = json.load(f).get('recommendations', [])
+    for start in range(0, len(recommendations), chunk_size):
+        yield pd.DataFrame.from_records(recommendations[start:start + chunk_size])
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Checkpoint, Resume, dan Pembatalan Run Optimasi
+
+- Checkpointer       : simpan state engine ke file .npz secara atomic (tmp +
+                       rename) setiap `interval` detik; dibaca lagi untuk resume
+- CancellationToken  : sinyal pembatalan dari file `<log_id>.cancel`, status
+                       log_optimasi 'dibatalkan' di database, atau SIGTERM;
+                       dicek engine di antara langkah suhu
+
+File berada di checkpoints/ (env WAREHOUSE_CHECKPOINT_DIR untuk override),
+satu per log_optimasi_id.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import json
+import time
+import signal
+import threading
+import numpy as np
+from typing import Callable, Dict, Optional
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_dir(path: Optional[str] = None) -> str:
+    return path or os.getenv('WAREHOUSE_CHECKPOINT_DIR', DEFAULT_CHECKPOINT_DIR)
+
+
+class Checkpointer:
+    """
+    Penyimpan state engine per log_optimasi_id
+
+    State berupa dict berisi array NumPy dan nilai skalar/JSON; key yang
+    diawali `json_` disimpan sebagai string JSON (mis. state RNG).
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None, interval: float = 60.0):
+        self.directory = checkpoint_dir(directory)
+        self.path = os.path.join(self.directory, f"{name}.npz")
+        self.interval = float(interval)
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def for_log(cls, log_optimasi_id: int, directory: Optional[str] = None, interval: float = 60.0) -> 'Checkpointer':
+        return cls(f"optimization_{log_optimasi_id}", directory, interval)
+
+    def due(self) -> bool:
+        """True jika sudah lewat `interval` detik sejak checkpoint terakhir"""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: Dict) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        payload = {'version': np.int64(CHECKPOINT_VERSION)}
+        for key, value in state.items():
+            payload[key] = np.asarray(json.dumps(value)) if key.startswith('json_') else np.asarray(value)
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._last_save = time.monotonic()
+        return self.path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Optional[Dict]:
+        if not self.exists():
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            if int(data['version']) != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version in {self.path}")
+            state = {}
+            for key in data.files:
+                if key == 'version':
+                    continue
+                value = data[key]
+                if key.startswith('json_'):
+                    state[key] = json.loads(str(value))
+                elif value.ndim == 0:
+                    state[key] = value.item()
+                else:
+                    state[key] = value
+        return state
+
+    def remove(self):
+        if self.exists():
+            os.remove(self.path)
+
+
+class CancellationToken:
+    """
+    Sumber pembatalan run: file, flag database, atau SIGTERM
+
+    Contoh:
+        token = CancellationToken(cancel_file='checkpoints/optimization_12.cancel',
+                                  db_check=lambda: db.get_optimization_status(12) == 'dibatalkan')
+        token.install_signal_handler()
+        ...
+        if token.is_cancelled(): ...
+    """
+
+    def __init__(self, cancel_file: Optional[str] = None, db_check: Optional[Callable[[], bool]] = None,
+                 db_poll_interval: float = 10.0):
+        self.cancel_file = cancel_file
+        self.db_check = db_check
+        self.db_poll_interval = float(db_poll_interval)
+        self.reason: Optional[str] = None
+        self._last_db_poll = time.monotonic()
+        self._previous_handler = None
+
+    @classmethod
+    def for_log(cls, log_optimasi_id: int, db_check: Optional[Callable[[], bool]] = None,
+                directory: Optional[str] = None, db_poll_interval: float = 10.0) -> 'CancellationToken':
+        cancel_file = os.path.join(checkpoint_dir(directory), f"optimization_{log_optimasi_id}.cancel")
+        return cls(cancel_file, db_check, db_poll_interval)
+
+    def cancel(self, reason: str = 'requested'):
+        if self.reason is None:
+            self.reason = reason
+
+    def install_signal_handler(self):
+        """Tangkap SIGTERM agar run berhenti rapi di langkah suhu berikutnya (main thread saja)"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self._previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: self.cancel('SIGTERM'))
+
+    def restore_signal_handler(self):
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGTERM, self._previous_handler)
+            self._previous_handler = None
+
+    def is_cancelled(self) -> bool:
+        if self.reason is not None:
+            return True
+        if self.cancel_file and os.path.exists(self.cancel_file):
+            self.cancel('cancel file')
+        elif self.db_check and time.monotonic() - self._last_db_poll >= self.db_poll_interval:
+            self._last_db_poll = time.monotonic()
+            try:
+                if self.db_check():
+                    self.cancel("status 'dibatalkan'")
+            except Exception as e:
+                print(f"⚠️  Warning: Could not poll cancellation status: {e}")
+        return self.reason is not None
+
+    def clear(self):
+        """Hapus file cancel setelah dipakai agar resume tidak langsung berhenti"""
+        if self.cancel_file and os.path.exists(self.cancel_file):
+            os.remove(self.cancel_file)
@@ -11,7 +11,13 @@ import sys
 import os
 import json
 import time
+import numpy as np
+from scipy import stats
 from warehouse_optimization import WarehouseOptimizer
+from optimization_engines import benchmark_engines
+from parameter_tuning import STRATEGIES, ParameterTuner, print_leaderboard
+from parallel_runner import run_jobs
+from quantity_runs import split_runs
 
 def run_single_optimization(params=None):
     """
@@ -20,15 +26,21 @@ def run_single_optimization(params=None):
     print("🚀 Starting warehouse optimization...")
     start_time = time.time()
     
-    optimizer = WarehouseOptimizer()
+    # params berupa algorithm_params (mis. hasil tuning); key lama temp_initial/temp_final tetap didukung
+    algorithm_params = dict(params or {})
+    if 'temp_initial' in algorithm_params:
+        algorithm_params.setdefault('temperature_initial', algorithm_params.pop('temp_initial'))
+    if 'temp_final' in algorithm_params:
+        algorithm_params.setdefault('temperature_final', algorithm_params.pop('temp_final'))
+    
+    # Run eksperimen selalu dijalankan ulang (tidak memakai cache hasil)
+    config = {'use_cache': False}
+    if params:
+        config['algorithm_params'] = algorithm_params
+    optimizer = WarehouseOptimizer(config)
     
     # Set custom parameters jika diberikan
     if params:
-        optimizer.temperature_initial = params.get('temp_initial', 1000.0)
-        optimizer.temperature_final = params.get('temp_final', 0.1)
-        optimizer.cooling_rate = params.get('cooling_rate', 0.95)
-        optimizer.max_iterations = params.get('max_iterations', 1000)
-        optimizer.max_no_improvement = params.get('max_no_improvement', 50)
         
         print(f"Using custom parameters:")
         print(f"  - Initial Temperature: {optimizer.temperature_initial}")
@@ -49,169 +61,236 @@ def run_single_optimization(params=None):
         print(f"❌ Optimization failed after {duration:.2f} seconds")
         return False
 
-def run_parameter_tuning():
+def load_problem(optimization_config=None):
+    """
+    Muat data dari database sekali dan kompilasi menjadi CompiledProblem;
+    lower bound dihitung sekali (optimizer.bound_result) dan dibagikan ke
+    semua job agar pipeline sama dengan optimize()
+    
+    Returns:
+        (optimizer, problem) atau (None, None) jika gagal
+    """
+    optimizer = WarehouseOptimizer(optimization_config)
+    if not optimizer.connect_database():
+        print("Failed to connect to database")
+        return None, None
+    
+    try:
+        if not optimizer.fetch_areas() or not optimizer.fetch_barang():
+            print("Failed to load data from database")
+            return None, None
+        # Kompilasi selagi terkoneksi: affinity co-access dibaca dari database.
+        # Barang dipecah menjadi run seperti optimize(); cost job dihitung setelah RunBalancer
+        problem = split_runs(optimizer.compile_problem(), optimizer.max_run_units)
+    finally:
+        optimizer.disconnect_database()
+    
+    if optimizer.optimality_bound:
+        optimizer.compute_optimality_bound(problem)
+    return optimizer, problem
+
+def run_parameter_tuning(strategy='grid', n_trials=27, seeds=(0, 1, 2), workers=None):
     """
     Menjalankan tuning parameter untuk menemukan kombinasi terbaik
     
-    Test berbagai kombinasi parameter Simulated Annealing:
-    - Temperature initial: [500, 1000, 2000]
-    - Cooling rate: [0.90, 0.95, 0.99]
-    - Max iterations: [500, 1000, 2000]
+    Data dimuat sekali lalu dibagikan ke process pool. Strategi:
+    - grid    : semua kombinasi SA_SEARCH_SPACE
+    - random  : n_trials kombinasi acak
+    - halving : successive halving atas max_iterations dari n_trials kandidat
+    Setiap konfigurasi dijalankan dengan semua seed.
     """
-    print("🔧 Starting parameter tuning...")
+    print(f"🔧 Starting parameter tuning ({strategy}, seeds: {list(seeds)})...")
     
-    # Parameter combinations untuk testing
-    param_combinations = [
-        {'temp_initial': 500, 'cooling_rate': 0.95, 'max_iterations': 500, 'name': 'Fast'},
-        {'temp_initial': 1000, 'cooling_rate': 0.95, 'max_iterations': 1000, 'name': 'Balanced'},
-        {'temp_initial': 2000, 'cooling_rate': 0.99, 'max_iterations': 2000, 'name': 'Thorough'},
-        {'temp_initial': 1500, 'cooling_rate': 0.90, 'max_iterations': 1500, 'name': 'Aggressive'},
-    ]
+    optimizer, problem = load_problem()
+    if problem is None:
+        return None
     
-    results = []
+    print(f"📊 Problem loaded once: {problem.n_items} items, {problem.n_areas} areas")
     
-    for i, params in enumerate(param_combinations, 1):
-        print(f"\n📊 Running configuration {i}/4: {params['name']}")
-        print("-" * 50)
-        
-        start_time = time.time()
-        
-        optimizer = WarehouseOptimizer()
-        optimizer.temperature_initial = params['temp_initial']
-        optimizer.cooling_rate = params['cooling_rate']
-        optimizer.max_iterations = params['max_iterations']
-        
-        # Load data
-        if not optimizer.load_token_from_file():
-            print("Failed to load token")
-            continue
-            
-        if not optimizer.fetch_areas() or not optimizer.fetch_barang():
-            print("Failed to load data")
-            continue
-        
-        # Run optimization
-        try:
-            best_solution, best_cost = optimizer.simulated_annealing()
-            duration = time.time() - start_time
-            
-            result = {
-                'config_name': params['name'],
-                'parameters': params,
-                'best_cost': best_cost,
-                'duration': duration,
-                'solution_count': len(best_solution)
-            }
-            results.append(result)
-            
-            print(f"✅ {params['name']} completed: Cost = {best_cost:.2f}, Time = {duration:.2f}s")
-            
-        except Exception as e:
-            print(f"❌ {params['name']} failed: {e}")
-        finally:
-            optimizer.disconnect_database()
+    start_time = time.time()
+    tuner = ParameterTuner(problem, engine='sa', seeds=seeds, workers=workers, bound=optimizer.bound_result,
+                           gap_tolerance=optimizer.bound_params['gap_tolerance'])
+    leaderboard = tuner.search(strategy, n_trials=n_trials, seed=0)
+    duration = time.time() - start_time
     
-    # Analisis hasil tuning
-    if results:
-        print("\n" + "="*70)
-        print("             PARAMETER TUNING RESULTS")
-        print("="*70)
-        
-        # Sort by best cost
-        results.sort(key=lambda x: x['best_cost'])
-        
-        print(f"{'Config':<12} {'Cost':<12} {'Time(s)':<10} {'Temp':<8} {'Cool':<6} {'Iter':<6}")
-        print("-" * 70)
-        
-        for result in results:
-            params = result['parameters']
-            print(f"{result['config_name']:<12} "
-                  f"{result['best_cost']:<12.2f} "
-                  f"{result['duration']:<10.2f} "
-                  f"{params['temp_initial']:<8} "
-                  f"{params['cooling_rate']:<6} "
-                  f"{params['max_iterations']:<6}")
-        
-        # Save results
-        with open('parameter_tuning_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        print(f"\n🏆 Best configuration: {results[0]['config_name']} with cost {results[0]['best_cost']:.2f}")
-        print("📄 Detailed results saved to parameter_tuning_results.json")
-        
-        return results[0]['parameters']  # Return best parameters
+    if not leaderboard:
+        return None
     
-    return None
+    print("\n" + "="*70)
+    print("             PARAMETER TUNING RESULTS")
+    print("="*70)
+    print_leaderboard(leaderboard)
+    
+    # Save results
+    filename = tuner.save('parameter_tuning_results.json')
+    
+    recommended = tuner.recommended_params()
+    print(f"\n🏆 Best configuration: mean cost {leaderboard[0]['mean_cost']:.2f} "
+          f"({len(tuner.runs)} runs in {duration:.1f}s)")
+    print(f"   Recommended algorithm_params: {json.dumps(recommended)}")
+    print(f"📄 Leaderboard saved to {filename}")
+    
+    return recommended
+
+def describe_replicates(values, confidence=0.95):
+    """
+    Statistik ringkas replikasi: mean, std (sampel), quantile, dan
+    confidence interval mean berbasis distribusi t
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if n > 1 else 0.0
+    half_width = float(stats.t.ppf((1 + confidence) / 2, n - 1) * std / np.sqrt(n)) if n > 1 else 0.0
+    quantiles = np.quantile(values, [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0])
+    
+    return {
+        'n': n,
+        'mean': mean,
+        'std': std,
+        'min': float(quantiles[0]),
+        'p05': float(quantiles[1]),
+        'p25': float(quantiles[2]),
+        'median': float(quantiles[3]),
+        'p75': float(quantiles[4]),
+        'p95': float(quantiles[5]),
+        'max': float(quantiles[6]),
+        'confidence': confidence,
+        'ci_low': mean - half_width,
+        'ci_high': mean + half_width,
+    }
 
-def run_batch_optimization(num_runs=5):
+def run_batch_optimization(num_runs=5, base_seed=None, workers=None, optimization_config=None):
     """
     Menjalankan optimasi beberapa kali untuk analisis konsistensi
+    
+    Data dimuat sekali; N replikasi dengan seed turunan dari base_seed
+    (SeedSequence.spawn) dijalankan paralel. Seed per run disimpan agar run
+    mana pun bisa di-replay via algorithm_params.seed.
     """
-    print(f"📈 Running batch optimization ({num_runs} runs)...")
+    if base_seed is None:
+        base_seed = int(np.random.SeedSequence().entropy % (2 ** 32))
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(base_seed).spawn(num_runs)]
     
-    results = []
+    print(f"📈 Running batch optimization ({num_runs} runs, base seed {base_seed})...")
     
-    for run in range(1, num_runs + 1):
-        print(f"\n🔄 Run {run}/{num_runs}")
-        print("-" * 30)
-        
-        start_time = time.time()
-        
-        optimizer = WarehouseOptimizer()
-        
-        # Connect ke database
-        if not optimizer.connect_database():
-            print("Failed to connect to database")
-            continue
-            
-        if not optimizer.fetch_areas() or not optimizer.fetch_barang():
-            print("Failed to load data from database")
-            optimizer.disconnect_database()
-            continue
-        
-        try:
-            best_solution, best_cost = optimizer.simulated_annealing()
-            duration = time.time() - start_time
-            
-            result = {
-                'run': run,
-                'best_cost': best_cost,
-                'duration': duration,
-                'solution_count': len(best_solution)
-            }
-            results.append(result)
-            
-            print(f"✅ Run {run} completed: Cost = {best_cost:.2f}")
-            
-        except Exception as e:
-            print(f"❌ Run {run} failed: {e}")
-            continue
+    # Data (termasuk frekuensi akses simulasi) dimuat sekali dengan data_seed = base_seed
+    config = dict(optimization_config or {})
+    config['algorithm_params'] = {**config.get('algorithm_params', {}), 'data_seed': base_seed}
+    optimizer, problem = load_problem(config)
+    if problem is None:
+        return None
+    
+    engine_name = optimizer.engine_name
+    params = optimizer.engine_parameters(engine_name)
+    jobs = [{'engine': engine_name, 'params': params, 'seed': seed, 'run': run,
+             'gap_tolerance': optimizer.bound_params['gap_tolerance']}
+            for run, seed in enumerate(seeds, 1)]
+    
+    start_time = time.time()
+    runs = run_jobs(problem, jobs, workers, bound=optimizer.bound_result)
+    wall_time = time.time() - start_time
+    
+    results = []
+    for run in runs:
+        results.append({
+            'run': run['run'],
+            'seed': run['seed'],
+            'best_cost': run['best_cost'],
+            'initial_cost': run['initial_cost'],
+            'duration': run['duration'],
+            'iterations': run['iterations'],
+            'evaluations': run['evaluations'],
+        })
+        print(f"✅ Run {run['run']} (seed {run['seed']}) completed: Cost = {run['best_cost']:.2f}, "
+              f"Time = {run['duration']:.2f}s")
     
     # Analisis hasil batch
     if results:
-        costs = [r['best_cost'] for r in results]
-        durations = [r['duration'] for r in results]
+        cost_stats = describe_replicates([r['best_cost'] for r in results])
+        duration_stats = describe_replicates([r['duration'] for r in results])
         
         print("\n" + "="*50)
         print("         BATCH OPTIMIZATION RESULTS")
         print("="*50)
         print(f"Number of successful runs: {len(results)}")
-        print(f"Best cost: {min(costs):.2f}")
-        print(f"Worst cost: {max(costs):.2f}")
-        print(f"Average cost: {sum(costs)/len(costs):.2f}")
-        print(f"Cost standard deviation: {(sum((x - sum(costs)/len(costs))**2 for x in costs) / len(costs))**0.5:.2f}")
-        print(f"Average duration: {sum(durations)/len(durations):.2f} seconds")
+        print(f"Best cost: {cost_stats['min']:.2f}")
+        print(f"Worst cost: {cost_stats['max']:.2f}")
+        print(f"Average cost: {cost_stats['mean']:.2f} "
+              f"(95% CI {cost_stats['ci_low']:.2f} - {cost_stats['ci_high']:.2f})")
+        print(f"Cost standard deviation: {cost_stats['std']:.2f}")
+        print(f"Cost quantiles (p05/median/p95): {cost_stats['p05']:.2f} / {cost_stats['median']:.2f} / "
+              f"{cost_stats['p95']:.2f}")
+        print(f"Average duration: {duration_stats['mean']:.2f} seconds "
+              f"(95% CI {duration_stats['ci_low']:.2f} - {duration_stats['ci_high']:.2f})")
+        print(f"Batch wall time: {wall_time:.2f} seconds")
         
         # Save results
         with open('batch_optimization_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+            json.dump({
+                'engine': engine_name,
+                'algorithm_params': params,
+                'base_seed': base_seed,
+                'wall_time': wall_time,
+                'statistics': {
+                    'best_cost': cost_stats,
+                    'duration': duration_stats,
+                },
+                'runs': results,
+            }, f, indent=2)
         
         print("📄 Detailed results saved to batch_optimization_results.json")
+        print(f"🔁 Replay a run with algorithm_params {{\"seed\": {results[0]['seed']}, \"data_seed\": {base_seed}}}")
         
         return results
     
     return None
 
+def run_engine_benchmark(seeds=(0, 1, 2)):
+    """
+    Perbandingan head-to-head engine optimasi (SA, Tabu Search, LNS)
+    
+    Data dimuat sekali, lalu setiap engine dijalankan dari solusi awal yang
+    sama untuk setiap seed. Hasil berisi best cost, wall time, dan kurva
+    cost terhadap waktu.
+    """
+    print(f"🏁 Running engine benchmark (seeds: {list(seeds)})...")
+    
+    optimizer = WarehouseOptimizer()
+    if not optimizer.connect_database():
+        print("Failed to connect to database")
+        return None
+    
+    try:
+        if not optimizer.fetch_areas() or not optimizer.fetch_barang():
+            print("Failed to load data from database")
+            return None
+        problem = split_runs(optimizer.compile_problem(), optimizer.max_run_units)
+    finally:
+        optimizer.disconnect_database()
+    
+    results = benchmark_engines(problem, seeds=tuple(seeds))
+    
+    print("\n" + "="*70)
+    print("             ENGINE BENCHMARK RESULTS")
+    print("="*70)
+    print(f"{'Engine':<28} {'Seed':<6} {'Cost':<12} {'Time(s)':<10} {'Eval/s':<10}")
+    print("-" * 70)
+    
+    for result in results:
+        print(f"{result['label']:<28} "
+              f"{result['seed']:<6} "
+              f"{result['best_cost']:<12.2f} "
+              f"{result['wall_time']:<10.2f} "
+              f"{result['evaluations_per_second']:<10.0f}")
+    
+    # Save results
+    with open('engine_benchmark_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    
+    print("📄 Detailed results (cost vs time) saved to engine_benchmark_results.json")
+    return results
+
 def main():
     """
     Main function dengan command line options
@@ -220,9 +299,11 @@ def main():
         print("🏭 Warehouse Optimization Tool")
         print("Usage:")
         print("  python run_optimization.py single     - Run single optimization")
-        print("  python run_optimization.py tune       - Run parameter tuning")
-        print("  python run_optimization.py batch [n]  - Run batch optimization (default n=5)")
-        print("  python run_optimization.py analyze    - Analyze existing results")
+        print("  python run_optimization.py tune [grid|random|halving] [trials] - Run parallel parameter tuning")
+        print("  python run_optimization.py batch [n] [seed] - Run seeded parallel batch (default n=5)")
+        print("  python run_optimization.py analyze [log_id] - Analyze existing results")
+        print("  python run_optimization.py compare <file|log_id>... - Score many layouts in one batch")
+        print("  python run_optimization.py engines    - Benchmark SA vs Tabu Search vs LNS")
         return 1
     
     command = sys.argv[1].lower()
@@ -231,7 +312,12 @@ def main():
         return 0 if run_single_optimization() else 1
         
     elif command == 'tune':
-        best_params = run_parameter_tuning()
+        strategy = sys.argv[2].lower() if len(sys.argv) > 2 else 'grid'
+        if strategy not in STRATEGIES:
+            print(f"Unknown tuning strategy: {strategy} (available: {', '.join(STRATEGIES)})")
+            return 1
+        n_trials = int(sys.argv[3]) if len(sys.argv) > 3 else 27
+        best_params = run_parameter_tuning(strategy, n_trials)
         if best_params:
             print("\n🎯 Running final optimization with best parameters...")
             return 0 if run_single_optimization(best_params) else 1
@@ -245,20 +331,35 @@ def main():
             except ValueError:
                 print("Invalid number of runs specified")
                 return 1
+        base_seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
         
-        results = run_batch_optimization(num_runs)
+        results = run_batch_optimization(num_runs, base_seed)
+        return 0 if results else 1
+        
+    elif command == 'engines':
+        results = run_engine_benchmark()
         return 0 if results else 1
         
     elif command == 'analyze':
         # Import dan jalankan analyzer
         try:
             from optimization_analyzer import analyze_optimization_results
-            return 0 if analyze_optimization_results() else 1
+            log_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            return 0 if analyze_optimization_results(log_optimasi_id=log_id) else 1
         except ImportError as e:
             print(f"Error importing analyzer: {e}")
             print("Make sure optimization_analyzer.py is available")
             return 1
             
+    elif command == 'compare':
+        from optimization_analyzer import compare_layouts
+        from result_export import latest_result_file
+        sources = [latest_result_file(int(arg)) if arg.isdigit() else arg for arg in sys.argv[2:]]
+        if not sources or not all(sources):
+            print("Usage: python run_optimization.py compare <file|log_id>...")
+            return 1
+        return 0 if compare_layouts(sources) else 1
+            
     else:
         print(f"Unknown command: {command}")
         return 1
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Kernel JIT Opsional untuk Inner Loop Simulated Annealing
+
+Loop Metropolis (ambil move, hitung delta, terima/tolak) tetap berupa loop
+skalar meskipun state sudah berbentuk array. Modul ini menyediakan satu
+kernel yang menjalankan seluruh langkah suhu per panggilan: target move,
+delta relocate/swap, uji penerimaan, apply, dan snapshot best-so-far.
+
+Backend (parameter engine `kernel`):
+- numba : kernel dikompilasi dengan `numba.njit` (jika numba terpasang)
+- numpy : loop Python/NumPy lama melalui MoveEvaluator (fallback)
+- auto  : numba bila tersedia, selain itu numpy
+
+Move dan bilangan acak penerimaan tetap diambil dari RNG engine per langkah
+suhu, sehingga kedua backend menghasilkan trajektori yang sama untuk seed
+yang sama. Throughput per backend: `python benchmark_suite.py --benchmarks
+sa_loop,sa_loop_numba`.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-19
+"""
+
+import math
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from optimization_problem import (ACCESS_DISTANCE_LIMIT, ACCESS_PENALTY_FACTOR, CATEGORY_SPREAD_FACTOR,
+                                  MoveEvaluator, space_penalty)
+
+try:
+    from numba import njit
+except ImportError:  # numba opsional, fallback ke loop NumPy
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+KERNEL_BACKENDS = ('auto', 'numba', 'numpy')
+
+
+def resolve_backend(name: Optional[str]) -> str:
+    """Backend efektif; 'numba' tanpa numba terpasang jatuh ke 'numpy'"""
+    key = (name or 'auto').lower()
+    if key not in KERNEL_BACKENDS:
+        raise ValueError(f"Unknown SA kernel backend '{name}'. Available: {', '.join(KERNEL_BACKENDS)}")
+    if key == 'auto':
+        return 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if key == 'numba' and not NUMBA_AVAILABLE:
+        print("⚠️  numba is not installed, falling back to the NumPy SA loop")
+        return 'numpy'
+    return key
+
+
+def _point_distance(a, x, y, door_distances, access_points, has_doors):
+    if not has_doors:
+        return math.hypot(x, y)
+    return door_distances[a] + math.hypot(x - access_points[a, 0], y - access_points[a, 1])
+
+
+def _item_cost(distance, frequency, hot):
+    """Kontribusi (distance cost, access penalty) satu barang"""
+    access = distance * ACCESS_PENALTY_FACTOR if (hot and distance > ACCESS_DISTANCE_LIMIT) else 0.0
+    return distance * frequency, access
+
+
+def _spread_penalty(spread):
+    return max(spread - 1, 0) * CATEGORY_SPREAD_FACTOR
+
+
+def _affinity_delta(i, nx, ny, exclude, x, y, aff_indptr, aff_indices, aff_data):
+    """Perubahan affinity cost jika barang i pindah ke (nx, ny): hanya baris CSR i"""
+    total = 0.0
+    for n in range(aff_indptr[i], aff_indptr[i + 1]):
+        k = aff_indices[n]
+        if k != exclude:
+            total += aff_data[n] * (math.hypot(nx - x[k], ny - y[k]) - math.hypot(x[i] - x[k], y[i] - y[k]))
+    return total
+
+
+def _temperature_step(strategy, move_i, move_j, move_area, move_u, move_v, accept_u, temperature,
+                      area_idx, x, y, distance, area_volume, area_count, cat_area, cat_spread, components,
+                      best_area_idx, best_x, best_y,
+                      volume, frequency, hot, category, inv_capacity, area_rects,
+                      door_distances, access_points, has_doors, weights,
+                      aff_indptr, aff_indices, aff_data,
+                      current_cost, best_cost, at_best, no_improvement_count, max_no_improvement):
+    """
+    Satu langkah suhu SA pada array state MoveEvaluator (dimodifikasi in-place)
+
+    Semantik sama dengan SimulatedAnnealingEngine.search: strategi 1 = pindah
+    area, 2 = tukar dua barang, 3 = geser dalam area (maks 2 m); best-so-far
+    disalin ke best_* tepat sebelum state meninggalkannya.
+
+    Returns:
+        (iterasi, current_cost, best_cost, at_best, left_best, no_improvement_count, improved)
+    """
+    w0, w1, w2, w3 = weights[0], weights[1], weights[2], weights[3]
+    iterations = 0
+    left_best = False
+    improved = False
+
+    for k in range(len(strategy)):
+        iterations += 1
+        i = move_i[k]
+        s = strategy[k]
+        j = move_j[k]
+        a = 0
+        nx = 0.0
+        ny = 0.0
+        new_d = 0.0
+
+        if s == 2:
+            di = distance[i]
+            dj = distance[j]
+            ai = area_idx[i]
+            aj = area_idx[j]
+            old_dci, old_aci = _item_cost(di, frequency[i], hot[i])
+            old_dcj, old_acj = _item_cost(dj, frequency[j], hot[j])
+            new_dci, new_aci = _item_cost(dj, frequency[i], hot[i])
+            new_dcj, new_acj = _item_cost(di, frequency[j], hot[j])
+            d_dist = (new_dci + new_dcj - old_dci - old_dcj
+                      + _affinity_delta(i, x[j], y[j], j, x, y, aff_indptr, aff_indices, aff_data)
+                      + _affinity_delta(j, x[i], y[i], i, x, y, aff_indptr, aff_indices, aff_data))
+            d_access = new_aci + new_acj - old_aci - old_acj
+            d_space = 0.0
+            d_cat = 0.0
+            if ai != aj:
+                vi = volume[i]
+                vj = volume[j]
+                vol_i = area_volume[ai]
+                cnt_i = area_count[ai]
+                vol_j = area_volume[aj]
+                cnt_j = area_count[aj]
+                d_space = (space_penalty(vol_i - vi + vj, cnt_i, inv_capacity[ai])
+                           - space_penalty(vol_i, cnt_i, inv_capacity[ai])
+                           + space_penalty(vol_j - vj + vi, cnt_j, inv_capacity[aj])
+                           - space_penalty(vol_j, cnt_j, inv_capacity[aj]))
+                ci = category[i]
+                cj = category[j]
+                if ci != cj:
+                    spread = cat_spread[ci]
+                    new_spread = spread - (1 if cat_area[ci, ai] == 1 else 0) + (1 if cat_area[ci, aj] == 0 else 0)
+                    d_cat += _spread_penalty(new_spread) - _spread_penalty(spread)
+                    spread = cat_spread[cj]
+                    new_spread = spread - (1 if cat_area[cj, aj] == 1 else 0) + (1 if cat_area[cj, ai] == 0 else 0)
+                    d_cat += _spread_penalty(new_spread) - _spread_penalty(spread)
+        else:
+            o = area_idx[i]
+            if s == 1:
+                a = move_area[k]
+                nx = area_rects[a, 0] + move_u[k] * (area_rects[a, 2] - area_rects[a, 0])
+                ny = area_rects[a, 1] + move_v[k] * (area_rects[a, 3] - area_rects[a, 1])
+            else:
+                a = o
+                nx = min(max(x[i] + (move_u[k] * 4.0 - 2.0), area_rects[a, 0]), area_rects[a, 2])
+                ny = min(max(y[i] + (move_v[k] * 4.0 - 2.0), area_rects[a, 1]), area_rects[a, 3])
+            new_d = _point_distance(a, nx, ny, door_distances, access_points, has_doors)
+            old_dc, old_ac = _item_cost(distance[i], frequency[i], hot[i])
+            new_dc, new_ac = _item_cost(new_d, frequency[i], hot[i])
+            d_dist = new_dc - old_dc + _affinity_delta(i, nx, ny, -1, x, y, aff_indptr, aff_indices, aff_data)
+            d_access = new_ac - old_ac
+            d_space = 0.0
+            d_cat = 0.0
+            if a != o:
+                v = volume[i]
+                vol_o = area_volume[o]
+                cnt_o = area_count[o]
+                vol_a = area_volume[a]
+                cnt_a = area_count[a]
+                d_space = (space_penalty(vol_o - v, cnt_o - 1, inv_capacity[o])
+                           - space_penalty(vol_o, cnt_o, inv_capacity[o])
+                           + space_penalty(vol_a + v, cnt_a + 1, inv_capacity[a])
+                           - space_penalty(vol_a, cnt_a, inv_capacity[a]))
+                c = category[i]
+                spread = cat_spread[c]
+                new_spread = spread - (1 if cat_area[c, o] == 1 else 0) + (1 if cat_area[c, a] == 0 else 0)
+                d_cat = _spread_penalty(new_spread) - _spread_penalty(spread)
+
+        delta_cost = w0 * d_dist + w1 * d_space + w2 * d_cat + w3 * d_access
+
+        if delta_cost < 0 or accept_u[k] < math.exp(-delta_cost / temperature):
+            if delta_cost >= 0 and at_best:
+                best_area_idx[:] = area_idx
+                best_x[:] = x
+                best_y[:] = y
+                at_best = False
+                left_best = True
+
+            if s == 2:
+                ai = area_idx[i]
+                aj = area_idx[j]
+                if ai != aj:
+                    vi = volume[i]
+                    vj = volume[j]
+                    area_volume[ai] += vj - vi
+                    area_volume[aj] += vi - vj
+                    ci = category[i]
+                    cj = category[j]
+                    if ci != cj:
+                        cat_area[ci, ai] -= 1
+                        if cat_area[ci, ai] == 0:
+                            cat_spread[ci] -= 1
+                        if cat_area[ci, aj] == 0:
+                            cat_spread[ci] += 1
+                        cat_area[ci, aj] += 1
+                        cat_area[cj, aj] -= 1
+                        if cat_area[cj, aj] == 0:
+                            cat_spread[cj] -= 1
+                        if cat_area[cj, ai] == 0:
+                            cat_spread[cj] += 1
+                        cat_area[cj, ai] += 1
+                    area_idx[i] = aj
+                    area_idx[j] = ai
+                tmp = x[i]
+                x[i] = x[j]
+                x[j] = tmp
+                tmp = y[i]
+                y[i] = y[j]
+                y[j] = tmp
+                tmp = distance[i]
+                distance[i] = distance[j]
+                distance[j] = tmp
+            else:
+                o = area_idx[i]
+                if a != o:
+                    v = volume[i]
+                    c = category[i]
+                    area_volume[o] -= v
+                    area_volume[a] += v
+                    area_count[o] -= 1
+                    area_count[a] += 1
+                    cat_area[c, o] -= 1
+                    if cat_area[c, o] == 0:
+                        cat_spread[c] -= 1
+                    if cat_area[c, a] == 0:
+                        cat_spread[c] += 1
+                    cat_area[c, a] += 1
+                    area_idx[i] = a
+                x[i] = nx
+                y[i] = ny
+                distance[i] = new_d
+
+            components[0] += d_dist
+            components[1] += d_space
+            components[2] += d_cat
+            components[3] += d_access
+            current_cost += delta_cost
+
+            if current_cost < best_cost:
+                best_cost = current_cost
+                at_best = True
+                improved = True
+                no_improvement_count = 0
+
+        if not improved:
+            no_improvement_count += 1
+            if no_improvement_count >= max_no_improvement:
+                break
+
+    return iterations, current_cost, best_cost, at_best, left_best, no_improvement_count, improved
+
+
+if NUMBA_AVAILABLE:
+    # Fungsi pembantu dikompilasi lebih dulu agar dapat dipanggil dari kernel
+    space_penalty = njit(cache=True)(space_penalty)
+    _point_distance = njit(cache=True)(_point_distance)
+    _item_cost = njit(cache=True)(_item_cost)
+    _spread_penalty = njit(cache=True)(_spread_penalty)
+    _affinity_delta = njit(cache=True)(_affinity_delta)
+    temperature_step = njit(cache=True)(_temperature_step)
+else:
+    temperature_step = None
+
+
+class AnnealingKernel:
+    """
+    Pengikat kernel ke satu MoveEvaluator: array masalah disiapkan sekali,
+    state evaluator dimodifikasi langsung oleh kernel
+
+    Contoh:
+        kernel = AnnealingKernel(evaluator)
+        result = kernel.step(moves, accept_u, temperature, current_cost, best_cost,
+                             at_best, no_improvement_count, max_no_improvement)
+    """
+
+    def __init__(self, evaluator: MoveEvaluator, step_function=None):
+        p = evaluator.problem
+        self.evaluator = evaluator
+        self.step_function = step_function or temperature_step
+        if self.step_function is None:
+            raise RuntimeError("numba is not installed; use the NumPy SA loop instead")
+        has_doors = p.door_distances is not None
+        affinity = p.affinity
+        self.problem_arrays = (
+            np.ascontiguousarray(p.volume, dtype=np.float64),
+            np.ascontiguousarray(p.frequency, dtype=np.float64),
+            np.ascontiguousarray(p.hot, dtype=np.bool_),
+            np.ascontiguousarray(p.category, dtype=np.int64),
+            np.ascontiguousarray(p.inv_capacity, dtype=np.float64),
+            np.ascontiguousarray(p.area_rects, dtype=np.float64),
+            p.door_distances if has_doors else np.zeros(p.n_areas),
+            p.access_points if has_doors else np.zeros((p.n_areas, 2)),
+            has_doors,
+            np.asarray(p.weights, dtype=np.float64),
+            np.zeros(p.n_items + 1, dtype=np.int64) if affinity is None else affinity.indptr.astype(np.int64),
+            np.zeros(0, dtype=np.int64) if affinity is None else affinity.indices.astype(np.int64),
+            np.zeros(0) if affinity is None else affinity.data,
+        )
+        self.best_buffers = (np.empty_like(evaluator.area_idx), np.empty_like(evaluator.x),
+                             np.empty_like(evaluator.y))
+
+    def step(self, moves: Dict[str, np.ndarray], accept_u: np.ndarray, temperature: float,
+             current_cost: float, best_cost: float, at_best: bool, no_improvement_count: int,
+             max_no_improvement: int) -> Tuple:
+        ev = self.evaluator
+        return self.step_function(
+            moves['strategy'], moves['i'], moves['j'], moves['area'], moves['u'], moves['v'], accept_u,
+            float(temperature),
+            ev.area_idx, ev.x, ev.y, ev.distance, ev.area_volume, ev.area_count, ev.cat_area, ev.cat_spread,
+            ev.components,
+            *self.best_buffers,
+            *self.problem_arrays,
+            float(current_cost), float(best_cost), bool(at_best), int(no_improvement_count),
+            int(max_no_improvement),
+        )
+
+    def best_layout(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Salinan best-so-far terakhir yang disimpan kernel"""
+        return tuple(buffer.copy() for buffer in self.best_buffers)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Generator Data Gudang Sintetis dan Database In-Memory
+
+Dipakai untuk benchmark dan pengujian offline tanpa MySQL:
+- generate_warehouse : AreaGudang/Barang sintetis (seeded, 100 s/d 1M barang)
+- synthetic_problem  : CompiledProblem langsung dari array (tanpa objek per barang)
+- InMemoryDatabase   : pengganti DatabaseManager dengan interface yang sama
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import json
+import math
+import hashlib
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from optimization_problem import CompiledProblem
+from warehouse_columns import AREA_COLUMNS, BARANG_COLUMNS, DEFAULT_CHUNK_SIZE, AreaColumns, BarangColumns, row_chunks
+
+CATEGORY_NAMES = ['Elektronik', 'Dokumen', 'Paket Express', 'Fragile', 'Umum',
+                  'Makanan', 'Tekstil', 'Otomotif', 'Kimia', 'Perkakas']
+AREA_TYPES = ['rak', 'lantai', 'khusus']
+
+# Advisory lock bernama, dibagi semua InMemoryDatabase dalam proses (setara GET_LOCK server MySQL)
+_ADVISORY_LOCKS: Dict[str, threading.Lock] = {}
+_ADVISORY_LOCKS_GUARD = threading.Lock()
+
+
+def default_area_count(n_items: int) -> int:
+    """Jumlah area default: tumbuh ~√N, minimal 5 dan maksimal 2000"""
+    return int(min(2000, max(5, round(math.sqrt(n_items)))))
+
+
+def _category_names(n_categories: int) -> List[str]:
+    names = []
+    for c in range(n_categories):
+        base = CATEGORY_NAMES[c % len(CATEGORY_NAMES)]
+        names.append(base if c < len(CATEGORY_NAMES) else f"{base} {c // len(CATEGORY_NAMES) + 1}")
+    return names
+
+
+def generate_area_arrays(n_areas: int, total_volume: float, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Layout blok rak 10x2 m dengan lorong 3 m, kapasitas total ≈ total volume / 0.7
+    """
+    rng = np.random.default_rng(seed)
+    per_row = max(1, int(math.ceil(math.sqrt(n_areas / 4))))
+    col = np.arange(n_areas) % per_row
+    row = np.arange(n_areas) // per_row
+
+    panjang = np.full(n_areas, 10.0)
+    lebar = np.full(n_areas, 2.0)
+    koordinat_x = 3.0 + col * (panjang + 3.0)
+    koordinat_y = 3.0 + row * (lebar + 3.0)
+    tinggi = rng.choice([3.0, 4.0, 5.0, 6.0], size=n_areas)
+
+    weight = rng.uniform(0.5, 1.5, size=n_areas)
+    kapasitas = np.round(weight / weight.sum() * total_volume / 0.7, 2) + 1.0
+    jenis = rng.choice(len(AREA_TYPES), size=n_areas, p=[0.7, 0.2, 0.1])
+
+    return {
+        'id': np.arange(1, n_areas + 1),
+        'koordinat_x': koordinat_x,
+        'koordinat_y': koordinat_y,
+        'panjang': panjang,
+        'lebar': lebar,
+        'tinggi': tinggi,
+        'kapasitas': kapasitas,
+        'jenis_area': jenis,
+    }
+
+
+def generate_item_arrays(n_items: int, n_categories: int = 10, seed: int = 0,
+                         max_quantity: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Barang dengan volume log-normal, kategori Zipf-like, frekuensi akses 1-10,
+    dan stok 1..max_quantity unit (stream RNG terpisah: barang tetap sama)
+    """
+    rng = np.random.default_rng(seed + 1)
+    panjang = np.round(rng.lognormal(0.0, 0.5, size=n_items), 2) + 0.1
+    lebar = np.round(rng.lognormal(-0.3, 0.4, size=n_items), 2) + 0.1
+    tinggi = np.round(rng.lognormal(-0.3, 0.4, size=n_items), 2) + 0.1
+    weights = 1.0 / np.arange(1, n_categories + 1)
+    kategori = rng.choice(n_categories, size=n_items, p=weights / weights.sum())
+    frekuensi = rng.integers(1, 11, size=n_items)
+    jumlah = (np.random.default_rng(seed + 2).integers(1, max_quantity + 1, size=n_items) if max_quantity > 1
+              else np.ones(n_items, dtype=np.int64))
+
+    return {
+        'id': np.arange(1, n_items + 1),
+        'panjang': panjang,
+        'lebar': lebar,
+        'tinggi': tinggi,
+        'volume': panjang * lebar * tinggi,
+        'kategori': kategori,
+        'frekuensi_akses': frekuensi,
+        'jumlah': jumlah,
+    }
+
+
+def _stock_volume(items: Dict[str, np.ndarray]) -> float:
+    return float((items['volume'] * items['jumlah']).sum())
+
+
+def generate_co_access_sessions(n_items: int, n_sessions: int, seed: int = 0,
+                                basket_size: int = 20) -> List[Tuple[str, int]]:
+    """
+    Sesi pengambilan sintetis (sesi, barang_id): setiap sesi mengambil 2-6
+    barang dari satu "keranjang" basket_size barang yang diacak sekali,
+    sehingga ada pasangan co-access yang konsisten
+    """
+    if n_items < 2 or n_sessions <= 0:
+        return []
+    rng = np.random.default_rng(seed + 3)
+    ids = rng.permutation(n_items) + 1
+    n_baskets = max(1, n_items // basket_size)
+    rows = []
+    for s, (basket, size) in enumerate(zip(rng.integers(0, n_baskets, size=n_sessions),
+                                           rng.integers(2, 7, size=n_sessions))):
+        members = ids[basket * basket_size:(basket + 1) * basket_size]
+        picked = rng.choice(members, size=min(int(size), len(members)), replace=False)
+        rows.extend((f"syn:{s}", int(barang_id)) for barang_id in picked)
+    return rows
+
+
+def synthetic_problem(n_items: int, n_areas: Optional[int] = None, n_categories: int = 10,
+                      seed: int = 0, max_quantity: int = 1) -> CompiledProblem:
+    """CompiledProblem sintetis dibangun langsung dari array (cepat untuk 1M barang)"""
+    items = generate_item_arrays(n_items, n_categories, seed, max_quantity)
+    areas = generate_area_arrays(n_areas or default_area_count(n_items), _stock_volume(items), seed)
+    names = _category_names(n_categories)
+
+    return CompiledProblem(
+        item_ids=items['id'],
+        volume=items['volume'],
+        frequency=items['frekuensi_akses'],
+        category=items['kategori'],
+        category_ids=list(range(1, n_categories + 1)),
+        category_names=names,
+        area_ids=areas['id'],
+        area_rects=np.stack([areas['koordinat_x'], areas['koordinat_y'],
+                             areas['koordinat_x'] + areas['panjang'],
+                             areas['koordinat_y'] + areas['lebar']], axis=1),
+        capacity=areas['kapasitas'],
+        quantity=items['jumlah'],
+    )
+
+
+def generate_warehouse(n_items: int, n_areas: Optional[int] = None, n_categories: int = 10,
+                       seed: int = 0, max_quantity: int = 1) -> Tuple[List, List]:
+    """
+    Menghasilkan list AreaGudang dan Barang sintetis (seeded)
+
+    Returns:
+        (areas, barang_list) siap dipakai WarehouseOptimizer
+    """
+    from warehouse_optimization import AreaGudang, Barang
+
+    items = generate_item_arrays(n_items, n_categories, seed, max_quantity)
+    area_data = generate_area_arrays(n_areas or default_area_count(n_items), _stock_volume(items), seed)
+    names = _category_names(n_categories)
+
+    areas = [
+        AreaGudang(
+            id=int(area_data['id'][i]),
+            kode_area=f"S{i + 1:04d}",
+            nama_area=f"Area S{i + 1:04d}",
+            koordinat_x=float(area_data['koordinat_x'][i]),
+            koordinat_y=float(area_data['koordinat_y'][i]),
+            panjang=float(area_data['panjang'][i]),
+            lebar=float(area_data['lebar'][i]),
+            tinggi=float(area_data['tinggi'][i]),
+            kapasitas=float(area_data['kapasitas'][i]),
+            kapasitas_terpakai=0.0,
+            jenis_area=AREA_TYPES[area_data['jenis_area'][i]],
+            tersedia=True,
+        )
+        for i in range(len(area_data['id']))
+    ]
+
+    barang_list = [
+        Barang(
+            id=int(item_id),
+            kode_barang=f"SYN-{item_id:07d}",
+            nama_barang=f"Barang Sintetis {item_id}",
+            volume=float(volume),
+            kategori_id=int(kategori) + 1,
+            kategori_nama=names[kategori],
+            frekuensi_akses=int(frekuensi),
+            prioritas=1,
+            jumlah=int(jumlah),
+        )
+        for item_id, volume, kategori, frekuensi, jumlah in zip(
+            items['id'], items['volume'], items['kategori'], items['frekuensi_akses'], items['jumlah'])
+    ]
+
+    return areas, barang_list
+
+
+class InMemoryDatabase:
+    """
+    Pengganti DatabaseManager untuk benchmark/pengujian offline
+
+    Menyimpan tabel area_gudang, barang, rekomendasi_penempatan, dan
+    log_optimasi dalam list/dict Python dengan method yang sama.
+    n_sessions > 0 menambahkan riwayat pengambilan untuk affinity co-access.
+    """
+
+    def __init__(self, n_items: int = 0, n_areas: Optional[int] = None, n_categories: int = 10, seed: int = 0,
+                 max_quantity: int = 1, n_sessions: int = 0):
+        self.db_config = {'database': 'in_memory'}
+        self.connection = None
+        self.cursor = None
+        self.area_rows: List[Dict] = []
+        self.barang_rows: List[Dict] = []
+        self.recommendations: List[Dict] = []
+        self.summaries: Dict[str, List[Dict]] = {}  # ringkasan_area_optimasi / ringkasan_kategori_optimasi
+        self.log_optimasi: Dict[int, Dict] = {}
+        self.co_access_rows: List[Tuple[str, int]] = []
+
+        if n_items:
+            self.populate(n_items, n_areas, n_categories, seed, max_quantity, n_sessions)
+
+    def populate(self, n_items: int, n_areas: Optional[int] = None, n_categories: int = 10, seed: int = 0,
+                 max_quantity: int = 1, n_sessions: int = 0):
+        """Isi tabel dengan data sintetis"""
+        items = generate_item_arrays(n_items, n_categories, seed, max_quantity)
+        self.co_access_rows = generate_co_access_sessions(n_items, n_sessions, seed)
+        if self.co_access_rows:
+            # Cache affinity dikunci nama database: bedakan dataset sintetis
+            self.db_config['database'] = f"in_memory_{n_items}_{seed}_{n_sessions}"
+        areas = generate_area_arrays(n_areas or default_area_count(n_items), _stock_volume(items), seed)
+        names = _category_names(n_categories)
+
+        self.area_rows = [
+            {
+                'id': int(areas['id'][i]),
+                'gudang_id': 1,
+                'kode_area': f"S{i + 1:04d}",
+                'nama_area': f"Area S{i + 1:04d}",
+                'koordinat_x': float(areas['koordinat_x'][i]),
+                'koordinat_y': float(areas['koordinat_y'][i]),
+                'panjang': float(areas['panjang'][i]),
+                'lebar': float(areas['lebar'][i]),
+                'tinggi': float(areas['tinggi'][i]),
+                'kapasitas': float(areas['kapasitas'][i]),
+                'kapasitas_terpakai': 0.0,
+                'jenis_area': AREA_TYPES[areas['jenis_area'][i]],
+                'tersedia': 1,
+            }
+            for i in range(len(areas['id']))
+        ]
+        self.barang_rows = [
+            {
+                'id': int(items['id'][i]),
+                'kode_barang': f"SYN-{i + 1:07d}",
+                'nama_barang': f"Barang Sintetis {i + 1}",
+                'panjang': float(items['panjang'][i]),
+                'lebar': float(items['lebar'][i]),
+                'tinggi': float(items['tinggi'][i]),
+                'volume': float(items['volume'][i]),
+                'kategori_barang_id': int(items['kategori'][i]) + 1,
+                'nama_kategori': names[items['kategori'][i]],
+                'jumlah': int(items['jumlah'][i]),
+            }
+            for i in range(n_items)
+        ]
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self):
+        pass
+
+    def fetch_areas(self) -> List[Dict]:
+        return [row for row in self.area_rows if row['tersedia']]
+
+    def fetch_barang(self) -> List[Dict]:
+        return list(self.barang_rows)
+
+    def fetch_area_columns(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AreaColumns:
+        return AreaColumns.from_chunks(row_chunks(self.fetch_areas(), AREA_COLUMNS, chunk_size), AREA_COLUMNS)
+
+    def fetch_barang_columns(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BarangColumns:
+        return BarangColumns.from_chunks(row_chunks(self.barang_rows, BARANG_COLUMNS, chunk_size), BARANG_COLUMNS)
+
+    def fetch_existing_placements(self) -> List[Dict]:
+        return []
+
+    def fetch_co_access_pairs(self, window_days: int = 90, bucket_minutes: int = 30) -> List[Tuple]:
+        return list(self.co_access_rows)
+
+    def acquire_advisory_lock(self, name: str, timeout: int = 0) -> Optional[bool]:
+        with _ADVISORY_LOCKS_GUARD:
+            lock = _ADVISORY_LOCKS.setdefault(name, threading.Lock())
+        return lock.acquire(timeout=timeout) if timeout > 0 else lock.acquire(blocking=timeout < 0)
+
+    def release_advisory_lock(self, name: str) -> bool:
+        lock = _ADVISORY_LOCKS.get(name)
+        if lock is None or not lock.locked():
+            return False
+        lock.release()
+        return True
+
+    def _replace_summaries(self, summaries: Optional[Dict[str, List[Dict]]] = None,
+                           log_optimasi_id: Optional[int] = None, source_log_optimasi_id: Optional[int] = None):
+        if not log_optimasi_id or not (summaries or source_log_optimasi_id):
+            return
+        for kind in ('area', 'kategori'):
+            table = self.summaries.setdefault(kind, [])
+            if summaries:
+                rows = list(summaries.get(kind) or [])
+            else:
+                rows = [dict(row, log_optimasi_id=log_optimasi_id) for row in table
+                        if row['log_optimasi_id'] == source_log_optimasi_id]
+            table[:] = [row for row in table if row['log_optimasi_id'] != log_optimasi_id] + rows
+
+    def save_optimization_results(self, recommendations: List[Dict],
+                                  summaries: Optional[Dict[str, List[Dict]]] = None,
+                                  summary_source_log_id: Optional[int] = None) -> bool:
+        if not recommendations:
+            return False
+        algoritma = recommendations[0].get('algoritma', 'Simulated Annealing')
+        log_optimasi_id = recommendations[0].get('log_optimasi_id')
+        replaced_logs = {r.get('log_optimasi_id') for r in self.recommendations
+                         if r.get('algoritma') == algoritma} - {log_optimasi_id}
+        self.recommendations = [r for r in self.recommendations if r.get('algoritma') != algoritma]
+        self.recommendations.extend(recommendations)
+        self._replace_summaries(summaries, log_optimasi_id, summary_source_log_id)
+        for table in self.summaries.values():
+            table[:] = [row for row in table if row['log_optimasi_id'] not in replaced_logs]
+        return True
+
+    def upsert_recommendations(self, recommendations: List[Dict],
+                               summaries: Optional[Dict[str, List[Dict]]] = None,
+                               removed: Optional[List[Tuple[str, int]]] = None) -> bool:
+        if not recommendations and not removed:
+            return True
+        keys = {(r['algoritma'], r['barang_id']) for r in recommendations} | set(removed or [])
+        self.recommendations = [r for r in self.recommendations if (r.get('algoritma'), r['barang_id']) not in keys]
+        self.recommendations.extend(recommendations)
+        rows = recommendations or [row for kind_rows in (summaries or {}).values() for row in kind_rows]
+        self._replace_summaries(summaries, rows[0].get('log_optimasi_id') if rows else None)
+        return True
+
+    def update_optimization_status(self, log_optimasi_id: int, status: str,
+                                   hasil_optimasi: Dict = None, detail_hasil: str = None) -> bool:
+        entry = self.log_optimasi.setdefault(log_optimasi_id, {})
+        entry['status'] = status
+        if hasil_optimasi:
+            entry['hasil_optimasi'] = json.loads(json.dumps(hasil_optimasi, default=float))
+        if detail_hasil:
+            entry['detail_hasil'] = detail_hasil
+        return True
+
+    def get_optimization_status(self, log_optimasi_id: int) -> Optional[str]:
+        return self.log_optimasi.get(log_optimasi_id, {}).get('status')
+
+    def get_optimization_result(self, log_optimasi_id: int) -> Optional[Dict]:
+        hasil = self.log_optimasi.get(log_optimasi_id, {}).get('hasil_optimasi')
+        return json.loads(json.dumps(hasil)) if hasil else None
+
+    def set_optimization_running(self, log_optimasi_id: int) -> bool:
+        self.log_optimasi.setdefault(log_optimasi_id, {})['status'] = 'sedang_berjalan'
+        return True
+
+    def master_data_fingerprint(self) -> Optional[str]:
+        digest = hashlib.sha256()
+        area_fields = ('id', 'gudang_id', 'kode_area', 'koordinat_x', 'koordinat_y', 'panjang', 'lebar',
+                       'tinggi', 'kapasitas', 'kapasitas_terpakai', 'jenis_area')
+        barang_fields = ('id', 'kode_barang', 'panjang', 'lebar', 'tinggi', 'kategori_barang_id', 'nama_kategori',
+                         'jumlah')
+        for row in self.fetch_areas():
+            digest.update(repr(tuple(row[f] for f in area_fields)).encode())
+        for row in self.barang_rows:
+            digest.update(repr(tuple(row[f] for f in barang_fields)).encode())
+        for row in self.co_access_rows:
+            digest.update(repr(row).encode())
+        return f"area_gudang:{len(self.fetch_areas())};barang:{len(self.barang_rows)};{digest.hexdigest()}"
+
+    def get_database_stats(self) -> Dict:
+        total_capacity = sum(row['kapasitas'] for row in self.area_rows if row['tersedia'])
+        used_capacity = sum(row['kapasitas_terpakai'] for row in self.area_rows if row['tersedia'])
+        stats = {
+            'areas': len(self.fetch_areas()),
+            'total_areas': len(self.area_rows),
+            'barang': len(self.barang_rows),
+            'kategori': len({row['kategori_barang_id'] for row in self.barang_rows}),
+            'placements': 0,
+            'recommendations': len(self.recommendations),
+            'capacity_utilization': (used_capacity / total_capacity) * 100 if total_capacity else 0,
+        }
+        area_rows = self.summaries.get('area', [])
+        if area_rows:
+            log_id = max(row['log_optimasi_id'] for row in area_rows)
+            latest = [row for row in area_rows if row['log_optimasi_id'] == log_id]
+            capacity = sum(row['kapasitas'] for row in latest)
+            stats['summary_log_optimasi_id'] = log_id
+            stats['summary_runs'] = sum(row['jumlah_run'] for row in latest)
+            stats['summary_items'] = sum(row['jumlah_barang'] for row in self.summaries.get('kategori', [])
+                                         if row['log_optimasi_id'] == log_id)
+            stats['projected_utilization'] = (sum(row['volume_terpakai'] for row in latest) / capacity * 100
+                                              if capacity else 0)
+        return stats
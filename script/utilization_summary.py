@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tabel Ringkasan Utilisasi per Log Optimasi
+
+Dashboard dan laporan tidak perlu lagi mengagregasi rekomendasi_penempatan
+per area dan kategori pada setiap request. Saat hasil optimasi disimpan,
+optimizer menulis ringkasan per log_optimasi_id dalam transaksi yang sama:
+
+- ringkasan_area_optimasi: jumlah barang, jumlah run, volume terpakai,
+  kapasitas, utilisasi proyeksi (%), dan rata-rata jarak tempuh dari pintu
+  per area
+- ringkasan_kategori_optimasi: jumlah barang, jumlah run, total volume,
+  jumlah area yang dipakai, dan rata-rata jarak tempuh per kategori
+
+jumlah_barang menghitung barang unik, jumlah_run menghitung baris
+rekomendasi (barang yang dipecah menjadi beberapa run dihitung sekali per
+area/kategori di jumlah_barang).
+
+Ringkasan dihitung vectorized (np.bincount) dari layout terkompilasi.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-19
+"""
+
+import numpy as np
+from typing import Dict, List
+
+from optimization_problem import CompiledProblem, id_positions
+
+
+def _mean(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+    return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+
+def summarize_layout(problem: CompiledProblem, area_idx: np.ndarray, x: np.ndarray, y: np.ndarray,
+                     log_optimasi_id: int) -> Dict[str, List[Dict]]:
+    """
+    Baris ringkasan area dan kategori untuk satu layout (area_idx -1 = tidak ditempatkan)
+
+    Semua area tersedia mendapat baris (termasuk yang kosong) agar utilisasi
+    proyeksi area kosong ikut terbaca; kategori hanya yang memiliki barang.
+    """
+    area_idx = np.asarray(area_idx, dtype=np.int64)
+    placed = np.flatnonzero(area_idx >= 0)
+    return _summarize(problem, placed, area_idx[placed], np.asarray(x)[placed], np.asarray(y)[placed],
+                      problem.volume[placed], log_optimasi_id)
+
+
+def _summarize(problem: CompiledProblem, items: np.ndarray, areas: np.ndarray, x: np.ndarray, y: np.ndarray,
+               volumes: np.ndarray, log_optimasi_id: int) -> Dict[str, List[Dict]]:
+    """Agregasi per baris penempatan (satu barang boleh muncul di beberapa run)"""
+    p = problem
+    distance = p.travel_distance(areas, x, y)
+    categories = p.category[items]
+    n_categories = len(p.category_ids)
+    # Barang unik: run satu barang berbagi barang_id di problem yang dipecah
+    barang_ids, first_run, barang = np.unique(p.item_ids[items], return_index=True, return_inverse=True)
+    n_barang = max(len(barang_ids), 1)
+
+    count = np.bincount(areas, minlength=p.n_areas)
+    area_barang = np.bincount(np.unique(areas * n_barang + barang.reshape(-1)) // n_barang, minlength=p.n_areas)
+    volume = np.bincount(areas, weights=volumes, minlength=p.n_areas)
+    area_distance = _mean(np.bincount(areas, weights=distance, minlength=p.n_areas), count.astype(np.float64))
+    utilization = np.divide(volume, p.capacity, out=np.zeros_like(volume), where=p.capacity > 0) * 100
+
+    category_count = np.bincount(categories, minlength=n_categories)
+    category_barang = np.bincount(categories[first_run], minlength=n_categories)
+    category_volume = np.bincount(categories, weights=volumes, minlength=n_categories)
+    category_distance = _mean(np.bincount(categories, weights=distance, minlength=n_categories),
+                              category_count.astype(np.float64))
+    pairs = np.unique(categories * p.n_areas + areas)
+    category_areas = np.bincount(pairs // max(p.n_areas, 1), minlength=n_categories)
+
+    log_id = int(log_optimasi_id)
+    area_rows = [{
+        'log_optimasi_id': log_id,
+        'area_gudang_id': int(p.area_ids[a]),
+        'jumlah_barang': int(area_barang[a]),
+        'jumlah_run': int(count[a]),
+        'volume_terpakai': round(float(volume[a]), 4),
+        'kapasitas': round(float(p.capacity[a]), 4),
+        'utilisasi_proyeksi': round(float(utilization[a]), 2),
+        'rata_rata_jarak': round(float(area_distance[a]), 4),
+    } for a in np.union1d(p.available, np.flatnonzero(count)).tolist()]
+    category_rows = [{
+        'log_optimasi_id': log_id,
+        'kategori_barang_id': int(p.category_ids[c]),
+        'jumlah_barang': int(category_barang[c]),
+        'jumlah_run': int(category_count[c]),
+        'total_volume': round(float(category_volume[c]), 4),
+        'jumlah_area': int(category_areas[c]),
+        'rata_rata_jarak': round(float(category_distance[c]), 4),
+    } for c in np.flatnonzero(category_count).tolist()]
+    return {'area': area_rows, 'kategori': category_rows}
+
+
+def summarize_recommendations(problem: CompiledProblem, recommendations: List[Dict],
+                              log_optimasi_id: int) -> Dict[str, List[Dict]]:
+    """
+    Ringkasan dari baris rekomendasi (barang atau area di luar problem
+    diabaikan); volume baris = volume satuan barang × jumlah unit run
+    """
+    items = id_positions(problem.item_ids, [rec['barang_id'] for rec in recommendations])
+    areas = id_positions(problem.area_ids, [rec['area_gudang_id'] for rec in recommendations])
+    known = (items >= 0) & (areas >= 0)
+    x = np.array([rec['koordinat_x'] for rec in recommendations], dtype=np.float64)[known]
+    y = np.array([rec['koordinat_y'] for rec in recommendations], dtype=np.float64)[known]
+    quantity = np.array([rec.get('jumlah', 1) for rec in recommendations], dtype=np.float64)[known]
+    items, areas = items[known], areas[known]
+    return _summarize(problem, items, areas, x, y, problem.unit_volume[items] * quantity, log_optimasi_id)
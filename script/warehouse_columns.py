@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Data Master Gudang dalam Bentuk Kolom (Columnar)
+
+Loader lama membaca baris lewat dictionary cursor lalu membuat satu objek
+`AreaGudang`/`Barang` per baris, sehingga 1M barang berarti jutaan objek
+Python (dict baris, dataclass, float, str) sebelum dikompilasi ke array.
+Modul ini mengisi array NumPy bertipe langsung dari chunk tuple cursor:
+
+- kolom numerik  : int64 / float64 / bool
+- StringColumn   : string unik per baris (kode, nama) dalam satu buffer
+                   UTF-8 + offset int64, bukan satu objek str per baris
+- Categorical    : string berulang (kategori, jenis area) di-intern menjadi
+                   kode int32 + tabel level
+
+API dataclass tetap tersedia sebagai view (`RecordView`): objek
+`AreaGudang`/`Barang` baru dibuat saat diakses.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import numpy as np
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Urutan kolom hasil query (DatabaseManager dan InMemoryDatabase)
+AREA_COLUMNS = ('id', 'gudang_id', 'kode_area', 'nama_area', 'koordinat_x', 'koordinat_y', 'panjang',
+                'lebar', 'tinggi', 'kapasitas', 'kapasitas_terpakai', 'jenis_area', 'tersedia')
+BARANG_COLUMNS = ('id', 'kode_barang', 'nama_barang', 'panjang', 'lebar', 'tinggi',
+                  'kategori_barang_id', 'nama_kategori', 'jumlah')
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Ukuran batch saat view membuat dataclass secara berurutan
+RECORD_BATCH = 65536
+
+
+class StringColumn:
+    """Kolom string dalam satu buffer UTF-8 dengan offset per baris"""
+
+    def __init__(self, data: bytes = b'', offsets: Optional[np.ndarray] = None):
+        self.data = data
+        self.offsets = np.zeros(1, dtype=np.int64) if offsets is None else np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values: Iterable) -> 'StringColumn':
+        encoded = [('' if v is None else str(v)).encode('utf-8') for v in values]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(b''.join(encoded), offsets)
+
+    @classmethod
+    def concat(cls, parts: List['StringColumn']) -> 'StringColumn':
+        if not parts:
+            return cls()
+        shifts = np.cumsum([0] + [len(p.data) for p in parts[:-1]])
+        offsets = np.concatenate([parts[0].offsets[:1]] + [p.offsets[1:] + s for p, s in zip(parts, shifts)])
+        return cls(b''.join(p.data for p in parts), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def tolist(self) -> List[str]:
+        data, offsets = self.data, self.offsets.tolist()
+        return [data[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def take(self, index: np.ndarray) -> 'StringColumn':
+        """Subset baris (vectorized, tanpa decode)"""
+        index = np.asarray(index, dtype=np.int64)
+        starts = self.offsets[index]
+        lengths = self.offsets[index + 1] - starts
+        offsets = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        buffer = np.frombuffer(self.data, dtype=np.uint8)
+        return StringColumn(buffer[positions].tobytes(), offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+
+class Categorical:
+    """Kolom string berulang: kode int32 per baris + daftar level (string di-intern)"""
+
+    def __init__(self, codes: Optional[np.ndarray] = None, levels: Optional[List[str]] = None):
+        self.codes = np.zeros(0, dtype=np.int32) if codes is None else np.asarray(codes, dtype=np.int32)
+        self.levels = list(levels or [])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.levels[self.codes[i]]
+
+    def tolist(self) -> List[str]:
+        levels = self.levels
+        return [levels[c] for c in self.codes.tolist()]
+
+    def take(self, index: np.ndarray) -> 'Categorical':
+        return Categorical(self.codes[index], self.levels)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+class _CategoricalBuilder:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.chunks: List[np.ndarray] = []
+
+    def append(self, values: Tuple):
+        index = self.index
+        codes = [index.setdefault('' if v is None else str(v), len(index)) for v in values]
+        self.chunks.append(np.array(codes, dtype=np.int32))
+
+    def build(self) -> Categorical:
+        codes = np.concatenate(self.chunks) if self.chunks else np.zeros(0, dtype=np.int32)
+        return Categorical(codes, list(self.index))
+
+
+class ColumnTable:
+    """
+    Tabel kolom dengan view dataclass
+
+    Subclass menentukan skema (`SCHEMA`: nama kolom → dtype / StringColumn /
+    Categorical) dan `record()` yang membuat satu objek dataclass.
+    """
+
+    SCHEMA: Dict = {}
+
+    def __init__(self, columns: Dict):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[List[Tuple]], names: Tuple[str, ...]) -> 'ColumnTable':
+        """Bangun tabel dari chunk baris tuple (urutan kolom = `names`)"""
+        numeric: Dict[str, List[np.ndarray]] = {}
+        strings: Dict[str, List[StringColumn]] = {}
+        categoricals: Dict[str, _CategoricalBuilder] = {}
+        for name, kind in cls.SCHEMA.items():
+            if kind is StringColumn:
+                strings[name] = []
+            elif kind is Categorical:
+                categoricals[name] = _CategoricalBuilder()
+            else:
+                numeric[name] = []
+
+        for rows in chunks:
+            if not rows:
+                continue
+            for name, values in zip(names, zip(*rows)):
+                if name in numeric:
+                    kind = cls.SCHEMA[name]
+                    # DECIMAL dari MySQL dikonversi per elemen; NULL menjadi 0
+                    numeric[name].append(np.array([0 if v is None else v for v in values], dtype=kind)
+                                         if None in values else np.array(values, dtype=kind))
+                elif name in strings:
+                    strings[name].append(StringColumn.from_values(values))
+                elif name in categoricals:
+                    categoricals[name].append(values)
+
+        columns = {}
+        for name, kind in cls.SCHEMA.items():
+            if name in numeric:
+                columns[name] = np.concatenate(numeric[name]) if numeric[name] else np.zeros(0, dtype=kind)
+            elif name in strings:
+                columns[name] = StringColumn.concat(strings[name])
+            else:
+                columns[name] = categoricals[name].build()
+        return cls(columns)
+
+    def take(self, index: np.ndarray) -> 'ColumnTable':
+        """Subset baris (mask bool atau indeks)"""
+        index = np.asarray(index)
+        if index.dtype == bool:
+            index = np.flatnonzero(index)
+        return type(self)({name: col.take(index) if isinstance(col, (StringColumn, Categorical)) else col[index]
+                           for name, col in self.columns.items()})
+
+    def filter_ids(self, name: str, ids: Optional[List[int]]) -> 'ColumnTable':
+        """Subset baris dengan nilai kolom `name` di `ids` (tanpa filter jika ids kosong)"""
+        if not ids:
+            return self
+        return self.take(np.isin(self.columns[name], np.asarray(list(ids), dtype=np.int64)))
+
+    def records(self) -> 'RecordView':
+        return RecordView(self)
+
+    def record(self, i: int):
+        raise NotImplementedError
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        raise NotImplementedError
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(col.nbytes for col in self.columns.values()))
+
+
+class AreaColumns(ColumnTable):
+    """Kolom area_gudang (record: AreaGudang)"""
+
+    SCHEMA = {
+        'id': np.int64,
+        'gudang_id': np.int64,
+        'kode_area': StringColumn,
+        'nama_area': StringColumn,
+        'koordinat_x': np.float64,
+        'koordinat_y': np.float64,
+        'panjang': np.float64,
+        'lebar': np.float64,
+        'tinggi': np.float64,
+        'kapasitas': np.float64,
+        'kapasitas_terpakai': np.float64,
+        'jenis_area': Categorical,
+        'tersedia': np.bool_,
+    }
+
+    def record(self, i: int):
+        return next(self.iter_records(i, i + 1))
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        from warehouse_optimization import AreaGudang
+
+        c = self.columns
+        stop = len(self) if stop is None else stop
+        for lo in range(start, stop, RECORD_BATCH):
+            hi = min(stop, lo + RECORD_BATCH)
+            rows = zip(
+                c['id'][lo:hi].tolist(), c['kode_area'].take(np.arange(lo, hi)).tolist(),
+                c['nama_area'].take(np.arange(lo, hi)).tolist(),
+                c['koordinat_x'][lo:hi].tolist(), c['koordinat_y'][lo:hi].tolist(),
+                c['panjang'][lo:hi].tolist(), c['lebar'][lo:hi].tolist(), c['tinggi'][lo:hi].tolist(),
+                c['kapasitas'][lo:hi].tolist(), c['kapasitas_terpakai'][lo:hi].tolist(),
+                c['jenis_area'].take(np.arange(lo, hi)).tolist(), c['tersedia'][lo:hi].tolist(),
+            )
+            for row in rows:
+                yield AreaGudang(*row)
+
+
+class BarangColumns(ColumnTable):
+    """
+    Kolom barang ⋈ kategori_barang (record: Barang)
+
+    volume, frekuensi_akses, dan prioritas adalah kolom turunan yang diisi
+    oleh WarehouseOptimizer setelah load.
+    """
+
+    SCHEMA = {
+        'id': np.int64,
+        'kode_barang': StringColumn,
+        'nama_barang': StringColumn,
+        'panjang': np.float64,
+        'lebar': np.float64,
+        'tinggi': np.float64,
+        'kategori_barang_id': np.int64,
+        'nama_kategori': Categorical,
+        'jumlah': np.int64,
+    }
+
+    def __init__(self, columns: Dict):
+        super().__init__(columns)
+        n = len(columns['id'])
+        if 'volume' not in columns:
+            columns['volume'] = columns['panjang'] * columns['lebar'] * columns['tinggi']
+        columns.setdefault('frekuensi_akses', np.ones(n, dtype=np.int64))
+        columns.setdefault('prioritas', np.ones(n, dtype=np.int8))
+
+    def record(self, i: int):
+        return next(self.iter_records(i, i + 1))
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        from warehouse_optimization import Barang
+
+        c = self.columns
+        stop = len(self) if stop is None else stop
+        for lo in range(start, stop, RECORD_BATCH):
+            hi = min(stop, lo + RECORD_BATCH)
+            rows = zip(
+                c['id'][lo:hi].tolist(), c['kode_barang'].take(np.arange(lo, hi)).tolist(),
+                c['nama_barang'].take(np.arange(lo, hi)).tolist(), c['volume'][lo:hi].tolist(),
+                c['kategori_barang_id'][lo:hi].tolist(), c['nama_kategori'].take(np.arange(lo, hi)).tolist(),
+                c['frekuensi_akses'][lo:hi].tolist(), c['prioritas'][lo:hi].tolist(), c['jumlah'][lo:hi].tolist(),
+            )
+            for row in rows:
+                yield Barang(*row)
+
+
+class RecordView(Sequence):
+    """
+    View read-only berisi dataclass di atas ColumnTable
+
+    Dipakai sebagai `optimizer.areas` / `optimizer.barang_list` agar kode
+    yang mengiterasi objek tetap berjalan; objek dibuat saat diakses.
+    """
+
+    def __init__(self, table: ColumnTable):
+        self.columns = table
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.columns.record(k) for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return self.columns.record(i)
+
+    def __iter__(self) -> Iterator:
+        return self.columns.iter_records()
+
+    def __repr__(self) -> str:
+        return f"<RecordView {type(self.columns).__name__} rows={len(self)}>"
+
+
+def table_of(records) -> Optional[ColumnTable]:
+    """ColumnTable di balik list records (None jika records berupa list objek biasa)"""
+    return records.columns if isinstance(records, RecordView) else None
+
+
+def row_chunks(rows: List, names: Tuple[str, ...], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+    """Chunk tuple dari list dict baris (untuk sumber data yang tidak punya tuple cursor)"""
+    for lo in range(0, len(rows), chunk_size):
+        yield [tuple(row[name] for name in names) for row in rows[lo:lo + chunk_size]]
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Model Graf Lorong Gudang (Aisle Graph) untuk Jarak Tempuh Picker
+
+Picker tidak bisa berjalan menembus rak, sehingga jarak garis lurus dari pintu
+masuk (0,0) meremehkan biaya tempuh sebenarnya. Modul ini membangun graf
+visibilitas dari koordinat area gudang:
+
+1. Node   : pintu masuk, titik akses tiap area, dan sudut-sudut rak
+            (diperbesar sebesar `clearance` agar berada di lorong)
+2. Edge   : segmen lurus antar node yang tidak memotong rak manapun (lorong)
+3. Jarak  : shortest path (Dijkstra, scipy.sparse.csgraph) dari pintu ke
+            setiap area dan antar area
+
+Matriks jarak dihitung sekali per layout, disimpan ke disk dengan kunci
+fingerprint layout, lalu di-memory-map oleh setiap run sehingga model biaya
+yang lebih akurat tidak menambah overhead per iterasi.
+
+Author: Sistem Gudang NCS
+Date: 2025-10-18
+"""
+
+import os
+import hashlib
+import numpy as np
+from typing import List, Optional, Tuple
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+# Versi format cache, naikkan jika cara membangun graf berubah
+GRAPH_CACHE_VERSION = 1
+
+# Jenis area yang berupa rak fisik (tidak bisa dilewati picker)
+OBSTACLE_AREA_TYPES = ('rak', 'khusus')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'distance_matrix')
+
+
+class WarehouseGraph:
+    """
+    Graf lorong gudang dan matriks jarak shortest-path antar area
+
+    Indeks matriks: 0 = pintu masuk, i + 1 = area ke-i (urutan sesuai list areas).
+    """
+
+    def __init__(self, areas: List, door: Tuple[float, float] = (0.0, 0.0),
+                 clearance: float = 0.5, neighbors: int = 16,
+                 cache_dir: Optional[str] = None):
+        self.areas = areas
+        self.door = (float(door[0]), float(door[1]))
+        self.clearance = float(clearance)
+        self.neighbors = int(neighbors)
+        self.cache_dir = cache_dir or os.getenv('WAREHOUSE_GRAPH_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+        # Geometri area sebagai array (x0, y0, x1, y1)
+        self.rects = np.array([
+            (a.koordinat_x, a.koordinat_y, a.koordinat_x + a.panjang, a.koordinat_y + a.lebar)
+            for a in areas
+        ], dtype=np.float64).reshape(-1, 4)
+        is_obstacle = np.array([a.jenis_area in OBSTACLE_AREA_TYPES for a in areas], dtype=bool)
+        self.obstacles = self.rects[is_obstacle]
+
+        self.access_points = self._compute_access_points()
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash layout (geometri area + parameter graf) untuk kunci cache"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            digest.update(repr((GRAPH_CACHE_VERSION, self.door, self.clearance, self.neighbors)).encode())
+            for area, rect in zip(self.areas, self.rects):
+                digest.update(repr((area.id, area.jenis_area, tuple(np.round(rect, 4)))).encode())
+            self._fingerprint = digest.hexdigest()[:20]
+        return self._fingerprint
+
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.cache_dir, f"aisle_{self.fingerprint}.npy")
+
+    def _inside_obstacle(self, points: np.ndarray) -> np.ndarray:
+        """Cek apakah titik berada di dalam rak (interior, bukan tepi)"""
+        if len(self.obstacles) == 0:
+            return np.zeros(len(points), dtype=bool)
+        px = points[:, 0:1]
+        py = points[:, 1:2]
+        o = self.obstacles
+        inside = (px > o[:, 0] + 1e-9) & (px < o[:, 2] - 1e-9) & (py > o[:, 1] + 1e-9) & (py < o[:, 3] - 1e-9)
+        return inside.any(axis=1)
+
+    def _compute_access_points(self) -> np.ndarray:
+        """
+        Titik akses area: tengah salah satu sisi area, digeser keluar sejauh
+        clearance ke lorong. Dipilih sisi yang tidak tertutup rak lain dan
+        paling dekat ke pintu.
+        """
+        points = np.empty((len(self.rects), 2), dtype=np.float64)
+        c = self.clearance
+        for i, (x0, y0, x1, y1) in enumerate(self.rects):
+            mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+            candidates = np.array([
+                (mx, y0 - c),  # sisi depan
+                (mx, y1 + c),  # sisi belakang
+                (x0 - c, my),  # sisi kiri
+                (x1 + c, my),  # sisi kanan
+            ])
+            free = ~self._inside_obstacle(candidates)
+            if not free.any():
+                # Area terkurung rak lain, gunakan titik tengah area
+                points[i] = (mx, my)
+                continue
+            candidates = candidates[free]
+            door_dist = np.hypot(candidates[:, 0] - self.door[0], candidates[:, 1] - self.door[1])
+            points[i] = candidates[np.argmin(door_dist)]
+        return points
+
+    def _corner_nodes(self) -> np.ndarray:
+        """Sudut rak yang diperbesar sebesar clearance (titik belok di lorong)"""
+        if len(self.obstacles) == 0:
+            return np.empty((0, 2))
+        c = self.clearance
+        o = self.obstacles
+        corners = np.concatenate([
+            np.stack([o[:, 0] - c, o[:, 1] - c], axis=1),
+            np.stack([o[:, 2] + c, o[:, 1] - c], axis=1),
+            np.stack([o[:, 0] - c, o[:, 3] + c], axis=1),
+            np.stack([o[:, 2] + c, o[:, 3] + c], axis=1),
+        ])
+        return corners[~self._inside_obstacle(corners)]
+
+    def _segments_blocked(self, p: np.ndarray, q: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """
+        Cek apakah segmen p->q memotong interior rak (Liang-Barsky, vectorized)
+        """
+        blocked = np.zeros(len(p), dtype=bool)
+        if len(self.obstacles) == 0 or len(p) == 0:
+            return blocked
+
+        eps = 1e-6
+        o = self.obstacles
+        ox0, oy0, ox1, oy1 = o[:, 0] + eps, o[:, 1] + eps, o[:, 2] - eps, o[:, 3] - eps
+
+        for start in range(0, len(p), chunk):
+            sl = slice(start, start + chunk)
+            x0, y0 = p[sl, 0:1], p[sl, 1:2]
+            dx, dy = q[sl, 0:1] - x0, q[sl, 1:2] - y0
+
+            t0 = np.zeros((len(x0), len(o)))
+            t1 = np.ones((len(x0), len(o)))
+            outside = np.zeros((len(x0), len(o)), dtype=bool)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for pk, qk in ((-dx, x0 - ox0), (dx, ox1 - x0), (-dy, y0 - oy0), (dy, oy1 - y0)):
+                    pk = np.broadcast_to(pk, t0.shape)
+                    qk = np.broadcast_to(qk, t0.shape)
+                    parallel = pk == 0
+                    outside |= parallel & (qk < 0)
+                    r = qk / pk
+                    t0 = np.where(~parallel & (pk < 0), np.maximum(t0, r), t0)
+                    t1 = np.where(~parallel & (pk > 0), np.minimum(t1, r), t1)
+            blocked[sl] = (~outside & (t0 < t1)).any(axis=1)
+        return blocked
+
+    def build_distance_matrix(self) -> np.ndarray:
+        """
+        Membangun graf visibilitas dan menghitung shortest path dengan Dijkstra
+
+        Returns:
+            Matriks (A+1)x(A+1) jarak tempuh; indeks 0 adalah pintu masuk
+        """
+        n_areas = len(self.rects)
+        terminals = np.vstack([np.array([self.door]), self.access_points])
+        nodes = np.vstack([terminals, self._corner_nodes()])
+        n_nodes = len(nodes)
+
+        if n_nodes < 2:
+            return np.zeros((n_areas + 1, n_areas + 1))
+
+        # Kandidat edge: k tetangga terdekat setiap node
+        k = min(self.neighbors + 1, n_nodes)
+        _, nbr = cKDTree(nodes).query(nodes, k=k)
+        src = np.repeat(np.arange(n_nodes), k - 1)
+        dst = nbr[:, 1:].reshape(-1)
+        pairs = np.unique(np.sort(np.stack([src, dst], axis=1), axis=1), axis=0)
+
+        visible = ~self._segments_blocked(nodes[pairs[:, 0]], nodes[pairs[:, 1]])
+        pairs = pairs[visible]
+        weights = np.hypot(*(nodes[pairs[:, 0]] - nodes[pairs[:, 1]]).T)
+
+        graph = coo_matrix((weights, (pairs[:, 0], pairs[:, 1])), shape=(n_nodes, n_nodes)).tocsr()
+        dist = dijkstra(graph, directed=False, indices=np.arange(len(terminals)))[:, :len(terminals)]
+
+        # Node yang tidak terhubung: fallback ke jarak garis lurus
+        unreachable = ~np.isfinite(dist)
+        if unreachable.any():
+            euclid = np.hypot(terminals[:, None, 0] - terminals[None, :, 0],
+                              terminals[:, None, 1] - terminals[None, :, 1])
+            dist[unreachable] = euclid[unreachable]
+            print(f"⚠️  {int(unreachable.sum())} aisle paths unreachable, using straight-line distance")
+
+        return dist
+
+    def load_or_build(self) -> np.ndarray:
+        """
+        Ambil matriks jarak dari cache disk (memory-mapped), atau bangun dan
+        simpan jika belum ada untuk fingerprint layout ini
+        """
+        path = self.cache_path
+        if os.path.exists(path):
+            try:
+                matrix = np.load(path, mmap_mode='r')
+                if matrix.shape == (len(self.rects) + 1, len(self.rects) + 1):
+                    print(f"🗺️  Loaded aisle distance matrix from cache ({self.fingerprint})")
+                    return matrix
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Invalid distance matrix cache, rebuilding: {e}")
+
+        matrix = self.build_distance_matrix()
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+            print(f"🗺️  Aisle distance matrix built and cached ({self.fingerprint})")
+            return np.load(path, mmap_mode='r')
+        except OSError as e:
+            print(f"⚠️  Warning: Could not cache distance matrix: {e}")
+            return matrix
@@ -11,6 +11,7 @@ Date: 2025-10-18
 """
 
 import numpy as np
+from scipy.sparse import csr_matrix
 import json
 import math
 import random
@@ -18,7 +19,24 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import sys
 import os
+import shutil
 from database_manager import DatabaseManager
+from warehouse_graph import WarehouseGraph
+from optimization_problem import COMPONENT_NAMES, OBJECTIVE_WEIGHTS, CompiledProblem
+from optimization_engines import ENGINES, EngineResult, OptimizationEngine, SimulatedAnnealingEngine, create_engine
+from instrumentation import PhaseTimer, RunProfiler
+from result_export import ResultExporter, results_dir
+from optimality_bound import DEFAULT_BOUND_PARAMS, BoundResult, bounded_start, compute_lower_bound
+from pareto import expand_layout, load_pareto_member, pareto_weights
+from run_control import CancellationToken, Checkpointer
+from result_cache import ResultCache, result_cache_key
+from placement_reasoning import area_features, category_class, reason_code, render_reasoning, size_class
+from warehouse_columns import table_of
+from utilization_summary import summarize_recommendations
+from quantity_runs import RunBalancer, split_runs
+from co_access import DEFAULT_AFFINITY_PARAMS, AffinityStore, load_affinity
+from picking_simulator import DEFAULT_SIMULATION_PARAMS, PickingSimulator, compare_layouts, load_orders
+from result_envelope import build_envelope, emit_envelope
 
 @dataclass
 class AreaGudang:
@@ -47,6 +65,7 @@ class Barang:
     kategori_nama: str
     frekuensi_akses: int = 1  # Default frekuensi akses
     prioritas: int = 1  # 1=tinggi, 2=sedang, 3=rendah
+    jumlah: int = 1  # Stok (total penempatan_barang.jumlah berstatus ditempatkan)
 
 @dataclass
 class PenempatanSolution:
@@ -55,13 +74,14 @@ class PenempatanSolution:
     area_id: int
     koordinat_x: float
     koordinat_y: float
+    jumlah: int = 1  # Unit barang dalam run penempatan ini
 
 class WarehouseOptimizer:
     """
     Kelas utama untuk optimasi penempatan barang menggunakan Simulated Annealing
     """
     
-    def __init__(self, optimization_config=None):
+    def __init__(self, optimization_config=None, db=None):
         # Parameter Simulated Annealing (internal, tidak di-expose ke user)
         self.temperature_initial = 1000.0  # Suhu awal (T0)
         self.temperature_final = 0.1       # Suhu akhir (Tf)
@@ -69,12 +89,78 @@ class WarehouseOptimizer:
         self.max_iterations = 1000         # Maksimum iterasi per suhu
         self.max_no_improvement = 50       # Maksimum iterasi tanpa perbaikan
         
+        # Engine metaheuristik ('sa', 'tabu', 'lns') dan parameternya
+        self.engine_name = 'sa'
+        self.engine_params: Dict = {}
+        self.seed: Optional[int] = None
+        # Seed simulasi frekuensi akses di fetch_barang (default: seed engine)
+        self.data_seed: Optional[int] = None
+        self.algorithm_label = ENGINES['sa'].label
+        
         # Konfigurasi optimasi dari user (parameter bisnis)
         self.optimization_config = optimization_config or {}
         self.gudang_ids = self.optimization_config.get('gudang_ids', [])
         self.barang_ids = self.optimization_config.get('barang_ids', [])
         self.prioritas_optimasi = self.optimization_config.get('prioritas_optimasi', 'space_utilization')
         self.target_utilisasi = self.optimization_config.get('target_utilisasi', 80.0)
+        # Model jarak tempuh: 'euclidean' (garis lurus dari pintu) atau 'aisle' (graf lorong)
+        self.distance_model = self.optimization_config.get('distance_model', 'euclidean')
+        # Export hasil per log_optimasi_id: 'ndjson' (gzip) atau 'parquet' (butuh pyarrow)
+        self.export_format = self.optimization_config.get('export_format', 'ndjson')
+        self.results_dir = self.optimization_config.get('results_dir')
+        # Checkpoint SA per log_optimasi_id (detik antar checkpoint) dan resume
+        self.checkpoint_interval = float(self.optimization_config.get('checkpoint_interval', 60.0))
+        self.resume = bool(self.optimization_config.get('resume', False))
+        self.cancelled = False
+        # Cache hasil per (konfigurasi, snapshot data master); use_cache=False untuk selalu run ulang
+        self.use_cache = bool(self.optimization_config.get('use_cache', True))
+        # Load data master langsung ke array NumPy (False: dict cursor + dataclass per baris)
+        self.columnar_load = bool(self.optimization_config.get('columnar_load', True))
+        # Batas unit per run penempatan (None: pecah hanya barang yang tidak muat di area terbesar)
+        self.max_run_units = self.optimization_config.get('max_run_units')
+        # Lower bound MILP/LP: gap dilaporkan di hasil_optimasi, search berhenti jika gap ≤ gap_tolerance
+        self.optimality_bound = bool(self.optimization_config.get('optimality_bound', True))
+        self.bound_params = {
+            'milp_max_variables': int(self.optimization_config.get(
+                'milp_max_variables', DEFAULT_BOUND_PARAMS['milp_max_variables'])),
+            'time_limit': float(self.optimization_config.get('bound_time_limit', DEFAULT_BOUND_PARAMS['time_limit'])),
+            'gap_tolerance': float(self.optimization_config.get(
+                'gap_tolerance', DEFAULT_BOUND_PARAMS['gap_tolerance'])),
+        }
+        self.bound_result: Optional[BoundResult] = None
+        # Affinity co-access: barang yang sering diambil bersama didekatkan (lihat co_access.py)
+        self.co_access_affinity = bool(self.optimization_config.get('co_access_affinity', True))
+        self.affinity_params = {
+            'affinity_weight': float(self.optimization_config.get(
+                'affinity_weight', DEFAULT_AFFINITY_PARAMS['affinity_weight'])),
+            'window_days': int(self.optimization_config.get(
+                'affinity_window_days', DEFAULT_AFFINITY_PARAMS['window_days'])),
+            'refresh_hours': float(self.optimization_config.get(
+                'affinity_refresh_hours', DEFAULT_AFFINITY_PARAMS['refresh_hours'])),
+        }
+        self.affinity = None
+        # Validasi layout: simulasi order picking (riwayat atau sintetis) setelah optimasi
+        self.picking_simulation = bool(self.optimization_config.get('picking_simulation', True))
+        self.simulation_params = {
+            'orders': int(self.optimization_config.get('simulation_orders', DEFAULT_SIMULATION_PARAMS['orders'])),
+            'walk_speed': float(self.optimization_config.get('walk_speed', DEFAULT_SIMULATION_PARAMS['walk_speed'])),
+            'pick_seconds': float(self.optimization_config.get(
+                'pick_seconds', DEFAULT_SIMULATION_PARAMS['pick_seconds'])),
+            'window_days': self.affinity_params['window_days'],
+        }
+        self.initial_layout = None
+        self.final_layout = None
+        self.result_cache = ResultCache(
+            directory=self.optimization_config.get('cache_dir'),
+            max_entries=self.optimization_config.get('cache_max_entries', 64),
+            max_bytes=int(self.optimization_config.get('cache_max_mb', 256) * 1024 * 1024)
+        ) if self.use_cache else None
+        self.cache_hit = False
+        # Single-flight: run identik yang bersamaan menunggu satu run (GET_LOCK) lalu memakai hasilnya dari cache
+        self.single_flight = bool(self.optimization_config.get('single_flight', True))
+        self.single_flight_timeout = int(self.optimization_config.get('single_flight_timeout', 900))
+        self.coalesced = False
+        self.compiled_problem: Optional[CompiledProblem] = None
         
         # Override parameter SA internal jika ada di config
         if 'algorithm_params' in self.optimization_config:
@@ -84,17 +170,36 @@ class WarehouseOptimizer:
             self.cooling_rate = alg_params.get('cooling_rate', self.cooling_rate)
             self.max_iterations = alg_params.get('max_iterations', self.max_iterations)
             self.max_no_improvement = alg_params.get('max_no_improvement', self.max_no_improvement)
+            self.engine_name = alg_params.get('engine', self.engine_name)
+            self.seed = alg_params.get('seed', self.seed)
+            self.data_seed = alg_params.get('data_seed', self.seed)
+            self.engine_params = dict(alg_params)
         
-        # Database manager
-        self.db = DatabaseManager()
+        # Database manager (dapat diganti, mis. InMemoryDatabase untuk benchmark)
+        self.db = db if db is not None else DatabaseManager()
         
         # Log optimasi ID untuk integrasi dengan API
         self.log_optimasi_id = None
         
+        # Timer per fase (connect, fetch, annealing, save, ...)
+        self.timer = PhaseTimer()
+        
         # Data warehouse
         self.areas: List[AreaGudang] = []
         self.barang_list: List[Barang] = []
         self.current_solution: List[PenempatanSolution] = []
+        self.last_recommendations: List[Dict] = []
+        # Status dan hasil_optimasi terakhir yang dicatat ke log_optimasi (amplop hasil CLI)
+        self.run_status: Optional[str] = None
+        self.hasil_optimasi: Optional[Dict] = None
+        # Front Pareto (engine 'mosa'): ringkasan untuk hasil_optimasi
+        self.pareto_result: Optional[Dict] = None
+        
+        # Model jarak lorong (diisi oleh prepare_distance_model)
+        self.area_distance_matrix: Optional[np.ndarray] = None
+        self._area_index: Dict[int, int] = {}
+        self._door_distances: List[float] = []
+        self._access_points: List[Tuple[float, float]] = []
         
     def connect_database(self) -> bool:
         """Membuat koneksi ke database"""
@@ -104,8 +209,13 @@ class WarehouseOptimizer:
         """Menutup koneksi database"""
         self.db.disconnect()
     
+    def use_columnar_load(self) -> bool:
+        return self.columnar_load and hasattr(self.db, 'fetch_area_columns')
+    
     def fetch_areas(self) -> bool:
         """Mengambil data area gudang dari database dengan filter"""
+        if self.use_columnar_load():
+            return self.fetch_area_columns()
         try:
             areas_data = self.db.fetch_areas()
             self.areas = []
@@ -133,6 +243,29 @@ class WarehouseOptimizer:
             
             gudang_filter = f" (filtered by gudang_ids: {self.gudang_ids})" if self.gudang_ids else " (all warehouses)"
             print(f"✅ Loaded {len(self.areas)} areas from database{gudang_filter}")
+            
+            self.prepare_distance_model()
+            return True
+        except Exception as e:
+            print(f"❌ Error fetching areas: {e}")
+            return False
+    
+    def fetch_area_columns(self) -> bool:
+        """
+        Versi kolumnar fetch_areas: self.areas menjadi view dataclass di atas
+        AreaColumns (lihat warehouse_columns)
+        """
+        try:
+            table = self.db.fetch_area_columns()
+            if table is None:
+                return False
+            table = table.filter_ids('gudang_id', self.gudang_ids)
+            self.areas = table.records()
+            
+            gudang_filter = f" (filtered by gudang_ids: {self.gudang_ids})" if self.gudang_ids else " (all warehouses)"
+            print(f"✅ Loaded {len(self.areas)} areas from database{gudang_filter}")
+            
+            self.prepare_distance_model()
             return True
         except Exception as e:
             print(f"❌ Error fetching areas: {e}")
@@ -140,12 +273,16 @@ class WarehouseOptimizer:
     
     def fetch_barang(self) -> bool:
         """Mengambil data barang dari database dengan filter"""
+        if self.use_columnar_load():
+            return self.fetch_barang_columns()
         try:
             print(f"🔍 Fetching barang data with filter: {self.barang_ids}")
             barang_data = self.db.fetch_barang()
             print(f"📋 Raw barang data count: {len(barang_data)}")
             
             self.barang_list = []
+            # Frekuensi akses (dan prioritas balanced) masih disimulasikan; seeded agar run bisa di-replay
+            simulation_rng = self.simulation_rng()
             
             for i, item_data in enumerate(barang_data):
                 try:
@@ -164,7 +301,7 @@ class WarehouseOptimizer:
                     print(f"   📏 Dimensions: {panjang}x{lebar}x{tinggi} = {volume}m³")
                     
                     # Set prioritas berdasarkan konfigurasi optimasi
-                    prioritas = self.get_item_priority(item_data)
+                    prioritas = self.get_item_priority(item_data, simulation_rng)
                     
                     barang = Barang(
                         id=item_data['id'],
@@ -173,8 +310,9 @@ class WarehouseOptimizer:
                         volume=volume,
                         kategori_id=item_data['kategori_barang_id'],
                         kategori_nama=item_data['nama_kategori'],
-                        frekuensi_akses=random.randint(1, 10),  # Simulasi frekuensi akses
-                        prioritas=prioritas
+                        frekuensi_akses=simulation_rng.randint(1, 10),  # Simulasi frekuensi akses
+                        prioritas=prioritas,
+                        jumlah=int(item_data.get('jumlah') or 1)
                     )
                     self.barang_list.append(barang)
                     print(f"   ✅ Item processed successfully")
@@ -194,7 +332,62 @@ class WarehouseOptimizer:
             traceback.print_exc()
             return False
     
-    def get_item_priority(self, item_data) -> int:
+    def fetch_barang_columns(self) -> bool:
+        """
+        Versi kolumnar fetch_barang: volume, frekuensi akses, dan prioritas
+        dihitung per kolom; self.barang_list menjadi view dataclass di atas
+        BarangColumns (lihat warehouse_columns)
+        """
+        try:
+            print(f"🔍 Fetching barang data with filter: {self.barang_ids}")
+            table = self.db.fetch_barang_columns()
+            if table is None:
+                return False
+            print(f"📋 Raw barang data count: {len(table)}")
+            table = table.filter_ids('id', self.barang_ids)
+            
+            # Frekuensi akses dan prioritas balanced masih disimulasikan dari generator
+            # yang sama dengan loader per baris, dengan urutan draw per barang yang sama
+            # (prioritas lalu frekuensi), sehingga kedua loader menghasilkan data identik
+            simulation_rng = self.simulation_rng()
+            n = len(table)
+            if self.prioritas_optimasi in ('accessibility', 'space_utilization'):
+                table['prioritas'][:] = self.get_item_priorities(table['volume'])
+                table['frekuensi_akses'][:] = np.fromiter((simulation_rng.randint(1, 10) for _ in range(n)),
+                                                          dtype=np.int64, count=n)
+            else:
+                draws = np.array([(simulation_rng.randint(1, 3), simulation_rng.randint(1, 10)) for _ in range(n)],
+                                 dtype=np.int64).reshape(n, 2)
+                table['prioritas'][:] = draws[:, 0]
+                table['frekuensi_akses'][:] = draws[:, 1]
+            self.barang_list = table.records()
+            
+            barang_filter = f" (filtered by barang_ids: {self.barang_ids})" if self.barang_ids else " (all items)"
+            print(f"✅ Loaded {len(self.barang_list)} items from database{barang_filter} "
+                  f"({table.nbytes / 1024 / 1024:.1f} MB columnar)")
+            return True
+        except Exception as e:
+            print(f"❌ Error fetching barang: {e}")
+            print(f"   Error type: {type(e).__name__}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def simulation_rng(self) -> random.Random:
+        """Generator data simulasi (frekuensi akses, prioritas balanced); seeded dengan data_seed"""
+        return random.Random(self.data_seed)
+    
+    def get_item_priorities(self, volume: np.ndarray, rng: Optional[random.Random] = None) -> np.ndarray:
+        """Versi vectorized get_item_priority untuk satu kolom volume"""
+        if self.prioritas_optimasi == 'accessibility':
+            return np.select([volume < 10, volume < 50], [1, 2], 3)
+        elif self.prioritas_optimasi == 'space_utilization':
+            return np.select([volume > 50, volume > 10], [1, 2], 3)
+        else:  # balanced
+            rng = rng or self.simulation_rng()
+            return np.fromiter((rng.randint(1, 3) for _ in range(len(volume))), dtype=np.int64, count=len(volume))
+    
+    def get_item_priority(self, item_data, rng: Optional[random.Random] = None) -> int:
         """Menentukan prioritas barang berdasarkan konfigurasi optimasi"""
         if self.prioritas_optimasi == 'accessibility':
             # Prioritas berdasarkan aksesibilitas - barang kecil prioritas tinggi
@@ -215,7 +408,7 @@ class WarehouseOptimizer:
             else:
                 return 3  # Prioritas rendah untuk barang kecil
         else:  # balanced
-            return random.randint(1, 3)  # Prioritas random untuk balanced
+            return (rng or random).randint(1, 3)  # Prioritas random untuk balanced
     
     def calculate_distance(self, x1: float, y1: float, x2: float, y2: float) -> float:
         """
@@ -224,6 +417,47 @@ class WarehouseOptimizer:
         """
         return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
     
+    def prepare_distance_model(self) -> bool:
+        """
+        Menyiapkan model jarak tempuh sesuai distance_model
+        
+        Untuk 'aisle', matriks jarak shortest-path dari graf lorong diambil dari
+        cache disk (memory-mapped) atau dibangun sekali per layout. Jarak pintu
+        ke setiap area disalin ke list agar lookup per iterasi tetap O(1).
+        """
+        area_table = table_of(self.areas)
+        area_ids = area_table['id'].tolist() if area_table is not None else [area.id for area in self.areas]
+        self._area_index = {area_id: i for i, area_id in enumerate(area_ids)}
+        self.area_distance_matrix = None
+        
+        if self.distance_model != 'aisle' or not self.areas:
+            return True
+        
+        try:
+            graph = WarehouseGraph(self.areas)
+            self.area_distance_matrix = graph.load_or_build()
+            self._door_distances = [float(d) for d in self.area_distance_matrix[0, 1:]]
+            self._access_points = [(float(x), float(y)) for x, y in graph.access_points]
+            return True
+        except Exception as e:
+            print(f"⚠️  Failed to build aisle distance model, using euclidean: {e}")
+            self.distance_model = 'euclidean'
+            return False
+    
+    def calculate_travel_distance(self, area_id: int, x: float, y: float) -> float:
+        """
+        Menghitung jarak tempuh dari pintu masuk (0,0) ke posisi penempatan
+        
+        - euclidean: d = √[x² + y²]
+        - aisle    : d = jarak lorong pintu→titik akses area + jarak titik akses→posisi
+        """
+        if self.area_distance_matrix is None:
+            return self.calculate_distance(0, 0, x, y)
+        
+        idx = self._area_index[area_id]
+        ax, ay = self._access_points[idx]
+        return self._door_distances[idx] + self.calculate_distance(ax, ay, x, y)
+    
     def calculate_objective_function(self, solution: List[PenempatanSolution]) -> float:
         """
         Fungsi objektif untuk evaluasi solusi penempatan
@@ -259,11 +493,15 @@ class WarehouseOptimizer:
             barang = next((b for b in self.barang_list if b.id == placement.barang_id), None)
             if barang:
                 # Jarak dari pintu masuk ke lokasi penempatan
-                distance = self.calculate_distance(0, 0, placement.koordinat_x, placement.koordinat_y)
-                # Bobot berdasarkan frekuensi akses (semakin sering diakses, semakin dekat ke pintu)
-                weighted_distance = distance * barang.frekuensi_akses
+                distance = self.calculate_travel_distance(placement.area_id, placement.koordinat_x, placement.koordinat_y)
+                # Bobot berdasarkan frekuensi akses (semakin sering diakses, semakin dekat ke pintu);
+                # run parsial membawa bagian frekuensi sebanding jumlah unitnya
+                weighted_distance = distance * barang.frekuensi_akses * placement.jumlah / barang.jumlah
                 distance_cost += weighted_distance
         
+        # Affinity co-access (sama dengan CompiledProblem): pasangan yang sering diambil bersama
+        distance_cost += self.solution_affinity_cost(solution)
+        
         # 2. Space Utilization Penalty - Penalti untuk ruang yang tidak optimal
         space_penalty = 0.0
         area_utilization = {}
@@ -276,7 +514,7 @@ class WarehouseOptimizer:
                 area_utilization[area_id] = 0.0
             
             if barang:
-                area_utilization[area_id] += barang.volume
+                area_utilization[area_id] += barang.volume * placement.jumlah
         
         for area in self.areas:
             if area.id in area_utilization:
@@ -309,7 +547,7 @@ class WarehouseOptimizer:
         for placement in solution:
             barang = next((b for b in self.barang_list if b.id == placement.barang_id), None)
             if barang and barang.frekuensi_akses > 7:  # Barang sering diakses
-                distance = self.calculate_distance(0, 0, placement.koordinat_x, placement.koordinat_y)
+                distance = self.calculate_travel_distance(placement.area_id, placement.koordinat_x, placement.koordinat_y)
                 if distance > 20:  # Jika terlalu jauh dari pintu masuk
                     access_penalty += distance * 2
         
@@ -321,6 +559,28 @@ class WarehouseOptimizer:
         
         return total_cost
     
+    def solution_affinity_cost(self, solution: List[PenempatanSolution]) -> float:
+        """
+        Σ_{i<j} A_ij · jarak(i, j) antar penempatan; affinity barang dibagi rata
+        ke run-nya, seperti quantity_runs.with_runs
+        """
+        if self.affinity is None or not solution:
+            return 0.0
+        table = table_of(self.barang_list)
+        item_ids = table['id'] if table is not None else [b.id for b in self.barang_list]
+        index = {int(barang_id): i for i, barang_id in enumerate(item_ids)}
+        run_item = np.array([index.get(int(p.barang_id), -1) for p in solution], dtype=np.int64)
+        known = np.flatnonzero(run_item >= 0)
+        if len(known) == 0:
+            return 0.0
+        run_item = run_item[known]
+        x = np.array([solution[k].koordinat_x for k in known], dtype=np.float64)
+        y = np.array([solution[k].koordinat_y for k in known], dtype=np.float64)
+        share = 1.0 / np.bincount(run_item, minlength=self.affinity.shape[0])[run_item]
+        members = csr_matrix((share, (np.arange(len(run_item)), run_item)), shape=(len(run_item), self.affinity.shape[0]))
+        pairs = (members @ self.affinity @ members.T).tocoo()
+        return 0.5 * float((pairs.data * np.hypot(x[pairs.row] - x[pairs.col], y[pairs.row] - y[pairs.col])).sum())
+    
     def generate_initial_solution(self) -> List[PenempatanSolution]:
         """
         Menghasilkan solusi awal secara random
@@ -429,23 +689,8 @@ class WarehouseOptimizer:
             probability = math.exp(-delta_cost / temperature)
             return probability
     
-    def simulated_annealing(self) -> Tuple[List[PenempatanSolution], float]:
-        """
-        Implementasi algoritma Simulated Annealing
-        
-        Algoritma:
-        1. Inisialisasi suhu awal T0 dan solusi awal S0
-        2. Untuk setiap suhu T:
-           a. Untuk setiap iterasi:
-              - Generate solusi tetangga S'
-              - Hitung ΔE = f(S') - f(S)
-              - Jika ΔE < 0: terima S'
-              - Jika ΔE ≥ 0: terima S' dengan probabilitas exp(-ΔE/T)
-           b. Kurangi suhu: T = α * T
-        3. Return solusi terbaik yang ditemukan
-        """
-        
-        print("🔥 Starting Simulated Annealing optimization...")
+    def print_optimization_config(self):
+        """Menampilkan konfigurasi optimasi dan parameter engine"""
         print()
         print("=== OPTIMIZATION CONFIGURATION ===")
         print(f"📦 Total Gudang: {len(set([area.gudang_id for area in self.areas]) if hasattr(self.areas[0], 'gudang_id') else [1])}")
@@ -455,224 +700,400 @@ class WarehouseOptimizer:
         print(f"📊 Target Utilisasi: {self.target_utilisasi}%")
         print()
         print("=== ALGORITHM PARAMETERS (INTERNAL) ===")
+        print(f"⚙️  Engine: {self.engine_name}")
         print(f"🌡️  Temperature: T0={self.temperature_initial}, Tf={self.temperature_final}")
         print(f"❄️  Cooling rate: {self.cooling_rate}")
         print(f"🔄 Max iterations: {self.max_iterations}")
         print(f"⏹️  Max no improvement: {self.max_no_improvement}")
         print()
+    
+    def compile_problem(self) -> CompiledProblem:
+        """Kompilasi areas dan barang_list menjadi array untuk engine optimasi"""
+        self.affinity = self.load_affinity()
+        self.compiled_problem = CompiledProblem.from_optimizer(self)
+        return self.compiled_problem
+    
+    def load_affinity(self):
+        """Matriks affinity co-access selaras barang_list (None jika nonaktif atau riwayat kosong)"""
+        if not self.co_access_affinity or not self.barang_list:
+            return None
+        table = table_of(self.barang_list)
+        item_ids = table['id'] if table is not None else [b.id for b in self.barang_list]
+        try:
+            affinity = load_affinity(self.db, item_ids, self.affinity_params)
+        except Exception as e:
+            print(f"⚠️  Warning: Co-access affinity unavailable: {e}")
+            return None
+        if affinity is not None:
+            print(f"🔗 Co-access affinity: {affinity.nnz // 2} item pairs (weight {self.affinity_params['affinity_weight']})")
+        return affinity
+    
+    def engine_parameters(self, engine_name: Optional[str] = None) -> Dict:
+        """Parameter engine efektif (atribut SA optimizer + algorithm_params)"""
+        name = engine_name or self.engine_name
+        params = dict(self.engine_params)
+        if issubclass(ENGINES.get(name, OptimizationEngine), SimulatedAnnealingEngine):
+            params.update({
+                'temperature_initial': self.temperature_initial,
+                'temperature_final': self.temperature_final,
+                'cooling_rate': self.cooling_rate,
+                'max_iterations': self.max_iterations,
+                'max_no_improvement': self.max_no_improvement,
+            })
+        return params
+    
+    def build_engine(self, engine_name: Optional[str] = None,
+                     problem: Optional[CompiledProblem] = None) -> OptimizationEngine:
+        """
+        Membuat engine metaheuristik untuk masalah terkompilasi
         
-        # Inisialisasi
-        current_solution = self.generate_initial_solution()
-        current_cost = self.calculate_objective_function(current_solution)
+        Parameter SA (temperature_initial, cooling_rate, dst.) diambil dari
+        atribut optimizer agar tetap bisa di-override langsung oleh runner.
+        """
+        name = engine_name or self.engine_name
+        engine = create_engine(name, problem or self.compile_problem(), params=self.engine_parameters(name),
+                               seed=self.seed)
+        self.algorithm_label = engine.label
+        return engine
+    
+    def run_engine(self, engine_name: Optional[str] = None,
+                   problem: Optional[CompiledProblem] = None) -> EngineResult:
+        """Menjalankan engine metaheuristik pada masalah terkompilasi"""
+        engine = self.build_engine(engine_name, problem)
+        print(f"🔥 Starting {engine.label} optimization...")
+        return engine.run()
+    
+    def optimize(self) -> Tuple[List[PenempatanSolution], float, EngineResult]:
+        """
+        Menjalankan engine yang dipilih (algorithm_params.engine) dan
+        mengembalikan solusi terbaik dalam bentuk List[PenempatanSolution]
+        """
+        self.print_optimization_config()
         
-        best_solution = current_solution.copy()
-        best_cost = current_cost
+        with self.timer.phase('initial_solution'):
+            problem = split_runs(self.compile_problem(), self.max_run_units)
+            engine = self.build_engine(problem=problem)
+            checkpointer, cancel_token = self.attach_run_control(engine)
+            resume_state = checkpointer.load() if checkpointer and self.resume else None
+            initial = engine.initial_layout() if resume_state is None else None
+            self.initial_layout = initial
         
-        temperature = self.temperature_initial
-        iteration_count = 0
-        no_improvement_count = 0
+        if self.optimality_bound:
+            with self.timer.phase('lower_bound'):
+                bound = self.compute_optimality_bound(problem)
+            # Instance kecil: layout MILP menjadi solusi awal engine (sama dengan parallel_runner)
+            initial = bounded_start(engine, bound, self.bound_params['gap_tolerance'], initial,
+                                    warm_start=resume_state is None)
+            self.initial_layout = initial
         
-        print(f"Initial solution cost: {current_cost:.2f}")
+        if resume_state is not None:
+            print(f"♻️  Resuming {engine.label} from checkpoint {checkpointer.path}")
+        else:
+            print(f"🔥 Starting {engine.label} optimization...")
         
-        # Loop utama Simulated Annealing
-        while temperature > self.temperature_final:
-            improved_in_temperature = False
-            
-            for i in range(self.max_iterations):
-                iteration_count += 1
-                
-                # Generate solusi tetangga
-                neighbor_solution = self.generate_neighbor(current_solution)
-                neighbor_cost = self.calculate_objective_function(neighbor_solution)
-                
-                # Hitung probabilitas penerimaan
-                accept_prob = self.acceptance_probability(current_cost, neighbor_cost, temperature)
-                
-                # Keputusan penerimaan
-                if random.random() < accept_prob:
-                    current_solution = neighbor_solution
-                    current_cost = neighbor_cost
-                    
-                    # Update solusi terbaik
-                    if current_cost < best_cost:
-                        best_solution = current_solution.copy()
-                        best_cost = current_cost
-                        improved_in_temperature = True
-                        no_improvement_count = 0
-                        print(f"Iteration {iteration_count}: New best cost = {best_cost:.2f} at T = {temperature:.2f}")
-                
-                # Early stopping jika tidak ada perbaikan
-                if not improved_in_temperature:
-                    no_improvement_count += 1
-                    if no_improvement_count >= self.max_no_improvement:
-                        print(f"Early stopping: No improvement for {self.max_no_improvement} iterations")
-                        break
-            
-            # Pendinginan suhu (cooling)
-            temperature *= self.cooling_rate
+        try:
+            with self.timer.phase('annealing'):
+                result = engine.run(initial=initial, resume=resume_state)
+        finally:
+            if cancel_token:
+                cancel_token.restore_signal_handler()
+        self.timer.add_evaluations('annealing', result.evaluations)
+        
+        self.cancelled = result.cancelled
+        if checkpointer and not result.cancelled:
+            checkpointer.remove()
+        if cancel_token:
+            cancel_token.clear()
+        
+        if result.archive is not None and len(result.archive) and not result.cancelled:
+            return self.select_pareto_layout(problem, result)
+        
+        cost = result.cost
+        if problem is not self.compiled_problem and not result.cancelled:
+            # Barang dipecah menjadi beberapa run: pindahkan unit parsial antar run
+            with self.timer.phase('run_balance'):
+                balancer = RunBalancer(problem)
+                problem, _ = balancer.balance(result.area_idx, result.x, result.y)
+            cost = balancer.evaluator.cost
+        
+        self.final_layout = (problem, (result.area_idx, result.x, result.y))
+        solution = problem.solution_from_layout(result.area_idx, result.x, result.y)
+        return solution, cost, result
+    
+    def simulate_picking(self) -> Optional[Dict]:
+        """
+        Putar ulang order picking pada layout hasil dan layout awal engine
+        (order sama), laporkan jarak tempuh dan throughput picker per jam
+        """
+        if not self.picking_simulation or self.final_layout is None:
+            return None
+        problem, layout = self.final_layout
+        area_distance = None if self.area_distance_matrix is None else self.area_distance_matrix[1:, 1:]
+        simulator = PickingSimulator(problem, area_distance, self.simulation_params)
+        try:
+            orders = load_orders(self.db, problem, self.simulation_params)
+            optimized = simulator.simulate(orders, *layout)
+            summary = optimized.summary()
+            if self.initial_layout is not None:
+                baseline = simulator.simulate(orders, *self.initial_layout)
+                summary['baseline'] = baseline.summary()
+                summary.update(compare_layouts(baseline, optimized))
+        except (ValueError, MemoryError) as e:
+            print(f"⚠️  Warning: Picking simulation failed: {e}")
+            return None
+        
+        print(f"🛒 Picking simulation ({summary['orders']} {summary['source']} orders): "
+              f"{summary['travel_per_order']:.1f} m/order, {summary['orders_per_hour']:.1f} orders/hour")
+        if 'travel_saving' in summary:
+            print(f"   vs initial layout: travel -{summary['travel_saving']:.1%}, "
+                  f"throughput +{summary['throughput_gain']:.1%}")
+        return summary
+    
+    def compute_optimality_bound(self, problem: CompiledProblem) -> Optional[BoundResult]:
+        """
+        Lower bound objektif: MILP eksak untuk instance kecil (barang × area ≤
+        milp_max_variables), relaksasi LP kelas frekuensi untuk instance besar
+        """
+        try:
+            bound = compute_lower_bound(problem, self.bound_params)
+        except (ValueError, MemoryError) as e:
+            print(f"⚠️  Warning: Could not compute lower bound: {e}")
+            bound = None
+        self.bound_result = bound
+        if bound is None:
+            print("⚠️  Warning: Lower bound solver did not finish, gap will not be reported")
+            return None
+        print(f"📐 Lower bound ({bound.method}, {bound.status}): {bound.lower_bound:.2f} "
+              f"in {bound.solve_time:.2f}s ({bound.variables} variables)")
+        if bound.objective is not None:
+            print(f"   MILP layout cost: {bound.objective:.2f}")
+        return bound
+    
+    def pareto_file(self, log_optimasi_id: Optional[int] = None) -> str:
+        """File layout front Pareto per log_optimasi_id di direktori hasil"""
+        log_id = log_optimasi_id or self.log_optimasi_id
+        return os.path.join(results_dir(self.results_dir), f"optimization_{log_id}_pareto.npz")
+    
+    def select_pareto_layout(self, problem: CompiledProblem,
+                             result: EngineResult) -> Tuple[List[PenempatanSolution], float, EngineResult]:
+        """
+        Mode multi-objektif: pilih anggota front dengan bobot preset
+        prioritas_optimasi, simpan semua layout front agar bisa di-reweight
+        tanpa run ulang
+        """
+        archive = result.archive
+        member = archive.select(pareto_weights(self.prioritas_optimasi))
+        area_idx, x, y = expand_layout(archive.layouts[member])
+        cost = problem.weighted_cost(archive.points[member])
+        
+        layouts_file = None
+        if self.log_optimasi_id:
+            try:
+                layouts_file = archive.save(self.pareto_file(), problem.item_ids, problem.area_ids, problem.quantity)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not save Pareto layouts: {e}")
+        
+        self.pareto_result = {
+            "selected_member": member,
+            "selected_by": self.prioritas_optimasi,
+            "weights": dict(zip(COMPONENT_NAMES, pareto_weights(self.prioritas_optimasi))),
+            "layouts_file": layouts_file,
+            "front": archive.summary(problem.weights),
+        }
+        print(f"🧭 Pareto front: {len(archive)} layouts, member {member} selected for '{self.prioritas_optimasi}'")
+        self.final_layout = (problem, (area_idx, x, y))
+        return problem.solution_from_layout(area_idx, x, y), cost, result
+    
+    def apply_pareto_member(self, member: int) -> bool:
+        """
+        Terapkan anggota front lain dari run multi-objektif (log_optimasi_id ini)
+        sebagai rekomendasi, tanpa menjalankan optimasi ulang
+        """
+        if not self.log_optimasi_id:
+            print("❌ Applying a Pareto member requires a log optimasi ID")
+            return False
+        if not self.connect_database():
+            print("❌ Failed to connect to database")
+            return False
+        
+        try:
+            data = load_pareto_member(self.pareto_file(), member)
+            if not self.fetch_areas() or not self.fetch_barang():
+                return False
+            cost = float(np.dot(OBJECTIVE_WEIGHTS, data['components']))
+            solution = [
+                PenempatanSolution(barang_id=int(item_id), area_id=int(area_id), koordinat_x=float(px), koordinat_y=float(py),
+                                   jumlah=int(count))
+                for item_id, area_id, px, py, count in zip(data['item_ids'], data['area_ids'], data['x'], data['y'],
+                                                           data['quantity'])
+            ]
+            self.algorithm_label = ENGINES['mosa'].label
+            success = self.save_solution_to_database(solution, cost)
             
-            if iteration_count % 100 == 0:
-                print(f"Iteration {iteration_count}: T = {temperature:.4f}, Current cost = {current_cost:.2f}")
+            hasil_optimasi = self.db.get_optimization_result(self.log_optimasi_id) or {}
+            self.run_status = "selesai" if success else "gagal"
+            self.hasil_optimasi = hasil_optimasi
+            if success and hasil_optimasi.get('pareto'):
+                hasil_optimasi['pareto']['selected_member'] = member
+                hasil_optimasi['pareto']['selected_by'] = 'manual'
+                hasil_optimasi['final_cost'] = cost
+                self.db.update_optimization_status(
+                    log_optimasi_id=self.log_optimasi_id,
+                    status="selesai",
+                    hasil_optimasi=hasil_optimasi,
+                    detail_hasil=f"Pareto member {member} applied ({len(solution)} items)"
+                )
+            print(f"🧭 Applied Pareto member {member}: weighted cost {cost:.2f}")
+            return success
+        except (OSError, ValueError) as e:
+            print(f"❌ Error applying Pareto member: {e}")
+            return False
+        finally:
+            self.disconnect_database()
+    
+    def attach_run_control(self, engine: OptimizationEngine) -> Tuple[Optional[Checkpointer], Optional[CancellationToken]]:
+        """
+        Pasang checkpoint periodik dan pembatalan (file .cancel, status
+        'dibatalkan' di log_optimasi, SIGTERM) untuk run dengan log_optimasi_id
+        """
+        if not self.log_optimasi_id:
+            return None, None
         
-        print(f"Optimization completed after {iteration_count} iterations")
-        print(f"Best cost achieved: {best_cost:.2f}")
+        log_id = self.log_optimasi_id
+        checkpointer = Checkpointer.for_log(log_id, interval=self.checkpoint_interval)
+        db_check = None
+        if hasattr(self.db, 'get_optimization_status'):
+            db_check = lambda: self.db.get_optimization_status(log_id) == 'dibatalkan'
+        cancel_token = CancellationToken.for_log(log_id, db_check=db_check)
+        cancel_token.install_signal_handler()
         
-        return best_solution, best_cost
+        if self.resume and checkpointer.exists() and hasattr(self.db, 'set_optimization_running'):
+            self.db.set_optimization_running(log_id)
+        
+        engine.attach_control(checkpointer, cancel_token)
+        return checkpointer, cancel_token
+    
+    def simulated_annealing(self) -> Tuple[List[PenempatanSolution], float]:
+        """
+        Implementasi algoritma Simulated Annealing
+        
+        Algoritma:
+        1. Inisialisasi suhu awal T0 dan solusi awal S0
+        2. Untuk setiap suhu T:
+           a. Untuk setiap iterasi:
+              - Generate solusi tetangga S'
+              - Hitung ΔE = f(S') - f(S)
+              - Jika ΔE < 0: terima S'
+              - Jika ΔE ≥ 0: terima S' dengan probabilitas exp(-ΔE/T)
+           b. Kurangi suhu: T = α * T
+        3. Return solusi terbaik yang ditemukan
+        
+        Loop dijalankan oleh SimulatedAnnealingEngine dengan evaluasi delta
+        (lihat optimization_engines.py).
+        """
+        self.print_optimization_config()
+        problem = self.compile_problem()
+        result = self.run_engine('sa', problem=problem)
+        return problem.solution_from_layout(result.area_idx, result.x, result.y), result.cost
     
     def generate_placement_reasoning(self, barang, area) -> str:
         """
-        Generate detailed and contextual placement reasoning based on item and area characteristics
-        """
-        # Get area utilization data
-        area_utilization = (area.kapasitas_terpakai / area.kapasitas * 100) if area.kapasitas > 0 else 0
-        
-        # Analyze item characteristics - check if it's a dictionary or dataclass
-        if hasattr(barang, 'get'):  # Dictionary from database
-            item_volume = barang.get('volume', 0)
-            item_name = barang.get('nama_barang', 'Item')
-            category = barang.get('nama_kategori', 'Umum')
-        else:  # Dataclass object
-            item_volume = getattr(barang, 'volume', 0)
-            item_name = getattr(barang, 'nama_barang', 'Item')
-            category = getattr(barang, 'kategori_nama', 'Umum')
-        
-        # Analyze area characteristics - check if it's a dictionary or dataclass
-        if hasattr(area, 'get'):  # Dictionary from database
-            area_type = area.get('jenis_area', 'rak')
-            area_name = area.get('nama_area', 'Area')
-            is_high_access = area.get('koordinat_x', 100) <= 20 and area.get('koordinat_y', 100) <= 20
-            is_secure_area = area.get('tinggi', 0) >= 5
-            area_space_available = area.get('kapasitas', 0) - area.get('kapasitas_terpakai', 0)
-        else:  # Dataclass object
-            area_type = getattr(area, 'jenis_area', 'rak')
-            area_name = getattr(area, 'nama_area', 'Area')
-            is_high_access = area.koordinat_x <= 20 and area.koordinat_y <= 20
-            is_secure_area = area.tinggi >= 5
-            area_space_available = area.kapasitas - area.kapasitas_terpakai
-        
-        # Generate reasoning based on multiple factors
-        reasons = []
-        
-        # Factor 1: Category-based placement
-        if 'elektronik' in category.lower():
-            if area_type == 'rak' and is_secure_area:
-                reasons.append(f"barang elektronik ditempatkan di rak tinggi untuk keamanan dan proteksi dari kelembaban")
-            elif area_utilization < 50:
-                reasons.append(f"area dengan kapasitas tersedia {area_space_available:.1f}m³ cocok untuk barang elektronik sensitif")
-            else:
-                reasons.append(f"penempatan elektronik di area khusus untuk menghindari kerusakan dan gangguan")
-                
-        elif 'dokumen' in category.lower():
-            if area_type == 'lantai':
-                reasons.append(f"dokumen ditempatkan di area lantai karena mudah diakses dan tidak memerlukan rak khusus")
-            elif area_utilization < 70:
-                reasons.append(f"area dengan utilisasi {area_utilization:.1f}% memiliki ruang memadai untuk arsip dokumen")
-            else:
-                reasons.append(f"penempatan dokumen di area administratif untuk kemudahan akses dan organisasi")
+        Kalimat alasan penempatan lengkap untuk satu barang di satu area
+        """
+        code = reason_code(category_class(barang.kategori_nama), size_class(barang.volume), area_features(area))
+        return render_reasoning(code, barang.nama_barang, area.nama_area)
+    
+    def item_reason_classes(self) -> Dict[int, Tuple[str, str]]:
+        """(kelas kategori, kelas ukuran) per barang_id untuk kode alasan"""
+        table = table_of(self.barang_list)
+        if table is None:
+            return {b.id: (category_class(b.kategori_nama), size_class(b.volume)) for b in self.barang_list}
+        
+        kategori = table['nama_kategori']
+        level_classes = [category_class(name) for name in kategori.levels]
+        category_classes = [level_classes[code] for code in kategori.codes.tolist()]
+        size_classes = [size_class(volume) for volume in table['volume'].tolist()]
+        return dict(zip(table['id'].tolist(), zip(category_classes, size_classes)))
+    
+    def build_recommendations(self, solution: List[PenempatanSolution]) -> List[Dict]:
+        """
+        Membuat baris rekomendasi dari solusi
+        
+        Kolom alasan berisi kode alasan ringkas (lihat placement_reasoning);
+        kalimat lengkap dirender saat dibaca oleh API.
+        """
+        classes_by_id = self.item_reason_classes()
+        features_by_area = {a.id: area_features(a) for a in self.areas}
+        recommendations = []
+        
+        for placement in solution:
+            classes = classes_by_id.get(placement.barang_id)
+            features = features_by_area.get(placement.area_id)
+            
+            if classes and features:
+                recommendation = {
+                    "barang_id": placement.barang_id,
+                    "area_gudang_id": placement.area_id,
+                    "koordinat_x": round(placement.koordinat_x, 2),
+                    "koordinat_y": round(placement.koordinat_y, 2),
+                    "jumlah": placement.jumlah,
+                    "alasan": reason_code(classes[0], classes[1], features),
+                    "confidence_score": 0.85,  # Score kepercayaan
+                    "algoritma": self.algorithm_label
+                }
                 
-        elif 'paket' in category.lower():
-            if is_high_access:
-                reasons.append(f"paket express ditempatkan dekat pintu masuk untuk memudahkan proses loading dan unloading")
-            elif area_utilization < 60:
-                reasons.append(f"area dengan kapasitas tersisa {area_space_available:.1f}m³ optimal untuk rotasi paket cepat")
-            else:
-                reasons.append(f"penempatan paket di area transit untuk mempercepat distribusi dan pengiriman")
+                # Tambahkan log_optimasi_id jika tersedia
+                if self.log_optimasi_id:
+                    recommendation["log_optimasi_id"] = self.log_optimasi_id
                 
-        elif 'fragile' in category.lower():
-            if area_type == 'rak' and is_secure_area:
-                reasons.append(f"barang fragile ditempatkan di rak tinggi untuk proteksi maksimal dari benturan")
-            else:
-                reasons.append(f"penempatan khusus untuk barang mudah pecah dengan akses terbatas")
+                recommendations.append(recommendation)
         
-        # Factor 2: Space optimization
-        if area_utilization < 30:
-            reasons.append(f"optimisasi ruang kosong dengan memanfaatkan area yang hanya terisi {area_utilization:.1f}%")
-        elif area_utilization > 80:
-            reasons.append(f"penempatan efisien pada area dengan utilisasi tinggi {area_utilization:.1f}%")
-        else:
-            reasons.append(f"pemanfaatan optimal ruang dengan tingkat utilisasi yang seimbang {area_utilization:.1f}%")
-            
-        # Factor 3: Item size considerations
-        if item_volume > 0.01:  # Large items (>10 liters)
-            tinggi_area = area.tinggi if hasattr(area, 'tinggi') else area.get('tinggi', 0)
-            if tinggi_area >= 4:
-                reasons.append(f"barang berukuran besar memerlukan area dengan tinggi memadai ({tinggi_area}m)")
-            else:
-                reasons.append(f"penempatan barang voluminous di area yang sesuai dengan dimensi produk")
-        elif item_volume > 0:
-            reasons.append(f"penempatan barang kompak untuk optimisasi density penyimpanan")
-        
-        # Factor 4: Access considerations
-        if is_high_access:
-            reasons.append(f"lokasi strategis dekat akses utama untuk operasional yang efisien")
-        
-        # Combine reasons into coherent explanation
-        if len(reasons) >= 2:
-            main_reason = reasons[0]
-            supporting_reason = reasons[1]
-            alasan = f"{item_name} ditempatkan di {area_name} karena {main_reason}, serta {supporting_reason}"
-        elif len(reasons) == 1:
-            alasan = f"{item_name} ditempatkan di {area_name} karena {reasons[0]}"
-        else:
-            # Fallback reasoning with area characteristics
-            if area_utilization < 50:
-                alasan = f"{item_name} ditempatkan di {area_name} untuk mengoptimalkan utilisasi ruang yang tersedia ({area_utilization:.1f}%)"
-            elif is_high_access:
-                alasan = f"{item_name} ditempatkan di {area_name} karena lokasi strategis dekat akses utama untuk operasional efisien"
-            else:
-                alasan = f"{item_name} ditempatkan di {area_name} berdasarkan analisis algoritma SA untuk konfigurasi optimal"
-            
-        return alasan
+        return recommendations
     
-    def save_solution_to_database(self, solution: List[PenempatanSolution]) -> bool:
+    def export_results(self, recommendations: List[Dict], cost: Optional[float] = None) -> Optional[str]:
+        """
+        Export rekomendasi ke file hasil (streaming, per log_optimasi_id)
+        """
+        metadata = {
+            "algorithm": self.algorithm_label,
+            "engine": self.engine_name,
+            "log_optimasi_id": self.log_optimasi_id,
+            "distance_model": self.distance_model,
+            "objective_function_value": cost,
+        }
+        exporter = ResultExporter(output_dir=self.results_dir, fmt=self.export_format)
+        return exporter.export(recommendations, metadata)
+    
+    def build_summaries(self, recommendations: List[Dict]) -> Optional[Dict[str, List[Dict]]]:
+        """Ringkasan utilisasi per area dan kategori untuk log_optimasi_id ini (lihat utilization_summary)"""
+        if not self.log_optimasi_id or not recommendations:
+            return None
+        problem = self.compiled_problem or self.compile_problem()
+        return summarize_recommendations(problem, recommendations, self.log_optimasi_id)
+    
+    def save_solution_to_database(self, solution: List[PenempatanSolution], cost: Optional[float] = None) -> bool:
         """
         Menyimpan solusi optimasi langsung ke database
         """
         try:
-            recommendations = []
+            with self.timer.phase('reasoning'):
+                recommendations = self.build_recommendations(solution)
+            self.last_recommendations = recommendations
+            with self.timer.phase('summary'):
+                summaries = self.build_summaries(recommendations)
             
-            for placement in solution:
-                barang = next((b for b in self.barang_list if b.id == placement.barang_id), None)
-                area = next((a for a in self.areas if a.id == placement.area_id), None)
-                
-                if barang and area:
-                    # Generate detailed reasoning based on item and area characteristics
-                    alasan = self.generate_placement_reasoning(barang, area)
-                    
-                    recommendation = {
-                        "barang_id": placement.barang_id,
-                        "area_gudang_id": placement.area_id,
-                        "koordinat_x": round(placement.koordinat_x, 2),
-                        "koordinat_y": round(placement.koordinat_y, 2),
-                        "alasan": alasan,
-                        "confidence_score": 0.85,  # Score kepercayaan
-                        "algoritma": "Simulated Annealing"
-                    }
-                    
-                    # Tambahkan log_optimasi_id jika tersedia
-                    if self.log_optimasi_id:
-                        recommendation["log_optimasi_id"] = self.log_optimasi_id
-                    
-                    recommendations.append(recommendation)
-            
-            # Simpan ke database
-            success = self.db.save_optimization_results(recommendations)
+            # Simpan ke database (rekomendasi + ringkasan dalam satu transaksi)
+            with self.timer.phase('db_save'):
+                success = self.db.save_optimization_results(recommendations, summaries)
             
             if success:
                 print(f"💾 Saved {len(recommendations)} recommendations to database")
                 
-                # Coba simpan ke file JSON untuk backup (opsional)
+                # Export file hasil untuk backup & analisis (opsional)
                 try:
-                    output_file = "optimization_result.json"
-                    with open(output_file, 'w') as f:
-                        json.dump({
-                            "algorithm": "Simulated Annealing",
-                            "timestamp": "2025-10-18",
-                            "total_items": len(recommendations),
-                            "log_optimasi_id": self.log_optimasi_id,
-                            "recommendations": recommendations
-                        }, f, indent=2)
-                    print(f"📄 Backup saved to {output_file}")
+                    with self.timer.phase('export'):
+                        output_file = self.export_results(recommendations, cost)
+                    print(f"📄 Results exported to {output_file}")
                 except Exception as file_error:
                     print(f"⚠️  Warning: Could not save backup file: {file_error}")
                     # Don't fail the entire operation for file permission issues
@@ -687,10 +1108,194 @@ class WarehouseOptimizer:
             print(f"❌ Error saving solution: {e}")
             return False
     
+    def result_cache_config(self) -> Dict:
+        """Konfigurasi ternormalisasi yang menentukan hasil optimasi (bagian kunci cache)"""
+        return {
+            'gudang_ids': sorted(int(i) for i in self.gudang_ids),
+            'barang_ids': sorted(int(i) for i in self.barang_ids),
+            'prioritas_optimasi': self.prioritas_optimasi,
+            'target_utilisasi': float(self.target_utilisasi),
+            'distance_model': self.distance_model,
+            'max_run_units': self.max_run_units,
+            # Matriks affinity dihitung ulang per jendela refresh: hasil lama kedaluwarsa bersamanya
+            'co_access': ({**self.affinity_params, 'window': AffinityStore(self.affinity_params).window}
+                          if self.co_access_affinity else None),
+            'engine': self.engine_name,
+            'algorithm_params': self.engine_parameters(),
+            # Bound menentukan warm start dan kapan search berhenti; blok optimality ikut di hasil
+            'optimality_bound': ({key: float(value) for key, value in self.bound_params.items()}
+                                 if self.optimality_bound else None),
+            # hasil_optimasi yang di-cache memuat picking_simulation
+            'picking_simulation': dict(self.simulation_params) if self.picking_simulation else None,
+        }
+    
+    def run_lock_name(self) -> str:
+        """Nama advisory lock (≤ 64 karakter) dari konfigurasi ternormalisasi dan scope gudang/barang"""
+        return f"wh_opt_{result_cache_key(self.result_cache_config(), 'single_flight')[:48]}"
+    
+    def acquire_run_lock(self) -> Optional[str]:
+        """
+        Single-flight: jika run identik sedang berjalan, tunggu sampai selesai
+        (GET_LOCK) agar hasilnya dipakai ulang lewat cache hasil. Return nama
+        lock yang dipegang, atau None jika single-flight tidak dipakai.
+        """
+        if (not self.single_flight or self.result_cache is None or self.resume
+                or not hasattr(self.db, 'acquire_advisory_lock')):
+            return None
+        name = self.run_lock_name()
+        acquired = self.db.acquire_advisory_lock(name, 0)
+        if acquired is False:
+            print(f"⏳ Identical optimization already running, waiting up to {self.single_flight_timeout}s for its result...")
+            self.coalesced = True
+            acquired = self.db.acquire_advisory_lock(name, self.single_flight_timeout)
+        if not acquired:
+            print("⚠️  Warning: Could not acquire single-flight lock, running without coalescing")
+            return None
+        return name
+    
+    def lookup_cached_result(self) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Hitung kunci cache (konfigurasi + fingerprint data master) dan cari
+        hasil tersimpan. Return (key, entry); key None jika cache tidak dipakai.
+        """
+        if self.result_cache is None or self.resume or not hasattr(self.db, 'master_data_fingerprint'):
+            return None, None
+        fingerprint = self.db.master_data_fingerprint()
+        if not fingerprint:
+            return None, None
+        
+        key = result_cache_key(self.result_cache_config(), fingerprint)
+        try:
+            return key, self.result_cache.get(key)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not read result cache: {e}")
+            return key, None
+    
+    def store_cached_result(self, key: str, hasil_optimasi: Dict):
+        """Simpan rekomendasi run ini ke cache hasil (kegagalan tidak menggagalkan run)"""
+        try:
+            cached = {k: v for k, v in hasil_optimasi.items() if k != 'performance'}
+            self.result_cache.put(key, self.last_recommendations, cached, self.log_optimasi_id)
+            print(f"🗃️  Result cached ({key[:12]})")
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write result cache: {e}")
+    
+    def copy_pareto_file(self, source: str) -> Optional[str]:
+        """Salin file layout front Pareto run sumber ke log_optimasi_id ini"""
+        try:
+            target = self.pareto_file()
+            shutil.copyfile(source, target)
+            return target
+        except OSError as e:
+            print(f"⚠️  Warning: Could not copy Pareto layouts: {e}")
+            return None
+    
+    def apply_cached_result(self, key: str, entry: Dict) -> bool:
+        """
+        Cache hit: salin set rekomendasi tersimpan ke log_optimasi_id ini dan
+        tandai log selesai tanpa menjalankan optimasi
+        """
+        self.cache_hit = True
+        recommendations = entry['recommendations']
+        for recommendation in recommendations:
+            if self.log_optimasi_id:
+                recommendation['log_optimasi_id'] = self.log_optimasi_id
+        self.algorithm_label = recommendations[0]['algoritma']
+        self.last_recommendations = recommendations
+        cached = entry['hasil_optimasi']
+        source_log_id = entry.get('source_log_optimasi_id')
+        print(f"🗃️  Cache hit ({key[:12]}): reusing {len(recommendations)} recommendations "
+              f"from log optimasi {source_log_id}")
+        
+        with self.timer.phase('db_save'):
+            # Layout identik dengan run sumber: ringkasan utilisasi disalin di database
+            success = self.db.save_optimization_results(recommendations, summary_source_log_id=source_log_id)
+        if success:
+            try:
+                with self.timer.phase('export'):
+                    output_file = self.export_results(recommendations, cached.get('final_cost'))
+                print(f"📄 Results exported to {output_file}")
+            except Exception as file_error:
+                print(f"⚠️  Warning: Could not save backup file: {file_error}")
+        
+        pareto = cached.get('pareto')
+        if pareto and pareto.get('layouts_file') and self.log_optimasi_id:
+            pareto = dict(pareto, layouts_file=self.copy_pareto_file(pareto['layouts_file']))
+        
+        performance = self.timer.summary()
+        hasil_optimasi = {
+            **cached,
+            **({"pareto": pareto} if pareto else {}),
+            "execution_time": round(performance['total_seconds'], 2),
+            "performance": performance,
+            "cache": {
+                "hit": True,
+                "key": key[:16],
+                "source_log_optimasi_id": source_log_id,
+                "cached_at": entry.get('created_at'),
+                "coalesced": self.coalesced,
+            }
+        }
+        self.run_status = "selesai" if success else "gagal"
+        self.hasil_optimasi = hasil_optimasi
+        if self.log_optimasi_id:
+            self.db.update_optimization_status(
+                log_optimasi_id=self.log_optimasi_id,
+                status="selesai" if success else "gagal",
+                hasil_optimasi=hasil_optimasi,
+                detail_hasil=f"Optimization result reused from cache ({len(recommendations)} items, "
+                             f"source log optimasi {source_log_id})"
+            )
+        
+        print()
+        print("=== OPTIMIZATION SUMMARY (CACHED) ===")
+        print(f"Total items optimized: {len(recommendations)}")
+        if cached.get('final_cost') is not None:
+            print(f"Final objective function value: {cached['final_cost']:.2f}")
+        print(f"Database save: {'✅ Success' if success else '❌ Failed'}")
+        print()
+        self.timer.print_summary()
+        return success
+    
+    def finish_cancelled_run(self, result: EngineResult) -> bool:
+        """
+        Run dibatalkan: best-so-far sudah tersimpan di checkpoint; catat status
+        'dibatalkan' tanpa menulis rekomendasi
+        """
+        performance = self.timer.summary()
+        hasil_optimasi = {
+            "initial_cost": result.initial_cost,
+            "final_cost": result.cost,
+            "iterations": result.iterations,
+            "evaluations": result.evaluations,
+            "execution_time": round(performance['total_seconds'], 2),
+            "algorithm": self.algorithm_label,
+            "engine": result.engine,
+            "checkpoint": Checkpointer.for_log(self.log_optimasi_id).path if self.log_optimasi_id else None,
+            "performance": performance
+        }
+        self.run_status = "dibatalkan"
+        self.hasil_optimasi = hasil_optimasi
+        if self.log_optimasi_id:
+            self.db.update_optimization_status(
+                log_optimasi_id=self.log_optimasi_id,
+                status="dibatalkan",
+                hasil_optimasi=hasil_optimasi,
+                detail_hasil=f"Optimization cancelled at iteration {result.iterations}; best-so-far saved to checkpoint"
+            )
+        
+        print()
+        print("=== OPTIMIZATION CANCELLED ===")
+        print(f"Best objective function value so far: {result.cost:.2f}")
+        print(f"Resume with: python warehouse_optimization.py --log-id={self.log_optimasi_id} --resume")
+        return False
+    
     def run_optimization(self) -> bool:
         """
         Menjalankan proses optimasi lengkap dengan koneksi database
         """
+        self.timer.reset()
+        
         print("=== WAREHOUSE SPACE OPTIMIZATION USING SIMULATED ANNEALING ===")
         print("🏭 PT. NCS Cabang Bandung - Gudang Optimization System")
         print()
@@ -703,18 +1308,35 @@ class WarehouseOptimizer:
         
         # Connect ke database
         print("🔗 Connecting to database...")
-        if not self.connect_database():
+        with self.timer.phase('connect'):
+            connected = self.connect_database()
+        if not connected:
             print("❌ Failed to connect to database")
             return False
         
+        run_lock = None
         try:
+            # Run identik yang sedang berjalan: tunggu hasilnya, jangan hitung ulang
+            with self.timer.phase('single_flight'):
+                run_lock = self.acquire_run_lock()
+            
+            # Request identik dengan data master yang sama: pakai hasil tersimpan
+            with self.timer.phase('cache_lookup'):
+                cache_key, cached = self.lookup_cached_result()
+            if cached is not None:
+                return self.apply_cached_result(cache_key, cached)
+            
             # Load data dari database
             print("📊 Loading warehouse and item data...")
-            if not self.fetch_areas():
+            with self.timer.phase('fetch_areas'):
+                areas_loaded = self.fetch_areas()
+            if not areas_loaded:
                 print("❌ Failed to fetch areas")
                 return False
             
-            if not self.fetch_barang():
+            with self.timer.phase('fetch_barang'):
+                barang_loaded = self.fetch_barang()
+            if not barang_loaded:
                 print("❌ Failed to fetch barang")
                 return False
                 
@@ -730,23 +1352,52 @@ class WarehouseOptimizer:
             print(f"📊 Data validation passed: {len(self.areas)} areas, {len(self.barang_list)} items")
             print()
             
-            # Jalankan optimasi
-            best_solution, best_cost = self.simulated_annealing()
+            # Jalankan optimasi dengan engine yang dipilih
+            best_solution, best_cost, result = self.optimize()
+            
+            if result.cancelled:
+                return self.finish_cancelled_run(result)
             
             # Simpan hasil ke database
-            success = self.save_solution_to_database(best_solution)
+            success = self.save_solution_to_database(best_solution, best_cost)
+            
+            with self.timer.phase('picking_simulation'):
+                simulation = self.simulate_picking()
             
             # Update status log optimasi menggunakan database manager
-            if self.log_optimasi_id:
-                hasil_optimasi = {
-                    "final_cost": best_cost,
-                    "total_items": len(best_solution),
-                    "areas_utilized": len(set(p.area_id for p in best_solution)),
-                    "execution_time": 0.1,  # Will be calculated properly
-                    "algorithm": "Simulated Annealing"
+            performance = self.timer.summary()
+            hasil_optimasi = {
+                "initial_cost": result.initial_cost,
+                "final_cost": best_cost,
+                "iterations": result.iterations,
+                "evaluations": result.evaluations,
+                "total_items": len(best_solution),
+                "total_units": sum(p.jumlah for p in best_solution),
+                "areas_utilized": len(set(p.area_id for p in best_solution)),
+                "execution_time": round(performance['total_seconds'], 2),
+                "algorithm": self.algorithm_label,
+                "engine": result.engine,
+                "performance": performance
+            }
+            if self.pareto_result:
+                hasil_optimasi["pareto"] = self.pareto_result
+            if simulation is not None:
+                hasil_optimasi["picking_simulation"] = simulation
+            if self.bound_result is not None:
+                hasil_optimasi["optimality"] = {
+                    **self.bound_result.summary(best_cost),
+                    "gap_tolerance": self.bound_params['gap_tolerance'],
+                    "early_stopped": result.gap_stopped,
                 }
-                
-                status = "selesai" if success else "gagal"
+                print(f"📐 Optimality gap: {hasil_optimasi['optimality']['gap']:.4%} "
+                      f"(lower bound {self.bound_result.lower_bound:.2f})")
+            if success and cache_key:
+                self.store_cached_result(cache_key, hasil_optimasi)
+            
+            status = "selesai" if success else "gagal"
+            self.run_status = status
+            self.hasil_optimasi = hasil_optimasi
+            if self.log_optimasi_id:
                 detail_hasil = f"Optimization completed with {len(best_solution)} items placed optimally"
                 
                 self.db.update_optimization_status(
@@ -762,10 +1413,14 @@ class WarehouseOptimizer:
             print(f"Final objective function value: {best_cost:.2f}")
             print(f"Areas utilized: {len(set(p.area_id for p in best_solution))}")
             print(f"Database save: {'✅ Success' if success else '❌ Failed'}")
+            print()
+            self.timer.print_summary()
             
             return success
             
         finally:
+            if run_lock:
+                self.db.release_advisory_lock(run_lock)
             # Selalu tutup koneksi database
             self.disconnect_database()
 
@@ -778,9 +1433,31 @@ def main():
     parser = argparse.ArgumentParser(description='Warehouse Optimization using Simulated Annealing')
     parser.add_argument('--log-id', type=int, help='Log optimasi ID untuk database')
     parser.add_argument('--params', type=str, help='JSON parameters untuk optimasi')
+    parser.add_argument('--resume', action='store_true', help='Lanjutkan run dari checkpoint log optimasi ini')
+    parser.add_argument('--pareto-member', type=int, help='Terapkan anggota front Pareto dari run multi-objektif log ini')
+    parser.add_argument('--profile', action='store_true', help='Simpan cProfile stats dan collapsed stacks untuk run ini')
+    parser.add_argument('--profile-dir', type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'),
+                        help='Direktori output profiling')
+    parser.add_argument('--result-fd', type=int, help='Tulis amplop hasil JSON ke file descriptor ini (default: baris terakhir stdout)')
     
     args = parser.parse_args()
     
+    # Amplop hasil selalu ditulis, termasuk saat gagal, agar pemanggil tidak perlu membaca ulang database
+    outcome = {'optimizer': None, 'error': None}
+    try:
+        exit_code = run_cli(args, outcome)
+    except Exception as e:
+        print(f"❌ Error during optimization: {e}")
+        outcome['error'] = str(e)
+        exit_code = 1
+    emit_envelope(build_envelope(outcome['optimizer'], exit_code, outcome['error'], args.log_id), args.result_fd)
+    return exit_code
+
+def run_cli(args, outcome: Dict) -> int:
+    """
+    Jalankan perintah CLI; optimizer dan pesan error dicatat di outcome
+    untuk amplop hasil
+    """
     # Parse configuration dari parameter
     optimization_config = {}
     if args.params:
@@ -789,25 +1466,58 @@ def main():
             print(f"📋 Received configuration: {optimization_config}")
         except json.JSONDecodeError as e:
             print(f"❌ Error parsing parameters: {e}")
+            outcome['error'] = f"Invalid parameters: {e}"
             return 1
     
+    if args.pareto_member is not None:
+        if not args.log_id:
+            print("❌ --pareto-member requires --log-id")
+            outcome['error'] = "--pareto-member requires --log-id"
+            return 1
+        optimizer = WarehouseOptimizer(optimization_config)
+        optimizer.log_optimasi_id = args.log_id
+        outcome['optimizer'] = optimizer
+        return 0 if optimizer.apply_pareto_member(args.pareto_member) else 1
+    
+    if args.resume:
+        if not args.log_id:
+            print("❌ --resume requires --log-id")
+            outcome['error'] = "--resume requires --log-id"
+            return 1
+        optimization_config['resume'] = True
+    
     # Inisialisasi optimizer dengan config
     optimizer = WarehouseOptimizer(optimization_config)
+    outcome['optimizer'] = optimizer
     
     # Set log ID jika ada
     if args.log_id:
         optimizer.log_optimasi_id = args.log_id
         print(f"🔗 Connected to log optimasi ID: {args.log_id}")
     
+    profiler = None
+    if args.profile:
+        name = f"optimization_{args.log_id}" if args.log_id else None
+        profiler = RunProfiler(output_dir=args.profile_dir, name=name)
+        profiler.start()
+    
     try:
-        success = optimizer.run_optimization()
+        try:
+            success = optimizer.run_optimization()
+        finally:
+            if profiler:
+                profiler.stop()
         if success:
             print("\n✅ Optimization completed successfully!")
+        elif optimizer.cancelled:
+            print("\n⛔ Optimization cancelled, checkpoint saved")
+            return 1
         else:
             print("\n❌ Optimization failed!")
             return 1
     except Exception as e:
         print(f"❌ Error during optimization: {e}")
+        outcome['error'] = str(e)
         return 1
     
     return 0